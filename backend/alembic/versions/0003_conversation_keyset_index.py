@@ -0,0 +1,41 @@
+"""Index conversations for newest-first keyset pagination.
+
+/conversations used OFFSET pagination, so deep pages scanned and
+discarded every earlier row. The cursor form (before_created_at,
+before_id) walks this index instead.
+
+Revision ID: 0003_conversation_keyset_index
+Revises: 0002_runner_lease
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_conversation_keyset_index"
+down_revision = "0002_runner_lease"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; conversations is the
+    # busiest table and a plain CREATE INDEX would block tick writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversations_world_created",
+            "conversations",
+            ["world_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_conversations_world_created",
+            table_name="conversations",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
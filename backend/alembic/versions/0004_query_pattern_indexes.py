@@ -0,0 +1,103 @@
+"""Composite and partial indexes for the hot query predicates.
+
+Until now only agent_memories/claims/claim_votes had secondary indexes,
+so every per-world read (and the translator / embedding backfill scans)
+was a sequential scan. Each index below names the query it serves;
+tests/test_query_plans.py asserts those queries stop seq-scanning.
+
+Built CONCURRENTLY so upgrading a live database does not block the
+simulation's writes.
+
+Revision ID: 0004_query_pattern_indexes
+Revises: 0003_conversation_keyset_index
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_query_pattern_indexes"
+down_revision = "0003_conversation_keyset_index"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial predicate)
+INDEXES: list[tuple[str, str, list[str], str | None]] = [
+    # worlds: landing page ordering, auto-genesis / ops status counts
+    ("ix_worlds_created_at", "worlds", ["created_at DESC"], None),
+    ("ix_worlds_status", "worlds", ["status"], None),
+    # per-world listings
+    ("ix_factions_world_id", "factions", ["world_id"], None),
+    ("ix_agents_world_faction", "agents", ["world_id", "faction_id"], None),
+    ("ix_agents_faction_id", "agents", ["faction_id"], None),
+    ("ix_world_tags_world_id", "world_tags", ["world_id"], None),
+    ("ix_knowledge_edges_world_id", "knowledge_edges", ["world_id"], None),
+    # relationship lookups by pair (conversation drift) and by either side
+    ("ix_relationships_world_pair", "relationships", ["world_id", "agent_a", "agent_b"], None),
+    ("ix_relationships_world_agent_b", "relationships", ["world_id", "agent_b"], None),
+    # feed + wiki title lookups
+    ("ix_wiki_pages_world_created", "wiki_pages", ["world_id", "created_at DESC"], None),
+    ("ix_wiki_pages_world_title", "wiki_pages", ["world_id", "title"], None),
+    ("ix_wiki_history_page_version", "wiki_history", ["page_id", "version"], None),
+    ("ix_conversations_world_epoch", "conversations", ["world_id", "epoch"], None),
+    ("ix_strata_world_epoch", "strata", ["world_id", "epoch DESC"], None),
+    ("ix_agent_posts_world_created", "agent_posts", ["world_id", "created_at DESC"], None),
+    ("ix_claims_world_status", "claims", ["world_id", "status"], None),
+    ("ix_agent_memories_agent_created", "agent_memories", ["agent_id", "created_at DESC"], None),
+    ("ix_bookmarks_session_created", "bookmarks", ["user_session", "created_at"], None),
+    # entity graph / mentions
+    (
+        "ix_entity_mentions_world_target",
+        "entity_mentions",
+        ["world_id", "target_type", "target_id", "created_at DESC"],
+        None,
+    ),
+    ("ix_entity_mentions_source", "entity_mentions", ["source_type", "source_id"], None),
+    ("ix_semantic_neighbors_pair", "semantic_neighbors", ["entity_a_id", "entity_b_id"], None),
+    ("ix_semantic_neighbors_entity_b", "semantic_neighbors", ["entity_b_id"], None),
+    # multiverse
+    ("ix_resonance_links_world_a", "resonance_links", ["world_a", "strength DESC"], None),
+    ("ix_resonance_links_world_b", "resonance_links", ["world_b", "strength DESC"], None),
+    ("ix_resonance_links_entities", "resonance_links", ["entity_a", "entity_b"], None),
+    ("ix_concept_memberships_cluster", "concept_memberships", ["cluster_id", "similarity DESC"], None),
+    ("ix_taxonomy_nodes_parent", "taxonomy_nodes", ["parent_id"], None),
+    ("ix_taxonomy_memberships_node", "taxonomy_memberships", ["node_id", "similarity DESC"], None),
+    # translator backlog scans + ops counters (rows leave the index once translated)
+    (
+        "ix_conversations_translation_pending",
+        "conversations",
+        ["created_at DESC"],
+        "topic_ko IS NULL AND topic <> ''",
+    ),
+    (
+        "ix_wiki_pages_translation_pending",
+        "wiki_pages",
+        ["created_at DESC"],
+        "title_ko IS NULL AND title <> ''",
+    ),
+    ("ix_strata_translation_pending", "strata", ["id"], "summary_ko IS NULL AND summary <> ''"),
+    # embedding backfill scans (semantic indexer / convergence)
+    ("ix_agents_embedding_pending", "agents", ["id"], "embedding IS NULL"),
+    ("ix_conversations_embedding_pending", "conversations", ["id"], "embedding IS NULL"),
+    ("ix_wiki_pages_embedding_pending", "wiki_pages", ["id"], "embedding IS NULL"),
+    ("ix_wiki_pages_embedded_created", "wiki_pages", ["created_at DESC"], "embedding IS NOT NULL"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(c) for c in columns],
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,82 @@
+"""Add world_stats, the incrementally maintained per-world counters.
+
+/worlds used to run three GROUP BY counts plus a DISTINCT ON over all
+conversations per request, and the faction endpoints one COUNT per
+faction. Write paths now bump this row (services/world_stats.py); the
+upgrade backfills it from the existing tables once.
+
+Revision ID: 0005_world_stats
+Revises: 0004_query_pattern_indexes
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "0005_world_stats"
+down_revision = "0004_query_pattern_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "world_stats",
+        sa.Column(
+            "world_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("worlds.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("agent_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("conversation_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("wiki_page_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("post_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("claim_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("canon_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("faction_agent_counts", JSONB(), nullable=False, server_default="{}"),
+        sa.Column("latest_topic", sa.String(500), nullable=True),
+        sa.Column("last_activity_at", sa.DateTime(), nullable=True),
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        INSERT INTO world_stats (
+            world_id, agent_count, conversation_count, wiki_page_count, post_count,
+            claim_count, canon_count, faction_agent_counts, latest_topic, last_activity_at
+        )
+        SELECT
+            w.id,
+            (SELECT count(*) FROM agents a WHERE a.world_id = w.id),
+            (SELECT count(*) FROM conversations c WHERE c.world_id = w.id),
+            (SELECT count(*) FROM wiki_pages p WHERE p.world_id = w.id),
+            (SELECT count(*) FROM agent_posts ap WHERE ap.world_id = w.id),
+            (SELECT count(*) FROM claims cl WHERE cl.world_id = w.id),
+            (SELECT count(*) FROM claims cl WHERE cl.world_id = w.id AND cl.status = 'canon'),
+            COALESCE(
+                (
+                    SELECT jsonb_object_agg(a.faction_id::text, a.n)
+                    FROM (
+                        SELECT faction_id, count(*) AS n
+                        FROM agents
+                        WHERE world_id = w.id AND faction_id IS NOT NULL
+                        GROUP BY faction_id
+                    ) a
+                ),
+                '{}'::jsonb
+            ),
+            (
+                SELECT c.topic FROM conversations c
+                WHERE c.world_id = w.id
+                ORDER BY c.created_at DESC
+                LIMIT 1
+            ),
+            (SELECT max(c.created_at) FROM conversations c WHERE c.world_id = w.id)
+        FROM worlds w
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("world_stats")
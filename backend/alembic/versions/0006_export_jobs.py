@@ -0,0 +1,44 @@
+"""Add export_jobs for background exports with on-disk artifacts.
+
+Revision ID: 0006_export_jobs
+Revises: 0005_world_stats
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "0006_export_jobs"
+down_revision = "0005_world_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "world_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("worlds.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("formats", JSONB(), nullable=False, server_default="[]"),
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_export_jobs_world_created",
+        "export_jobs",
+        ["world_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_world_created", table_name="export_jobs")
+    op.drop_table("export_jobs")
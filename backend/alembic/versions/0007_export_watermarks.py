@@ -0,0 +1,70 @@
+"""Timestamps and indexes for incremental (since=) exports.
+
+agents, knowledge_edges and strata had no creation time, so exports could
+not select "rows added since the last pull". Existing rows are stamped with
+the migration time, which puts them in the first incremental window after
+the upgrade. The indexes serve the per-world window scans; the new
+knowledge_edges index supersedes ix_knowledge_edges_world_id.
+
+Revision ID: 0007_export_watermarks
+Revises: 0006_export_jobs
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_export_watermarks"
+down_revision = "0006_export_jobs"
+branch_labels = None
+depends_on = None
+
+STAMPED_TABLES = ("agents", "knowledge_edges", "strata")
+
+INDEXES = [
+    ("ix_agents_world_created", "agents", ["world_id", "created_at"]),
+    ("ix_knowledge_edges_world_created", "knowledge_edges", ["world_id", "created_at"]),
+    ("ix_wiki_pages_world_updated", "wiki_pages", ["world_id", "updated_at"]),
+    ("ix_wiki_history_created", "wiki_history", ["created_at"]),
+]
+
+
+def upgrade() -> None:
+    for table in STAMPED_TABLES:
+        # A constant-per-statement default: no table rewrite on PG 11+.
+        op.add_column(
+            table,
+            sa.Column("created_at", sa.DateTime(), nullable=True, server_default=sa.text("timezone('utc', now())")),
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(c) for c in columns],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.drop_index(
+            "ix_knowledge_edges_world_id",
+            table_name="knowledge_edges",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_knowledge_edges_world_id",
+            "knowledge_edges",
+            ["world_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in reversed(STAMPED_TABLES):
+        op.drop_column(table, "created_at")
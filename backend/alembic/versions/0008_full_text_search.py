@@ -0,0 +1,89 @@
+"""Full-text search: generated tsvector columns, GIN and trigram indexes.
+
+Wiki and global search matched ILIKE '%q%' against every page's content,
+which no index can serve. Each searchable table now carries a stored
+search_vector (weights: A = title/topic/name, B = body/summary/role,
+C = conversation messages) with a GIN index, and pg_trgm indexes serve
+fuzzy matches on agent names and wiki titles (services/text_search.py).
+
+Adding a stored generated column rewrites the table under an exclusive
+lock; run this upgrade in a maintenance window on large databases. The
+indexes themselves are built CONCURRENTLY.
+
+Revision ID: 0008_full_text_search
+Revises: 0007_export_watermarks
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0008_full_text_search"
+down_revision = "0007_export_watermarks"
+branch_labels = None
+depends_on = None
+
+# Must match the Computed() expressions in models/tables.py.
+SEARCH_VECTORS = {
+    "wiki_pages": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    ),
+    "conversations": (
+        "setweight(to_tsvector('english', coalesce(topic, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('english', jsonb_path_query_array(coalesce(messages, '[]'), '$[*].content')), 'C')"
+    ),
+    "agents": (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(persona ->> 'role', '')), 'B')"
+    ),
+}
+
+TRIGRAM_INDEXES = [
+    ("ix_agents_name_trgm", "agents", "name"),
+    ("ix_wiki_pages_title_trgm", "wiki_pages", "title"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(
+            table,
+            sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(expression, persisted=True)),
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.create_index(
+                f"ix_{table}_search",
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _column in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        for table in reversed(list(SEARCH_VECTORS)):
+            op.drop_index(f"ix_{table}_search", table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in reversed(list(SEARCH_VECTORS)):
+        op.drop_column(table, "search_vector")
+    # pg_trgm is left installed; other database objects may depend on it.
@@ -0,0 +1,43 @@
+"""HNSW indexes for approximate nearest-neighbour search.
+
+Hybrid search (services/hybrid_search.py) orders wiki pages, conversations
+and strata by cosine distance to the query embedding; without an index
+every query computed the distance to every stored vector. Rows without an
+embedding are not indexed.
+
+Built CONCURRENTLY; HNSW builds are CPU-heavy, so raise
+maintenance_work_mem for the session on large tables.
+
+Revision ID: 0009_vector_ann_indexes
+Revises: 0008_full_text_search
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0009_vector_ann_indexes"
+down_revision = "0008_full_text_search"
+branch_labels = None
+depends_on = None
+
+TABLES = ("wiki_pages", "conversations", "strata")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_embedding_hnsw",
+                table,
+                ["embedding"],
+                postgresql_using="hnsw",
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(f"ix_{table}_embedding_hnsw", table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""Add translation_memory so identical source texts are translated once.
+
+Revision ID: 0010_translation_memory
+Revises: 0009_vector_ann_indexes
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0010_translation_memory"
+down_revision = "0009_vector_ann_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "translation_memory",
+        sa.Column("source_hash", sa.String(64), primary_key=True),
+        sa.Column("target_lang", sa.String(8), primary_key=True),
+        sa.Column("translation", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("translation_memory")
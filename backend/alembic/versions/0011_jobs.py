@@ -0,0 +1,64 @@
+"""Add jobs, the durable queue background services share across workers.
+
+Every uvicorn worker used to run the convergence, semantic indexer,
+taxonomy and translator loops itself, so each cycle ran once per worker
+over the same rows. Work is now enqueued here and claimed with
+FOR UPDATE SKIP LOCKED (services/job_queue.py).
+
+Revision ID: 0011_jobs
+Revises: 0010_translation_memory
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "0011_jobs"
+down_revision = "0010_translation_memory"
+branch_labels = None
+depends_on = None
+
+UTC_NOW = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("kind", sa.String(64), nullable=False),
+        sa.Column("dedupe_key", sa.String(200), nullable=True),
+        sa.Column("payload", JSONB(), nullable=False, server_default="{}"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("repeat_seconds", sa.Integer(), nullable=True),
+        sa.Column("run_after", sa.DateTime(), nullable=False, server_default=UTC_NOW),
+        sa.Column("lease_owner", sa.String(64), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True, server_default=UTC_NOW),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "uq_jobs_pending_dedupe",
+        "jobs",
+        ["kind", "dedupe_key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+    op.create_index("ix_jobs_claim", "jobs", ["status", "priority", "run_after"])
+    op.create_index(
+        "ix_jobs_finished",
+        "jobs",
+        ["finished_at"],
+        postgresql_where=sa.text("status IN ('done', 'failed')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_finished", table_name="jobs")
+    op.drop_index("ix_jobs_claim", table_name="jobs")
+    op.drop_index("uq_jobs_pending_dedupe", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,23 @@
+"""Add worlds.genesis_checkpoint so an interrupted genesis resumes where it stopped.
+
+Revision ID: 0012_genesis_checkpoints
+Revises: 0011_jobs
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0012_genesis_checkpoints"
+down_revision = "0011_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("worlds", sa.Column("genesis_checkpoint", JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("worlds", "genesis_checkpoint")
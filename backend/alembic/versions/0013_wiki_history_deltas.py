@@ -0,0 +1,116 @@
+"""Store wiki_history as reverse deltas with a full snapshot every 10 versions.
+
+Existing rows are converted page by page: each becomes a delta against
+the next newer version on record (or the live page) unless its version is
+a multiple of 10 or the delta would not be smaller than the text.
+Duplicate rows for one version are left whole.
+Downgrade materializes every row's full text again.
+
+The delta format is the one in null_engine.services.wiki_history, copied
+here so the migration doesn't change when that module does.
+
+Revision ID: 0013_wiki_history_deltas
+Revises: 0012_genesis_checkpoints
+Create Date: 2026-10-19
+"""
+
+import difflib
+import json
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0013_wiki_history_deltas"
+down_revision = "0012_genesis_checkpoints"
+branch_labels = None
+depends_on = None
+
+SNAPSHOT_EVERY = 10
+
+
+def _make_delta(newer: str, older: str) -> list:
+    a = newer.splitlines(keepends=True)
+    b = older.splitlines(keepends=True)
+    delta: list = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(b[j1:j2])
+    return delta
+
+
+def _apply_delta(newer: str, delta: list) -> str:
+    lines = newer.splitlines(keepends=True)
+    out: list[str] = []
+    pos = 0
+    for item in delta:
+        if isinstance(item, list):
+            out.extend(item)
+        elif item > 0:
+            out.extend(lines[pos:pos + item])
+            pos += item
+        else:
+            pos -= item
+    return "".join(out)
+
+
+def _page_rows(bind, page_id):
+    return bind.execute(
+        sa.text(
+            "SELECT id, version, content, delta FROM wiki_history WHERE page_id = :page_id "
+            "ORDER BY version DESC, created_at DESC"
+        ),
+        {"page_id": page_id},
+    ).all()
+
+
+def _page_ids(bind):
+    return bind.execute(
+        sa.text(
+            "SELECT p.id, p.content FROM wiki_pages p "
+            "WHERE EXISTS (SELECT 1 FROM wiki_history h WHERE h.page_id = p.id)"
+        )
+    ).all()
+
+
+def upgrade() -> None:
+    op.add_column("wiki_history", sa.Column("delta", JSONB(), nullable=True))
+
+    bind = op.get_bind()
+    update = sa.text("UPDATE wiki_history SET content = NULL, delta = CAST(:delta AS JSONB) WHERE id = :id")
+    for page_id, page_content in _page_ids(bind):
+        newer = page_content or ""
+        seen = set()
+        for row_id, version, content, _ in _page_rows(bind, page_id):
+            if version in seen:
+                # Duplicate version from concurrent edits: left whole, off the chain.
+                continue
+            seen.add(version)
+            older = content or ""
+            if version % SNAPSHOT_EVERY != 0:
+                delta = json.dumps(_make_delta(newer, older))
+                if len(delta) < len(older):
+                    bind.execute(update, {"id": row_id, "delta": delta})
+            newer = older
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    update = sa.text("UPDATE wiki_history SET content = :content WHERE id = :id")
+    for page_id, page_content in _page_ids(bind):
+        newer = page_content or ""
+        seen = set()
+        for row_id, version, content, delta in _page_rows(bind, page_id):
+            if version in seen:
+                continue
+            seen.add(version)
+            if content is None:
+                content = _apply_delta(newer, delta or [])
+                bind.execute(update, {"id": row_id, "content": content})
+            newer = content
+    op.drop_column("wiki_history", "delta")
@@ -0,0 +1,113 @@
+"""Prepare knowledge_edges for the incremental knowledge graph builder.
+
+Edges become unique per (world, subject, predicate, object) so the builder
+can merge confidence with ON CONFLICT; that index and a (world, object)
+one serve neighborhood lookups in both directions, (world, updated_at)
+serves incremental exports of corroborated edges, and all are built
+CONCURRENTLY so writers aren't blocked. sources lists the documents that
+stated each triple, so one document corroborates it only once.
+knowledge_watermarks records how far, as a (changed_at, id) keyset, the
+builder has read each world's wiki pages and conversations.
+
+Revision ID: 0014_knowledge_graph
+Revises: 0013_wiki_history_deltas
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "0014_knowledge_graph"
+down_revision = "0013_wiki_history_deltas"
+branch_labels = None
+depends_on = None
+
+UTC_NOW = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_edges",
+        sa.Column(
+            "source_conversation",
+            UUID(as_uuid=True),
+            sa.ForeignKey("conversations.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.add_column("knowledge_edges", sa.Column("updated_at", sa.DateTime(), nullable=True, server_default=UTC_NOW))
+    op.add_column("knowledge_edges", sa.Column("sources", JSONB(), nullable=False, server_default="[]"))
+    op.execute(
+        """
+        UPDATE knowledge_edges
+        SET sources = jsonb_build_array('wiki_page:' || source_page::text)
+        WHERE source_page IS NOT NULL
+        """
+    )
+    # Keep the most confident copy of any duplicated triple.
+    op.execute(
+        """
+        DELETE FROM knowledge_edges e
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY world_id, subject, predicate, object
+                ORDER BY confidence DESC NULLS LAST, created_at
+            ) AS rank
+            FROM knowledge_edges
+        ) ranked
+        WHERE e.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_table(
+        "knowledge_watermarks",
+        sa.Column(
+            "world_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("worlds.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("source", sa.String(32), primary_key=True),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("watermark_id", UUID(as_uuid=True), nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_knowledge_edges_triple",
+            "knowledge_edges",
+            ["world_id", "subject", "predicate", "object"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_knowledge_edges_world_object",
+            "knowledge_edges",
+            ["world_id", "object"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_knowledge_edges_world_updated",
+            "knowledge_edges",
+            ["world_id", "updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_knowledge_edges_world_updated", table_name="knowledge_edges", postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_knowledge_edges_world_object", table_name="knowledge_edges", postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "uq_knowledge_edges_triple", table_name="knowledge_edges", postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_table("knowledge_watermarks")
+    op.drop_column("knowledge_edges", "sources")
+    op.drop_column("knowledge_edges", "updated_at")
+    op.drop_column("knowledge_edges", "source_conversation")
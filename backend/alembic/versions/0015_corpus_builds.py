@@ -0,0 +1,33 @@
+"""Add corpus_builds so training-corpus builds outlive the process that started them.
+
+Revision ID: 0015_corpus_builds
+Revises: 0014_knowledge_graph
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "0015_corpus_builds"
+down_revision = "0014_knowledge_graph"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "corpus_builds",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("options", JSONB(), nullable=False, server_default="{}"),
+        sa.Column("out_dir", sa.String(1000), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("manifest", JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("corpus_builds")
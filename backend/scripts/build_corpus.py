@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Build a deduplicated, sharded training corpus from every world in the database.
+
+Usage:
+  poetry run python scripts/build_corpus.py --out data/corpus/2026-10 --format chatml --shard-mb 128
+  poetry run python scripts/build_corpus.py --output parquet --include wiki --world-id <uuid> --world-id <uuid>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from null_engine.config import settings
+from null_engine.services.columnar_export import pyarrow_available
+from null_engine.services.corpus_builder import CORPUS_OUTPUTS, CORPUS_SOURCES, CorpusOptions, build_corpus
+from null_engine.services.exporter import parse_include
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="NULL cross-world training corpus builder")
+    parser.add_argument("--out", default=None, help="Output directory (default: corpus_output_dir/<timestamp>)")
+    parser.add_argument("--format", choices=["chatml", "alpaca", "sharegpt"], default="chatml")
+    parser.add_argument("--include", default="conversations,wiki", help="Comma-separated: conversations, wiki")
+    parser.add_argument("--world-id", action="append", default=None, help="Limit to these worlds (repeatable)")
+    parser.add_argument("--output", choices=CORPUS_OUTPUTS, default="jsonl")
+    parser.add_argument("--shard-mb", type=int, default=None, help="Target shard size in MiB of sample JSON")
+    parser.add_argument("--min-chars", type=int, default=200)
+    parser.add_argument("--max-chars", type=int, default=32_000)
+    parser.add_argument("--min-distinct-ratio", type=float, default=0.3, help="Minimum share of distinct words")
+    parser.add_argument("--shingle-size", type=int, default=5, help="Words per MinHash shingle")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash permutations")
+    parser.add_argument("--bands", type=int, default=8, help="LSH bands; must divide --num-perm")
+    return parser.parse_args()
+
+
+def options_from_args(args: argparse.Namespace) -> CorpusOptions:
+    include = parse_include(args.include) & set(CORPUS_SOURCES)
+    if not include:
+        raise SystemExit(f"--include must name at least one of {list(CORPUS_SOURCES)}")
+    if args.num_perm % args.bands:
+        raise SystemExit("--bands must divide --num-perm")
+    if args.output == "parquet" and not pyarrow_available():
+        raise SystemExit("--output parquet requires the pyarrow package")
+    return CorpusOptions(
+        format=args.format,
+        include=frozenset(include),
+        world_ids=tuple(uuid.UUID(w) for w in args.world_id) if args.world_id else None,
+        output=args.output,
+        shard_bytes=args.shard_mb * 1024**2 if args.shard_mb else None,
+        min_chars=args.min_chars,
+        max_chars=args.max_chars,
+        min_distinct_ratio=args.min_distinct_ratio,
+        shingle_size=args.shingle_size,
+        num_perm=args.num_perm,
+        bands=args.bands,
+    )
+
+
+async def _main() -> int:
+    args = parse_args()
+    options = options_from_args(args)
+    out_dir = Path(args.out) if args.out else Path(settings.corpus_output_dir) / datetime.now(UTC).strftime(
+        "%Y%m%dT%H%M%SZ"
+    )
+    manifest = await build_corpus(out_dir, options)
+    summary = {key: manifest[key] for key in ("worlds", "samples_seen", "samples_kept", "dropped")}
+    summary["shards"] = len(manifest["shards"])
+    summary["out_dir"] = str(out_dir)
+    print(json.dumps(summary, indent=2, ensure_ascii=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -3,6 +3,7 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.api.deps import require_write_access
 from null_engine.db import get_db
@@ -14,14 +15,14 @@ router = APIRouter(tags=["agents"])
 
 @router.get("/worlds/{world_id}/agents", response_model=list[AgentOut])
 async def list_agents(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Agent).where(Agent.world_id == world_id))
+    result = await db.execute(select(Agent).options(defer(Agent.embedding)).where(Agent.world_id == world_id))
     return result.scalars().all()
 
 
 @router.get("/worlds/{world_id}/agents/{agent_id}", response_model=AgentOut)
 async def get_agent(world_id: uuid.UUID, agent_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
-        select(Agent).where(Agent.world_id == world_id, Agent.id == agent_id)
+        select(Agent).options(defer(Agent.embedding)).where(Agent.world_id == world_id, Agent.id == agent_id)
     )
     agent = result.scalar_one_or_none()
     if not agent:
@@ -41,7 +42,7 @@ async def whisper_to_agent(
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
-        select(Agent).where(Agent.world_id == world_id, Agent.id == agent_id)
+        select(Agent).options(defer(Agent.embedding)).where(Agent.world_id == world_id, Agent.id == agent_id)
     )
     agent = result.scalar_one_or_none()
     if not agent:
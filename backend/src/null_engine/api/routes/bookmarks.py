@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.db import get_db
 from null_engine.models.schemas import BookmarkCreate, BookmarkOut, OkResponse
@@ -107,7 +108,7 @@ async def export_bookmarks(
 
         if bm.entity_type == "wiki_page":
             page = (await db.execute(
-                select(WikiPage).where(WikiPage.id == bm.entity_id)
+                select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.id == bm.entity_id)
             )).scalar_one_or_none()
             if page:
                 item["title"] = page.title
@@ -115,7 +116,7 @@ async def export_bookmarks(
 
         elif bm.entity_type == "agent":
             agent = (await db.execute(
-                select(Agent).where(Agent.id == bm.entity_id)
+                select(Agent).options(defer(Agent.embedding)).where(Agent.id == bm.entity_id)
             )).scalar_one_or_none()
             if agent:
                 item["name"] = agent.name
@@ -123,7 +124,7 @@ async def export_bookmarks(
 
         elif bm.entity_type == "conversation":
             conv = (await db.execute(
-                select(Conversation).where(Conversation.id == bm.entity_id)
+                select(Conversation).options(defer(Conversation.embedding)).where(Conversation.id == bm.entity_id)
             )).scalar_one_or_none()
             if conv:
                 item["topic"] = conv.topic
@@ -1,13 +1,15 @@
 import uuid
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, load_only
 
 from null_engine.db import get_db
 from null_engine.models.schemas import ConversationDetailOut, FeedItemOut
 from null_engine.models.tables import Agent, AgentPost, Conversation, Faction, Stratum, WikiPage
+from null_engine.services.translation_demand import note_untranslated
 
 router = APIRouter(tags=["conversations"])
 
@@ -17,19 +19,39 @@ async def list_conversations(
     world_id: uuid.UUID,
     limit: int = Query(20, le=50),
     offset: int = Query(0, ge=0),
+    before_created_at: datetime | None = Query(None),
+    before_id: uuid.UUID | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
+    """Newest-first conversations.
+
+    Pass the last row's (created_at, id) as before_created_at/before_id
+    to fetch the next page; that walks ix_conversations_world_created
+    instead of scanning past every skipped row like offset does.
+    """
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(status_code=422, detail="before_created_at and before_id must be given together")
+
+    stmt = (
         select(Conversation)
+        .options(defer(Conversation.embedding))
         .where(Conversation.world_id == world_id)
-        .order_by(Conversation.created_at.desc())
-        .offset(offset)
+        .order_by(Conversation.created_at.desc(), Conversation.id.desc())
         .limit(limit)
     )
+    if before_created_at is not None:
+        stmt = stmt.where(
+            tuple_(Conversation.created_at, Conversation.id) < tuple_(before_created_at, before_id)
+        )
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    result = await db.execute(stmt)
     conversations = result.scalars().all()
 
     if not conversations:
         return []
+    note_untranslated("conversation", world_id, conversations, "topic_ko")
 
     # Collect all participant agent IDs
     all_agent_ids: set[uuid.UUID] = set()
@@ -107,6 +129,10 @@ async def get_feed(
     # Fetch conversations
     conv_result = await db.execute(
         select(Conversation)
+        .options(load_only(
+            Conversation.id, Conversation.topic, Conversation.topic_ko,
+            Conversation.participants, Conversation.messages, Conversation.created_at,
+        ))
         .where(Conversation.world_id == world_id, Conversation.created_at < before_dt)
         .order_by(Conversation.created_at.desc())
         .limit(limit)
@@ -132,6 +158,10 @@ async def get_feed(
     # Fetch recent wiki edits
     wiki_result = await db.execute(
         select(WikiPage)
+        .options(load_only(
+            WikiPage.id, WikiPage.title, WikiPage.title_ko, WikiPage.created_by_agent,
+            WikiPage.status, WikiPage.version, WikiPage.created_at,
+        ))
         .where(WikiPage.world_id == world_id, WikiPage.created_at < before_dt)
         .order_by(WikiPage.created_at.desc())
         .limit(limit)
@@ -150,6 +180,7 @@ async def get_feed(
     # Fetch strata
     strata_result = await db.execute(
         select(Stratum)
+        .options(defer(Stratum.embedding))
         .where(Stratum.world_id == world_id)
         .order_by(Stratum.epoch.desc())
         .limit(limit)
@@ -165,6 +196,10 @@ async def get_feed(
     )
     agent_posts = posts_result.scalars().all()
 
+    note_untranslated("conversation", world_id, conversations, "topic_ko")
+    note_untranslated("wiki_page", world_id, wiki_pages, "title_ko")
+    note_untranslated("stratum", world_id, strata, "summary_ko")
+
     # Fetch agent names for posts
     post_agent_ids = {p.agent_id for p in agent_posts}
     post_agent_names: dict[str, str] = {}
@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,13 +12,16 @@ from null_engine.models.schemas import (
     EntityMentionOut,
     SemanticNeighborOut,
 )
-from null_engine.models.tables import (
-    Agent,
-    EntityMention,
-    KnowledgeEdge,
-    SemanticNeighbor,
-    WikiPage,
+from null_engine.models.tables import EntityMention, SemanticNeighbor
+from null_engine.services.entity_graph import (
+    EGO_MAX_DEPTH,
+    Graph,
+    ego_graph,
+    sampled_graph,
+    to_columnar,
+    top_edges,
 )
+from null_engine.services.response_cache import cached_response
 
 router = APIRouter(tags=["entities"])
 
@@ -66,58 +69,72 @@ async def get_entity_neighbors(
     return result.scalars().all()
 
 
+def _graph_payload(graph: Graph, format: str):
+    if format == "columnar":
+        # Plain JSON arrays; skips building a model per node and edge.
+        return to_columnar(graph)
+    return EntityGraphOut(
+        nodes=[EntityGraphNode(id=node.id, type=node.type, label=node.label) for node in graph.nodes],
+        edges=[
+            EntityGraphEdge(
+                source_id=edge.source_id, target_id=edge.target_id, type=edge.type, weight=edge.weight, label=edge.label,
+            )
+            for edge in graph.edges
+        ],
+    )
+
+
+@router.get(
+    "/worlds/{world_id}/entities/{entity_type}/{entity_id}/graph",
+    response_model=EntityGraphOut,
+)
+async def get_entity_ego_graph(
+    world_id: uuid.UUID,
+    entity_type: str,
+    entity_id: uuid.UUID,
+    request: Request,
+    depth: int = Query(1, ge=1, le=EGO_MAX_DEPTH),
+    max_edges: int = Query(200, ge=1, le=2000),
+    format: str = Query("json", pattern="^(json|columnar)$"),
+    db: AsyncSession = Depends(get_db),
+):
+    """The entity's neighborhood up to depth hops, heaviest edges first."""
+
+    async def _load():
+        graph = await ego_graph(db, world_id, entity_type, entity_id, depth=depth, max_edges=max_edges)
+        return _graph_payload(graph, format)
+
+    return await cached_response(request, _load, world_id=world_id)
+
+
 @router.get(
     "/worlds/{world_id}/entity-graph",
     response_model=EntityGraphOut,
 )
 async def get_entity_graph(
     world_id: uuid.UUID,
+    request: Request,
+    mode: str = Query("overview", pattern="^(overview|top)$"),
+    sample: str = Query("hubs", pattern="^(hubs|random)$"),
+    max_nodes: int = Query(200, ge=1, le=2000),
+    max_edges: int = Query(500, ge=1, le=5000),
+    format: str = Query("json", pattern="^(json|columnar)$"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get the full entity graph for a world (agents + wiki + mentions + knowledge edges)."""
-    nodes: list[EntityGraphNode] = []
-    edges: list[EntityGraphEdge] = []
-    seen_nodes: set[str] = set()
-
-    # Add agents as nodes
-    agents_result = await db.execute(
-        select(Agent).where(Agent.world_id == world_id)
-    )
-    for agent in agents_result.scalars().all():
-        key = str(agent.id)
-        if key not in seen_nodes:
-            seen_nodes.add(key)
-            nodes.append(EntityGraphNode(id=agent.id, type="agent", label=agent.name))
-
-    # Add wiki pages as nodes
-    wiki_result = await db.execute(
-        select(WikiPage).where(WikiPage.world_id == world_id)
-    )
-    for page in wiki_result.scalars().all():
-        key = str(page.id)
-        if key not in seen_nodes:
-            seen_nodes.add(key)
-            nodes.append(EntityGraphNode(id=page.id, type="wiki_page", label=page.title))
-
-    # Add mention-based edges
-    mentions_result = await db.execute(
-        select(EntityMention).where(EntityMention.world_id == world_id)
-    )
-    for mention in mentions_result.scalars().all():
-        edges.append(EntityGraphEdge(
-            source_id=mention.source_id,
-            target_id=mention.target_id,
-            type="mention",
-            weight=mention.confidence,
-        ))
-
-    # Add knowledge edges
-    kg_result = await db.execute(
-        select(KnowledgeEdge).where(KnowledgeEdge.world_id == world_id)
-    )
-    for edge in kg_result.scalars().all():
-        # Knowledge edges use string subjects, so we map them to wiki page IDs if possible
-        # For now, skip — they're already in the graph tab via knowledgeEdges
-        pass
+    """A bounded view of the world's entity graph (mentions + knowledge edges).
+
+    mode=overview samples max_nodes nodes (hubs by weighted degree, or
+    random) and the heaviest edges among them; mode=top returns the
+    max_edges heaviest edges. format=columnar encodes the result as
+    parallel arrays for the graph renderer. Views are cached until the
+    world's version moves (sample=random included).
+    """
+
+    async def _load():
+        if mode == "top":
+            graph = await top_edges(db, world_id, max_edges=max_edges)
+        else:
+            graph = await sampled_graph(db, world_id, max_nodes=max_nodes, max_edges=max_edges, sample=sample)
+        return _graph_payload(graph, format)
 
-    return EntityGraphOut(nodes=nodes, edges=edges)
+    return await cached_response(request, _load, world_id=world_id)
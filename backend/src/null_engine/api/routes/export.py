@@ -1,155 +1,80 @@
-import json
+import os
 import uuid
-from typing import Any, Literal
+from typing import Any
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
+from null_engine.api.deps import require_write_access
 from null_engine.db import get_db
-from null_engine.models.schemas import AgentExportOut
-from null_engine.models.tables import (
-    Agent,
-    Conversation,
-    KnowledgeEdge,
-    WikiPage,
-    World,
+from null_engine.models.schemas import (
+    AgentExportOut,
+    CorpusBuildCreate,
+    CorpusBuildOut,
+    ExportArtifactOut,
+    ExportJobCreate,
+    ExportJobOut,
+)
+from null_engine.models.tables import Agent, CorpusBuild, ExportJob, WikiPage, World
+from null_engine.services.columnar_export import (
+    COLUMNAR_FORMATS,
+    FILE_EXTENSIONS,
+    MEDIA_TYPES,
+    TABLES,
+    columnar_stream,
+    pyarrow_available,
+)
+from null_engine.services.corpus_builder import (
+    CORPUS_SOURCES,
+    CorpusOptions,
+    create_corpus_build,
+    get_corpus_build,
+)
+from null_engine.services.export_jobs import (
+    ARTIFACT_FORMATS,
+    artifact_path,
+    create_export_job,
+)
+from null_engine.services.export_stream import COMPRESSIONS, ExportWindow, decode_cursor, zstd_available
+from null_engine.services.exporter import (
+    ExportBody,
+    TrainingFormat,
+    conversations_export,
+    full_export,
+    knowledge_graph_export,
+    parse_include,
+    training_export,
 )
 
 router = APIRouter(tags=["export"])
-TrainingFormat = Literal["chatml", "alpaca", "sharegpt"]
-
-
-def _parse_include(include: str) -> set[str]:
-    aliases = {
-        "conversation": "conversations",
-        "conversations": "conversations",
-        "wiki": "wiki",
-        "wikis": "wiki",
-        "kg": "kg",
-        "knowledgegraph": "kg",
-        "knowledge_graph": "kg",
-        "knowledge-graph": "kg",
-    }
-    include_set: set[str] = set()
-    for token in include.split(","):
-        normalized = token.strip().lower()
-        if not normalized:
-            continue
-        if normalized in {"all", "*", "default", "full"}:
-            return {"conversations", "wiki", "kg"}
-        if normalized in {"none", "null", "off"}:
-            return set()
-        canonical = aliases.get(normalized)
-        if canonical:
-            include_set.add(canonical)
-    return include_set
-
-
-def _conversation_training_sample(conversation: Any, fmt: TrainingFormat) -> dict[str, Any] | None:
-    messages: list[dict[str, Any]] = conversation.messages or []
-    if not messages:
-        return None
-
-    if fmt == "chatml":
-        chatml_messages = [{"role": "system", "content": f"Topic: {conversation.topic}"}]
-        for message in messages:
-            agent_id = message.get("agent_id", "unknown")
-            content = message.get("content", "")
-            chatml_messages.append(
-                {"role": "user", "content": f"[{agent_id}]: {content}"}
-            )
-        if conversation.summary:
-            chatml_messages.append({"role": "assistant", "content": conversation.summary})
-        return {"messages": chatml_messages}
-
-    if fmt == "alpaca":
-        instruction = f"Continue the conversation about '{conversation.topic}'"
-        input_text = "\n".join(
-            f"{message.get('agent_id', '')}: {message.get('content', '')}"
-            for message in messages[:2]
-        )
-        output_text = "\n".join(
-            f"{message.get('agent_id', '')}: {message.get('content', '')}"
-            for message in messages[2:]
-        )
-        return {
-            "instruction": instruction,
-            "input": input_text,
-            "output": output_text or conversation.summary,
-        }
+COMPRESSION_PATTERN = f"^({'|'.join(COMPRESSIONS)})$"
+CURSOR_HEADER = "X-Export-Cursor"
 
-    sharegpt_conversations = [
-        {"from": "human", "value": message.get("content", "")}
-        for message in messages
-    ]
-    if conversation.summary:
-        sharegpt_conversations.append({"from": "gpt", "value": conversation.summary})
-    return {"conversations": sharegpt_conversations}
-
-
-def _wiki_training_sample(page: Any, fmt: TrainingFormat) -> dict[str, Any]:
-    if fmt == "chatml":
-        return {
-            "messages": [
-                {"role": "system", "content": "You are a world-building wiki author."},
-                {"role": "user", "content": f"Write a wiki article about: {page.title}"},
-                {"role": "assistant", "content": page.content},
-            ]
-        }
-    if fmt == "alpaca":
-        return {
-            "instruction": f"Write a wiki article about: {page.title}",
-            "input": "",
-            "output": page.content,
-        }
-    return {
-        "conversations": [
-            {"from": "human", "value": f"Write about {page.title}"},
-            {"from": "gpt", "value": page.content},
-        ]
-    }
-
-
-def _knowledge_graph_training_sample(
-    edges: list[Any], fmt: TrainingFormat
-) -> dict[str, Any] | None:
-    if not edges:
-        return None
-
-    triples = [f"{edge.subject} {edge.predicate} {edge.object}" for edge in edges]
-    triple_text = "\n".join(triples)
-
-    if fmt == "chatml":
-        return {
-            "messages": [
-                {"role": "system", "content": "Extract knowledge triples."},
-                {"role": "assistant", "content": triple_text},
-            ]
-        }
-    if fmt == "alpaca":
-        return {
-            "instruction": "List knowledge graph triples.",
-            "input": "",
-            "output": triple_text,
-        }
-    return {
-        "conversations": [
-            {"from": "human", "value": "What are the key relationships?"},
-            {"from": "gpt", "value": triple_text},
-        ]
-    }
+
+def _export_window(
+    since: str | None = Query(None, description="Cursor from a previous export's X-Export-Cursor header"),
+) -> ExportWindow:
+    """Only rows changed since the cursor; the response's cursor resumes after it."""
+    try:
+        return ExportWindow.starting_at(decode_cursor(since) if since else None)
+    except ValueError:
+        raise HTTPException(422, "Invalid since cursor") from None
 
 
 @router.get("/worlds/{world_id}/export/wiki", response_model=list[dict[str, Any]])
 async def export_wiki(
     world_id: uuid.UUID,
     format: str = Query("md", pattern="^(md|json)$"),
+    window: ExportWindow = Depends(_export_window),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(WikiPage).where(WikiPage.world_id == world_id))
+    stmt = select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.world_id == world_id)
+    result = await db.execute(window.bound(stmt, WikiPage.updated_at))
     pages = result.scalars().all()
+    headers = {CURSOR_HEADER: window.next_cursor}
 
     if format == "md":
         lines = []
@@ -158,7 +83,7 @@ async def export_wiki(
             lines.append(f"*Status: {p.status} | Version: {p.version}*\n")
             lines.append(f"{p.content}\n")
             lines.append("---\n")
-        return PlainTextResponse("\n".join(lines), media_type="text/markdown")
+        return PlainTextResponse("\n".join(lines), media_type="text/markdown", headers=headers)
 
     data = [
         {
@@ -171,7 +96,16 @@ async def export_wiki(
         }
         for p in pages
     ]
-    return JSONResponse(data)
+    return JSONResponse(data, headers=headers)
+
+
+def _streaming_export(body: ExportBody, compression: str, window: ExportWindow) -> StreamingResponse:
+    if compression == "zstd" and not zstd_available():
+        raise HTTPException(400, "zstd compression requires the zstandard package")
+    headers = {CURSOR_HEADER: window.next_cursor}
+    if compression != "none":
+        headers["Content-Encoding"] = compression
+    return StreamingResponse(body.encoded(compression), media_type=body.media_type, headers=headers)
 
 
 @router.get(
@@ -181,44 +115,10 @@ async def export_wiki(
 async def export_conversations(
     world_id: uuid.UUID,
     format: str = Query("jsonl", pattern="^(jsonl|json)$"),
-    db: AsyncSession = Depends(get_db),
+    compression: str = Query("none", pattern=COMPRESSION_PATTERN),
+    window: ExportWindow = Depends(_export_window),
 ):
-    result = await db.execute(
-        select(Conversation)
-        .where(Conversation.world_id == world_id)
-        .order_by(Conversation.created_at)
-    )
-    convs = result.scalars().all()
-
-    if format == "jsonl":
-        lines = []
-        for c in convs:
-            obj = {
-                "type": "conversation",
-                "epoch": c.epoch,
-                "tick": c.tick,
-                "topic": c.topic,
-                "participants": c.participants,
-                "messages": c.messages,
-                "summary": c.summary,
-            }
-            lines.append(json.dumps(obj, ensure_ascii=False))
-        return PlainTextResponse("\n".join(lines), media_type="application/jsonl")
-
-    data = [
-        {
-            "id": str(c.id),
-            "epoch": c.epoch,
-            "tick": c.tick,
-            "topic": c.topic,
-            "participants": c.participants,
-            "messages": c.messages,
-            "summary": c.summary,
-            "created_at": c.created_at.isoformat() if c.created_at else None,
-        }
-        for c in convs
-    ]
-    return JSONResponse(data)
+    return _streaming_export(conversations_export(world_id, format, window), compression, window)
 
 
 @router.get("/worlds/{world_id}/export/training", response_model=list[dict[str, Any]])
@@ -226,41 +126,12 @@ async def export_training_data(
     world_id: uuid.UUID,
     format: TrainingFormat = Query("chatml", pattern="^(chatml|alpaca|sharegpt)$"),
     include: str = Query("conversations,wiki,kg"),
-    db: AsyncSession = Depends(get_db),
+    compression: str = Query("none", pattern=COMPRESSION_PATTERN),
+    window: ExportWindow = Depends(_export_window),
 ):
     """Export world data in LLM training formats."""
-    include_set = _parse_include(include)
-    samples: list[dict] = []
-
-    if "conversations" in include_set:
-        result = await db.execute(
-            select(Conversation)
-            .where(Conversation.world_id == world_id)
-            .order_by(Conversation.created_at)
-        )
-        for c in result.scalars().all():
-            sample = _conversation_training_sample(c, format)
-            if sample:
-                samples.append(sample)
-
-    if "wiki" in include_set:
-        result = await db.execute(
-            select(WikiPage).where(WikiPage.world_id == world_id)
-        )
-        for p in result.scalars().all():
-            samples.append(_wiki_training_sample(p, format))
-
-    if "kg" in include_set:
-        result = await db.execute(
-            select(KnowledgeEdge).where(KnowledgeEdge.world_id == world_id)
-        )
-        edges = result.scalars().all()
-        kg_sample = _knowledge_graph_training_sample(edges, format)
-        if kg_sample:
-            samples.append(kg_sample)
-
-    lines = [json.dumps(s, ensure_ascii=False) for s in samples]
-    return PlainTextResponse("\n".join(lines), media_type="application/jsonl")
+    body = training_export(world_id, format, parse_include(include), window)
+    return _streaming_export(body, compression, window)
 
 
 @router.get(
@@ -270,40 +141,40 @@ async def export_training_data(
 async def export_knowledge_graph(
     world_id: uuid.UUID,
     format: str = Query("json", pattern="^(csv|json)$"),
-    db: AsyncSession = Depends(get_db),
+    compression: str = Query("none", pattern=COMPRESSION_PATTERN),
+    window: ExportWindow = Depends(_export_window),
 ):
-    result = await db.execute(
-        select(KnowledgeEdge).where(KnowledgeEdge.world_id == world_id)
-    )
-    edges = result.scalars().all()
+    return _streaming_export(knowledge_graph_export(world_id, format, window), compression, window)
 
-    if format == "csv":
-        lines = ["subject,predicate,object,confidence"]
-        for e in edges:
-            subj = e.subject.replace('"', '""')
-            pred = e.predicate.replace('"', '""')
-            obj = e.object.replace('"', '""')
-            lines.append(f'"{subj}","{pred}","{obj}",{e.confidence}')
-        return PlainTextResponse("\n".join(lines), media_type="text/csv")
 
-    data = [
-        {
-            "subject": e.subject,
-            "predicate": e.predicate,
-            "object": e.object,
-            "confidence": e.confidence,
-        }
-        for e in edges
-    ]
-    return JSONResponse(data)
+@router.get("/worlds/{world_id}/export/columnar/{table}")
+async def export_columnar(
+    world_id: uuid.UUID,
+    table: str = Path(..., pattern=f"^({'|'.join(TABLES)})$"),
+    format: str = Query("parquet", pattern=f"^({'|'.join(COLUMNAR_FORMATS)})$"),
+    window: ExportWindow = Depends(_export_window),
+):
+    """Export one table as Parquet or an Arrow IPC stream (messages are one row each)."""
+    if not pyarrow_available():
+        raise HTTPException(400, "columnar export requires the pyarrow package")
+    if window.incremental and TABLES[table].changed_at is None:
+        raise HTTPException(400, f"{table} has no change tracking; since= is not supported")
+    filename = f"{world_id}-{table}.{FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        columnar_stream(world_id, table, format, window),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', CURSOR_HEADER: window.next_cursor},
+    )
 
 
 @router.get("/worlds/{world_id}/export/agents", response_model=list[AgentExportOut])
 async def export_agents(
     world_id: uuid.UUID,
+    window: ExportWindow = Depends(_export_window),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Agent).where(Agent.world_id == world_id))
+    stmt = select(Agent).options(defer(Agent.embedding)).where(Agent.world_id == world_id)
+    result = await db.execute(window.bound(stmt, Agent.created_at))
     agents = result.scalars().all()
     data = [
         {
@@ -317,71 +188,139 @@ async def export_agents(
         }
         for a in agents
     ]
-    return JSONResponse(data)
+    return JSONResponse(data, headers={CURSOR_HEADER: window.next_cursor})
 
 
 @router.get("/worlds/{world_id}/export/all", response_model=list[dict[str, Any]])
 async def export_all(
     world_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    compression: str = Query("none", pattern=COMPRESSION_PATTERN),
+    window: ExportWindow = Depends(_export_window),
 ):
     """Export everything as JSONL."""
-    lines = []
-
-    # World
-    result = await db.execute(select(World).where(World.id == world_id))
-    world = result.scalar_one_or_none()
-    if world:
-        lines.append(json.dumps({
-            "type": "world",
-            "id": str(world.id),
-            "seed_prompt": world.seed_prompt,
-            "config": world.config,
-            "status": world.status,
-        }, ensure_ascii=False))
-
-    # Agents
-    result = await db.execute(select(Agent).where(Agent.world_id == world_id))
-    for a in result.scalars().all():
-        lines.append(json.dumps({
-            "type": "agent",
-            "id": str(a.id),
-            "name": a.name,
-            "persona": a.persona,
-            "beliefs": a.beliefs,
-        }, ensure_ascii=False))
+    return _streaming_export(full_export(world_id, window), compression, window)
+
+
+def _export_job_out(job: ExportJob) -> ExportJobOut:
+    artifacts = []
+    if job.status == "ready":
+        for fmt in job.formats:
+            path = artifact_path(job.world_id, job.data_version, fmt)
+            artifacts.append(ExportArtifactOut(
+                format=fmt,
+                url=f"/api/worlds/{job.world_id}/exports/{job.id}/files/{fmt}",
+                size_bytes=path.stat().st_size if path.is_file() else None,
+            ))
+    return ExportJobOut(
+        id=job.id,
+        world_id=job.world_id,
+        status=job.status,
+        formats=job.formats,
+        data_version=job.data_version,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        artifacts=artifacts,
+    )
 
-    # Wiki
-    result = await db.execute(select(WikiPage).where(WikiPage.world_id == world_id))
-    for p in result.scalars().all():
-        lines.append(json.dumps({
-            "type": "wiki_page",
-            "id": str(p.id),
-            "title": p.title,
-            "content": p.content,
-            "status": p.status,
-        }, ensure_ascii=False))
-
-    # Conversations
-    result = await db.execute(select(Conversation).where(Conversation.world_id == world_id))
-    for c in result.scalars().all():
-        lines.append(json.dumps({
-            "type": "conversation",
-            "epoch": c.epoch,
-            "topic": c.topic,
-            "messages": c.messages,
-            "summary": c.summary,
-        }, ensure_ascii=False))
-
-    # Knowledge graph
-    result = await db.execute(select(KnowledgeEdge).where(KnowledgeEdge.world_id == world_id))
-    for e in result.scalars().all():
-        lines.append(json.dumps({
-            "type": "knowledge_edge",
-            "subject": e.subject,
-            "predicate": e.predicate,
-            "object": e.object,
-            "confidence": e.confidence,
-        }, ensure_ascii=False))
-
-    return PlainTextResponse("\n".join(lines), media_type="application/jsonl")
+
+async def _get_export_job(db: AsyncSession, world_id: uuid.UUID, job_id: uuid.UUID) -> ExportJob:
+    result = await db.execute(select(ExportJob).where(ExportJob.id == job_id, ExportJob.world_id == world_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(404, "Export job not found")
+    return job
+
+
+@router.post(
+    "/worlds/{world_id}/exports",
+    response_model=ExportJobOut,
+    status_code=202,
+    dependencies=[Depends(require_write_access)],
+)
+async def create_export(world_id: uuid.UUID, body: ExportJobCreate, db: AsyncSession = Depends(get_db)):
+    """Build the requested artifacts in the background (or reuse them if the world hasn't changed)."""
+    unknown = [fmt for fmt in body.formats if fmt not in ARTIFACT_FORMATS]
+    if unknown:
+        raise HTTPException(422, f"Unknown export formats: {', '.join(unknown)}; expected {sorted(ARTIFACT_FORMATS)}")
+    unavailable = [fmt for fmt in body.formats if not ARTIFACT_FORMATS[fmt].available()]
+    if unavailable:
+        raise HTTPException(400, f"Export formats unavailable on this server: {', '.join(unavailable)}")
+
+    result = await db.execute(select(World.id).where(World.id == world_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(404, "World not found")
+
+    job = await create_export_job(db, world_id, body.formats)
+    return _export_job_out(job)
+
+
+@router.get("/worlds/{world_id}/exports/{job_id}", response_model=ExportJobOut)
+async def get_export(world_id: uuid.UUID, job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    return _export_job_out(await _get_export_job(db, world_id, job_id))
+
+
+@router.get("/worlds/{world_id}/exports/{job_id}/files/{fmt}")
+async def download_export(world_id: uuid.UUID, job_id: uuid.UUID, fmt: str, db: AsyncSession = Depends(get_db)):
+    """Serve a finished artifact; Range requests resume interrupted downloads."""
+    job = await _get_export_job(db, world_id, job_id)
+    if fmt not in job.formats:
+        raise HTTPException(404, "Format not part of this export")
+    if job.status != "ready":
+        raise HTTPException(409, f"Export job is {job.status}")
+    path = artifact_path(world_id, job.data_version, fmt)
+    try:
+        os.utime(path)  # mark recently used for LRU eviction
+    except FileNotFoundError:
+        raise HTTPException(410, "Artifact was evicted; request a new export") from None
+    return FileResponse(
+        path,
+        media_type=ARTIFACT_FORMATS[fmt].media_type,
+        filename=f"{world_id}-v{job.data_version}-{fmt}",
+    )
+
+
+def _corpus_build_out(build: CorpusBuild) -> CorpusBuildOut:
+    return CorpusBuildOut(
+        id=build.id,
+        status=build.status,
+        out_dir=build.out_dir,
+        error=build.error,
+        created_at=build.created_at,
+        finished_at=build.finished_at,
+        manifest=build.manifest,
+    )
+
+
+@router.post(
+    "/exports/corpus",
+    response_model=CorpusBuildOut,
+    status_code=202,
+    dependencies=[Depends(require_write_access)],
+)
+async def create_corpus_build_endpoint(body: CorpusBuildCreate, db: AsyncSession = Depends(get_db)):
+    """Build a deduplicated, sharded training corpus across worlds in the background."""
+    include = parse_include(body.include) & set(CORPUS_SOURCES)
+    if not include:
+        raise HTTPException(422, f"include must name at least one of {list(CORPUS_SOURCES)}")
+    if body.output == "parquet" and not pyarrow_available():
+        raise HTTPException(400, "parquet output requires the pyarrow package")
+    options = CorpusOptions(
+        format=body.format,
+        include=frozenset(include),
+        world_ids=tuple(body.world_ids) if body.world_ids is not None else None,
+        output=body.output,
+        shard_bytes=body.shard_mb * 1024**2 if body.shard_mb else None,
+        min_chars=body.min_chars,
+        max_chars=body.max_chars,
+        min_distinct_ratio=body.min_distinct_ratio,
+    )
+    return _corpus_build_out(await create_corpus_build(db, options))
+
+
+@router.get("/exports/corpus/{build_id}", response_model=CorpusBuildOut)
+async def get_corpus_build_status(build_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    build = await get_corpus_build(db, build_id)
+    if build is None:
+        raise HTTPException(404, "Corpus build not found")
+    return _corpus_build_out(build)
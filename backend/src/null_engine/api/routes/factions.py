@@ -1,29 +1,40 @@
 import uuid
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from null_engine.db import get_db
 from null_engine.models.schemas import FactionWithCountOut, RelationshipOut
-from null_engine.models.tables import Agent, Faction, Relationship
+from null_engine.models.tables import Faction, Relationship, WorldStats
+from null_engine.services.response_cache import cached_response
 
 router = APIRouter(tags=["factions"])
 
 
 @router.get("/worlds/{world_id}/factions", response_model=list[FactionWithCountOut])
-async def list_factions(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def list_factions(world_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)):
+    return await cached_response(
+        request, lambda: _load_factions(world_id, db), model=list[FactionWithCountOut], world_id=world_id
+    )
+
+
+async def _load_factions(world_id: uuid.UUID, db: AsyncSession) -> list[dict]:
     result = await db.execute(
         select(Faction).where(Faction.world_id == world_id)
     )
     factions = result.scalars().all()
+    if not factions:
+        return []
+
+    counts_result = await db.execute(
+        select(WorldStats.faction_agent_counts).where(WorldStats.world_id == world_id)
+    )
+    faction_agent_counts = counts_result.scalar() or {}
 
     out = []
     for f in factions:
-        count_result = await db.execute(
-            select(func.count(Agent.id)).where(Agent.faction_id == f.id)
-        )
-        agent_count = count_result.scalar() or 0
+        agent_count = int(faction_agent_counts.get(str(f.id), 0))
         out.append({
             "id": str(f.id),
             "world_id": str(f.world_id),
@@ -36,7 +47,13 @@ async def list_factions(world_id: uuid.UUID, db: AsyncSession = Depends(get_db))
 
 
 @router.get("/worlds/{world_id}/relationships", response_model=list[RelationshipOut])
-async def list_relationships(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def list_relationships(world_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)):
+    return await cached_response(
+        request, lambda: _load_relationships(world_id, db), model=list[RelationshipOut], world_id=world_id
+    )
+
+
+async def _load_relationships(world_id: uuid.UUID, db: AsyncSession) -> list[dict]:
     result = await db.execute(
         select(Relationship).where(Relationship.world_id == world_id)
     )
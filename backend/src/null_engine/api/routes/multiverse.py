@@ -1,27 +1,31 @@
 import uuid
+from dataclasses import asdict
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from null_engine.core.warm_pool import POOL_STATUSES
 from null_engine.db import get_db
 from null_engine.models.schemas import (
     ClusterDetailOut,
     ClusterMemberOut,
     ClusterOut,
     GlobalSearchResult,
+    HybridSearchOut,
+    HybridSearchResult,
     ResonanceLinkOut,
     WorldNeighborOut,
     WorldsSimilarityMapOut,
 )
 from null_engine.models.tables import (
-    Agent,
     ConceptCluster,
     ConceptMembership,
     ResonanceLink,
-    WikiPage,
     World,
 )
+from null_engine.services import hybrid_search, text_search
+from null_engine.services.response_cache import cached_response
 
 router = APIRouter(prefix="/multiverse", tags=["multiverse"])
 
@@ -52,7 +56,6 @@ async def get_cluster(cluster_id: uuid.UUID, db: AsyncSession = Depends(get_db))
     )
     cluster = result.scalar_one_or_none()
     if not cluster:
-        from fastapi import HTTPException
         raise HTTPException(404, "Cluster not found")
 
     members_result = await db.execute(
@@ -88,49 +91,54 @@ async def get_resonance(
 @router.get("/search", response_model=list[GlobalSearchResult])
 async def global_search(
     q: str = Query(..., min_length=1),
+    world_id: uuid.UUID | None = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search across all worlds by text matching. Vector search when embeddings available."""
-    pattern = f"%{q}%"
-    results: list[GlobalSearchResult] = []
-
-    # Search wiki pages
-    wiki_result = await db.execute(
-        select(WikiPage)
-        .where(or_(WikiPage.title.ilike(pattern), WikiPage.content.ilike(pattern)))
-        .limit(10)
-    )
-    for p in wiki_result.scalars().all():
-        title_match = q.lower() in p.title.lower()
-        results.append(GlobalSearchResult(
-            entity_type="wiki_page",
-            entity_id=p.id,
-            world_id=p.world_id,
-            title=p.title,
-            snippet=p.content[:150],
-            score=1.0 if title_match else 0.5,
-        ))
-
-    # Search agents
-    agent_result = await db.execute(
-        select(Agent).where(Agent.name.ilike(pattern)).limit(10)
-    )
-    for a in agent_result.scalars().all():
-        results.append(GlobalSearchResult(
-            entity_type="agent",
-            entity_id=a.id,
-            world_id=a.world_id,
-            title=a.name,
-            snippet=str(a.persona.get("role", "")),
-            score=0.8,
-        ))
+    """Full-text search over wiki pages, conversations and agents, ranked across types."""
+    hits = await text_search.search(db, q, world_id=world_id, limit=limit, offset=offset)
+    return [
+        GlobalSearchResult(
+            entity_type=hit.entity_type,
+            entity_id=hit.entity_id,
+            world_id=hit.world_id,
+            title=hit.title,
+            snippet=hit.snippet,
+            highlight=hit.highlight,
+            score=hit.score,
+        )
+        for hit in hits
+    ]
+
 
-    results.sort(key=lambda r: r.score, reverse=True)
-    return results[:20]
+@router.get("/search/hybrid", response_model=HybridSearchOut)
+async def hybrid_global_search(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    world_id: uuid.UUID | None = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Full-text and vector (wiki, conversations, strata) search fused by reciprocal rank."""
+    try:
+        page = await hybrid_search.hybrid_search(db, q, world_id=world_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(422, "Invalid search cursor") from None
+    response.headers["Server-Timing"] = page.server_timing
+    return HybridSearchOut(
+        results=[HybridSearchResult(**asdict(hit)) for hit in page.hits],
+        next_cursor=page.next_cursor,
+        semantic=page.semantic,
+        embedding_cached=page.embedding_cached,
+        timings_ms=page.timings_ms,
+    )
 
 
 @router.get("/worlds/map", response_model=WorldsSimilarityMapOut)
 async def worlds_similarity_map(
+    request: Request,
     min_strength: float = Query(0.0, ge=0.0, le=1.0),
     min_count: int = Query(1, ge=1, le=1000),
     link_limit: int = Query(200, ge=1, le=1000),
@@ -138,6 +146,20 @@ async def worlds_similarity_map(
     db: AsyncSession = Depends(get_db),
 ):
     """Return deduplicated world pairs with resonance strength for visualization."""
+    return await cached_response(
+        request,
+        lambda: _load_similarity_map(db, min_strength, min_count, link_limit, world_limit),
+        model=WorldsSimilarityMapOut,
+    )
+
+
+async def _load_similarity_map(
+    db: AsyncSession,
+    min_strength: float,
+    min_count: int,
+    link_limit: int,
+    world_limit: int,
+) -> dict:
     result = await db.execute(
         select(
             ResonanceLink.world_a,
@@ -190,7 +212,12 @@ async def worlds_similarity_map(
             .limit(world_limit)
         )
     else:
-        worlds_result = await db.execute(select(World).order_by(World.created_at.desc()).limit(world_limit))
+        worlds_result = await db.execute(
+            select(World)
+            .where(World.status.notin_(POOL_STATUSES))
+            .order_by(World.created_at.desc())
+            .limit(world_limit)
+        )
 
     worlds = [
         {
@@ -10,6 +10,7 @@ from null_engine.core.runner_manager import runner_manager
 from null_engine.db import get_db
 from null_engine.models.schemas import (
     OpsAlertOut,
+    OpsCacheOut,
     OpsLoopOut,
     OpsMetricsOut,
     OpsQueueOut,
@@ -17,7 +18,10 @@ from null_engine.models.schemas import (
     OpsWorldStatusOut,
 )
 from null_engine.models.tables import Conversation, Stratum, WikiPage, World
+from null_engine.services.embedding_pipeline import oldest_pending_age_seconds, pending_embeddings
+from null_engine.services.mention_extractor import pending_mention_jobs
 from null_engine.services.runtime_metrics import (
+    get_cache_metrics_snapshot,
     get_loop_metrics_snapshot,
     get_runner_metrics_snapshot,
     merge_metric_defaults,
@@ -94,6 +98,19 @@ def _build_alerts(
             )
         )
 
+    if queue_data["embedding_oldest_age_seconds"] >= settings.ops_embedding_backlog_age_seconds:
+        alerts.append(
+            OpsAlertOut(
+                code="embedding_backlog",
+                severity="warning",
+                message="Embedding queue is falling behind",
+                context={
+                    "embedding_pending": queue_data["embedding_pending"],
+                    "embedding_oldest_age_seconds": queue_data["embedding_oldest_age_seconds"],
+                },
+            )
+        )
+
     if queue_data["generating_worlds"] >= settings.ops_generating_worlds_threshold:
         alerts.append(
             OpsAlertOut(
@@ -153,6 +170,9 @@ async def _build_ops_snapshot(db: AsyncSession) -> OpsMetricsOut:
         "translator_pending_wiki_pages": int(pending_wiki_result.scalar() or 0),
         "translator_pending_strata": int(pending_strata_result.scalar() or 0),
         "generating_worlds": int(generating_worlds_result.scalar() or 0),
+        "mention_extractor_pending": pending_mention_jobs(),
+        "embedding_pending": pending_embeddings(),
+        "embedding_oldest_age_seconds": oldest_pending_age_seconds(),
     }
 
     loop_defaults = {
@@ -184,6 +204,9 @@ async def _build_ops_snapshot(db: AsyncSession) -> OpsMetricsOut:
     ]
     runners.sort(key=lambda runner: runner.world_id.hex)
 
+    cache = [OpsCacheOut.model_validate(row) for row in get_cache_metrics_snapshot()]
+    cache.sort(key=lambda row: row.route)
+
     active_runners = len(runner_manager.running_world_ids())
 
     alerts = _build_alerts(
@@ -201,6 +224,7 @@ async def _build_ops_snapshot(db: AsyncSession) -> OpsMetricsOut:
         loops=loops,
         runners=runners,
         queues=OpsQueueOut(**queue_data),
+        cache=cache,
         alerts=alerts,
     )
 
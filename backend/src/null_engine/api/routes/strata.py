@@ -1,12 +1,15 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.db import get_db
 from null_engine.models.schemas import StrataComparisonOut, StratumOut
 from null_engine.models.tables import Stratum
+from null_engine.services.response_cache import cached_response
+from null_engine.services.translation_demand import note_untranslated
 
 router = APIRouter(tags=["strata"])
 
@@ -14,15 +17,24 @@ router = APIRouter(tags=["strata"])
 @router.get("/worlds/{world_id}/strata", response_model=list[StratumOut])
 async def get_strata(
     world_id: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Get all temporal strata for a world."""
-    result = await db.execute(
-        select(Stratum)
-        .where(Stratum.world_id == world_id)
-        .order_by(Stratum.epoch.desc())
-    )
-    return result.scalars().all()
+
+    async def _load():
+        result = await db.execute(
+            select(Stratum)
+            .options(defer(Stratum.embedding))
+            .where(Stratum.world_id == world_id)
+            .order_by(Stratum.epoch.desc())
+        )
+        strata = result.scalars().all()
+        # Cache hits skip this; the entries are dropped once the translations land.
+        note_untranslated("stratum", world_id, strata, "summary_ko")
+        return strata
+
+    return await cached_response(request, _load, model=list[StratumOut], world_id=world_id)
 
 
 def _normalize_str_list(values: list | None) -> list[str]:
@@ -54,7 +66,7 @@ async def compare_strata(
             raise HTTPException(400, "from_epoch must be less than to_epoch")
 
         result = await db.execute(
-            select(Stratum).where(
+            select(Stratum).options(defer(Stratum.embedding)).where(
                 Stratum.world_id == world_id,
                 Stratum.epoch.in_([from_epoch, to_epoch]),
             )
@@ -68,6 +80,7 @@ async def compare_strata(
     else:
         result = await db.execute(
             select(Stratum)
+            .options(defer(Stratum.embedding))
             .where(Stratum.world_id == world_id)
             .order_by(Stratum.epoch.desc())
             .limit(2)
@@ -108,7 +121,7 @@ async def get_stratum(
 ):
     """Get a specific stratum by epoch."""
     result = await db.execute(
-        select(Stratum).where(
+        select(Stratum).options(defer(Stratum.embedding)).where(
             Stratum.world_id == world_id,
             Stratum.epoch == epoch,
         )
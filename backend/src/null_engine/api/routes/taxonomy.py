@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,19 +12,24 @@ from null_engine.models.schemas import (
     TaxonomyWorldOut,
 )
 from null_engine.models.tables import TaxonomyMembership, TaxonomyNode, World
+from null_engine.services.response_cache import cached_response
 
 router = APIRouter(tags=["taxonomy"])
 
 
 @router.get("/taxonomy/tree", response_model=list[TaxonomyNodeOut])
-async def get_taxonomy_tree(db: AsyncSession = Depends(get_db)):
+async def get_taxonomy_tree(request: Request, db: AsyncSession = Depends(get_db)):
     """Get all root-level taxonomy nodes."""
-    result = await db.execute(
-        select(TaxonomyNode)
-        .where(TaxonomyNode.parent_id.is_(None))
-        .order_by(TaxonomyNode.member_count.desc())
-    )
-    return result.scalars().all()
+
+    async def _load():
+        result = await db.execute(
+            select(TaxonomyNode)
+            .where(TaxonomyNode.parent_id.is_(None))
+            .order_by(TaxonomyNode.member_count.desc())
+        )
+        return result.scalars().all()
+
+    return await cached_response(request, _load, model=list[TaxonomyNodeOut])
 
 
 @router.get("/taxonomy/tree/{node_id}", response_model=TaxonomyNodeDetail)
@@ -1,31 +1,118 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.db import get_db
-from null_engine.models.schemas import KnowledgeEdgeOut, WikiPageOut
+from null_engine.models.schemas import (
+    KnowledgeEdgeOut,
+    WikiDiffOut,
+    WikiPageOut,
+    WikiSearchOut,
+    WikiVersionContentOut,
+    WikiVersionOut,
+)
 from null_engine.models.tables import KnowledgeEdge, WikiPage
+from null_engine.services.hybrid_search import hybrid_search
 from null_engine.services.storage import search_wiki_pages
+from null_engine.services.translation_demand import note_untranslated
+from null_engine.services.wiki_history import history_versions, reconstruct_version, unified_diff
 
 router = APIRouter(tags=["wiki"])
 
 
 @router.get("/worlds/{world_id}/wiki", response_model=list[WikiPageOut])
 async def list_wiki_pages(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(WikiPage).where(WikiPage.world_id == world_id))
-    return result.scalars().all()
+    result = await db.execute(select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.world_id == world_id))
+    pages = result.scalars().all()
+    note_untranslated("wiki_page", world_id, pages, "title_ko")
+    return pages
+
 
+def _search_result(page: WikiPage, highlight: str) -> WikiSearchOut:
+    return WikiSearchOut(**WikiPageOut.model_validate(page).model_dump(), highlight=highlight)
 
-@router.get("/worlds/{world_id}/wiki/search", response_model=list[WikiPageOut])
+
+@router.get("/worlds/{world_id}/wiki/search", response_model=list[WikiSearchOut])
 async def search_wiki(
     world_id: uuid.UUID,
+    response: Response,
     q: str = Query(..., min_length=1),
+    mode: str = Query("text", pattern="^(text|hybrid)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
     db: AsyncSession = Depends(get_db),
 ):
-    pages = await search_wiki_pages(db, world_id, q)
-    return pages
+    """Full-text search, ranked and fuzzy on titles; mode=hybrid also ranks by embedding similarity."""
+    if mode == "text":
+        hits = await search_wiki_pages(db, world_id, q, limit=limit, offset=offset)
+        return [_search_result(page, highlight) for page, highlight in hits]
+
+    page = await hybrid_search(db, q, world_id=world_id, kinds=("wiki_page",), limit=offset + limit)
+    response.headers["Server-Timing"] = page.server_timing
+    highlights = {hit.entity_id: hit.highlight for hit in page.hits[offset:]}
+    if not highlights:
+        return []
+    result = await db.execute(
+        select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.id.in_(list(highlights)))
+    )
+    by_id = {p.id: p for p in result.scalars().all()}
+    return [_search_result(by_id[page_id], highlight) for page_id, highlight in highlights.items() if page_id in by_id]
+
+
+async def _get_page(db: AsyncSession, world_id: uuid.UUID, page_id: uuid.UUID) -> WikiPage:
+    result = await db.execute(
+        select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.id == page_id, WikiPage.world_id == world_id)
+    )
+    page = result.scalar_one_or_none()
+    if page is None:
+        raise HTTPException(404, "Wiki page not found")
+    return page
+
+
+async def _version_text(db: AsyncSession, page: WikiPage, version: int) -> str:
+    text = await reconstruct_version(db, page, version)
+    if text is None:
+        raise HTTPException(404, f"Version {version} not found")
+    return text
+
+
+@router.get("/worlds/{world_id}/wiki/{page_id}/history", response_model=list[WikiVersionOut])
+async def list_wiki_versions(world_id: uuid.UUID, page_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Superseded versions of a page, newest first, without their text."""
+    page = await _get_page(db, world_id, page_id)
+    return await history_versions(db, page.id)
+
+
+@router.get("/worlds/{world_id}/wiki/{page_id}/versions/{version}", response_model=WikiVersionContentOut)
+async def get_wiki_version(
+    world_id: uuid.UUID, page_id: uuid.UUID, version: int, db: AsyncSession = Depends(get_db),
+):
+    page = await _get_page(db, world_id, page_id)
+    return WikiVersionContentOut(page_id=page.id, version=version, content=await _version_text(db, page, version))
+
+
+@router.get("/worlds/{world_id}/wiki/{page_id}/diff", response_model=WikiDiffOut)
+async def diff_wiki_versions(
+    world_id: uuid.UUID,
+    page_id: uuid.UUID,
+    from_version: int = Query(..., ge=1),
+    to_version: int | None = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Unified diff between two versions (to_version defaults to the current one)."""
+    page = await _get_page(db, world_id, page_id)
+    to_version = page.version if to_version is None else to_version
+    older = await _version_text(db, page, from_version)
+    newer = await _version_text(db, page, to_version)
+    return WikiDiffOut(
+        page_id=page.id,
+        from_version=from_version,
+        to_version=to_version,
+        diff=unified_diff(older, newer, from_version=from_version, to_version=to_version),
+    )
 
 
 @router.get("/worlds/{world_id}/knowledge-graph", response_model=list[KnowledgeEdgeOut])
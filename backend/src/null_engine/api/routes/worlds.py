@@ -1,14 +1,17 @@
 import asyncio
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.api.deps import require_write_access
+from null_engine.core.genesis import enqueue_genesis
 from null_engine.core.runner_manager import runner_manager
-from null_engine.db import async_session, get_db
+from null_engine.core.warm_pool import POOL_STATUSES, claim_generic_world, claim_pooled_world
+from null_engine.db import get_db
 from null_engine.models.schemas import (
     RecentMessageOut,
     SimulationControlOut,
@@ -17,66 +20,54 @@ from null_engine.models.schemas import (
     WorldOut,
     WorldTagOut,
 )
-from null_engine.models.tables import Agent, Conversation, WikiPage, World, WorldTag
+from null_engine.models.tables import Conversation, World, WorldStats, WorldTag
+from null_engine.services.response_cache import bump_world_version, cached_response
+from null_engine.services.world_analytics import get_world_analytics
 
 router = APIRouter(tags=["worlds"])
 
-_genesis_tasks: dict[uuid.UUID, asyncio.Task] = {}
-
-
 @router.get("/worlds", response_model=list[WorldCardOut])
 async def list_worlds(
+    request: Request,
     tag: str | None = None,
     mature: bool | None = None,
     incubating: bool | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(World).order_by(World.created_at.desc()).limit(50)
+    return await cached_response(
+        request,
+        lambda: _load_world_cards(db, tag, mature, incubating),
+        model=list[WorldCardOut],
+    )
+
+
+async def _load_world_cards(
+    db: AsyncSession,
+    tag: str | None,
+    mature: bool | None,
+    incubating: bool | None,
+) -> list[WorldCardOut]:
+    # Counters come from world_stats (maintained by the write paths), so
+    # this stays two small queries regardless of how much history exists.
+    query = (
+        select(World, WorldStats)
+        .outerjoin(WorldStats, WorldStats.world_id == World.id)
+        .where(World.status.notin_(POOL_STATUSES))
+        .order_by(World.created_at.desc())
+        .limit(50)
+    )
 
     if tag:
         world_ids_q = select(WorldTag.world_id).where(WorldTag.tag.ilike(f"%{tag}%"))
         query = query.where(World.id.in_(world_ids_q))
 
     result = await db.execute(query)
-    worlds = result.scalars().all()
+    rows = result.all()
 
-    if not worlds:
+    if not rows:
         return []
 
-    world_ids = [w.id for w in worlds]
-
-    # Batch count agents per world
-    agent_counts_q = await db.execute(
-        select(Agent.world_id, func.count()).where(Agent.world_id.in_(world_ids)).group_by(Agent.world_id)
-    )
-    agent_counts = dict(agent_counts_q.all())
-
-    # Batch count conversations per world
-    conv_counts_q = await db.execute(
-        select(Conversation.world_id, func.count()).where(Conversation.world_id.in_(world_ids)).group_by(Conversation.world_id)
-    )
-    conv_counts = dict(conv_counts_q.all())
-
-    # Batch count wiki pages per world
-    wiki_counts_q = await db.execute(
-        select(WikiPage.world_id, func.count()).where(WikiPage.world_id.in_(world_ids)).group_by(WikiPage.world_id)
-    )
-    wiki_counts = dict(wiki_counts_q.all())
-
-    # Batch fetch latest conversation topic per world
-    latest_conv_q = await db.execute(
-        select(
-            Conversation.world_id,
-            Conversation.topic,
-        )
-        .distinct(Conversation.world_id)
-        .where(Conversation.world_id.in_(world_ids))
-        .order_by(Conversation.world_id, Conversation.created_at.desc())
-    )
-    latest_activity_map: dict[uuid.UUID, str] = {}
-    for row in latest_conv_q.all():
-        if row.world_id not in latest_activity_map:
-            latest_activity_map[row.world_id] = row.topic
+    world_ids = [w.id for w, _stats in rows]
 
     # Batch fetch all tags
     tags_q = await db.execute(
@@ -88,10 +79,10 @@ async def list_worlds(
         tags_by_world.setdefault(t.world_id, []).append(WorldTagOut.model_validate(t))
 
     out = []
-    for w in worlds:
-        agent_count = agent_counts.get(w.id, 0)
-        conversation_count = conv_counts.get(w.id, 0)
-        wiki_page_count = wiki_counts.get(w.id, 0)
+    for w, stats in rows:
+        agent_count = stats.agent_count if stats else 0
+        conversation_count = stats.conversation_count if stats else 0
+        wiki_page_count = stats.wiki_page_count if stats else 0
 
         # Apply maturity filters
         is_mature = conversation_count >= 5 and wiki_page_count >= 1
@@ -106,18 +97,24 @@ async def list_worlds(
         card.conversation_count = conversation_count
         card.wiki_page_count = wiki_page_count
         card.epoch_count = w.current_epoch
-        card.latest_activity = latest_activity_map.get(w.id)
+        card.latest_activity = stats.latest_topic if stats else None
+        card.genesis_progress = _genesis_progress(w)
 
         out.append(card)
 
     return out
 
 
+def _genesis_progress(world: World) -> dict | None:
+    return (world.genesis_checkpoint or {}).get("progress") if world.status == "generating" else None
+
+
 @router.get("/worlds/{world_id}/recent-messages", response_model=list[RecentMessageOut])
 async def get_recent_messages(world_id: uuid.UUID, limit: int = 5, db: AsyncSession = Depends(get_db)):
     """Return recent conversation messages for the SystemPulse mini-feed."""
     result = await db.execute(
         select(Conversation)
+        .options(defer(Conversation.embedding))
         .where(Conversation.world_id == world_id)
         .order_by(Conversation.created_at.desc())
         .limit(limit)
@@ -148,66 +145,29 @@ async def get_recent_messages(world_id: uuid.UUID, limit: int = 5, db: AsyncSess
     return messages[-10:]
 
 
-async def _background_genesis(world_id: uuid.UUID, seed_prompt: str, extra_config: dict):
-    """Run full genesis in background after the world row is created."""
-    import structlog
-    logger = structlog.get_logger()
-    try:
-        async with async_session() as db:
-            from null_engine.core.genesis import populate_world
-            await populate_world(db, world_id, seed_prompt, extra_config)
-
-        # generating -> ready, then hand off to the runner manager
-        async with async_session() as db:
-            result = await db.execute(select(World).where(World.id == world_id))
-            world = result.scalar_one_or_none()
-            if world:
-                world.status = "ready"
-                await db.commit()
-
-        # Auto-start simulation after genesis completes (no-op if a manual
-        # /start or another worker already owns the world's lease).
-        started = await runner_manager.start(world_id)
-
-        async with async_session() as db:
-            result = await db.execute(select(World).where(World.id == world_id))
-            world = result.scalar_one_or_none()
-            if world and started:
-                world.status = "running"
-                await db.commit()
-            logger.info(
-                "genesis.background_complete",
-                world_id=str(world_id),
-                status=world.status if world else "missing",
-            )
-    except Exception:
-        logger.exception("genesis.background_failed", world_id=str(world_id))
-        try:
-            async with async_session() as db:
-                result = await db.execute(select(World).where(World.id == world_id))
-                world = result.scalar_one_or_none()
-                if world:
-                    world.status = "error"
-                    await db.commit()
-        except Exception:
-            pass
-    finally:
-        _genesis_tasks.pop(world_id, None)
-
-
 @router.post("/worlds", response_model=WorldOut, status_code=201, dependencies=[Depends(require_write_access)])
 async def create_world_endpoint(body: WorldCreate, db: AsyncSession = Depends(get_db)):
-    world = World(seed_prompt=body.seed_prompt, config=body.config or {}, status="generating")
-    db.add(world)
-    await db.flush()
+    # A warm-pool world pooled for this exact seed is already populated (its
+    # genesis checkpoint is complete); a generic one only needs re-theming;
+    # otherwise the genesis.run job runs the full genesis. The claim and the
+    # job commit together, so a claimed world always has its genesis.run.
+    pooled = await claim_pooled_world(
+        db, [body.seed_prompt], status="generating", extra_config=body.config, commit=False,
+    )
+    retheme = False
+    if pooled is None:
+        pooled = await claim_generic_world(db, body.seed_prompt, extra_config=body.config, commit=False)
+        retheme = pooled is not None
+    if pooled is not None:
+        world = (await db.execute(select(World).where(World.id == pooled.id))).scalar_one()
+    else:
+        world = World(seed_prompt=body.seed_prompt, config=body.config or {}, status="generating")
+        db.add(world)
+        await db.flush()
+    await enqueue_genesis(db, world.id, body.seed_prompt, body.config or {}, retheme=retheme)
     await db.commit()
     await db.refresh(world)
-
-    task = asyncio.create_task(
-        _background_genesis(world.id, body.seed_prompt, body.config or {})
-    )
-    _genesis_tasks[world.id] = task
-
+    await bump_world_version(world.id)
     return world
 
 
@@ -217,7 +177,9 @@ async def get_world(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     world = result.scalar_one_or_none()
     if not world:
         raise HTTPException(404, "World not found")
-    return world
+    out = WorldOut.model_validate(world)
+    out.genesis_progress = _genesis_progress(world)
+    return out
 
 
 @router.post("/worlds/{world_id}/start", response_model=SimulationControlOut, dependencies=[Depends(require_write_access)])
@@ -239,6 +201,7 @@ async def start_simulation(world_id: uuid.UUID, db: AsyncSession = Depends(get_d
 
     world.status = "running"
     await db.commit()
+    await bump_world_version(world_id)
     return {"status": "started", "world_id": str(world_id)}
 
 
@@ -260,6 +223,7 @@ async def stop_simulation(world_id: uuid.UUID, db: AsyncSession = Depends(get_db
     if world:
         world.status = "paused"
         await db.commit()
+        await bump_world_version(world_id)
     return {"status": "stopped", "world_id": str(world_id)}
 
 
@@ -322,6 +286,7 @@ async def catch_up(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     # Get recent conversations
     conv_result = await db.execute(
         select(Conversation)
+        .options(defer(Conversation.embedding))
         .where(Conversation.world_id == world_id)
         .order_by(Conversation.created_at.desc())
         .limit(5)
@@ -371,36 +336,30 @@ Summary:"""
 # --- Analytics: Faction Power ---
 @router.get("/worlds/{world_id}/analytics/faction-power")
 async def faction_power_analytics(world_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    """Faction power over epochs."""
-
-    from null_engine.models.tables import Faction
-
-    result = await db.execute(select(World).where(World.id == world_id))
-    world = result.scalar_one_or_none()
-    if not world:
+    """Faction power: influence share scaled by cohesion, plus cross-faction tension."""
+    analytics = await get_world_analytics(db, world_id)
+    if analytics is None:
         raise HTTPException(404, "World not found")
 
-    # Get factions
-    factions_result = await db.execute(select(Faction).where(Faction.world_id == world_id))
-    factions = factions_result.scalars().all()
-
-    # Simple: return current power per faction (agent count × avg relationship strength)
-    data = []
-    for f in factions:
-        agent_count_result = await db.execute(
-            select(func.count()).where(Agent.faction_id == f.id)
-        )
-        count = agent_count_result.scalar() or 0
-
-        data.append({
-            "faction_id": str(f.id),
+    data = [
+        {
+            "faction_id": str(faction_id),
             "faction_name": f.name,
             "color": f.color,
-            "agent_count": count,
-            "power": count,  # Simplified; could factor in relationships
-        })
-
-    return {"epoch": world.current_epoch, "factions": data}
+            "agent_count": f.agent_count,
+            "power": round(f.power, 1),
+            "influence": round(f.influence, 4),
+            "cohesion": round(f.cohesion, 3),
+            "tension": round(f.tension, 3),
+            "conversations": f.conversations,
+        }
+        for faction_id, f in analytics.factions.items()
+    ]
+    tensions = [
+        {"faction_a": str(a), "faction_b": str(b), "tension": round(value, 3)}
+        for (a, b), value in analytics.tensions.items()
+    ]
+    return {"epoch": analytics.epoch, "factions": data, "tensions": tensions}
 
 
 # --- Analytics: Agent Influence ---
@@ -411,42 +370,23 @@ async def agent_influence_analytics(
     db: AsyncSession = Depends(get_db),
 ):
     """Agent influence radar data."""
-    from null_engine.models.tables import Relationship
-
-    agent_result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = agent_result.scalar_one_or_none()
-    if not agent:
+    analytics = await get_world_analytics(db, world_id)
+    agent = analytics.agents.get(agent_id) if analytics is not None else None
+    if agent is None:
         raise HTTPException(404, "Agent not found")
 
-    # Get relationships
-    rels_result = await db.execute(
-        select(Relationship).where(
-            Relationship.world_id == world_id,
-            (Relationship.agent_a == agent_id) | (Relationship.agent_b == agent_id),
-        )
-    )
-    rels = rels_result.scalars().all()
-
-    # Get conversation count
-    conv_count_result = await db.execute(
-        select(func.count())
-        .select_from(Conversation)
-        .where(Conversation.world_id == world_id)
-    )
-    conv_count = conv_count_result.scalar() or 0
-
-    avg_strength = sum(r.strength for r in rels) / len(rels) if rels else 0.5
-    allies = sum(1 for r in rels if r.strength > 0.6)
-    rivals = sum(1 for r in rels if r.strength < 0.3)
-
+    # Radar axes on a 0-10 scale; influence is relative to the world's most influential agent.
+    influence = 10 * agent.influence / analytics.max_influence if analytics.max_influence else 0.0
     return {
         "agent_id": str(agent_id),
         "agent_name": agent.name,
+        "influence_rank": agent.influence_rank,
         "axes": [
-            {"axis": "Relationships", "value": len(rels)},
-            {"axis": "Avg Strength", "value": round(avg_strength * 10, 1)},
-            {"axis": "Allies", "value": allies},
-            {"axis": "Rivals", "value": rivals},
-            {"axis": "Conversations", "value": min(conv_count, 10)},
+            {"axis": "Relationships", "value": agent.relationships},
+            {"axis": "Avg Strength", "value": round(agent.avg_strength * 10, 1)},
+            {"axis": "Allies", "value": agent.allies},
+            {"axis": "Rivals", "value": agent.rivals},
+            {"axis": "Conversations", "value": min(agent.conversations, 10)},
+            {"axis": "Influence", "value": round(influence, 1)},
         ],
     }
@@ -33,6 +33,9 @@ class Settings(BaseSettings):
     # Local LLM (Ollama)
     ollama_base_url: str = "http://localhost:11434"
     llm_provider: str = "ollama"  # "ollama" | "openai" | "anthropic"
+    # In-flight LLM calls per process; queued calls are admitted by role
+    # priority (services/llm_router.py ROLE_PRIORITY).
+    llm_max_concurrency: int = 4
 
     # Embeddings — the single source of truth for the vector dimension.
     # DB vector columns, the Ollama model and the OpenAI `dimensions`
@@ -40,6 +43,16 @@ class Settings(BaseSettings):
     embedding_model: str = "qwen3-embedding:0.6b"  # Ollama model (1024-dim)
     openai_embedding_model: str = "text-embedding-3-small"  # truncated via `dimensions`
     embedding_dim: int = 1024
+    # Search queries are embedded once per distinct (normalised) query text.
+    query_embedding_cache_size: int = 2048
+    query_embedding_cache_ttl_seconds: float = 3600.0
+
+    # Hybrid search (services/hybrid_search.py): candidates taken from each
+    # of the full-text and vector lists, the reciprocal-rank-fusion constant,
+    # and the HNSW candidate queue (higher = better recall, slower).
+    search_candidates: int = 100
+    search_rrf_k: int = 60
+    search_hnsw_ef_search: int = 100
 
     # Simulation defaults
     default_agents_per_faction: int = 3
@@ -52,6 +65,100 @@ class Settings(BaseSettings):
     ops_runner_success_rate_threshold: float = 0.9
     ops_translator_backlog_threshold: int = 50
     ops_generating_worlds_threshold: int = 5
+    ops_embedding_backlog_age_seconds: int = 120
+
+    # Read-model response cache (services/response_cache.py). Entries are
+    # keyed by world version, so the TTL only bounds staleness for writes
+    # that don't bump a version.
+    response_cache_enabled: bool = True
+    response_cache_ttl_seconds: float = 30.0
+    response_cache_max_entries: int = 1024
+    # Share entries and world versions across workers through redis_url.
+    response_cache_redis_enabled: bool = False
+
+    # Rows fetched per server-side cursor round trip in streaming exports.
+    export_batch_size: int = 500
+    # Rows per Parquet row group / Arrow record batch in columnar exports.
+    export_row_group_size: int = 65536
+    # since= exports stop this far behind the clock so rows from a tick
+    # that is still running land in the next window (services/export_stream.py).
+    export_since_lag_seconds: int = 600
+    # Background export artifacts (services/export_jobs.py); least recently
+    # used files are evicted once the directory exceeds the budget.
+    export_artifact_dir: str = "data/exports"
+    export_artifact_budget_bytes: int = 2 * 1024**3
+    # Cross-world training corpora (services/corpus_builder.py); one
+    # directory of shards plus manifest.json per build.
+    corpus_output_dir: str = "data/corpus"
+    corpus_shard_bytes: int = 256 * 1024**2
+
+    # Background translation (services/translator.py): rows per entity type
+    # per cycle, and how many segments / characters share one LLM call.
+    translation_batch_rows: int = 20
+    translation_batch_segments: int = 40
+    translation_batch_chars: int = 6000
+    # Batches the translator keeps in flight at once (still bounded by
+    # llm_max_concurrency), and how many viewer-demanded entities it remembers.
+    translation_concurrency: int = 2
+    # translator.batch jobs queued or running at once while draining a backlog.
+    translation_max_jobs: int = 4
+    translation_demand_max_entries: int = 5000
+
+    # Durable background jobs (services/job_queue.py): jobs each worker runs
+    # at once, how often idle workers look for new ones, how long a claim
+    # holds without a heartbeat, and retry backoff (doubling per attempt).
+    job_worker_concurrency: int = 4
+    job_poll_seconds: float = 2.0
+    job_lease_seconds: int = 300
+    job_max_attempts: int = 5
+    job_backoff_seconds: float = 10.0
+    job_backoff_max_seconds: float = 900.0
+    # Finished and failed jobs are deleted after this long.
+    job_retention_hours: int = 24
+
+    # Embedding pipeline (services/embedding_pipeline.py): drainers of the
+    # in-process queue, rows per provider call and how long a worker waits
+    # for a batch to fill. Rows the queue can't take, or that are still
+    # unembedded after the sweep delay, are picked up by an embed.sweep job;
+    # a periodic sweep backfills everything else.
+    embedding_workers: int = 2
+    embedding_batch_size: int = 32
+    embedding_batch_wait_seconds: float = 0.5
+    embedding_queue_size: int = 5000
+    embedding_sweep_delay_seconds: int = 300
+    embedding_sweep_interval_seconds: int = 900
+
+    # Wiki articles (core/wiki.py) one worker generates at once, across
+    # topics and worlds, and how often a superseded version is kept in full
+    # instead of as a delta (services/wiki_history.py).
+    wiki_concurrency: int = 2
+    wiki_snapshot_every: int = 10
+
+    # Knowledge graph builder (services/knowledge_graph.py): how often it
+    # reads new and changed wiki pages and conversations, documents and
+    # characters per LLM call, documents per world per run, and how old a
+    # row must be before it is read, so a late commit can't fall behind the
+    # watermark.
+    kg_interval_seconds: int = 300
+    kg_batch_documents: int = 4
+    kg_batch_chars: int = 6000
+    kg_max_documents: int = 40
+    kg_settle_seconds: int = 60
+
+    # Genesis runs as a durable, checkpointed genesis.run job (core/genesis.py);
+    # at most this many run at once across all workers.
+    genesis_max_concurrency: int = 2
+
+    # Warm pool (core/warm_pool.py): generated but unstarted worlds kept ready
+    # for auto-genesis and POST /worlds; 0 disables it. warm_pool_generic of
+    # them are themeless and get re-themed to the requested seed on claim.
+    warm_pool_size: int = 0
+    warm_pool_generic: int = 1
+    warm_pool_interval_seconds: int = 120
+
+    # Pending entity-mention extractions (services/mention_extractor.py);
+    # texts arriving while the queue is full are skipped.
+    mention_queue_size: int = 1000
 
     # Vector DB behavior
     # When false, app falls back to JSON columns if pgvector extension is unavailable.
@@ -48,6 +48,25 @@ AUTO_GENESIS_INTERVAL = 300  # 5 minutes
 MIN_WORLD_AGE_SECONDS = 1800  # 30 minutes
 
 
+async def _create_auto_world(used_indices: set[int], active_count: int):
+    """Queue a full genesis for a random seed not used recently."""
+    # Pick a random unused seed
+    available = [i for i in range(len(AUTO_SEEDS)) if i not in used_indices]
+    if not available:
+        used_indices.clear()
+        available = list(range(len(AUTO_SEEDS)))
+
+    idx = random.choice(available)
+    used_indices.add(idx)
+    seed = AUTO_SEEDS[idx]
+
+    logger.info("auto_genesis.creating", seed=seed[:60], active=active_count)
+
+    async with async_session() as db:
+        world = await create_world(db, seed)
+        logger.info("auto_genesis.created", world_id=str(world.id))
+
+
 async def auto_genesis_loop():
     """Generate worlds continuously, even when active worlds exist."""
     logger.info("auto_genesis.started")
@@ -101,34 +120,31 @@ async def auto_genesis_loop():
                     await asyncio.sleep(min(wait, AUTO_GENESIS_INTERVAL))
                     continue
 
-            # Pick a random unused seed
-            available = [i for i in range(len(AUTO_SEEDS)) if i not in used_indices]
-            if not available:
-                used_indices.clear()
-                available = list(range(len(AUTO_SEEDS)))
-
-            idx = random.choice(available)
-            used_indices.add(idx)
-            seed = AUTO_SEEDS[idx]
-
-            logger.info("auto_genesis.creating", seed=seed[:60], active=active_count)
+            # A warm-pool world starts in seconds instead of a full genesis.
+            from null_engine.core.warm_pool import claim_pooled_world
 
             async with async_session() as db:
-                world = await create_world(db, seed)
-                world_id = world.id
-                logger.info("auto_genesis.created", world_id=str(world_id))
-
-            # Auto-start the simulation through the manager (lease-guarded)
-            from null_engine.core.runner_manager import runner_manager
-
-            started = await runner_manager.start(world_id)
-            if started:
-                async with async_session() as db:
-                    from sqlalchemy import update
-                    await db.execute(
-                        update(World).where(World.id == world_id).values(status="running")
-                    )
-                    await db.commit()
+                pooled = await claim_pooled_world(db, AUTO_SEEDS)
+
+            if pooled is None:
+                # The genesis.run job starts the world once it is ready.
+                await _create_auto_world(used_indices, active_count)
+            else:
+                world_id = pooled.id
+                used_indices.add(AUTO_SEEDS.index(pooled.seed_prompt))
+                logger.info("auto_genesis.claimed_pooled", world_id=str(world_id), seed=pooled.seed_prompt[:60])
+
+                # Auto-start the simulation through the manager (lease-guarded)
+                from null_engine.core.runner_manager import runner_manager
+
+                started = await runner_manager.start(world_id)
+                if started:
+                    async with async_session() as db:
+                        from sqlalchemy import update
+                        await db.execute(
+                            update(World).where(World.id == world_id).values(status="running")
+                        )
+                        await db.commit()
 
         except Exception:
             logger.exception("auto_genesis.error")
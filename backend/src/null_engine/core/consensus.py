@@ -6,7 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from null_engine.models.schemas import WSEnvelope
 from null_engine.models.tables import Claim, ClaimVote, WikiPage
+from null_engine.services.embedding_pipeline import enqueue_embeddings
 from null_engine.services.llm_router import LLMGenerationError, llm_router
+from null_engine.services.wiki_history import history_entry
+from null_engine.services.world_stats import record_activity
 from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
@@ -89,6 +92,7 @@ class ConsensusEngine:
         )
         db.add(db_claim)
         await db.flush()
+        await record_activity(db, world_id, claims=1)
 
         # Add initial vote from proposer
         vote = ClaimVote(
@@ -165,9 +169,10 @@ class ConsensusEngine:
                         select(Claim).where(Claim.id == claim["db_id"])
                     )
                     db_claim = result.scalar_one_or_none()
-                    if db_claim:
+                    if db_claim and db_claim.status != "canon":
                         db_claim.status = "canon"
                         await db.flush()
+                        await record_activity(db, world_id, canon=1)
 
                     return "canon"
                 return "proposed"
@@ -207,10 +212,14 @@ class ConsensusEngine:
         existing = result.scalar_one_or_none()
 
         if existing:
-            # Append to existing page
-            existing.content += f"\n\n- {claim_text} (established by consensus)"
+            # Append to existing page, keeping the superseded version in its history
+            new_content = f"{existing.content or ''}\n\n- {claim_text} (established by consensus)"
+            db.add(history_entry(existing, new_content))
+            existing.content = new_content
             existing.version += 1
             existing.status = "canon"
+            # Stale now; re-embedded once this commits.
+            existing.embedding = None
         else:
             # Create new wiki page
             page = WikiPage(
@@ -224,6 +233,8 @@ class ConsensusEngine:
 
         try:
             await db.flush()
+            await record_activity(db, world_id, wiki_pages=0 if existing else 1)
+            await enqueue_embeddings(db, "wiki_page", [existing.id if existing else page.id])
         except Exception:
             logger.exception("consensus.wiki_creation_failed")
 
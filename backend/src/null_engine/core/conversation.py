@@ -6,9 +6,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from null_engine.agents.memory import MemoryManager
+from null_engine.db import after_commit
 from null_engine.models.schemas import AgentMessage, ConversationTurn, WSEnvelope
 from null_engine.models.tables import Agent, Conversation, Relationship
+from null_engine.services.embedding_pipeline import enqueue_embeddings
 from null_engine.services.llm_router import LLMGenerationError, llm_router
+from null_engine.services.world_stats import record_activity
 from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
@@ -171,16 +174,12 @@ async def run_conversation(
     # Persist conversation to DB
     conv_id = await _save_conversation(db, turn, tick, summary)
 
-    # Extract entity mentions
+    # Extract entity mentions in the background worker, once the tick
+    # commits the conversation (a rolled-back tick leaves nothing to link).
     if conv_id:
-        try:
-            from null_engine.services.mention_extractor import extract_mentions_from_conversation
-            await extract_mentions_from_conversation(
-                db, world_id, conv_id,
-                [{"content": m.content} for m in turn.messages],
-            )
-        except Exception:
-            logger.exception("conversation.mention_extraction_failed")
+        from null_engine.services.mention_extractor import enqueue_conversation_mentions
+        messages = [{"content": m.content} for m in turn.messages]
+        after_commit(db, lambda: enqueue_conversation_mentions(world_id, conv_id, messages))
 
     return turn
 
@@ -204,6 +203,8 @@ async def _save_conversation(db: AsyncSession, turn: ConversationTurn, tick: int
         )
         db.add(conv)
         await db.flush()
+        await record_activity(db, turn.world_id, conversations=1, latest_topic=turn.topic)
+        await enqueue_embeddings(db, "conversation", [conv.id])
         return conv.id
     except Exception:
         logger.exception("conversation.save_failed")
@@ -278,6 +279,7 @@ Respond with ONLY a number between -1.0 and 1.0. Nothing else."""
 
 
 async def _update_relationships(db: AsyncSession, world_id: uuid.UUID, participants: list[Agent], messages: list[AgentMessage] | None = None):
+    drifted = False
     for i, a in enumerate(participants):
         for b in participants[i + 1:]:
             result = await db.execute(
@@ -328,3 +330,8 @@ async def _update_relationships(db: AsyncSession, world_id: uuid.UUID, participa
                     pass  # Fall back to random drift
 
             rel.strength = max(0.0, min(1.0, rel.strength + drift))
+            drifted = True
+
+    if drifted:
+        # Relationship rows feed exports and analytics keyed on data_version.
+        await record_activity(db, world_id)
@@ -0,0 +1,120 @@
+"""Epoch-boundary work, run off the simulation tick loop.
+
+The tick that closes an epoch enqueues one epoch.close job per (world,
+epoch) in its own commit, carrying the herald's buffered events and the
+epoch's conversation summaries. A job worker then runs, concurrently and
+each with its own session:
+
+- the herald announcement for the new epoch
+- the stratum for the closed epoch (services/stratum_detector.py)
+- one wiki update per conversation topic, up to WIKI_TOPICS_PER_EPOCH
+
+so the world keeps ticking while the librarian catches up. Every step
+that finishes is recorded with mark_step_done; when another step fails
+the job is retried with backoff and only the unfinished steps run again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.core.herald import herald
+from null_engine.core.wiki import wiki_engine
+from null_engine.db import async_session
+from null_engine.models.tables import World
+from null_engine.services.job_queue import enqueue_job, mark_step_done, register_job
+from null_engine.services.stratum_detector import detect_stratum
+
+logger = structlog.get_logger()
+
+EPOCH_JOB = "epoch.close"
+WIKI_TOPICS_PER_EPOCH = 3
+# Summaries the wiki writer sees per topic.
+WIKI_SUMMARIES = 5
+
+
+def epoch_topics(summaries: list[str]) -> list[str]:
+    """Distinct conversation topics from "[E1T3] topic (n messages): ..." summaries."""
+    topics: list[str] = []
+    for summary in summaries:
+        if "] " not in summary:
+            continue
+        # Drop the "(n messages)" count, or every count would get its own page.
+        topic = summary.split("] ", 1)[1].split(":")[0].rsplit(" (", 1)[0]
+        if topic not in topics:
+            topics.append(topic)
+    return topics[:WIKI_TOPICS_PER_EPOCH]
+
+
+async def enqueue_epoch_job(
+    db: AsyncSession,
+    world_id: uuid.UUID,
+    epoch: int,
+    *,
+    events: list[dict],
+    summaries: list[str],
+) -> None:
+    """Queue the work for closing epoch in db's transaction (once per world and epoch)."""
+    await enqueue_job(
+        EPOCH_JOB,
+        {"world_id": str(world_id), "epoch": epoch, "events": events, "summaries": summaries, "done": {}},
+        dedupe_key=f"{world_id}:{epoch}",
+        db=db,
+    )
+
+
+async def _stratum(world_id: uuid.UUID, epoch: int) -> None:
+    async with async_session() as db:
+        await detect_stratum(db, world_id, epoch)
+        await db.commit()
+
+
+async def _wiki(world_id: uuid.UUID, topic: str, summaries: list[str]) -> None:
+    async with async_session() as db:
+        await wiki_engine.generate_or_update_page(db, world_id, topic, summaries)
+
+
+async def _run_step(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    await step()
+    await mark_step_done(name)
+
+
+async def run_epoch_pipeline(payload: dict[str, Any]) -> None:
+    world_id = uuid.UUID(payload["world_id"])
+    epoch = int(payload["epoch"])
+    summaries = list(payload.get("summaries") or [])
+    done = payload.get("done") or {}
+
+    async with async_session() as db:
+        if (await db.execute(select(World.id).where(World.id == world_id))).scalar_one_or_none() is None:
+            logger.info("epoch_pipeline.world_gone", world_id=str(world_id), epoch=epoch)
+            return
+
+    steps: dict[str, Callable[[], Awaitable[None]]] = {
+        "herald": lambda: herald.announce(world_id, epoch + 1, list(payload.get("events") or [])),
+        "stratum": lambda: _stratum(world_id, epoch),
+    }
+    for topic in epoch_topics(summaries):
+        steps[f"wiki:{topic}"] = lambda topic=topic: _wiki(world_id, topic, summaries[-WIKI_SUMMARIES:])
+    pending = [name for name in steps if not done.get(name)]
+
+    results = await asyncio.gather(*(_run_step(name, steps[name]) for name in pending), return_exceptions=True)
+    failed = []
+    for name, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            failed.append(name)
+            logger.warning("epoch_pipeline.step_failed", world_id=str(world_id), epoch=epoch, step=name,
+                           error=f"{type(result).__name__}: {result}")
+    logger.info("epoch_pipeline.ran", world_id=str(world_id), epoch=epoch, ran=len(pending), failed=len(failed))
+    if failed:
+        raise RuntimeError(f"epoch {epoch} steps failed: {', '.join(failed)}")
+
+
+register_job(EPOCH_JOB, run_epoch_pipeline)
@@ -1,16 +1,29 @@
+import asyncio
+import random
 import uuid
 from typing import Any
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import String, cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB, array
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from null_engine.config import settings
-from null_engine.models.tables import Agent, Faction, Relationship, World, WorldTag
+from null_engine.db import async_session
+from null_engine.models.schemas import WSEnvelope
+from null_engine.models.tables import Agent, Faction, Job, Relationship, World, WorldTag
+from null_engine.services.embedding_pipeline import enqueue_embeddings
+from null_engine.services.job_queue import enqueue_job, register_job
 from null_engine.services.llm_router import LLMGenerationError, llm_router
+from null_engine.services.response_cache import bump_world_version
+from null_engine.services.world_stats import record_activity
+from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
 
+GENESIS_JOB = "genesis.run"
+RECOVER_JOB = "genesis.recover"
+
 WORLD_GEN_PROMPT = """You are a world architect. Given the seed prompt below, generate a detailed world configuration.
 
 Seed: {seed_prompt}
@@ -51,164 +64,307 @@ For each character, respond with a JSON array:
 
 
 async def create_world(db: AsyncSession, seed_prompt: str, extra_config: dict[str, Any] | None = None) -> World:
-    """Synchronous full creation (used by auto_genesis and tests)."""
+    """Create a `generating` world and queue its genesis.run job in one transaction."""
     world = World(seed_prompt=seed_prompt, config=extra_config or {}, status="generating")
     db.add(world)
     await db.flush()
+    await enqueue_genesis(db, world.id, seed_prompt, extra_config or {})
     await db.commit()
-    world_id = world.id
+    await db.refresh(world)
+    logger.info("genesis: world queued", world_id=str(world.id))
+    return world
 
-    from sqlalchemy import update
 
-    try:
-        await populate_world(db, world_id, seed_prompt, extra_config or {})
-    except Exception:
-        # Mark the world failed instead of stranding it in 'generating' —
-        # a stuck 'generating' row would also livelock auto-genesis, which
-        # counts it against its active-worlds cap forever.
-        await db.rollback()
-        await db.execute(
-            update(World).where(World.id == world_id).values(status="error")
-        )
-        await db.commit()
-        raise
-
-    # Re-fetch world since populate_world may have expunged it
-    await db.execute(
-        update(World).where(World.id == world_id).values(status="ready")
+async def enqueue_genesis(
+    db: AsyncSession,
+    world_id: uuid.UUID,
+    seed_prompt: str,
+    extra_config: dict[str, Any],
+    *,
+    retheme: bool = False,
+) -> None:
+    """Queue the world's genesis.run job in db's transaction (one per world)."""
+    await enqueue_job(
+        GENESIS_JOB,
+        {"world_id": str(world_id), "seed_prompt": seed_prompt, "extra_config": extra_config, "retheme": retheme},
+        dedupe_key=str(world_id),
+        db=db,
     )
-    await db.commit()
 
-    result = await db.execute(select(World).where(World.id == world_id))
-    world = result.scalar_one()
-    logger.info("genesis: world created", world_id=str(world_id))
-    return world
 
+async def _announce_status(world_id: uuid.UUID, status: str) -> None:
+    """Tell clients watching genesis (genesis.progress) that it has ended."""
+    await bump_world_version(world_id)
+    await broadcast(world_id, WSEnvelope(type="world.status", payload={"status": status}))
+
+
+def _checkpoint(**steps: Any):
+    """World.genesis_checkpoint with steps merged in (top-level keys)."""
+    return func.coalesce(World.genesis_checkpoint, cast({}, JSONB)).concat(cast(steps, JSONB))
+
+
+async def _checkpoint_personas(world_id: uuid.UUID, faction_id: uuid.UUID, personas: list[dict]) -> None:
+    """Record one faction's personas from its own session (factions finish concurrently)."""
+    async with async_session() as checkpoint_db:
+        await checkpoint_db.execute(
+            update(World)
+            .where(World.id == world_id)
+            .values(genesis_checkpoint=func.jsonb_set(
+                World.genesis_checkpoint, array(["personas", str(faction_id)]), cast(personas, JSONB),
+            ))
+        )
+        await checkpoint_db.commit()
 
-async def _update_progress(db: AsyncSession, world_id: uuid.UUID, step: str, step_num: int, total_steps: int, detail: str = ""):
-    """Update genesis progress in the world's config JSONB using a separate session to avoid expiring objects in the caller."""
-    from sqlalchemy import update
-    from sqlalchemy.dialects.postgresql import JSONB as JSONB_TYPE
 
-    from null_engine.db import async_session as _async_session
+async def _announce_progress(world_id: uuid.UUID, step: str, step_num: int, total_steps: int, detail: str = ""):
+    """Record genesis progress and push it to the world's WebSocket clients as genesis.progress.
 
+    The broadcast only reaches clients connected to this process; the copy
+    in World.genesis_checkpoint["progress"] is what /worlds serves to the
+    rest (genesis_progress), from its own session like the personas.
+    """
     progress = {
-        "_genesis_progress": {
-            "step": step,
-            "step_num": step_num,
-            "total_steps": total_steps,
-            "detail": detail,
-            "percent": round(step_num / total_steps * 100),
-        }
+        "step": step,
+        "step_num": step_num,
+        "total_steps": total_steps,
+        "detail": detail,
+        "percent": round(step_num / total_steps * 100),
     }
-    from sqlalchemy import cast, func
-    async with _async_session() as progress_db:
+    async with async_session() as progress_db:
         await progress_db.execute(
-            update(World)
-            .where(World.id == world_id)
-            .values(config=func.coalesce(World.config, cast({}, JSONB_TYPE)).concat(cast(progress, JSONB_TYPE)))
+            update(World).where(World.id == world_id).values(genesis_checkpoint=_checkpoint(progress=progress))
         )
         await progress_db.commit()
+    await bump_world_version(world_id)
+    await broadcast(world_id, WSEnvelope(type="genesis.progress", payload=progress))
 
 
 async def populate_world(db: AsyncSession, world_id: uuid.UUID, seed_prompt: str, extra_config: dict[str, Any]) -> None:
-    """Generate factions, agents, relationships, and tags for an existing world row."""
+    """Generate factions, agents, relationships, and tags for an existing world row.
+
+    Faction personas are generated concurrently (admitted by the LLM
+    scheduler) with the world tags; agents and relationships are then
+    written with one INSERT each.
+
+    Each step is recorded in World.genesis_checkpoint in the transaction
+    that writes its rows (each faction's personas as soon as they arrive),
+    so running this again after a crash skips every completed step.
+    """
 
     num_factions = settings.default_factions
     # Total steps: 1 (world config) + 1 (factions) + num_factions (agents) + 1 (relationships) + 1 (tags) = num_factions + 4
     total_steps = num_factions + 4
 
-    logger.info("genesis: populating world", world_id=str(world_id), seed=seed_prompt[:80])
-
-    # Step 1: Generate world config via LLM
-    await _update_progress(db, world_id, "world_config", 1, total_steps, "Designing world architecture...")
-
-    world_config = await llm_router.generate_json(
-        role="genesis_architect",
-        prompt=WORLD_GEN_PROMPT.format(
-            seed_prompt=seed_prompt,
-            num_factions=num_factions,
-        ),
-    )
-
-    if extra_config:
-        world_config.update(extra_config)
-
-    # Update world config
     result = await db.execute(select(World).where(World.id == world_id))
     world = result.scalar_one_or_none()
     if not world:
         return
-    world.config = world_config
-    await db.commit()
+    checkpoint = dict(world.genesis_checkpoint or {})
+    world_config = dict(world.config or {})
     # Expunge so ORM doesn't re-write config on future commits
     db.expunge(world)
 
-    # Step 2: Create factions
-    await _update_progress(db, world_id, "factions", 2, total_steps, "Establishing factions...")
-
-    faction_specs = world_config.get("factions", [])
-    factions: list[Faction] = []
-    for spec in faction_specs:
-        faction = Faction(
-            world_id=world_id,
-            name=spec["name"],
-            description=spec.get("description", ""),
-            color=spec.get("color", "#FFFFFF"),
+    logger.info(
+        "genesis: populating world", world_id=str(world_id), seed=seed_prompt[:80],
+        resumed=sorted(key for key, done in checkpoint.items() if done and key != "progress"),
+    )
+
+    # Step 1: Generate world config via LLM
+    if not checkpoint.get("config"):
+        await _announce_progress(world_id, "world_config", 1, total_steps, "Designing world architecture...")
+        world_config = await llm_router.generate_json(
+            role="genesis_architect",
+            prompt=WORLD_GEN_PROMPT.format(
+                seed_prompt=seed_prompt,
+                num_factions=num_factions,
+            ),
         )
-        db.add(faction)
-        factions.append(faction)
-    await db.flush()
-    await db.commit()
+        if extra_config:
+            world_config.update(extra_config)
+        await db.execute(
+            update(World).where(World.id == world_id).values(config=world_config, genesis_checkpoint=_checkpoint(config=True))
+        )
+        await db.commit()
 
-    # Steps 3..N: Generate agents per faction — sequential with progress updates
-    world_desc = world_config.get("description", seed_prompt)
-    all_agents: list[Agent] = []
+    # Tags only need the world config; classify them while personas generate.
+    tags_task = asyncio.create_task(_generate_world_tags(world_config)) if not checkpoint.get("tags") else None
 
-    for idx, (faction, spec) in enumerate(zip(factions, faction_specs)):
-        step_num = 3 + idx
-        await _update_progress(
-            db, world_id, "agents", step_num, total_steps,
-            f"Summoning agents for {faction.name}..."
-        )
+    try:
+        # Step 2: Create factions
+        faction_specs = world_config.get("factions", [])
+        if not checkpoint.get("factions"):
+            await _announce_progress(world_id, "factions", 2, total_steps, "Establishing factions...")
+            factions: list[Faction] = []
+            for spec in faction_specs:
+                faction = Faction(
+                    world_id=world_id,
+                    name=spec["name"],
+                    description=spec.get("description", ""),
+                    color=spec.get("color", "#FFFFFF"),
+                )
+                db.add(faction)
+                factions.append(faction)
+            await db.flush()
+            await db.execute(
+                update(World).where(World.id == world_id).values(genesis_checkpoint=_checkpoint(factions=True, personas={}))
+            )
+            await db.commit()
+        else:
+            factions = list((await db.execute(select(Faction).where(Faction.world_id == world_id))).scalars().all())
+        specs_by_name = {spec.get("name"): spec for spec in faction_specs}
+
+        # Steps 3..N: Generate agents for every faction at once
+        world_desc = world_config.get("description", seed_prompt)
+        faction_personas: dict[str, list[dict]] = dict(checkpoint.get("personas") or {})
+        summoned = len(faction_personas)
+
+        async def _summon(faction: Faction) -> None:
+            nonlocal summoned
+            spec = specs_by_name.get(faction.name, {})
+            count = min(spec.get("agent_count", settings.default_agents_per_faction), settings.default_agents_per_faction)
+            personas = await _generate_personas(faction.name, faction.description, world_desc, count)
+            await _checkpoint_personas(world_id, faction.id, personas)
+            faction_personas[str(faction.id)] = personas
+            summoned += 1
+            await _announce_progress(
+                world_id, "agents", 2 + summoned, total_steps,
+                f"Summoned agents for {faction.name}..."
+            )
 
-        count = min(spec.get("agent_count", settings.default_agents_per_faction), settings.default_agents_per_faction)
-        personas = await _generate_personas(
-            faction.name, faction.description, world_desc, count,
-        )
-        for persona in personas:
-            agent = Agent(
-                world_id=world_id,
-                faction_id=faction.id,
-                name=persona.get("name", f"Agent-{uuid.uuid4().hex[:6]}"),
-                persona=persona,
-                beliefs=[],
-                status="idle",
+        if not checkpoint.get("agents"):
+            await asyncio.gather(*(_summon(f) for f in factions if str(f.id) not in faction_personas))
+
+            agent_rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "world_id": world_id,
+                    "faction_id": faction.id,
+                    "name": persona.get("name", f"Agent-{uuid.uuid4().hex[:6]}"),
+                    "persona": persona,
+                    "beliefs": [],
+                    "status": "idle",
+                }
+                for faction in factions
+                for persona in faction_personas.get(str(faction.id), [])
+            ]
+            agent_ids = [row["id"] for row in agent_rows]
+            if agent_rows:
+                await db.execute(insert(Agent).values(agent_rows))
+            await record_activity(
+                db, world_id,
+                agents=len(agent_rows),
+                faction_agents={f.id: len(faction_personas.get(str(f.id), [])) for f in factions},
             )
-            db.add(agent)
-            all_agents.append(agent)
-        await db.flush()
+            await enqueue_embeddings(db, "agent", agent_ids)
+            await db.execute(
+                update(World).where(World.id == world_id).values(genesis_checkpoint=_checkpoint(agents=True))
+            )
+            await db.commit()
+        else:
+            agent_ids = list((await db.execute(select(Agent.id).where(Agent.world_id == world_id))).scalars().all())
+
+        # Step N+1: Relationships
+        if not checkpoint.get("relationships"):
+            await _announce_progress(
+                world_id, "relationships", total_steps - 1, total_steps,
+                "Weaving relationships..."
+            )
+            relationship_rows = _generate_relationships(world_id, agent_ids)
+            if relationship_rows:
+                await db.execute(insert(Relationship).values(relationship_rows))
+            await db.execute(
+                update(World).where(World.id == world_id).values(genesis_checkpoint=_checkpoint(relationships=True))
+            )
+            await db.commit()
+
+        # Step N+2: Tags
+        if tags_task is not None:
+            await _announce_progress(
+                world_id, "tags", total_steps, total_steps,
+                "Classifying world tags..."
+            )
+            for tag, weight in await tags_task:
+                db.add(WorldTag(world_id=world_id, tag=tag, weight=weight))
+            await db.execute(
+                update(World).where(World.id == world_id).values(genesis_checkpoint=_checkpoint(tags=True))
+            )
+            await db.flush()
+            await db.commit()
+    finally:
+        if tags_task is not None:
+            tags_task.cancel()
+
+    logger.info("genesis: world populated", world_id=str(world_id), agents=len(agent_ids))
+
+
+async def _set_status(world_id: uuid.UUID, status: str, **values: Any) -> None:
+    async with async_session() as db:
+        await db.execute(update(World).where(World.id == world_id).values(status=status, **values))
         await db.commit()
+    await _announce_status(world_id, status)
 
-    # Step N+1: Relationships
-    await _update_progress(
-        db, world_id, "relationships", total_steps - 1, total_steps,
-        "Weaving relationships..."
-    )
-    await _generate_relationships(db, world_id, all_agents)
-    await db.flush()
-    await db.commit()
 
-    # Step N+2: Tags
-    await _update_progress(
-        db, world_id, "tags", total_steps, total_steps,
-        "Classifying world tags..."
-    )
-    await _generate_world_tags(db, world_id, world_config)
+async def run_genesis(payload: dict[str, Any]) -> None:
+    """genesis.run: populate (or re-theme) the world, mark it ready and start it.
 
-    await db.flush()
-    await db.commit()
-    logger.info("genesis: world populated", world_id=str(world_id), agents=len(all_agents))
+    Raises on failure so the job queue retries; populate_world resumes
+    from the checkpoint.
+    """
+    world_id = uuid.UUID(payload["world_id"])
+    seed_prompt = payload["seed_prompt"]
+    async with async_session() as db:
+        if payload.get("retheme"):
+            # A generic warm-pool world; it is already populated.
+            from null_engine.core.warm_pool import retheme_world
+
+            try:
+                await retheme_world(db, world_id, seed_prompt)
+            except LLMGenerationError:
+                # Still a complete world, just not themed to the seed.
+                logger.warning("genesis.retheme_failed", world_id=str(world_id))
+        else:
+            await populate_world(db, world_id, seed_prompt, payload.get("extra_config") or {})
+
+    # generating -> ready, then hand off to the runner manager
+    await _set_status(world_id, "ready", genesis_checkpoint=None)
+
+    # Auto-start simulation after genesis completes (no-op if a manual
+    # /start or another worker already owns the world's lease).
+    from null_engine.core.runner_manager import runner_manager
+
+    if await runner_manager.start(world_id):
+        await _set_status(world_id, "running")
+    logger.info("genesis.complete", world_id=str(world_id))
+
+
+async def _genesis_failed(payload: dict[str, Any], error: str) -> None:
+    # Mark the world failed instead of stranding it in 'generating' —
+    # a stuck 'generating' row would also livelock auto-genesis, which
+    # waits while any world is generating.
+    logger.error("genesis.failed", world_id=payload.get("world_id"), error=error)
+    await _set_status(uuid.UUID(payload["world_id"]), "error")
+
+
+async def recover_genesis(_payload: dict[str, Any]) -> None:
+    """Queue a genesis.run job for every `generating` world that has none."""
+    pending = (
+        select(Job.id)
+        .where(
+            Job.kind == GENESIS_JOB,
+            Job.dedupe_key == cast(World.id, String),
+            Job.status.in_(("queued", "running")),
+        )
+        .exists()
+    )
+    async with async_session() as db:
+        stranded = (await db.execute(
+            select(World.id, World.seed_prompt, World.config).where(World.status == "generating", ~pending)
+        )).all()
+        for row in stranded:
+            await enqueue_genesis(db, row.id, row.seed_prompt, row.config or {})
+        await db.commit()
+    if stranded:
+        logger.info("genesis.recovered", worlds=[str(row.id) for row in stranded])
 
 
 async def _generate_personas(faction_name: str, faction_desc: str, world_desc: str, count: int) -> list[dict]:
@@ -253,7 +409,8 @@ Tags should capture: genre, themes, setting, mood, key mechanics.
 Keep tags short (1-3 words), lowercase."""
 
 
-async def _generate_world_tags(db: AsyncSession, world_id: uuid.UUID, config: dict):
+async def _generate_world_tags(config: dict) -> list[tuple[str, float]]:
+    """(tag, weight) pairs for the world; empty if the LLM call fails."""
     try:
         faction_names = ", ".join(f.get("name", "") for f in config.get("factions", []))
         result = await llm_router.generate_json(
@@ -266,32 +423,38 @@ async def _generate_world_tags(db: AsyncSession, world_id: uuid.UUID, config: di
             max_tokens=512,
         )
         tags = result if isinstance(result, list) else result.get("tags", [])
-        for item in tags[:8]:
-            if isinstance(item, dict) and item.get("tag"):
-                tag = WorldTag(
-                    world_id=world_id,
-                    tag=str(item["tag"]).lower().strip()[:100],
-                    weight=float(item.get("weight", 1.0)),
-                )
-                db.add(tag)
+        return [
+            (str(item["tag"]).lower().strip()[:100], float(item.get("weight", 1.0)))
+            for item in tags[:8]
+            if isinstance(item, dict) and item.get("tag")
+        ]
     except Exception:
         logger.exception("genesis.tag_generation_failed")
+        return []
 
 
-async def _generate_relationships(db: AsyncSession, world_id: uuid.UUID, agents: list[Agent]):
-    import random
-
-    for i, agent_a in enumerate(agents):
-        num_relations = random.randint(2, min(5, len(agents) - 1))
-        others = [a for j, a in enumerate(agents) if j != i]
+def _generate_relationships(world_id: uuid.UUID, agent_ids: list[uuid.UUID]) -> list[dict[str, Any]]:
+    """Random starting relationships: 2-5 outgoing per agent."""
+    rows: list[dict[str, Any]] = []
+    if len(agent_ids) < 2:
+        return rows
+    for i, agent_a in enumerate(agent_ids):
+        num_relations = random.randint(min(2, len(agent_ids) - 1), min(5, len(agent_ids) - 1))
+        others = [a for j, a in enumerate(agent_ids) if j != i]
         targets = random.sample(others, min(num_relations, len(others)))
         for agent_b in targets:
-            rel_type = random.choice(["ally", "rival", "neutral", "trade", "mentor"])
-            rel = Relationship(
-                world_id=world_id,
-                agent_a=agent_a.id,
-                agent_b=agent_b.id,
-                type=rel_type,
-                strength=round(random.uniform(0.1, 1.0), 2),
-            )
-            db.add(rel)
+            rows.append({
+                "id": uuid.uuid4(),
+                "world_id": world_id,
+                "agent_a": agent_a,
+                "agent_b": agent_b,
+                "type": random.choice(["ally", "rival", "neutral", "trade", "mentor"]),
+                "strength": round(random.uniform(0.1, 1.0), 2),
+            })
+    return rows
+
+
+# Genesis runs as a durable job: a restarted worker resumes it from the
+# checkpoint; genesis_max_concurrency bounds it cluster-wide.
+register_job(GENESIS_JOB, run_genesis, max_running=settings.genesis_max_concurrency, on_failure=_genesis_failed)
+register_job(RECOVER_JOB, recover_genesis, every_seconds=300)
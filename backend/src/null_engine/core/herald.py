@@ -26,8 +26,11 @@ class Herald:
             self._event_buffer[world_id] = []
         self._event_buffer[world_id].append(event)
 
-    async def announce(self, world_id: uuid.UUID, epoch: int):
-        events = self._event_buffer.get(world_id, [])
+    def take_events(self, world_id: uuid.UUID) -> list[dict]:
+        """Hand over and clear the events buffered since the last announcement."""
+        return self._event_buffer.pop(world_id, [])
+
+    async def announce(self, world_id: uuid.UUID, epoch: int, events: list[dict]):
         if not events:
             return
 
@@ -50,7 +53,6 @@ class Herald:
             payload={"text": announcement, "event_count": len(events)},
         ))
 
-        self._event_buffer[world_id] = []
         logger.info("herald.announced", world_id=str(world_id))
 
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from null_engine.models.schemas import WSEnvelope
 from null_engine.models.tables import Agent, AgentPost, World
 from null_engine.services.llm_router import LLMGenerationError, llm_router
+from null_engine.services.world_stats import record_activity
 from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
@@ -85,6 +86,7 @@ Respond with ONLY the post content, no additional commentary."""
             content_ko=None,
         )
         db.add(post)
+        await record_activity(db, world_id, posts=1)
         await db.commit()
         await db.refresh(post)
 
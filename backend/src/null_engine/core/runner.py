@@ -8,13 +8,14 @@ from sqlalchemy import select
 from null_engine.agents.memory import MemoryManager
 from null_engine.core.consensus import consensus_engine
 from null_engine.core.conversation import run_conversation
+from null_engine.core.epoch_pipeline import enqueue_epoch_job
 from null_engine.core.events import check_random_events
 from null_engine.core.herald import herald
 from null_engine.core.posts import generate_agent_posts
 from null_engine.core.time_dilation import time_dilation
-from null_engine.core.wiki import wiki_engine
 from null_engine.db import async_session
 from null_engine.models.tables import World
+from null_engine.services.response_cache import bump_world_version
 from null_engine.services.runtime_metrics import note_runner_status, note_runner_tick
 
 logger = structlog.get_logger()
@@ -170,6 +171,7 @@ class SimulationRunner:
                     try:
                         tick_metrics = await self._tick(db, world)
                         tick_ok = True
+                        await bump_world_version(self.world_id)
                     except Exception:
                         self._tick_failures += 1
                         await db.rollback()
@@ -234,7 +236,6 @@ class SimulationRunner:
         tick = world.current_tick
         epoch = world.current_epoch
         claims_count = 0
-        wiki_topics_generated = 0
 
         logger.info("tick", world_id=str(self.world_id), epoch=epoch, tick=tick)
 
@@ -286,37 +287,20 @@ class SimulationRunner:
         # 4. Check consensus
         await consensus_engine.check_consensus(db, self.world_id)
 
-        # 5. Advance time
+        # 5. Advance time. Epoch-boundary work (herald, stratum, wiki) is
+        # queued in the same commit and runs in the epoch pipeline, so the
+        # next tick doesn't wait for it.
+        if time_dilation.ends_epoch(world):
+            await enqueue_epoch_job(
+                db,
+                self.world_id,
+                epoch,
+                events=herald.take_events(self.world_id),
+                summaries=self._conversation_summaries[-10:],
+            )
+            self._conversation_summaries = []
         epoch_changed = await time_dilation.advance_tick(db, world)
 
-        if epoch_changed:
-            # Herald announcement
-            await herald.announce(self.world_id, world.current_epoch)
-
-            # Generate stratum for the completed epoch
-            try:
-                from null_engine.services.stratum_detector import detect_stratum
-                await detect_stratum(db, self.world_id, epoch)
-            except Exception:
-                logger.exception("runner.stratum_failed", epoch=epoch)
-
-            # Wiki generation every epoch
-            if self._conversation_summaries:
-                topics = set()
-                for s in self._conversation_summaries[-10:]:
-                    # Extract topic from summary
-                    if "] " in s:
-                        topic = s.split("] ", 1)[1].split(":")[0]
-                        topics.add(topic)
-
-                for topic in list(topics)[:3]:
-                    await wiki_engine.generate_or_update_page(
-                        db, self.world_id, topic, self._conversation_summaries[-5:]
-                    )
-                    wiki_topics_generated += 1
-
-                self._conversation_summaries = []
-
         return {
             "participants": len(turn.participants),
             "conversation_messages": len(turn.messages),
@@ -325,7 +309,6 @@ class SimulationRunner:
             "events_triggered": len(events),
             "posts_created": len(posts),
             "epoch_changed": epoch_changed,
-            "wiki_topics_generated": wiki_topics_generated,
         }
 
     async def _vote_on_claims(self, db) -> int:
@@ -14,17 +14,20 @@ class TimeDilation:
     def __init__(self, ticks_per_epoch: int | None = None):
         self.ticks_per_epoch = ticks_per_epoch or settings.ticks_per_epoch
 
+    def ends_epoch(self, world: World) -> bool:
+        """Whether the next advance_tick closes the world's current epoch."""
+        return world.current_tick + 1 >= self.ticks_per_epoch
+
     async def advance_tick(self, db: AsyncSession, world: World) -> bool:
         """Advance one tick. Returns True if epoch transitioned."""
-        world.current_tick += 1
-
-        if world.current_tick >= self.ticks_per_epoch:
+        if self.ends_epoch(world):
             world.current_tick = 0
             world.current_epoch += 1
             await self._epoch_transition(db, world)
             await db.commit()
             return True
 
+        world.current_tick += 1
         await db.commit()
         return False
 
@@ -0,0 +1,261 @@
+"""Warm pool of fully generated, unstarted worlds for instant genesis.
+
+A periodic job keeps warm_pool_size worlds in status `pooled`: most of
+them for AUTO_SEEDS prompts, warm_pool_generic of them for GENERIC_SEED.
+Claiming is one UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED),
+so concurrent requests never get the same world:
+
+- auto-genesis claims any pooled AUTO_SEEDS world and starts it
+- POST /worlds claims a world pooled for exactly its seed, or else a
+  generic one that retheme_world rewrites for the new seed (world config,
+  faction and agent names, tags) in two LLM calls instead of a full
+  genesis
+
+Pooled worlds are hidden from the world listings. The pool is only
+topped up while the LLM scheduler has spare slots and no world is being
+generated, one world per run, so it uses otherwise idle capacity.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.core.auto_genesis import AUTO_SEEDS
+from null_engine.core.genesis import _generate_world_tags, populate_world
+from null_engine.db import async_session
+from null_engine.models.tables import Agent, Faction, World, WorldTag
+from null_engine.services.embedding_pipeline import enqueue_embeddings
+from null_engine.services.job_queue import register_job
+from null_engine.services.llm_router import llm_router, llm_scheduler
+from null_engine.services.response_cache import bump_world_version
+
+logger = structlog.get_logger()
+
+REPLENISH_JOB = "warm_pool.replenish"
+POOL_STATUSES = ("pooling", "pooled")
+GENERIC_SEED = (
+    "A civilization of rival factions competing for land, resources, knowledge and belief, "
+    "with shifting alliances, old grudges and a secret that could upend the balance of power."
+)
+# A pooling row this old belongs to a run that died.
+_STALE_POOLING = timedelta(hours=1)
+
+RETHEME_PROMPT = """You are a world architect. Re-theme an existing world skeleton to fit a new seed.
+Keep the number and order of factions and agents; give each a name and description (or role)
+that fits the new world.
+
+New seed: {seed_prompt}
+
+Current world: {description}
+Factions:
+{factions}
+Agents (faction: name — role):
+{agents}
+
+Respond with JSON:
+{{
+  "era": "time period",
+  "tech_level": "technology description",
+  "description": "2-3 sentence world description",
+  "factions": [{{"name": "...", "description": "..."}}, ...],
+  "agents": [{{"name": "...", "role": "..."}}, ...]
+}}
+"""
+
+
+@dataclass(frozen=True)
+class PooledWorld:
+    id: uuid.UUID
+    seed_prompt: str
+
+
+def claim_statement(seeds: Sequence[str], status: str, *, seed_prompt: str | None = None,
+                    extra_config: dict[str, Any] | None = None):
+    """Take the oldest pooled world for one of seeds, moving it to status."""
+    candidate = (
+        select(World.id)
+        .where(World.status == "pooled", World.seed_prompt.in_(list(seeds)))
+        .order_by(World.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    values: dict[str, Any] = {"status": status, "created_at": datetime.utcnow()}
+    if seed_prompt is not None:
+        values["seed_prompt"] = seed_prompt
+    if extra_config:
+        values["config"] = func.coalesce(World.config, cast({}, JSONB)).concat(cast(extra_config, JSONB))
+    return (
+        update(World)
+        .where(World.id == candidate.scalar_subquery())
+        .values(**values)
+        .returning(World.id, World.seed_prompt)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_pooled_world(
+    db: AsyncSession,
+    seeds: Sequence[str],
+    *,
+    status: str = "ready",
+    extra_config: dict[str, Any] | None = None,
+    commit: bool = True,
+) -> PooledWorld | None:
+    """Claim a world pooled for one of seeds; None when there is none.
+
+    Commits unless commit=False, which leaves the claim in db's transaction
+    for the caller to commit (and bump_world_version) with its own writes.
+    """
+    if settings.warm_pool_size <= 0:
+        return None
+    row = (await db.execute(claim_statement(seeds, status, extra_config=extra_config))).first()
+    if commit:
+        await db.commit()
+    if row is None:
+        return None
+    if commit:
+        await bump_world_version(row.id)
+    logger.info("warm_pool.claimed", world_id=str(row.id), seed=row.seed_prompt[:60])
+    return PooledWorld(row.id, row.seed_prompt)
+
+
+async def claim_generic_world(
+    db: AsyncSession,
+    seed_prompt: str,
+    *,
+    extra_config: dict[str, Any] | None = None,
+    commit: bool = True,
+) -> PooledWorld | None:
+    """Claim a generic pooled world for seed_prompt, left `generating` until retheme_world.
+
+    Commits unless commit=False, as claim_pooled_world.
+    """
+    if settings.warm_pool_size <= 0:
+        return None
+    stmt = claim_statement([GENERIC_SEED], "generating", seed_prompt=seed_prompt, extra_config=extra_config)
+    row = (await db.execute(stmt)).first()
+    if commit:
+        await db.commit()
+    if row is None:
+        return None
+    if commit:
+        await bump_world_version(row.id)
+    logger.info("warm_pool.claimed_generic", world_id=str(row.id))
+    return PooledWorld(row.id, row.seed_prompt)
+
+
+async def retheme_world(db: AsyncSession, world_id: uuid.UUID, seed_prompt: str) -> None:
+    """Rewrite a claimed generic world's config, factions, agents and tags for seed_prompt."""
+    world = (await db.execute(select(World).where(World.id == world_id))).scalar_one()
+    factions = list((await db.execute(
+        select(Faction).where(Faction.world_id == world_id).order_by(Faction.name)
+    )).scalars().all())
+    agents = list((await db.execute(
+        select(Agent).where(Agent.world_id == world_id).order_by(Agent.faction_id, Agent.name)
+    )).scalars().all())
+    faction_names = {faction.id: faction.name for faction in factions}
+
+    config = dict(world.config or {})
+    result = await llm_router.generate_json(
+        role="genesis_architect",
+        prompt=RETHEME_PROMPT.format(
+            seed_prompt=seed_prompt,
+            description=config.get("description", GENERIC_SEED),
+            factions="\n".join(f"- {f.name}: {f.description}" for f in factions),
+            agents="\n".join(
+                f"- {faction_names.get(a.faction_id, '?')}: {a.name} — {(a.persona or {}).get('role', '')}"
+                for a in agents
+            ),
+        ),
+    )
+    if not isinstance(result, dict):
+        result = {}
+
+    # Apply whatever lines up; anything the model dropped keeps its generic text.
+    for faction, spec in zip(factions, result.get("factions") or []):
+        if isinstance(spec, dict) and spec.get("name"):
+            faction.name = str(spec["name"])[:200]
+            faction.description = str(spec.get("description", faction.description))
+    for agent, spec in zip(agents, result.get("agents") or []):
+        if isinstance(spec, dict) and spec.get("name"):
+            agent.name = str(spec["name"])[:200]
+            agent.persona = {**(agent.persona or {}), "name": agent.name, "role": spec.get("role", "")}
+            agent.embedding = None
+    for key in ("era", "tech_level", "description"):
+        if result.get(key):
+            config[key] = result[key]
+    config["factions"] = [
+        {"name": faction.name, "description": faction.description, "color": faction.color}
+        for faction in factions
+    ]
+    world.config = config
+
+    tags = await _generate_world_tags(config)
+    await db.execute(delete(WorldTag).where(WorldTag.world_id == world_id))
+    for tag, weight in tags:
+        db.add(WorldTag(world_id=world_id, tag=tag, weight=weight))
+    await enqueue_embeddings(db, "agent", [agent.id for agent in agents])
+    await db.commit()
+    logger.info("warm_pool.rethemed", world_id=str(world_id), seed=seed_prompt[:60])
+
+
+def _next_seed(pooled_seeds: list[str]) -> str:
+    generic = sum(1 for seed in pooled_seeds if seed == GENERIC_SEED)
+    if generic < settings.warm_pool_generic:
+        return GENERIC_SEED
+    unused = [seed for seed in AUTO_SEEDS if seed not in pooled_seeds]
+    return random.choice(unused or AUTO_SEEDS)
+
+
+async def replenish_pool(_payload: dict[str, Any]) -> None:
+    """Generate one pooled world if the pool is short and the LLM is idle."""
+    if settings.warm_pool_size <= 0:
+        return
+    async with async_session() as db:
+        await db.execute(
+            delete(World).where(World.status == "pooling", World.created_at < datetime.utcnow() - _STALE_POOLING)
+        )
+        await db.commit()
+        pooled_seeds = list((await db.execute(
+            select(World.seed_prompt).where(World.status.in_(POOL_STATUSES))
+        )).scalars().all())
+        generating = (await db.execute(
+            select(func.count()).select_from(World).where(World.status == "generating")
+        )).scalar() or 0
+
+    if len(pooled_seeds) >= settings.warm_pool_size:
+        return
+    if generating or llm_scheduler.waiting:
+        logger.info("warm_pool.busy", generating=generating, llm_waiting=llm_scheduler.waiting)
+        return
+
+    seed = _next_seed(pooled_seeds)
+    async with async_session() as db:
+        world = World(seed_prompt=seed, config={}, status="pooling")
+        db.add(world)
+        await db.commit()
+        world_id = world.id
+        try:
+            await populate_world(db, world_id, seed, {})
+        except Exception:
+            await db.rollback()
+            await db.execute(delete(World).where(World.id == world_id))
+            await db.commit()
+            raise
+        await db.execute(update(World).where(World.id == world_id).values(status="pooled"))
+        await db.commit()
+    logger.info("warm_pool.replenished", world_id=str(world_id), size=len(pooled_seeds) + 1)
+
+
+register_job(REPLENISH_JOB, replenish_pool, every_seconds=settings.warm_pool_interval_seconds)
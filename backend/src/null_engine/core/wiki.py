@@ -1,12 +1,18 @@
+import asyncio
 import uuid
 
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from null_engine.config import settings
 from null_engine.models.schemas import WSEnvelope
-from null_engine.models.tables import WikiHistory, WikiPage
+from null_engine.models.tables import WikiPage
+from null_engine.services.embedding_pipeline import enqueue_embeddings
 from null_engine.services.llm_router import LLMGenerationError, llm_router
+from null_engine.services.response_cache import bump_world_version
+from null_engine.services.wiki_history import history_entry
+from null_engine.services.world_stats import record_activity
 from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
@@ -46,15 +52,142 @@ Guidelines:
 - Create internal links using [[Page Title]] format for related topics
 - Be comprehensive but avoid speculation beyond established facts"""
 
+# Old articles without "## " sections are rewritten whole; cap how much of
+# them goes back into the prompt.
+WIKI_LEGACY_CONTEXT_CHARS = 4000
+
+
+WIKI_SECTION_PROMPT = """You are a world librarian maintaining a Wikipedia-style article.
+
+Topic: {topic}
+The article's sections, each with its opening lines:
+{outline}
+
+Recent conversation summaries:
+{summaries}
+
+Return only the sections these summaries change, or a new "## " section if
+nothing fits. You only see the start of each section, so "append" new
+paragraphs to it (e.g. Notable Events); "replace" only a section you can
+restate in full (e.g. Current Status). Same encyclopedic tone and
+[[Page Title]] links as the article.
+
+Respond with JSON:
+{{"sections": [{{"heading": "exact existing heading or a new one", "mode": "append" or "replace", "content": "markdown body without the heading"}}]}}
+Respond with {{"sections": []}} if nothing changes."""
+
+# Per-section excerpt in the update prompt, so it stays the same size
+# however long the article grows.
+SECTION_EXCERPT_CHARS = 300
+
+
+def split_sections(content: str) -> list[tuple[str, str]]:
+    """Split markdown into (heading, body) pairs at "## " headings.
+
+    Text before the first heading comes back under the heading "".
+    """
+    sections: list[tuple[str, str]] = []
+    heading, lines = "", []
+    for line in content.splitlines():
+        if line.startswith("## "):
+            if heading or any(part.strip() for part in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = line[3:].strip(), []
+        else:
+            lines.append(line)
+    if heading or any(part.strip() for part in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+
+def join_sections(sections: list[tuple[str, str]]) -> str:
+    parts = [f"## {heading}\n\n{body}" if heading else body for heading, body in sections]
+    return "\n\n".join(part for part in parts if part) + "\n"
+
+
+def splice_sections(content: str, updates: list[tuple[str, str, bool]]) -> str:
+    """Apply (heading, body, append) updates to the sections of content.
+
+    Headings match case-insensitively; a matched section gets body added
+    to its end (append) or replaced by it; unknown headings become new
+    sections at the end.
+    """
+    sections = split_sections(content)
+    index = {heading.lower(): i for i, (heading, _) in enumerate(sections) if heading}
+    for heading, body, append in updates:
+        i = index.get(heading.lower())
+        if i is None:
+            index[heading.lower()] = len(sections)
+            sections.append((heading, body))
+        else:
+            old_heading, old_body = sections[i]
+            sections[i] = (old_heading, f"{old_body}\n\n{body}".strip() if append else body)
+    return join_sections(sections)
+
+
+def _outline(sections: list[tuple[str, str]]) -> str:
+    return "\n".join(
+        f"## {heading}\n{' '.join(body.split())[:SECTION_EXCERPT_CHARS]}" for heading, body in sections if heading
+    )
+
+
+def _section_updates(result: dict | list) -> list[tuple[str, str, bool]]:
+    sections = result.get("sections") if isinstance(result, dict) else None
+    updates = []
+    for section in sections or []:
+        if not isinstance(section, dict):
+            continue
+        heading = str(section.get("heading") or "").strip().lstrip("#").strip()
+        body = str(section.get("content") or "").strip()
+        if heading and body:
+            updates.append((heading, body, section.get("mode") != "replace"))
+    return updates
+
 
 class WikiEngine:
+    def __init__(self):
+        # Bounds this worker's concurrent article generations across topics
+        # and worlds, so epoch jobs don't crowd out the simulation's calls.
+        self._limiter = asyncio.Semaphore(max(1, settings.wiki_concurrency))
+
+    async def _write_article(self, topic: str, existing: str, summaries: list[str]) -> str | None:
+        """New article text, or None when the summaries change nothing.
+
+        Pages already split into "## " sections only get their changed
+        sections back from the model, spliced into the stored markdown, so
+        prompt and output stay the same size as the article grows. New
+        pages, and old ones without sections, are written whole.
+        """
+        summaries_text = "\n".join(f"- {s}" for s in summaries)
+        sections = split_sections(existing) if existing else []
+        async with self._limiter:
+            if any(heading for heading, _ in sections):
+                result = await llm_router.generate_json(
+                    role="wiki_writer",
+                    prompt=WIKI_SECTION_PROMPT.format(topic=topic, outline=_outline(sections), summaries=summaries_text),
+                    max_tokens=2048,
+                )
+                updates = _section_updates(result)
+                if not updates:
+                    return None
+                return splice_sections(existing, updates)
+            return await llm_router.generate_text(
+                role="wiki_writer",
+                prompt=WIKI_GEN_PROMPT.format(
+                    topic=topic,
+                    existing=existing[:WIKI_LEGACY_CONTEXT_CHARS] if existing else "(new article)",
+                    summaries=summaries_text,
+                ),
+                max_tokens=4096,
+            )
+
     async def generate_or_update_page(
         self,
         db: AsyncSession,
         world_id: uuid.UUID,
         topic: str,
         summaries: list[str],
-    ) -> WikiPage:
+    ) -> WikiPage | None:
         # Check for existing page
         result = await db.execute(
             select(WikiPage).where(WikiPage.world_id == world_id, WikiPage.title == topic)
@@ -63,30 +196,21 @@ class WikiEngine:
         existing_content = existing_page.content if existing_page else ""
 
         try:
-            content = await llm_router.generate_text(
-                role="wiki_writer",
-                prompt=WIKI_GEN_PROMPT.format(
-                    topic=topic,
-                    existing=existing_content or "(new article)",
-                    summaries="\n".join(f"- {s}" for s in summaries),
-                ),
-                max_tokens=4096,
-            )
+            content = await self._write_article(topic, existing_content or "", summaries)
         except LLMGenerationError:
-            logger.warning("wiki.generation_skipped", topic=topic)
+            logger.warning("wiki.generation_failed", topic=topic)
+            raise
+        if content is None:
+            logger.info("wiki.unchanged", page=topic)
             return existing_page
 
         if existing_page:
-            # Save history
-            history = WikiHistory(
-                page_id=existing_page.id,
-                content=existing_page.content,
-                version=existing_page.version,
-            )
-            db.add(history)
+            db.add(history_entry(existing_page, content))
 
             existing_page.content = content
             existing_page.version += 1
+            # Stale now; re-embedded once this commits.
+            existing_page.embedding = None
             page = existing_page
         else:
             page = WikiPage(
@@ -97,15 +221,15 @@ class WikiEngine:
             )
             db.add(page)
             await db.flush()
-
-        # Extract entity mentions
-        try:
-            from null_engine.services.mention_extractor import extract_mentions_from_wiki
-            await extract_mentions_from_wiki(db, world_id, page.id, content)
-        except Exception:
-            logger.exception("wiki.mention_extraction_failed")
+        await record_activity(db, world_id, wiki_pages=0 if existing_page else 1)
+        await enqueue_embeddings(db, "wiki_page", [page.id])
 
         await db.commit()
+        await bump_world_version(world_id)
+
+        # Extract entity mentions in the background worker
+        from null_engine.services.mention_extractor import enqueue_wiki_mentions
+        enqueue_wiki_mentions(world_id, page.id, content)
 
         await broadcast(world_id, WSEnvelope(
             type="wiki.edit",
@@ -1,6 +1,9 @@
+from collections.abc import Callable
+
 import structlog
-from sqlalchemy import JSON, text
+from sqlalchemy import JSON, event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from null_engine.config import settings
 from null_engine.models.base import Base
@@ -9,12 +12,40 @@ engine = create_async_engine(settings.database_url, echo=False, pool_size=20, ma
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 logger = structlog.get_logger()
 _pgvector_enabled = True
+_VECTOR_INDEX_METHODS = {"hnsw", "ivfflat"}
+_AFTER_COMMIT = "db.after_commit"
 
 
 def pgvector_enabled() -> bool:
     return _pgvector_enabled
 
 
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("db.after_commit_failed")
+
+
+def _drop_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Call callback once db's current transaction commits; a rollback discards it.
+
+    For side effects that must only see committed rows, e.g. handing ids
+    to an in-process worker.
+    """
+    if _AFTER_COMMIT not in db.info:
+        db.info[_AFTER_COMMIT] = []
+        if not event.contains(db.sync_session, "after_commit", _run_after_commit):
+            event.listen(db.sync_session, "after_commit", _run_after_commit)
+            event.listen(db.sync_session, "after_rollback", _drop_after_commit)
+    db.info[_AFTER_COMMIT].append(callback)
+
+
 def _is_vector_column(column_type: object) -> bool:
     return column_type.__class__.__name__.lower() == "vector"
 
@@ -23,13 +54,47 @@ def _apply_vector_json_fallback() -> int:
     """Replace pgvector columns with JSON columns so startup can proceed without extension."""
     replaced = 0
     for table in Base.metadata.tables.values():
+        vector_columns = set()
         for column in table.columns:
             if _is_vector_column(column.type):
                 column.type = JSON()
+                vector_columns.add(column.name)
                 replaced += 1
+        # ANN indexes (hnsw, vector_cosine_ops) can't be built on a JSON column;
+        # the migration chain creates them once pgvector is available.
+        for index in list(table.indexes):
+            if index.dialect_options["postgresql"]["using"] in _VECTOR_INDEX_METHODS and (
+                {column.name for column in index.columns} & vector_columns
+            ):
+                table.indexes.discard(index)
     return replaced
 
 
+def _drop_trigram_indexes() -> int:
+    """Remove gin_trgm_ops indexes from the metadata when pg_trgm can't be installed."""
+    dropped = 0
+    for table in Base.metadata.tables.values():
+        for index in list(table.indexes):
+            ops = index.dialect_options["postgresql"]["ops"] or {}
+            if "gin_trgm_ops" in ops.values():
+                table.indexes.discard(index)
+                dropped += 1
+    return dropped
+
+
+async def _configure_pg_trgm() -> None:
+    """pg_trgm for the fallback create_all (migration 0008 creates it otherwise)."""
+    async with engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            return
+        try:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.commit()
+        except Exception as exc:
+            await conn.rollback()
+            logger.warning("db.pg_trgm_unavailable", error=str(exc), dropped_indexes=_drop_trigram_indexes())
+
+
 async def _configure_pgvector() -> None:
     global _pgvector_enabled
 
@@ -190,6 +255,7 @@ async def create_tables():
                 # Dev/CI fallback (non-postgres or missing pgvector): the
                 # migration chain requires the vector type, so build the
                 # JSON-column variant directly from the patched metadata.
+                await _configure_pg_trgm()
                 async with engine.begin() as conn:
                     await conn.run_sync(Base.metadata.create_all)
         finally:
@@ -145,11 +145,11 @@ async def lifespan(app: FastAPI):
     import asyncio
 
     from null_engine.core.auto_genesis import auto_genesis_loop
-    from null_engine.services.convergence import convergence_loop
+    from null_engine.services.embedding_pipeline import embedding_worker_loop
     from null_engine.services.embeddings import probe_embedding_dimension
-    from null_engine.services.semantic_indexer import semantic_indexer_loop
-    from null_engine.services.taxonomy_builder import taxonomy_builder_loop
-    from null_engine.services.translator import translation_worker_loop
+    from null_engine.services.job_queue import job_worker_loop
+    from null_engine.services.mention_extractor import mention_worker_loop
+    from null_engine.services.translator import translation_demand_loop
 
     logger.info("starting null-engine")
     await create_tables()
@@ -164,10 +164,12 @@ async def lifespan(app: FastAPI):
     # pass finds nothing to adopt.
     background_tasks = [
         asyncio.create_task(_run_resilient_loop("runner_reconciliation", _runner_reconciliation_loop)),
-        asyncio.create_task(_run_resilient_loop("convergence", convergence_loop)),
-        asyncio.create_task(_run_resilient_loop("semantic_indexer", semantic_indexer_loop)),
-        asyncio.create_task(_run_resilient_loop("taxonomy_builder", taxonomy_builder_loop)),
-        asyncio.create_task(_run_resilient_loop("translator", translation_worker_loop)),
+        # Convergence, semantic indexing, taxonomy and translation run as
+        # jobs claimed from the shared queue, once cluster-wide.
+        asyncio.create_task(_run_resilient_loop("jobs", job_worker_loop)),
+        asyncio.create_task(_run_resilient_loop("translation_demand", translation_demand_loop)),
+        asyncio.create_task(_run_resilient_loop("mention_extractor", mention_worker_loop)),
+        asyncio.create_task(_run_resilient_loop("embedding_pipeline", embedding_worker_loop)),
     ]
     if settings.auto_genesis_enabled:
         background_tasks.append(
@@ -36,6 +36,8 @@ class WorldOut(BaseModel):
     current_epoch: int
     current_tick: int
     created_at: datetime
+    # Latest genesis step while status is "generating" (World.genesis_checkpoint["progress"]).
+    genesis_progress: dict[str, Any] | None = None
 
     model_config = {"from_attributes": True}
 
@@ -172,6 +174,33 @@ class WikiPageOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class WikiSearchOut(WikiPageOut):
+    # Matched fragments with terms wrapped in <mark></mark>; the text is not HTML-escaped.
+    highlight: str = ""
+
+
+class WikiVersionOut(BaseModel):
+    version: int
+    created_at: datetime | None = None
+    edited_by_agent: uuid.UUID | None = None
+    snapshot: bool
+
+    model_config = {"from_attributes": True}
+
+
+class WikiVersionContentOut(BaseModel):
+    page_id: uuid.UUID
+    version: int
+    content: str
+
+
+class WikiDiffOut(BaseModel):
+    page_id: uuid.UUID
+    from_version: int
+    to_version: int
+    diff: str  # unified diff, 3 lines of context
+
+
 class KnowledgeEdgeOut(BaseModel):
     subject: str
     predicate: str
@@ -238,6 +267,7 @@ class WorldCardOut(BaseModel):
     wiki_page_count: int = 0
     epoch_count: int = 0
     latest_activity: str | None = None
+    genesis_progress: dict[str, Any] | None = None
 
     model_config = {"from_attributes": True}
 
@@ -318,9 +348,27 @@ class GlobalSearchResult(BaseModel):
     world_id: uuid.UUID
     title: str
     snippet: str
+    # snippet with matched terms wrapped in <mark></mark>; the text is not HTML-escaped.
+    highlight: str = ""
     score: float
 
 
+class HybridSearchResult(GlobalSearchResult):
+    # entity_type also includes "stratum" (vector matches only).
+    text_rank: int | None = None
+    vector_rank: int | None = None
+    distance: float | None = None
+
+
+class HybridSearchOut(BaseModel):
+    results: list[HybridSearchResult] = Field(default_factory=list)
+    next_cursor: str | None = None
+    # False when no query embedding was available: full-text results only.
+    semantic: bool
+    embedding_cached: bool = False
+    timings_ms: dict[str, float] = Field(default_factory=dict)
+
+
 # --- WebSocket ---
 class WSEnvelope(BaseModel):
     type: str
@@ -447,6 +495,50 @@ class BookmarkOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# --- Export jobs ---
+class ExportJobCreate(BaseModel):
+    formats: list[str] = Field(min_length=1, max_length=20)
+
+
+class ExportArtifactOut(BaseModel):
+    format: str
+    url: str
+    size_bytes: int | None = None
+
+
+class ExportJobOut(BaseModel):
+    id: uuid.UUID
+    world_id: uuid.UUID
+    status: str
+    formats: list[str]
+    data_version: int
+    error: str | None = None
+    created_at: datetime | None = None
+    finished_at: datetime | None = None
+    artifacts: list[ExportArtifactOut] = Field(default_factory=list)
+
+
+class CorpusBuildCreate(BaseModel):
+    format: str = Field("chatml", pattern="^(chatml|alpaca|sharegpt)$")
+    include: str = "conversations,wiki"
+    world_ids: list[uuid.UUID] | None = None
+    output: str = Field("jsonl", pattern="^(jsonl|parquet)$")
+    shard_mb: int | None = Field(None, ge=1, le=4096)
+    min_chars: int = Field(200, ge=0)
+    max_chars: int = Field(32_000, ge=1)
+    min_distinct_ratio: float = Field(0.3, ge=0.0, le=1.0)
+
+
+class CorpusBuildOut(BaseModel):
+    id: uuid.UUID
+    status: str
+    out_dir: str
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+    manifest: dict[str, Any] | None = None
+
+
 # --- Entity Graph ---
 class EntityGraphNode(BaseModel):
     id: uuid.UUID
@@ -459,6 +551,7 @@ class EntityGraphEdge(BaseModel):
     target_id: uuid.UUID
     type: str  # "mention" | "knowledge"
     weight: float
+    label: str | None = None  # knowledge edge predicate
 
 
 class EntityGraphOut(BaseModel):
@@ -538,6 +631,19 @@ class OpsQueueOut(BaseModel):
     translator_pending_wiki_pages: int
     translator_pending_strata: int
     generating_worlds: int
+    mention_extractor_pending: int = 0
+    embedding_pending: int = 0
+    embedding_oldest_age_seconds: int = 0
+
+
+class OpsCacheOut(BaseModel):
+    route: str
+    hits: int
+    misses: int
+    coalesced: int
+    not_modified: int
+    evictions: int
+    hit_rate: float
 
 
 class OpsAlertOut(BaseModel):
@@ -554,6 +660,7 @@ class OpsMetricsOut(BaseModel):
     loops: list[OpsLoopOut] = Field(default_factory=list)
     runners: list[OpsRunnerOut] = Field(default_factory=list)
     queues: OpsQueueOut
+    cache: list[OpsCacheOut] = Field(default_factory=list)
     alerts: list[OpsAlertOut] = Field(default_factory=list)
 
 
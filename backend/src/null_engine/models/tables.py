@@ -2,9 +2,9 @@ import uuid
 from datetime import datetime
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from null_engine.config import settings
 from null_engine.models.base import Base
@@ -18,6 +18,16 @@ def new_uuid():
     return uuid.uuid4()
 
 
+# Columns added after launch: existing rows were backfilled with the
+# migration time (0007_export_watermarks).
+UTC_NOW = text("timezone('utc', now())")
+
+
+def tsvector_column(expression: str):
+    """Stored tsvector for full-text search (0008_full_text_search); never loaded by default."""
+    return deferred(Column(TSVECTOR, Computed(expression, persisted=True)))
+
+
 class World(Base):
     __tablename__ = "worlds"
 
@@ -31,6 +41,14 @@ class World(Base):
     # Runner lease: which process may tick this world (see core/runner_manager.py)
     lease_owner = Column(String(64), nullable=True)
     lease_expires_at = Column(DateTime, nullable=True)
+    # Completed genesis steps, so a resumed genesis.run job skips them
+    # (core/genesis.py); cleared once the world is ready.
+    genesis_checkpoint = Column(JSONB, nullable=True)
+
+    __table_args__ = (
+        Index("ix_worlds_created_at", created_at.desc()),
+        Index("ix_worlds_status", status),
+    )
 
     factions = relationship("Faction", back_populates="world", cascade="all, delete-orphan")
     agents = relationship("Agent", back_populates="world", cascade="all, delete-orphan")
@@ -45,6 +63,8 @@ class Faction(Base):
     description = Column(Text, default="")
     color = Column(String(7), default="#FFFFFF")
 
+    __table_args__ = (Index("ix_factions_world_id", world_id),)
+
     world = relationship("World", back_populates="factions")
     agents = relationship("Agent", back_populates="faction")
 
@@ -60,10 +80,24 @@ class Agent(Base):
     beliefs = Column(JSONB, default=list)
     status = Column(String(20), default="idle")
     embedding = Column(Vector(EMBEDDING_DIM), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=UTC_NOW)
+    search_vector = tsvector_column(
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(persona ->> 'role', '')), 'B')"
+    )
 
     world = relationship("World", back_populates="agents")
     faction = relationship("Faction", back_populates="agents")
 
+    __table_args__ = (
+        Index("ix_agents_world_faction", world_id, faction_id),
+        Index("ix_agents_faction_id", faction_id),
+        Index("ix_agents_embedding_pending", id, postgresql_where=embedding.is_(None)),
+        Index("ix_agents_world_created", world_id, created_at),
+        Index("ix_agents_search", "search_vector", postgresql_using="gin"),
+        Index("ix_agents_name_trgm", name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 
 class Relationship(Base):
     __tablename__ = "relationships"
@@ -75,6 +109,11 @@ class Relationship(Base):
     type = Column(String(50), default="neutral")
     strength = Column(Float, default=0.5)
 
+    __table_args__ = (
+        Index("ix_relationships_world_pair", world_id, agent_a, agent_b),
+        Index("ix_relationships_world_agent_b", world_id, agent_b),
+    )
+
 
 class WikiPage(Base):
     __tablename__ = "wiki_pages"
@@ -91,6 +130,32 @@ class WikiPage(Base):
     created_by_agent = Column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    search_vector = tsvector_column(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    )
+
+    __table_args__ = (
+        Index("ix_wiki_pages_world_created", world_id, created_at.desc()),
+        Index("ix_wiki_pages_world_title", world_id, title),
+        # Translator backlog scan / ops counter; rows drop out once translated.
+        Index(
+            "ix_wiki_pages_translation_pending",
+            created_at.desc(),
+            postgresql_where=title_ko.is_(None) & (title != ""),
+        ),
+        Index("ix_wiki_pages_embedding_pending", id, postgresql_where=embedding.is_(None)),
+        Index("ix_wiki_pages_embedded_created", created_at.desc(), postgresql_where=embedding.isnot(None)),
+        Index("ix_wiki_pages_world_updated", world_id, updated_at),
+        Index("ix_wiki_pages_search", "search_vector", postgresql_using="gin"),
+        Index("ix_wiki_pages_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_wiki_pages_embedding_hnsw",
+            embedding,
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
 
 
 class WikiHistory(Base):
@@ -98,11 +163,19 @@ class WikiHistory(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=new_uuid)
     page_id = Column(UUID(as_uuid=True), ForeignKey("wiki_pages.id", ondelete="CASCADE"), nullable=False)
-    content = Column(Text, default="")
+    # Full text for snapshots; otherwise NULL and delta holds line ops that
+    # turn the next newer version into this one (services/wiki_history.py).
+    content = Column(Text, nullable=True)
+    delta = Column(JSONB, nullable=True)
     version = Column(Integer, nullable=False)
     edited_by_agent = Column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_wiki_history_page_version", page_id, version),
+        Index("ix_wiki_history_created", created_at),
+    )
+
 
 class KnowledgeEdge(Base):
     __tablename__ = "knowledge_edges"
@@ -113,7 +186,37 @@ class KnowledgeEdge(Base):
     predicate = Column(String(200), nullable=False)
     object = Column(String(500), nullable=False)
     source_page = Column(UUID(as_uuid=True), ForeignKey("wiki_pages.id", ondelete="SET NULL"), nullable=True)
+    source_conversation = Column(
+        UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="SET NULL"), nullable=True
+    )
+    # "wiki_page:<id>" / "conversation:<id>" of every document that stated the
+    # triple; each corroborates its confidence once (services/knowledge_graph.py).
+    sources = Column(JSONB, nullable=False, default=list, server_default="[]")
     confidence = Column(Float, default=0.5)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=UTC_NOW)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=UTC_NOW)
+
+    __table_args__ = (
+        Index("ix_knowledge_edges_world_created", world_id, created_at),
+        # Incremental exports window on updated_at, which corroboration moves.
+        Index("ix_knowledge_edges_world_updated", world_id, updated_at),
+        # One row per triple, merged on conflict (services/knowledge_graph.py);
+        # with ix_knowledge_edges_world_object it serves both adjacency directions.
+        Index("uq_knowledge_edges_triple", world_id, subject, predicate, object, unique=True),
+        Index("ix_knowledge_edges_world_object", world_id, object),
+    )
+
+
+class KnowledgeWatermark(Base):
+    """How far the knowledge graph builder has read a world's documents of one source."""
+
+    __tablename__ = "knowledge_watermarks"
+
+    world_id = Column(UUID(as_uuid=True), ForeignKey("worlds.id", ondelete="CASCADE"), primary_key=True)
+    source = Column(String(32), primary_key=True)  # "wiki_page" | "conversation"
+    watermark = Column(DateTime, nullable=False)
+    # Id of the last document read at watermark: the position is the (changed_at, id) keyset.
+    watermark_id = Column(UUID(as_uuid=True), nullable=False)
 
 
 class Conversation(Base):
@@ -134,6 +237,30 @@ class Conversation(Base):
     topic_ko = Column(String(500), nullable=True, default=None)
     messages_ko = Column(JSONB, nullable=True, default=None)
     summary_ko = Column(Text, nullable=True, default=None)
+    search_vector = tsvector_column(
+        "setweight(to_tsvector('english', coalesce(topic, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('english', jsonb_path_query_array(coalesce(messages, '[]'), '$[*].content')), 'C')"
+    )
+
+    __table_args__ = (
+        # Serves the newest-first keyset pagination in /conversations and /feed.
+        Index("ix_conversations_world_created", world_id, created_at.desc(), id.desc()),
+        Index("ix_conversations_world_epoch", world_id, epoch),
+        Index(
+            "ix_conversations_translation_pending",
+            created_at.desc(),
+            postgresql_where=topic_ko.is_(None) & (topic != ""),
+        ),
+        Index("ix_conversations_embedding_pending", id, postgresql_where=embedding.is_(None)),
+        Index("ix_conversations_search", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_conversations_embedding_hnsw",
+            embedding,
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
 
 
 class WorldTag(Base):
@@ -144,6 +271,8 @@ class WorldTag(Base):
     tag = Column(String(100), nullable=False)
     weight = Column(Float, default=1.0)
 
+    __table_args__ = (Index("ix_world_tags_world_id", world_id),)
+
 
 class ConceptCluster(Base):
     __tablename__ = "concept_clusters"
@@ -167,6 +296,8 @@ class ConceptMembership(Base):
     entity_id = Column(UUID(as_uuid=True), nullable=False)
     similarity = Column(Float, default=0.0)
 
+    __table_args__ = (Index("ix_concept_memberships_cluster", cluster_id, similarity.desc()),)
+
 
 class ResonanceLink(Base):
     __tablename__ = "resonance_links"
@@ -181,6 +312,12 @@ class ResonanceLink(Base):
     strength = Column(Float, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_resonance_links_world_a", world_a, strength.desc()),
+        Index("ix_resonance_links_world_b", world_b, strength.desc()),
+        Index("ix_resonance_links_entities", entity_a, entity_b),
+    )
+
 
 class EntityMention(Base):
     __tablename__ = "entity_mentions"
@@ -195,6 +332,11 @@ class EntityMention(Base):
     confidence = Column(Float, default=1.0)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_entity_mentions_world_target", world_id, target_type, target_id, created_at.desc()),
+        Index("ix_entity_mentions_source", source_type, source_id),
+    )
+
 
 class SemanticNeighbor(Base):
     __tablename__ = "semantic_neighbors"
@@ -207,6 +349,11 @@ class SemanticNeighbor(Base):
     similarity = Column(Float, default=0.0)
     is_cross_world = Column(String(5), default="false")  # "true" | "false"
 
+    __table_args__ = (
+        Index("ix_semantic_neighbors_pair", entity_a_id, entity_b_id),
+        Index("ix_semantic_neighbors_entity_b", entity_b_id),
+    )
+
 
 class TaxonomyNode(Base):
     __tablename__ = "taxonomy_nodes"
@@ -223,6 +370,8 @@ class TaxonomyNode(Base):
     children = relationship("TaxonomyNode", back_populates="parent_node", foreign_keys="[TaxonomyNode.parent_id]")
     parent_node = relationship("TaxonomyNode", remote_side="[TaxonomyNode.id]", foreign_keys="[TaxonomyNode.parent_id]")
 
+    __table_args__ = (Index("ix_taxonomy_nodes_parent", parent_id),)
+
 
 class TaxonomyMembership(Base):
     __tablename__ = "taxonomy_memberships"
@@ -234,6 +383,8 @@ class TaxonomyMembership(Base):
     entity_id = Column(UUID(as_uuid=True), nullable=False)
     similarity = Column(Float, default=0.0)
 
+    __table_args__ = (Index("ix_taxonomy_memberships_node", node_id, similarity.desc()),)
+
 
 class Stratum(Base):
     __tablename__ = "strata"
@@ -247,6 +398,18 @@ class Stratum(Base):
     faded_concepts = Column(JSONB, default=list)
     dominant_themes = Column(JSONB, default=list)
     embedding = Column(Vector(EMBEDDING_DIM), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=UTC_NOW)
+
+    __table_args__ = (
+        Index("ix_strata_world_epoch", world_id, epoch.desc()),
+        Index("ix_strata_translation_pending", id, postgresql_where=summary_ko.is_(None) & (summary != "")),
+        Index(
+            "ix_strata_embedding_hnsw",
+            embedding,
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
 
 
 class Bookmark(Base):
@@ -261,6 +424,8 @@ class Bookmark(Base):
     note = Column(Text, default="")
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_bookmarks_session_created", user_session, created_at),)
+
 
 class AgentMemory(Base):
     __tablename__ = "agent_memories"
@@ -272,6 +437,8 @@ class AgentMemory(Base):
     content = Column(JSONB, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_agent_memories_agent_created", agent_id, created_at.desc()),)
+
 
 class Claim(Base):
     __tablename__ = "claims"
@@ -286,6 +453,8 @@ class Claim(Base):
     faction_id = Column(UUID(as_uuid=True), ForeignKey("factions.id", ondelete="SET NULL"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_claims_world_status", world_id, status),)
+
 
 class ClaimVote(Base):
     __tablename__ = "claim_votes"
@@ -310,3 +479,119 @@ class AgentPost(Base):
     title_ko = Column(String(500), nullable=True)
     content_ko = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_agent_posts_world_created", world_id, created_at.desc()),)
+
+
+class WorldStats(Base):
+    """Per-world counters kept current by the write paths (services/world_stats.py).
+
+    Lets /worlds and the faction endpoints read one row per world instead
+    of re-aggregating conversations/agents/wiki pages on every request.
+    """
+
+    __tablename__ = "world_stats"
+
+    world_id = Column(UUID(as_uuid=True), ForeignKey("worlds.id", ondelete="CASCADE"), primary_key=True)
+    agent_count = Column(Integer, nullable=False, default=0, server_default="0")
+    conversation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    wiki_page_count = Column(Integer, nullable=False, default=0, server_default="0")
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    claim_count = Column(Integer, nullable=False, default=0, server_default="0")
+    canon_count = Column(Integer, nullable=False, default=0, server_default="0")
+    faction_agent_counts = Column(JSONB, nullable=False, default=dict, server_default="{}")  # {faction_id: n}
+    latest_topic = Column(String(500), nullable=True)
+    last_activity_at = Column(DateTime, nullable=True)
+    # Bumped on every recorded write; cheap "has anything changed" check.
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ExportJob(Base):
+    """A requested set of export artifacts (services/export_jobs.py).
+
+    Artifacts live on disk keyed by (world_id, data_version, format), so a
+    job for an unchanged world reuses the files an earlier job wrote.
+    """
+
+    __tablename__ = "export_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_uuid)
+    world_id = Column(UUID(as_uuid=True), ForeignKey("worlds.id", ondelete="CASCADE"), nullable=False)
+    formats = Column(JSONB, nullable=False, default=list)
+    data_version = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, ready, error
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_export_jobs_world_created", world_id, created_at.desc()),)
+
+
+class CorpusBuild(Base):
+    """A requested cross-world training corpus build (services/corpus_builder.py).
+
+    Shards and the manifest are written to out_dir; the row lets every
+    worker report the build's status and survives restarts.
+    """
+
+    __tablename__ = "corpus_builds"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_uuid)
+    options = Column(JSONB, nullable=False, default=dict)
+    out_dir = Column(String(1000), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, ready, error
+    error = Column(Text, nullable=True)
+    manifest = Column(JSONB, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class TranslationMemory(Base):
+    """Translations already paid for, keyed by a hash of the source text (services/translator.py)."""
+
+    __tablename__ = "translation_memory"
+
+    source_hash = Column(String(64), primary_key=True)  # sha256 hex of the source text
+    target_lang = Column(String(8), primary_key=True)
+    translation = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Job(Base):
+    """A unit of background work shared by every worker process (services/job_queue.py).
+
+    Workers claim queued rows with FOR UPDATE SKIP LOCKED and hold them
+    under a lease; a job whose lease lapses (worker died) is claimable
+    again. At most one queued or running job exists per (kind, dedupe_key).
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=new_uuid)
+    kind = Column(String(64), nullable=False)
+    dedupe_key = Column(String(200), nullable=True)
+    payload = Column(JSONB, nullable=False, default=dict, server_default="{}")
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # lower runs first
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=5, server_default="5")
+    # Periodic jobs enqueue their next run this many seconds after finishing.
+    repeat_seconds = Column(Integer, nullable=True)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=UTC_NOW)
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=UTC_NOW)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "uq_jobs_pending_dedupe",
+            kind,
+            dedupe_key,
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_jobs_claim", status, priority, run_after),
+        Index("ix_jobs_finished", finished_at, postgresql_where=text("status IN ('done', 'failed')")),
+    )
@@ -0,0 +1,319 @@
+"""Columnar (Parquet / Arrow IPC stream) export for data miners.
+
+Each table is written incrementally: rows stream off a server-side cursor,
+are buffered up to export_row_group_size, and every full buffer becomes one
+Parquet row group / Arrow record batch that is flushed to the client before
+the next one is read. Conversation messages are flattened to one row each so
+analysts don't have to re-parse the JSONB arrays.
+
+pyarrow is optional; pyarrow_available() gates the endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import InstrumentedAttribute, defer
+
+from null_engine.config import settings
+from null_engine.db import async_session
+from null_engine.models.tables import Claim, ClaimVote, Conversation, Relationship, Stratum
+from null_engine.services.export_stream import ExportWindow, stream_batches
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrows"}
+
+# Column kinds, mapped to Arrow types in _arrow_schema(). "dict" columns are
+# dictionary-encoded strings: UUIDs (world_id, agent_id, ...) and small
+# vocabularies (status, type) repeat heavily.
+_DICT, _TEXT, _INT, _FLOAT, _TIME, _TEXT_LIST = "dict", "text", "int", "float", "time", "text_list"
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _uuid(value: Any) -> str | None:
+    return str(value) if value is not None else None
+
+
+def message_rows(conversation: Any) -> list[dict[str, Any]]:
+    """Flatten a conversation's messages (and their Korean translations) to rows."""
+    messages = conversation.messages or []
+    messages_ko = conversation.messages_ko or []
+    rows = []
+    for index, message in enumerate(messages):
+        translated = messages_ko[index] if index < len(messages_ko) else None
+        rows.append({
+            "world_id": _uuid(conversation.world_id),
+            "conversation_id": _uuid(conversation.id),
+            "epoch": conversation.epoch,
+            "tick": conversation.tick,
+            "round": message.get("round", index),
+            "agent_id": message.get("agent_id"),
+            "content": message.get("content", ""),
+            "content_ko": translated.get("content") if isinstance(translated, dict) else None,
+        })
+    return rows
+
+
+def _conversation_rows(c: Conversation) -> list[dict[str, Any]]:
+    return [{
+        "id": _uuid(c.id),
+        "world_id": _uuid(c.world_id),
+        "epoch": c.epoch,
+        "tick": c.tick,
+        "topic": c.topic,
+        "summary": c.summary,
+        "participant_count": len(c.participants or []),
+        "message_count": len(c.messages or []),
+        "created_at": c.created_at,
+    }]
+
+
+def _claim_rows(c: Claim) -> list[dict[str, Any]]:
+    return [{
+        "id": _uuid(c.id),
+        "world_id": _uuid(c.world_id),
+        "claim_text": c.claim_text,
+        "category": c.category,
+        "confidence": c.confidence,
+        "status": c.status,
+        "proposer_id": _uuid(c.proposer_id),
+        "faction_id": _uuid(c.faction_id),
+        "created_at": c.created_at,
+    }]
+
+
+def _vote_rows(v: ClaimVote) -> list[dict[str, Any]]:
+    return [{
+        "id": _uuid(v.id),
+        "claim_id": _uuid(v.claim_id),
+        "agent_id": _uuid(v.agent_id),
+        "faction_id": _uuid(v.faction_id),
+        "created_at": v.created_at,
+    }]
+
+
+def _relationship_rows(r: Relationship) -> list[dict[str, Any]]:
+    return [{
+        "id": _uuid(r.id),
+        "world_id": _uuid(r.world_id),
+        "agent_a": _uuid(r.agent_a),
+        "agent_b": _uuid(r.agent_b),
+        "type": r.type,
+        "strength": r.strength,
+    }]
+
+
+def _text_list(values: Any) -> list[str]:
+    return [str(v) for v in values or []]
+
+
+def _stratum_rows(s: Stratum) -> list[dict[str, Any]]:
+    return [{
+        "id": _uuid(s.id),
+        "world_id": _uuid(s.world_id),
+        "epoch": s.epoch,
+        "summary": s.summary,
+        "summary_ko": s.summary_ko,
+        "emerged_concepts": _text_list(s.emerged_concepts),
+        "faded_concepts": _text_list(s.faded_concepts),
+        "dominant_themes": _text_list(s.dominant_themes),
+    }]
+
+
+@dataclass(frozen=True)
+class ColumnarTable:
+    columns: tuple[tuple[str, str], ...]
+    query: Callable[[uuid.UUID], Select]
+    to_rows: Callable[[Any], Iterable[dict[str, Any]]]
+    # Timestamp an incremental (since=) export filters on; None: full exports only.
+    changed_at: InstrumentedAttribute | None = None
+
+
+def _conversations_query(world_id: uuid.UUID) -> Select:
+    return (
+        select(Conversation)
+        .options(defer(Conversation.embedding))
+        .where(Conversation.world_id == world_id)
+        .order_by(Conversation.created_at)
+    )
+
+
+TABLES: dict[str, ColumnarTable] = {
+    "messages": ColumnarTable(
+        columns=(
+            ("world_id", _DICT), ("conversation_id", _DICT), ("epoch", _INT), ("tick", _INT),
+            ("round", _INT), ("agent_id", _DICT), ("content", _TEXT), ("content_ko", _TEXT),
+        ),
+        query=_conversations_query,
+        to_rows=message_rows,
+        changed_at=Conversation.created_at,
+    ),
+    "conversations": ColumnarTable(
+        columns=(
+            ("id", _TEXT), ("world_id", _DICT), ("epoch", _INT), ("tick", _INT), ("topic", _TEXT),
+            ("summary", _TEXT), ("participant_count", _INT), ("message_count", _INT), ("created_at", _TIME),
+        ),
+        query=_conversations_query,
+        to_rows=_conversation_rows,
+        changed_at=Conversation.created_at,
+    ),
+    "claims": ColumnarTable(
+        columns=(
+            ("id", _TEXT), ("world_id", _DICT), ("claim_text", _TEXT), ("category", _DICT), ("confidence", _FLOAT),
+            ("status", _DICT), ("proposer_id", _DICT), ("faction_id", _DICT), ("created_at", _TIME),
+        ),
+        query=lambda world_id: select(Claim).where(Claim.world_id == world_id).order_by(Claim.created_at),
+        to_rows=_claim_rows,
+        changed_at=Claim.created_at,
+    ),
+    "votes": ColumnarTable(
+        columns=(("id", _TEXT), ("claim_id", _DICT), ("agent_id", _DICT), ("faction_id", _DICT), ("created_at", _TIME)),
+        query=lambda world_id: (
+            select(ClaimVote)
+            .join(Claim, Claim.id == ClaimVote.claim_id)
+            .where(Claim.world_id == world_id)
+            .order_by(ClaimVote.created_at)
+        ),
+        to_rows=_vote_rows,
+        changed_at=ClaimVote.created_at,
+    ),
+    "relationships": ColumnarTable(
+        columns=(
+            ("id", _TEXT), ("world_id", _DICT), ("agent_a", _DICT), ("agent_b", _DICT),
+            ("type", _DICT), ("strength", _FLOAT),
+        ),
+        query=lambda world_id: select(Relationship).where(Relationship.world_id == world_id),
+        to_rows=_relationship_rows,
+    ),
+    "strata": ColumnarTable(
+        columns=(
+            ("id", _TEXT), ("world_id", _DICT), ("epoch", _INT), ("summary", _TEXT), ("summary_ko", _TEXT),
+            ("emerged_concepts", _TEXT_LIST), ("faded_concepts", _TEXT_LIST), ("dominant_themes", _TEXT_LIST),
+        ),
+        query=lambda world_id: (
+            select(Stratum).options(defer(Stratum.embedding)).where(Stratum.world_id == world_id).order_by(Stratum.epoch)
+        ),
+        to_rows=_stratum_rows,
+        changed_at=Stratum.created_at,
+    ),
+}
+
+
+def _arrow_schema(table: ColumnarTable):
+    import pyarrow as pa
+
+    types = {
+        _DICT: pa.dictionary(pa.int32(), pa.string()),
+        _TEXT: pa.string(),
+        _INT: pa.int32(),
+        _FLOAT: pa.float64(),
+        _TIME: pa.timestamp("us"),
+        _TEXT_LIST: pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in table.columns])
+
+
+class _ChunkSink:
+    """Write-only file object; the bytes written so far are drained per row group."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ColumnarWriter:
+    def __init__(self, table: ColumnarTable, fmt: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._schema = _arrow_schema(table)
+        self._names = [name for name, _ in table.columns]
+        self._fmt = fmt
+        self.sink = _ChunkSink()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self.sink, self._schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_stream(self.sink, self._schema)
+
+    def write(self, rows: list[dict[str, Any]]) -> bytes:
+        import pyarrow as pa
+
+        batch = pa.Table.from_pydict({name: [row[name] for row in rows] for name in self._names}, schema=self._schema)
+        if self._fmt == "parquet":
+            self._writer.write_table(batch, row_group_size=len(rows))
+        else:
+            self._writer.write_table(batch)
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self.sink.drain()
+
+
+async def columnar_stream(
+    world_id: uuid.UUID, table_name: str, fmt: str, window: ExportWindow | None = None
+) -> AsyncIterator[bytes]:
+    """Yield the encoded file one row group at a time."""
+    table = TABLES[table_name]
+    stmt = table.query(world_id)
+    if window is not None and table.changed_at is not None:
+        stmt = window.bound(stmt, table.changed_at)
+    group_size = settings.export_row_group_size
+    writer = await asyncio.to_thread(_ColumnarWriter, table, fmt)
+    pending: list[dict[str, Any]] = []
+
+    async with async_session() as db:
+        async for batch in stream_batches(db, stmt):
+            for item in batch:
+                pending.extend(table.to_rows(item))
+            while len(pending) >= group_size:
+                group, pending = pending[:group_size], pending[group_size:]
+                chunk = await asyncio.to_thread(writer.write, group)
+                if chunk:
+                    yield chunk
+
+    if pending:
+        chunk = await asyncio.to_thread(writer.write, pending)
+        if chunk:
+            yield chunk
+    tail = await asyncio.to_thread(writer.close)
+    if tail:
+        yield tail
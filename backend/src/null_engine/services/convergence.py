@@ -1,14 +1,14 @@
 """Convergence Detector — background service for cross-world intelligence.
 
 Periodically:
-1. Ensures WikiPage embeddings exist
-2. Finds cross-world nearest neighbors via pgvector
-3. Clusters similar content into ConceptClusters
-4. Creates ResonanceLinks between worlds
-5. Labels clusters via LLM
+1. Finds cross-world nearest neighbors via pgvector
+2. Clusters similar content into ConceptClusters
+3. Creates ResonanceLinks between worlds
+4. Labels clusters via LLM
+
+WikiPage embeddings come from services/embedding_pipeline.py.
 """
 
-import asyncio
 import time
 
 import structlog
@@ -22,7 +22,9 @@ from null_engine.models.tables import (
     ResonanceLink,
     WikiPage,
 )
+from null_engine.services.job_queue import register_job
 from null_engine.services.llm_router import llm_router
+from null_engine.services.response_cache import bump_global_version
 
 logger = structlog.get_logger()
 
@@ -31,35 +33,6 @@ CLUSTER_MIN_MEMBERS = 2
 CONVERGENCE_INTERVAL = 120  # seconds
 
 
-async def _ensure_embeddings(db: AsyncSession):
-    """Generate embeddings for wiki pages that don't have them."""
-    result = await db.execute(
-        select(WikiPage).where(WikiPage.embedding.is_(None)).limit(50)
-    )
-    pages = result.scalars().all()
-    if not pages:
-        return
-
-    for page in pages:
-        try:
-            embed_text = f"{page.title}\n{page.content[:2000]}"
-            embedding = await _get_embedding(embed_text)
-            if embedding:
-                page.embedding = embedding
-        except Exception:
-            logger.exception("convergence.embed_failed", page_id=str(page.id))
-
-    await db.flush()
-    logger.info("convergence.embeddings_generated", count=len(pages))
-
-
-async def _get_embedding(text: str) -> list[float] | None:
-    """Delegate to the central embedding service (single dimension source)."""
-    from null_engine.services.embeddings import get_embedding
-
-    return await get_embedding(text)
-
-
 async def _find_cross_world_neighbors(db: AsyncSession):
     """Use pgvector to find similar wiki pages across different worlds."""
     if not pgvector_enabled():
@@ -109,11 +82,12 @@ async def _find_cross_world_neighbors(db: AsyncSession):
     return pairs
 
 
-async def _update_clusters(db: AsyncSession, pairs: list):
-    """Group similar pairs into concept clusters."""
+async def _update_clusters(db: AsyncSession, pairs: list) -> int:
+    """Group similar pairs into concept clusters; returns the number of rows written."""
     if not pairs:
-        return
+        return 0
 
+    written = 0
     # Simple approach: create/update clusters from pairs
     for page_a, page_b, similarity in pairs:
         # Check if either page is already in a cluster
@@ -137,6 +111,7 @@ async def _update_clusters(db: AsyncSession, pairs: list):
             db.add(cluster)
             await db.flush()
             cluster_id = cluster.id
+            written += 1
 
         # Add memberships if not existing
         for page in [page_a, page_b]:
@@ -154,6 +129,7 @@ async def _update_clusters(db: AsyncSession, pairs: list):
                     entity_id=page.id,
                     similarity=similarity,
                 ))
+                written += 1
 
         # Create resonance link
         if page_a.world_id != page_b.world_id:
@@ -173,6 +149,7 @@ async def _update_clusters(db: AsyncSession, pairs: list):
                     entity_type="wiki_page",
                     strength=similarity,
                 ))
+                written += 1
 
     # Update member counts
     clusters_result = await db.execute(select(ConceptCluster))
@@ -182,18 +159,23 @@ async def _update_clusters(db: AsyncSession, pairs: list):
             .select_from(ConceptMembership)
             .where(ConceptMembership.cluster_id == cluster.id)
         )
-        cluster.member_count = count_result.scalar() or 0
+        member_count = count_result.scalar() or 0
+        if cluster.member_count != member_count:
+            cluster.member_count = member_count
+            written += 1
 
     await db.flush()
+    return written
 
 
-async def _label_clusters(db: AsyncSession):
-    """Use LLM to generate better labels for unlabeled clusters."""
+async def _label_clusters(db: AsyncSession) -> int:
+    """Use LLM to generate better labels for unlabeled clusters; returns how many were labeled."""
     result = await db.execute(
         select(ConceptCluster).where(ConceptCluster.description == "").limit(5)
     )
     clusters = result.scalars().all()
 
+    labeled = 0
     for cluster in clusters:
         members_result = await db.execute(
             select(ConceptMembership)
@@ -230,8 +212,10 @@ Return JSON: {{"label": "...", "description": "..."}}""",
             if isinstance(result_json, dict):
                 cluster.label = str(result_json.get("label", cluster.label))[:200]
                 cluster.description = str(result_json.get("description", ""))
+                labeled += 1
         except Exception:
             logger.exception("convergence.label_failed", cluster_id=str(cluster.id))
+    return labeled
 
 
 async def run_convergence_cycle():
@@ -239,14 +223,17 @@ async def run_convergence_cycle():
     cycle_started = time.monotonic()
     async with async_session() as db:
         try:
-            await _ensure_embeddings(db)
             pairs = await _find_cross_world_neighbors(db)
-            await _update_clusters(db, pairs)
-            await _label_clusters(db)
+            written = await _update_clusters(db, pairs)
+            written += await _label_clusters(db)
             await db.commit()
+            if written:
+                # Resonance links feed the cross-world similarity map.
+                await bump_global_version()
             logger.info(
                 "convergence.cycle_complete",
                 pairs=len(pairs),
+                written=written,
                 duration_ms=int((time.monotonic() - cycle_started) * 1000),
             )
         except Exception:
@@ -255,14 +242,8 @@ async def run_convergence_cycle():
                 "convergence.cycle_failed",
                 duration_ms=int((time.monotonic() - cycle_started) * 1000),
             )
+            raise
 
 
-async def convergence_loop():
-    """Background loop that runs convergence detection periodically."""
-    logger.info("convergence.loop_started", interval=CONVERGENCE_INTERVAL)
-    while True:
-        await asyncio.sleep(CONVERGENCE_INTERVAL)
-        try:
-            await run_convergence_cycle()
-        except Exception:
-            logger.exception("convergence.loop_error")
+# One run per interval across all workers (services/job_queue.py).
+register_job("convergence.cycle", lambda _payload: run_convergence_cycle(), every_seconds=CONVERGENCE_INTERVAL)
@@ -0,0 +1,425 @@
+"""Cross-world training corpus builder.
+
+Streams training samples (the same ones /export/training emits) from every
+world, drops samples that fail the length/quality filters or are near
+duplicates of one already kept, and writes the rest to size-balanced JSONL
+or Parquet shards with a manifest.json describing the build.
+
+Near duplicates are found with MinHash over word shingles and LSH banding:
+a sample is dropped when any of its band hashes has been seen before, so
+pairs above roughly (1/bands) ** (1/rows) Jaccard similarity collide. The
+build is one pass and only the band hashes of kept samples stay in memory;
+sample text is written out and released batch by batch.
+
+Builds run from scripts/build_corpus.py or in the background via
+POST /api/exports/corpus, which records a corpus_builds row and queues a
+corpus.build job (services/job_queue.py) in the same transaction, so any
+worker can report its status and a restart resumes it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import shutil
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from null_engine.config import settings
+from null_engine.db import async_session
+from null_engine.models.tables import Conversation, CorpusBuild, WikiPage, World
+from null_engine.services.export_stream import stream_batches
+from null_engine.services.exporter import TrainingFormat, conversation_training_sample, wiki_training_sample
+from null_engine.services.job_queue import enqueue_job, register_job
+
+logger = structlog.get_logger()
+
+CORPUS_OUTPUTS = ("jsonl", "parquet")
+CORPUS_SOURCES = ("conversations", "wiki")
+MANIFEST_NAME = "manifest.json"
+CORPUS_JOB = "corpus.build"
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CorpusOptions:
+    format: TrainingFormat = "chatml"
+    include: frozenset[str] = frozenset(CORPUS_SOURCES)
+    world_ids: tuple[uuid.UUID, ...] | None = None
+    output: str = "jsonl"
+    shard_bytes: int | None = None
+    min_chars: int = 200
+    max_chars: int = 32_000
+    # Share of distinct words; catches loops of the same line or phrase.
+    min_distinct_ratio: float = 0.3
+    shingle_size: int = 5
+    num_perm: int = 64
+    bands: int = 8
+    seed: int = 1
+
+    @property
+    def rows(self) -> int:
+        return self.num_perm // self.bands
+
+    @property
+    def dedup_threshold(self) -> float:
+        return (1 / self.bands) ** (1 / self.rows)
+
+
+def sample_text(sample: Any) -> str:
+    """All string leaves of a training sample, in order."""
+    if isinstance(sample, str):
+        return sample
+    if isinstance(sample, dict):
+        values = sample.values()
+    elif isinstance(sample, list):
+        values = sample
+    else:
+        return ""
+    return "\n".join(text for text in (sample_text(v) for v in values) if text)
+
+
+def quality_issue(text: str, options: CorpusOptions) -> str | None:
+    """Name of the first filter the text fails, or None if it passes."""
+    if len(text) < options.min_chars:
+        return "too_short"
+    if len(text) > options.max_chars:
+        return "too_long"
+    words = _WORD.findall(text.lower())
+    if not words:
+        return "no_words"
+    if len(set(words)) / len(words) < options.min_distinct_ratio:
+        return "repetitive"
+    return None
+
+
+class MinHasher:
+    """MinHash signatures over word k-shingles (universal hashing mod 2^61 - 1)."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> set[str]:
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        if len(words) <= k:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in self.shingles(text)), dtype=np.uint64
+        )
+        # uint64 products wrap; that only perturbs the permutation family.
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+class LshIndex:
+    """Band-hash sets of the signatures kept so far."""
+
+    def __init__(self, bands: int, rows: int):
+        self._bands = bands
+        self._rows = rows
+        self._seen: list[set[int]] = [set() for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._seen[0])
+
+    def add_if_new(self, signature: np.ndarray) -> bool:
+        """Index the signature unless it collides with a kept one in any band."""
+        keys = [
+            hash(signature[i * self._rows:(i + 1) * self._rows].tobytes())
+            for i in range(self._bands)
+        ]
+        if any(key in seen for key, seen in zip(keys, self._seen, strict=True)):
+            return False
+        for key, seen in zip(keys, self._seen, strict=True):
+            seen.add(key)
+        return True
+
+
+@dataclass
+class _Shard:
+    path: Path
+    samples: int = 0
+    bytes: int = 0
+
+
+class ShardWriter:
+    """Writes records to shard-NNNNN files, starting a new one at shard_bytes.
+
+    Sizes are counted in encoded JSON bytes, so Parquet shards are balanced
+    by content rather than by their compressed size on disk.
+    """
+
+    def __init__(self, out_dir: Path, output: str, shard_bytes: int):
+        self._out_dir = out_dir
+        self._output = output
+        self._shard_bytes = shard_bytes
+        self._current: _Shard | None = None
+        self._file: Any = None
+        self._pending: list[dict[str, str]] = []
+        self.shards: list[dict[str, Any]] = []
+
+    def write(self, world_id: str, source: str, sample: dict[str, Any]) -> None:
+        if self._current is None:
+            self._open()
+        line = json.dumps(sample, ensure_ascii=False)
+        if self._output == "jsonl":
+            self._file.write(line + "\n")
+        else:
+            self._pending.append({"world_id": world_id, "source": source, "sample": line})
+            if len(self._pending) >= settings.export_row_group_size:
+                self._flush_rows()
+        self._current.samples += 1
+        self._current.bytes += len(line.encode()) + 1
+        if self._current.bytes >= self._shard_bytes:
+            self._close()
+
+    def close(self) -> list[dict[str, Any]]:
+        if self._current is not None:
+            self._close()
+        return self.shards
+
+    def _open(self) -> None:
+        self._current = _Shard(self._out_dir / f"shard-{len(self.shards):05d}.{self._output}")
+        if self._output == "jsonl":
+            self._file = open(self._current.path, "w", encoding="utf-8")
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.schema([
+                ("world_id", pa.dictionary(pa.int32(), pa.string())),
+                ("source", pa.dictionary(pa.int32(), pa.string())),
+                ("sample", pa.string()),
+            ])
+            self._file = pq.ParquetWriter(self._current.path, schema, compression="zstd")
+
+    def _flush_rows(self) -> None:
+        import pyarrow as pa
+
+        columns = {name: [row[name] for row in self._pending] for name in ("world_id", "source", "sample")}
+        self._file.write_table(pa.Table.from_pydict(columns, schema=self._file.schema))
+        self._pending = []
+
+    def _close(self) -> None:
+        if self._pending:
+            self._flush_rows()
+        self._file.close()
+        shard, self._current, self._file = self._current, None, None
+        self.shards.append({
+            "path": shard.path.name,
+            "samples": shard.samples,
+            "content_bytes": shard.bytes,
+            "file_bytes": shard.path.stat().st_size,
+            "sha256": _sha256(shard.path),
+        })
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CorpusBuilder:
+    """Filters, deduplicates and shards samples; feed it batches, then finish()."""
+
+    def __init__(self, out_dir: Path, options: CorpusOptions):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.out_dir = out_dir
+        self.options = options
+        self._hasher = MinHasher(options.num_perm, options.shingle_size, options.seed)
+        self._index = LshIndex(options.bands, options.rows)
+        self._writer = ShardWriter(out_dir, options.output, options.shard_bytes or settings.corpus_shard_bytes)
+        self._worlds: set[str] = set()
+        self.seen: Counter[str] = Counter()
+        self.kept: Counter[str] = Counter()
+        self.dropped: Counter[str] = Counter()
+
+    def add(self, world_id: str, source: str, samples: list[dict[str, Any]]) -> None:
+        self._worlds.add(world_id)
+        for sample in samples:
+            self.seen[source] += 1
+            text = sample_text(sample)
+            issue = quality_issue(text, self.options)
+            if issue is None and not self._index.add_if_new(self._hasher.signature(text)):
+                issue = "near_duplicate"
+            if issue:
+                self.dropped[issue] += 1
+                continue
+            self.kept[source] += 1
+            self._writer.write(world_id, source, sample)
+
+    def finish(self) -> dict[str, Any]:
+        """Close the last shard and write manifest.json (written last: its presence marks a complete build)."""
+        shards = self._writer.close()
+        options = self.options
+        manifest = {
+            "version": 1,
+            "created_at": datetime.now(UTC).isoformat(),
+            "format": options.format,
+            "output": options.output,
+            "include": sorted(options.include),
+            "worlds": len(self._worlds),
+            "samples_seen": sum(self.seen.values()),
+            "samples_kept": sum(self.kept.values()),
+            "kept_by_source": dict(self.kept),
+            "dropped": dict(self.dropped),
+            "filters": {
+                "min_chars": options.min_chars,
+                "max_chars": options.max_chars,
+                "min_distinct_ratio": options.min_distinct_ratio,
+            },
+            "dedup": {
+                "method": "minhash-lsh",
+                "shingle_size": options.shingle_size,
+                "num_perm": options.num_perm,
+                "bands": options.bands,
+                "rows": options.rows,
+                "threshold": round(options.dedup_threshold, 3),
+                "seed": options.seed,
+            },
+            "shards": shards,
+        }
+        (self.out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return manifest
+
+
+async def build_corpus(out_dir: Path, options: CorpusOptions) -> dict[str, Any]:
+    """Build a corpus from all (or options.world_ids) worlds into out_dir; returns the manifest."""
+    builder = await asyncio.to_thread(CorpusBuilder, out_dir, options)
+    async with async_session() as db:
+        if options.world_ids is not None:
+            world_ids = list(options.world_ids)
+        else:
+            result = await db.execute(select(World.id).order_by(World.created_at))
+            world_ids = list(result.scalars().all())
+
+        for world_id in world_ids:
+            key = str(world_id)
+            if "conversations" in options.include:
+                stmt = (
+                    select(Conversation)
+                    .options(defer(Conversation.embedding))
+                    .where(Conversation.world_id == world_id)
+                    .order_by(Conversation.created_at)
+                )
+                async for batch in stream_batches(db, stmt):
+                    samples = [s for s in (conversation_training_sample(c, options.format) for c in batch) if s]
+                    await asyncio.to_thread(builder.add, key, "conversations", samples)
+
+            if "wiki" in options.include:
+                stmt = (
+                    select(WikiPage)
+                    .options(defer(WikiPage.embedding))
+                    .where(WikiPage.world_id == world_id)
+                    .order_by(WikiPage.updated_at)
+                )
+                async for batch in stream_batches(db, stmt):
+                    samples = [wiki_training_sample(p, options.format) for p in batch]
+                    await asyncio.to_thread(builder.add, key, "wiki", samples)
+
+    manifest = await asyncio.to_thread(builder.finish)
+    logger.info(
+        "corpus_build.finished",
+        out_dir=str(out_dir),
+        samples_kept=manifest["samples_kept"],
+        dropped=manifest["dropped"],
+        shards=len(manifest["shards"]),
+    )
+    return manifest
+
+
+def options_to_payload(options: CorpusOptions) -> dict[str, Any]:
+    payload = asdict(options)
+    payload["include"] = sorted(options.include)
+    if options.world_ids is not None:
+        payload["world_ids"] = [str(world_id) for world_id in options.world_ids]
+    return payload
+
+
+def options_from_payload(payload: dict[str, Any]) -> CorpusOptions:
+    values = {f.name: payload[f.name] for f in fields(CorpusOptions) if f.name in payload}
+    values["include"] = frozenset(values.get("include", CORPUS_SOURCES))
+    if values.get("world_ids") is not None:
+        values["world_ids"] = tuple(uuid.UUID(world_id) for world_id in values["world_ids"])
+    return CorpusOptions(**values)
+
+
+async def create_corpus_build(db: AsyncSession, options: CorpusOptions) -> CorpusBuild:
+    """Record a build and queue its corpus.build job in one transaction."""
+    build_id = uuid.uuid4()
+    build = CorpusBuild(
+        id=build_id,
+        options=options_to_payload(options),
+        out_dir=str(Path(settings.corpus_output_dir) / str(build_id)),
+        status="queued",
+    )
+    db.add(build)
+    await db.flush()
+    await enqueue_job(CORPUS_JOB, {"build_id": str(build_id)}, dedupe_key=str(build_id), db=db)
+    await db.commit()
+    await db.refresh(build)
+    return build
+
+
+async def get_corpus_build(db: AsyncSession, build_id: uuid.UUID) -> CorpusBuild | None:
+    result = await db.execute(select(CorpusBuild).where(CorpusBuild.id == build_id))
+    return result.scalar_one_or_none()
+
+
+async def run_corpus_build(payload: dict[str, Any]) -> None:
+    """corpus.build: build into the row's out_dir; raises so the job queue retries with backoff."""
+    build_id = uuid.UUID(payload["build_id"])
+    async with async_session() as db:
+        build = await get_corpus_build(db, build_id)
+        if build is None or build.status in ("ready", "error"):
+            return
+        build.status = "running"
+        await db.commit()
+
+        out_dir = Path(build.out_dir)
+        # A retried attempt starts over; drop shards an earlier one left behind.
+        await asyncio.to_thread(shutil.rmtree, out_dir, True)
+        build.manifest = await build_corpus(out_dir, options_from_payload(build.options))
+        build.status = "ready"
+        build.finished_at = datetime.utcnow()
+        await db.commit()
+
+
+async def _corpus_build_failed(payload: dict[str, Any], error: str) -> None:
+    logger.error("corpus_build.failed", build_id=payload.get("build_id"), error=error)
+    async with async_session() as db:
+        await db.execute(
+            update(CorpusBuild)
+            .where(CorpusBuild.id == uuid.UUID(payload["build_id"]))
+            .values(status="error", error=error[:1000], finished_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+register_job(CORPUS_JOB, run_corpus_build, on_failure=_corpus_build_failed)
@@ -0,0 +1,262 @@
+"""Event-driven embedding of new agents, conversations, wiki pages and strata.
+
+Write paths call enqueue_embeddings in their own transaction. Once it
+commits, two things happen:
+
+- the row ids go onto an in-process queue that embedding_workers tasks
+  drain at once, embedding_batch_size rows per provider call
+  (embeddings.get_embeddings)
+- an embed.sweep job for the kind is added to the durable job queue
+  (services/job_queue.py) in a short transaction of its own, delayed by
+  embedding_sweep_delay_seconds and deduped per kind, so rows still
+  unembedded by then (process died, queue full, provider down) are picked
+  up by whichever worker claims it. It is not added in the caller's
+  transaction: a tick holding the uncommitted dedupe key would block
+  every other world's tick on it. While a sweep this process queued is
+  still due, later commits don't queue another; if the process dies in
+  between, the periodic sweep catches up.
+
+A batch reads its rows' text in a short transaction and calls the
+provider holding no locks. Each embedding is written back only while the
+row's embedding is still NULL and its text columns still hold what was
+read, so a racing worker's result or a concurrent edit is never
+overwritten; at worst two workers pay for the same row. A periodic sweep
+backfills rows written before the pipeline existed. Changing a row's
+text resets its embedding to NULL and enqueues it again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.db import after_commit, async_session
+from null_engine.models.tables import Agent, Conversation, Stratum, WikiPage
+from null_engine.services.embeddings import get_embeddings
+from null_engine.services.job_queue import enqueue_job, register_job
+
+logger = structlog.get_logger()
+
+SWEEP_JOB = "embed.sweep"
+
+
+@dataclass(frozen=True)
+class EmbedKind:
+    model: Any
+    # The columns text reads; the write-back checks they are unchanged.
+    columns: tuple[str, ...]
+    text: Callable[[Any], str]
+
+
+def _agent_text(agent: Agent) -> str:
+    persona = agent.persona or {}
+    return f"{agent.name}\n{persona.get('role', '')}\n{persona.get('personality', '')}"
+
+
+EMBED_KINDS: dict[str, EmbedKind] = {
+    "agent": EmbedKind(Agent, ("name", "persona"), _agent_text),
+    "conversation": EmbedKind(Conversation, ("topic", "summary"), lambda conv: f"{conv.topic}\n{conv.summary}"),
+    "wiki_page": EmbedKind(
+        WikiPage, ("title", "content"), lambda page: f"{page.title}\n{(page.content or '')[:2000]}"
+    ),
+    "stratum": EmbedKind(Stratum, ("summary",), lambda stratum: stratum.summary or ""),
+}
+
+_queue: asyncio.Queue[tuple[str, uuid.UUID]] | None = None
+# Queued keys → monotonic enqueue time, in arrival order (oldest first).
+_pending: dict[tuple[str, uuid.UUID], float] = {}
+# Kind → monotonic time the sweep this process queued for it runs.
+_sweep_due: dict[str, float] = {}
+_sweep_tasks: set[asyncio.Task] = set()
+
+
+def _get_queue() -> asyncio.Queue[tuple[str, uuid.UUID]]:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.embedding_queue_size)
+    return _queue
+
+
+def _push(kind: str, entity_id: uuid.UUID) -> bool:
+    key = (kind, entity_id)
+    if key in _pending:
+        return True
+    try:
+        _get_queue().put_nowait(key)
+    except asyncio.QueueFull:
+        # The delayed sweep job still covers the row.
+        logger.warning("embedding_pipeline.queue_full", kind=kind, entity_id=str(entity_id))
+        return False
+    _pending[key] = time.monotonic()
+    return True
+
+
+async def _enqueue_sweep(kind: str) -> None:
+    try:
+        queued = await enqueue_job(
+            SWEEP_JOB,
+            {"kinds": [kind]},
+            dedupe_key=kind,
+            delay_seconds=settings.embedding_sweep_delay_seconds,
+        )
+    except Exception:
+        _sweep_due.pop(kind, None)
+        logger.warning("embedding_pipeline.sweep_enqueue_failed", kind=kind)
+        return
+    if not queued:
+        # Another pending sweep may run sooner than ours would have.
+        _sweep_due.pop(kind, None)
+
+
+def _schedule_sweep(kind: str) -> None:
+    now = time.monotonic()
+    if _sweep_due.get(kind, 0.0) > now:
+        return
+    _sweep_due[kind] = now + settings.embedding_sweep_delay_seconds
+    task = asyncio.get_running_loop().create_task(_enqueue_sweep(kind))
+    _sweep_tasks.add(task)
+    task.add_done_callback(_sweep_tasks.discard)
+
+
+def _dispatch(kind: str, entity_ids: list[uuid.UUID]) -> None:
+    for entity_id in entity_ids:
+        _push(kind, entity_id)
+    _schedule_sweep(kind)
+
+
+async def enqueue_embeddings(db: AsyncSession, kind: str, entity_ids: Iterable[uuid.UUID]) -> None:
+    """Schedule embedding of rows written in db's current transaction."""
+    if kind not in EMBED_KINDS:
+        raise ValueError(f"unknown embedding kind {kind!r}")
+    ids = [entity_id for entity_id in entity_ids if entity_id is not None]
+    if not ids:
+        return
+    after_commit(db, lambda: _dispatch(kind, ids))
+
+
+def pending_embeddings() -> int:
+    return len(_pending)
+
+
+def oldest_pending_age_seconds() -> int:
+    """Seconds the oldest queued row has waited; 0 when the queue is empty."""
+    oldest = next(iter(_pending.values()), None)
+    return 0 if oldest is None else int(time.monotonic() - oldest)
+
+
+async def embed_rows(
+    kind: str,
+    entity_ids: list[uuid.UUID] | None = None,
+    *,
+    limit: int | None = None,
+    exclude: set[uuid.UUID] | None = None,
+) -> tuple[int, list[uuid.UUID]]:
+    """Embed still-unembedded rows in one provider call.
+
+    Returns how many rows were claimed and the ids of those that got no
+    embedding. No lock is held across the provider call; a row embedded
+    or edited meanwhile is left as it is.
+    """
+    spec = EMBED_KINDS[kind]
+    model = spec.model
+    columns = [getattr(model, name) for name in spec.columns]
+    stmt = select(model.id, *columns).where(model.embedding.is_(None))
+    if entity_ids is not None:
+        stmt = stmt.where(model.id.in_(entity_ids))
+    if exclude:
+        stmt = stmt.where(model.id.notin_(exclude))
+    stmt = stmt.limit(limit or settings.embedding_batch_size)
+
+    async with async_session() as db:
+        rows = list((await db.execute(stmt)).all())
+    if not rows:
+        return 0, []
+    embeddings = await get_embeddings([spec.text(row) for row in rows])
+
+    failed = []
+    written = 0
+    async with async_session() as db:
+        for row, embedding in zip(rows, embeddings):
+            if embedding is None:
+                failed.append(row.id)
+                continue
+            result = await db.execute(
+                update(model)
+                .where(
+                    model.id == row.id,
+                    model.embedding.is_(None),
+                    *(column == getattr(row, name) for name, column in zip(spec.columns, columns)),
+                )
+                .values(embedding=embedding)
+            )
+            written += result.rowcount
+        await db.commit()
+    logger.info("embedding_pipeline.embedded", kind=kind, claimed=len(rows), written=written, failed=len(failed))
+    return len(rows), failed
+
+
+async def _embed_batch(batch: list[tuple[str, uuid.UUID]]) -> None:
+    by_kind: dict[str, list[uuid.UUID]] = {}
+    for kind, entity_id in batch:
+        by_kind.setdefault(kind, []).append(entity_id)
+    for kind, ids in by_kind.items():
+        try:
+            await embed_rows(kind, ids, limit=len(ids))
+        except Exception:
+            logger.exception("embedding_pipeline.batch_failed", kind=kind, size=len(ids))
+
+
+async def _drain() -> None:
+    queue = _get_queue()
+    while True:
+        batch = [await queue.get()]
+        if queue.qsize() < settings.embedding_batch_size - 1:
+            # Let a burst of writes fill the batch before paying for a call.
+            await asyncio.sleep(settings.embedding_batch_wait_seconds)
+        while len(batch) < settings.embedding_batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await _embed_batch(batch)
+        finally:
+            for key in batch:
+                _pending.pop(key, None)
+                queue.task_done()
+
+
+async def embedding_worker_loop() -> None:
+    """Run embedding_workers drainers of the in-process queue."""
+    workers = [asyncio.create_task(_drain()) for _ in range(settings.embedding_workers)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def run_embedding_sweep(payload: dict[str, Any]) -> None:
+    """Embed every unembedded row of the payload's kinds (all kinds by default)."""
+    for kind in payload.get("kinds") or list(EMBED_KINDS):
+        failed: set[uuid.UUID] = set()
+        while True:
+            claimed, batch_failed = await embed_rows(kind, exclude=failed)
+            if not claimed:
+                break
+            if len(batch_failed) == claimed:
+                # Provider down or misconfigured; the job queue retries with backoff.
+                raise RuntimeError(f"no {kind} rows could be embedded")
+            failed.update(batch_failed)
+        if failed:
+            logger.warning("embedding_pipeline.sweep_skipped", kind=kind, rows=len(failed))
+
+
+register_job(SWEEP_JOB, run_embedding_sweep, every_seconds=settings.embedding_sweep_interval_seconds)
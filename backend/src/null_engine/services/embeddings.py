@@ -6,6 +6,9 @@ Historically the Ollama path silently discarded every embedding because
 the model emits 1024 dims while the DB columns were fixed at 1536.
 """
 
+import time
+from collections import OrderedDict
+
 import httpx
 import structlog
 
@@ -20,37 +23,92 @@ probe_state: dict[str, object] = {"status": "unknown", "actual_dim": None, "deta
 
 _mismatch_logged = False
 
+# (model, dim, normalised text) -> (expires_at, embedding); see get_query_embedding.
+_query_cache: OrderedDict[tuple[str, int, str], tuple[float, list[float]]] = OrderedDict()
+
 
 async def get_embedding(text: str) -> list[float] | None:
     """Return an ``settings.embedding_dim``-dim embedding, or None on failure."""
-    global _mismatch_logged
     try:
         if settings.llm_provider == "ollama":
             emb = await _ollama_embedding(text)
         else:
             emb = await _openai_embedding(text)
-        if emb is None:
-            return None
-        if len(emb) != settings.embedding_dim:
-            if not _mismatch_logged:
-                _mismatch_logged = True
-                logger.error(
-                    "embeddings.dimension_mismatch",
-                    expected=settings.embedding_dim,
-                    actual=len(emb),
-                    model=settings.embedding_model,
-                    hint="align EMBEDDING_DIM / EMBEDDING_MODEL and re-run the reindex",
-                )
-            probe_state.update(
-                {"status": "dimension_mismatch", "actual_dim": len(emb)}
-            )
-            return None
-        return emb
+        return _checked(emb)
     except Exception:
         logger.exception("embeddings.error")
         return None
 
 
+def _checked(emb: list[float] | None) -> list[float] | None:
+    global _mismatch_logged
+    if emb is None:
+        return None
+    if len(emb) != settings.embedding_dim:
+        if not _mismatch_logged:
+            _mismatch_logged = True
+            logger.error(
+                "embeddings.dimension_mismatch",
+                expected=settings.embedding_dim,
+                actual=len(emb),
+                model=settings.embedding_model,
+                hint="align EMBEDDING_DIM / EMBEDDING_MODEL and re-run the reindex",
+            )
+        probe_state.update(
+            {"status": "dimension_mismatch", "actual_dim": len(emb)}
+        )
+        return None
+    return emb
+
+
+async def get_embeddings(texts: list[str]) -> list[list[float] | None]:
+    """Embed several texts in one provider call; None where a text failed.
+
+    Both providers accept a list input, so a batch costs one round trip.
+    """
+    if not texts:
+        return []
+    try:
+        if settings.llm_provider == "ollama":
+            embs = await _ollama_embeddings(texts)
+        else:
+            embs = await _openai_embeddings(texts)
+    except Exception:
+        logger.exception("embeddings.batch_error", size=len(texts))
+        return [None] * len(texts)
+    if len(embs) != len(texts):
+        logger.warning("embeddings.batch_misaligned", size=len(texts), returned=len(embs))
+        return [None] * len(texts)
+    return [_checked(emb) for emb in embs]
+
+
+async def get_query_embedding(text: str) -> tuple[list[float] | None, bool]:
+    """Embedding for a search query, from a bounded LRU when possible.
+
+    Returns (embedding, cache_hit). Failures are not cached, so a provider
+    outage doesn't pin "no embedding" for a popular query.
+    """
+    model = settings.embedding_model if settings.llm_provider == "ollama" else settings.openai_embedding_model
+    key = (model, settings.embedding_dim, " ".join(text.lower().split()))
+    now = time.monotonic()
+    cached = _query_cache.get(key)
+    if cached and cached[0] > now:
+        _query_cache.move_to_end(key)
+        return cached[1], True
+
+    emb = await get_embedding(text)
+    if emb is not None:
+        _query_cache[key] = (now + settings.query_embedding_cache_ttl_seconds, emb)
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > settings.query_embedding_cache_size:
+            _query_cache.popitem(last=False)
+    return emb, False
+
+
+def clear_query_embedding_cache() -> None:
+    _query_cache.clear()
+
+
 async def _ollama_embedding(text: str) -> list[float] | None:
     async with httpx.AsyncClient(timeout=30.0) as client:
         resp = await client.post(
@@ -65,6 +123,18 @@ async def _ollama_embedding(text: str) -> list[float] | None:
         return embeddings[0] if embeddings else None
 
 
+async def _ollama_embeddings(texts: list[str]) -> list[list[float] | None]:
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        resp = await client.post(
+            f"{settings.ollama_base_url}/api/embed",
+            json={"model": settings.embedding_model, "input": [text[:2000] for text in texts]},
+        )
+        if resp.status_code != 200:
+            logger.warning("embeddings.ollama_http_error", status=resp.status_code)
+            return [None] * len(texts)
+        return resp.json().get("embeddings") or []
+
+
 async def _openai_embedding(text: str) -> list[float] | None:
     from openai import AsyncOpenAI
 
@@ -77,6 +147,18 @@ async def _openai_embedding(text: str) -> list[float] | None:
     return resp.data[0].embedding
 
 
+async def _openai_embeddings(texts: list[str]) -> list[list[float] | None]:
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    resp = await client.embeddings.create(
+        model=settings.openai_embedding_model,
+        input=[text[:8000] for text in texts],
+        dimensions=settings.embedding_dim,
+    )
+    return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
+
+
 async def probe_embedding_dimension() -> None:
     """Startup check: verify the configured model's real output dimension.
 
@@ -0,0 +1,233 @@
+"""Bounded views of a world's entity graph.
+
+Edges are entity mentions (aggregated per source/target pair, weight =
+summed confidence) plus knowledge edges whose subject and object name a
+known agent, faction or wiki page. Names aren't unique, so each resolves
+to one node: an agent before a faction before a wiki page. Every view is
+cut down in SQL, so response size follows the request's limits:
+
+- overview: max_nodes nodes sampled by weighted degree ("hubs") or at
+  random, and the heaviest max_edges edges among them
+- top: the max_edges heaviest edges
+- ego: the depth-k neighborhood of one entity, expanded level by level
+  along the heaviest edges until max_edges
+
+Building a view still aggregates the world's mentions, so the routes
+serve them through the response cache keyed on the world version; the
+mention extractor bumps it when it writes. to_columnar encodes a graph
+as parallel arrays with edges as node indexes, for the frontend renderer.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import String, and_, case, func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.models.tables import Agent, Conversation, EntityMention, Faction, KnowledgeEdge, WikiPage
+
+EGO_MAX_DEPTH = 3
+
+_LABELS = {
+    "agent": (Agent, Agent.name),
+    "faction": (Faction, Faction.name),
+    "wiki_page": (WikiPage, WikiPage.title),
+    "conversation": (Conversation, Conversation.topic),
+}
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    id: uuid.UUID
+    type: str
+    label: str
+
+
+@dataclass(frozen=True)
+class GraphEdge:
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    type: str  # "mention" | "knowledge"
+    weight: float
+    label: str | None = None  # knowledge edge predicate
+
+
+@dataclass
+class Graph:
+    nodes: list[GraphNode]
+    edges: list[GraphEdge]
+
+
+def _names(world_id: uuid.UUID, name: str):
+    """One (id, type, name) per distinct entity name in the world."""
+    candidates = union_all(
+        select(
+            Agent.id.label("id"), literal("agent").label("type"), Agent.name.label("name"), literal(0).label("priority"),
+        ).where(Agent.world_id == world_id),
+        select(Faction.id, literal("faction"), Faction.name, literal(1)).where(Faction.world_id == world_id),
+        select(WikiPage.id, literal("wiki_page"), WikiPage.title, literal(2)).where(WikiPage.world_id == world_id),
+    ).subquery(f"{name}_candidates")
+    ranked = select(
+        candidates.c.id,
+        candidates.c.type,
+        candidates.c.name,
+        func.row_number()
+        .over(partition_by=candidates.c.name, order_by=(candidates.c.priority, candidates.c.id))
+        .label("rank"),
+    ).subquery(f"{name}_ranked")
+    return select(ranked.c.id, ranked.c.type, ranked.c.name).where(ranked.c.rank == 1).subquery(name)
+
+
+def edges_subquery(world_id: uuid.UUID):
+    """Every edge of the world as (source_id, source_type, target_id, target_type, type, weight, label)."""
+    source_type = case((EntityMention.source_type == "wiki", "wiki_page"), else_=EntityMention.source_type)
+    mentions = (
+        select(
+            EntityMention.source_id.label("source_id"),
+            source_type.label("source_type"),
+            EntityMention.target_id.label("target_id"),
+            EntityMention.target_type.label("target_type"),
+            literal("mention").label("type"),
+            func.sum(func.coalesce(EntityMention.confidence, 1.0)).label("weight"),
+            literal(None, String).label("label"),
+        )
+        .where(EntityMention.world_id == world_id)
+        .group_by(EntityMention.source_id, source_type, EntityMention.target_id, EntityMention.target_type)
+    )
+    subject = _names(world_id, "subject_entity")
+    obj = _names(world_id, "object_entity")
+    knowledge = (
+        select(
+            subject.c.id,
+            subject.c.type,
+            obj.c.id,
+            obj.c.type,
+            literal("knowledge"),
+            func.coalesce(KnowledgeEdge.confidence, 0.5),
+            KnowledgeEdge.predicate,
+        )
+        .select_from(KnowledgeEdge)
+        .join(subject, subject.c.name == KnowledgeEdge.subject)
+        .join(obj, obj.c.name == KnowledgeEdge.object)
+        .where(KnowledgeEdge.world_id == world_id)
+    )
+    return union_all(mentions, knowledge).subquery("graph_edges")
+
+
+async def _labels(db: AsyncSession, types: dict[uuid.UUID, str]) -> dict[uuid.UUID, str]:
+    by_type: dict[str, list[uuid.UUID]] = {}
+    for node_id, node_type in types.items():
+        by_type.setdefault(node_type, []).append(node_id)
+    labels: dict[uuid.UUID, str] = {}
+    for node_type, ids in by_type.items():
+        if node_type not in _LABELS:
+            continue
+        model, column = _LABELS[node_type]
+        rows = (await db.execute(select(model.id, column).where(model.id.in_(ids)))).all()
+        labels.update({row[0]: row[1] or "" for row in rows})
+    return labels
+
+
+async def _graph(db: AsyncSession, rows: list, extra_nodes: dict[uuid.UUID, str] | None = None) -> Graph:
+    types = dict(extra_nodes or {})
+    edges = []
+    for row in rows:
+        types.setdefault(row.source_id, row.source_type)
+        types.setdefault(row.target_id, row.target_type)
+        edges.append(GraphEdge(row.source_id, row.target_id, row.type, float(row.weight or 0.0), row.label))
+    labels = await _labels(db, types)
+    nodes = [GraphNode(node_id, node_type, labels.get(node_id, node_type)) for node_id, node_type in types.items()]
+    return Graph(nodes, edges)
+
+
+async def top_edges(db: AsyncSession, world_id: uuid.UUID, *, max_edges: int) -> Graph:
+    edges = edges_subquery(world_id)
+    rows = (await db.execute(select(edges).order_by(edges.c.weight.desc()).limit(max_edges))).all()
+    return await _graph(db, rows)
+
+
+async def sampled_graph(
+    db: AsyncSession, world_id: uuid.UUID, *, max_nodes: int, max_edges: int, sample: str = "hubs",
+) -> Graph:
+    edges = edges_subquery(world_id)
+    endpoints = union_all(
+        select(edges.c.source_id.label("id"), edges.c.source_type.label("type"), edges.c.weight),
+        select(edges.c.target_id, edges.c.target_type, edges.c.weight),
+    ).subquery("endpoints")
+    order = func.random() if sample == "random" else func.sum(endpoints.c.weight).desc()
+    node_rows = (await db.execute(
+        select(endpoints.c.id, endpoints.c.type)
+        .group_by(endpoints.c.id, endpoints.c.type)
+        .order_by(order)
+        .limit(max_nodes)
+    )).all()
+    if not node_rows:
+        return Graph([], [])
+    ids = [row.id for row in node_rows]
+    rows = (await db.execute(
+        select(edges)
+        .where(edges.c.source_id.in_(ids), edges.c.target_id.in_(ids))
+        .order_by(edges.c.weight.desc())
+        .limit(max_edges)
+    )).all()
+    return await _graph(db, rows, {row.id: row.type for row in node_rows})
+
+
+async def ego_graph(
+    db: AsyncSession,
+    world_id: uuid.UUID,
+    entity_type: str,
+    entity_id: uuid.UUID,
+    *,
+    depth: int,
+    max_edges: int,
+) -> Graph:
+    """The entity and everything within depth hops, heaviest edges first."""
+    edges = edges_subquery(world_id)
+    rows: list = []
+    older: set[uuid.UUID] = set()
+    frontier = {entity_id}
+    for _ in range(min(depth, EGO_MAX_DEPTH)):
+        budget = max_edges - len(rows)
+        if budget <= 0 or not frontier:
+            break
+        outgoing = edges.c.source_id.in_(frontier)
+        incoming = edges.c.target_id.in_(frontier)
+        if older:
+            # Edges back to earlier levels were fetched when those were the frontier.
+            outgoing = and_(outgoing, edges.c.target_id.notin_(older))
+            incoming = and_(incoming, edges.c.source_id.notin_(older))
+        level = (await db.execute(
+            select(edges).where(or_(outgoing, incoming)).order_by(edges.c.weight.desc()).limit(budget)
+        )).all()
+        rows.extend(level)
+        older |= frontier
+        frontier = {node for row in level for node in (row.source_id, row.target_id)} - older
+    return await _graph(db, rows, {entity_id: entity_type})
+
+
+def to_columnar(graph: Graph) -> dict:
+    """Parallel arrays: node and edge types as indexes into vocabularies, edges as node indexes."""
+    index = {node.id: i for i, node in enumerate(graph.nodes)}
+    node_types = sorted({node.type for node in graph.nodes})
+    edge_types = sorted({edge.type for edge in graph.edges})
+    node_type_index = {value: i for i, value in enumerate(node_types)}
+    edge_type_index = {value: i for i, value in enumerate(edge_types)}
+    return {
+        "node_types": node_types,
+        "edge_types": edge_types,
+        "nodes": {
+            "id": [str(node.id) for node in graph.nodes],
+            "type": [node_type_index[node.type] for node in graph.nodes],
+            "label": [node.label for node in graph.nodes],
+        },
+        "edges": {
+            "source": [index[edge.source_id] for edge in graph.edges],
+            "target": [index[edge.target_id] for edge in graph.edges],
+            "type": [edge_type_index[edge.type] for edge in graph.edges],
+            "weight": [round(edge.weight, 4) for edge in graph.edges],
+            "label": [edge.label for edge in graph.edges],
+        },
+    }
@@ -0,0 +1,221 @@
+"""Background export jobs with versioned on-disk artifacts.
+
+POST /worlds/{id}/exports records an ExportJob and, in the same
+transaction, queues an export.build job (services/job_queue.py) that
+builds the requested formats on whichever worker claims it, so a restart
+resumes the build instead of stranding the row. Artifacts are written to
+export_artifact_dir/<world_id>/v<data_version>/<format>, where data_version
+comes from world_stats, so requesting the same format for an unchanged world
+reuses the file instead of re-running the export. Every write path that
+changes exported rows (conversations, relationships, translations,
+strata, knowledge edges, ...) bumps data_version through
+record_activity. Data written while a
+build is running may land in that version's artifact; the next bump moves
+later requests to a new file.
+
+The directory is kept under export_artifact_budget_bytes by evicting the
+least recently used artifacts (downloads refresh a file's mtime).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.db import async_session
+from null_engine.models.tables import ExportJob
+from null_engine.services.columnar_export import MEDIA_TYPES, TABLES, columnar_stream, pyarrow_available
+from null_engine.services.exporter import (
+    conversations_export,
+    full_export,
+    knowledge_graph_export,
+    parse_include,
+    training_export,
+)
+from null_engine.services.job_queue import enqueue_job, register_job
+from null_engine.services.world_stats import get_world_stats
+
+logger = structlog.get_logger()
+
+EXPORT_JOB = "export.build"
+
+
+@dataclass(frozen=True)
+class ArtifactFormat:
+    media_type: str
+    build: Callable[[uuid.UUID], AsyncIterator[bytes]]
+    available: Callable[[], bool] = lambda: True
+
+
+def _training(fmt: str) -> ArtifactFormat:
+    return ArtifactFormat(
+        "application/jsonl",
+        lambda world_id: training_export(world_id, fmt, parse_include("all")).encoded(),
+    )
+
+
+def _parquet(table: str) -> ArtifactFormat:
+    return ArtifactFormat(
+        MEDIA_TYPES["parquet"],
+        lambda world_id: columnar_stream(world_id, table, "parquet"),
+        pyarrow_available,
+    )
+
+
+ARTIFACT_FORMATS: dict[str, ArtifactFormat] = {
+    "all.jsonl": ArtifactFormat("application/jsonl", lambda world_id: full_export(world_id).encoded()),
+    "conversations.jsonl": ArtifactFormat(
+        "application/jsonl", lambda world_id: conversations_export(world_id, "jsonl").encoded()
+    ),
+    "conversations.json": ArtifactFormat(
+        "application/json", lambda world_id: conversations_export(world_id, "json").encoded()
+    ),
+    "training-chatml.jsonl": _training("chatml"),
+    "training-alpaca.jsonl": _training("alpaca"),
+    "training-sharegpt.jsonl": _training("sharegpt"),
+    "knowledge-graph.csv": ArtifactFormat("text/csv", lambda world_id: knowledge_graph_export(world_id, "csv").encoded()),
+    "knowledge-graph.json": ArtifactFormat(
+        "application/json", lambda world_id: knowledge_graph_export(world_id, "json").encoded()
+    ),
+    **{f"{table}.parquet": _parquet(table) for table in TABLES},
+}
+
+
+def artifact_path(world_id: uuid.UUID, data_version: int, fmt: str) -> Path:
+    return Path(settings.export_artifact_dir) / str(world_id) / f"v{data_version}" / fmt
+
+
+def _touch(path: Path) -> bool:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+async def create_export_job(db: AsyncSession, world_id: uuid.UUID, formats: list[str]) -> ExportJob:
+    """Record a job and queue its build; it is ready at once if every artifact already exists for this version."""
+    stats = await get_world_stats(db, world_id)
+    data_version = stats.data_version if stats else 0
+    formats = list(dict.fromkeys(formats))
+
+    job = ExportJob(world_id=world_id, formats=formats, data_version=data_version, status="queued")
+    reused = await asyncio.to_thread(
+        lambda: all(_touch(artifact_path(world_id, data_version, fmt)) for fmt in formats)
+    )
+    if reused:
+        job.status = "ready"
+        job.finished_at = datetime.utcnow()
+    db.add(job)
+    if not reused:
+        await db.flush()
+        await enqueue_job(EXPORT_JOB, {"job_id": str(job.id)}, dedupe_key=str(job.id), db=db)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def build_artifact(world_id: uuid.UUID, data_version: int, fmt: str) -> Path:
+    path = artifact_path(world_id, data_version, fmt)
+    if await asyncio.to_thread(_touch, path):
+        return path
+
+    await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    fh = await asyncio.to_thread(open, tmp, "wb")
+    try:
+        async for chunk in ARTIFACT_FORMATS[fmt].build(world_id):
+            await asyncio.to_thread(fh.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(fh.close)
+        await asyncio.to_thread(tmp.unlink, missing_ok=True)
+        raise
+    await asyncio.to_thread(fh.close)
+    # Readers only ever see complete files; concurrent builds of the same
+    # artifact just replace one another.
+    await asyncio.to_thread(os.replace, tmp, path)
+    return path
+
+
+async def run_export_job(payload: dict[str, Any]) -> None:
+    """export.build: build the job's artifacts; raises so the job queue retries with backoff."""
+    job_id = uuid.UUID(payload["job_id"])
+    async with async_session() as db:
+        result = await db.execute(select(ExportJob).where(ExportJob.id == job_id))
+        job = result.scalar_one_or_none()
+        if job is None or job.status in ("ready", "error"):
+            return
+        job.status = "running"
+        await db.commit()
+
+        # Artifacts finished by an earlier attempt are reused by build_artifact.
+        paths = [await build_artifact(job.world_id, job.data_version, fmt) for fmt in job.formats]
+        job.status = "ready"
+        job.finished_at = datetime.utcnow()
+        await db.commit()
+        logger.info("export_job.finished", job_id=str(job_id), status=job.status)
+
+    await asyncio.to_thread(evict_artifacts, keep=set(paths))
+
+
+async def _export_job_failed(payload: dict[str, Any], error: str) -> None:
+    logger.error("export_job.failed", job_id=payload.get("job_id"), error=error)
+    async with async_session() as db:
+        await db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == uuid.UUID(payload["job_id"]))
+            .values(status="error", error=error[:1000], finished_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+def evict_artifacts(budget_bytes: int | None = None, keep: set[Path] | None = None) -> int:
+    """Delete least recently used artifacts until the directory fits the budget.
+
+    Returns the number of bytes freed. In-progress (dot-prefixed) files and
+    the paths in keep are never removed.
+    """
+    budget = settings.export_artifact_budget_bytes if budget_bytes is None else budget_bytes
+    root = Path(settings.export_artifact_dir)
+    if not root.is_dir():
+        return 0
+
+    files = []
+    for path in root.rglob("*"):
+        if path.name.startswith(".") or not path.is_file():
+            continue
+        stat = path.stat()
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+
+    freed = 0
+    for _, size, path in sorted(files):
+        if total <= budget:
+            break
+        if keep and path in keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        freed += size
+        for parent in (path.parent, path.parent.parent):
+            try:
+                parent.rmdir()  # only succeeds once empty
+            except OSError:
+                break
+    if freed:
+        logger.info("export_artifacts.evicted", freed_bytes=freed, remaining_bytes=total)
+    return freed
+
+
+register_job(EXPORT_JOB, run_export_job, on_failure=_export_job_failed)
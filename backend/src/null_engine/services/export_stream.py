@@ -0,0 +1,165 @@
+"""Constant-memory building blocks for the /export endpoints.
+
+Rows come off a server-side cursor (AsyncSession.stream with yield_per) one
+batch at a time; each batch is JSON-encoded, and optionally compressed, in a
+worker thread so a large export never holds the whole world in memory or
+stalls the event loop.
+
+FastAPI closes yield dependencies before a StreamingResponse body is sent,
+so body generators open their own session instead of using get_db.
+
+Incremental exports select a half-open time window [since, until). until
+trails the clock by export_since_lag_seconds because rows are stamped when
+they are flushed, not when the tick that wrote them commits; the lag keeps
+a still-open tick's rows out of a window that has already been handed out.
+The next pull starts at until, so windows neither overlap nor leave gaps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+import zlib
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from null_engine.config import settings
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+_CURSOR_PREFIX = "v1:"
+
+
+def encode_cursor(watermark: datetime) -> str:
+    raw = (_CURSOR_PREFIX + watermark.isoformat()).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("malformed export cursor") from exc
+    if not raw.startswith(_CURSOR_PREFIX):
+        raise ValueError("malformed export cursor")
+    return datetime.fromisoformat(raw[len(_CURSOR_PREFIX):])
+
+
+@dataclass(frozen=True)
+class ExportWindow:
+    """Rows changed in [since, until); since=None means a full export of everything before until.
+
+    A full export is bounded by until too, so the cursor it hands out
+    (until) starts a window that doesn't repeat any row it already sent.
+    """
+
+    since: datetime | None
+    until: datetime
+
+    @classmethod
+    def starting_at(cls, since: datetime | None) -> ExportWindow:
+        until = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=settings.export_since_lag_seconds)
+        if since is not None and until < since:
+            until = since
+        return cls(since, until)
+
+    @property
+    def incremental(self) -> bool:
+        return self.since is not None
+
+    @property
+    def next_cursor(self) -> str:
+        return encode_cursor(self.until)
+
+    def bound(self, stmt: Select, column: InstrumentedAttribute) -> Select:
+        if self.since is None:
+            # Rows without a timestamp never enter a window; only a full export sends them.
+            return stmt.where(or_(column.is_(None), column < self.until))
+        return stmt.where(column >= self.since, column < self.until)
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def stream_batches(db: AsyncSession, stmt: Select, batch_size: int | None = None) -> AsyncIterator[list[Any]]:
+    """Yield ORM rows of stmt in batches without buffering the result set."""
+    size = batch_size or settings.export_batch_size
+    result = await db.stream(stmt.execution_options(yield_per=size))
+    async for batch in result.scalars().partitions(size):
+        yield batch
+
+
+class ChunkEncoder:
+    """Turns text into (optionally compressed) bytes, one batch at a time."""
+
+    def __init__(self, compression: str = "none"):
+        if compression == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif compression == "zstd":
+            import zstandard
+
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            self._compressor = None
+
+    def feed(self, text: str) -> bytes:
+        data = text.encode()
+        return self._compressor.compress(data) if self._compressor else data
+
+    def finish(self) -> bytes:
+        return self._compressor.flush() if self._compressor else b""
+
+
+def jsonl_lines(rows: Iterable[dict[str, Any]]) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+class JsonArrayRenderer:
+    """Renders successive batches as the comma-separated body of one JSON array."""
+
+    def __init__(self) -> None:
+        self._first = True
+
+    def __call__(self, rows: list[dict[str, Any]]) -> str:
+        body = ",".join(json.dumps(row, ensure_ascii=False) for row in rows)
+        if self._first:
+            self._first = False
+            return body
+        return "," + body
+
+
+async def encode_stream(
+    parts: AsyncIterator[list[dict[str, Any]] | str],
+    render: Callable[[list[dict[str, Any]]], str],
+    compression: str = "none",
+) -> AsyncIterator[bytes]:
+    """Encode an async stream of row batches (and literal str fragments) to bytes.
+
+    render turns one batch of plain dicts into text; it runs in a worker
+    thread together with compression, so it must not touch ORM objects.
+    """
+    encoder = ChunkEncoder(compression)
+    async for part in parts:
+        if isinstance(part, str):
+            chunk = encoder.feed(part)
+        elif part:
+            chunk = await asyncio.to_thread(lambda rows=part: encoder.feed(render(rows)))
+        else:
+            continue
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if tail:
+        yield tail
@@ -0,0 +1,397 @@
+"""Export bodies shared by the /export routes and background export jobs.
+
+Each *_export() function returns an ExportBody: an async stream of row
+batches (plus literal text fragments) and the renderer that turns a batch
+into text. The body reads through its own session (see export_stream), so
+it can be handed to a StreamingResponse or written to a file.
+
+Given an incremental ExportWindow, bodies only cover rows created (wiki
+pages: updated) inside it, and JSONL bodies end with tombstones for the
+wiki versions replaced in the window plus a {"type": "cursor"} record
+carrying the since= value for the next pull.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Literal
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, defer, load_only
+
+from null_engine.db import async_session
+from null_engine.models.tables import Agent, Conversation, KnowledgeEdge, WikiHistory, WikiPage, World
+from null_engine.services.export_stream import (
+    ExportWindow,
+    JsonArrayRenderer,
+    encode_stream,
+    jsonl_lines,
+    stream_batches,
+)
+
+TrainingFormat = Literal["chatml", "alpaca", "sharegpt"]
+
+
+@dataclass
+class ExportBody:
+    parts: AsyncIterator[list[dict[str, Any]] | str]
+    render: Callable[[list[dict[str, Any]]], str]
+    media_type: str
+
+    def encoded(self, compression: str = "none") -> AsyncIterator[bytes]:
+        return encode_stream(self.parts, self.render, compression)
+
+
+def parse_include(include: str) -> set[str]:
+    aliases = {
+        "conversation": "conversations",
+        "conversations": "conversations",
+        "wiki": "wiki",
+        "wikis": "wiki",
+        "kg": "kg",
+        "knowledgegraph": "kg",
+        "knowledge_graph": "kg",
+        "knowledge-graph": "kg",
+    }
+    include_set: set[str] = set()
+    for token in include.split(","):
+        normalized = token.strip().lower()
+        if not normalized:
+            continue
+        if normalized in {"all", "*", "default", "full"}:
+            return {"conversations", "wiki", "kg"}
+        if normalized in {"none", "null", "off"}:
+            return set()
+        canonical = aliases.get(normalized)
+        if canonical:
+            include_set.add(canonical)
+    return include_set
+
+
+def conversation_training_sample(conversation: Any, fmt: TrainingFormat) -> dict[str, Any] | None:
+    messages: list[dict[str, Any]] = conversation.messages or []
+    if not messages:
+        return None
+
+    if fmt == "chatml":
+        chatml_messages = [{"role": "system", "content": f"Topic: {conversation.topic}"}]
+        for message in messages:
+            agent_id = message.get("agent_id", "unknown")
+            content = message.get("content", "")
+            chatml_messages.append(
+                {"role": "user", "content": f"[{agent_id}]: {content}"}
+            )
+        if conversation.summary:
+            chatml_messages.append({"role": "assistant", "content": conversation.summary})
+        return {"messages": chatml_messages}
+
+    if fmt == "alpaca":
+        instruction = f"Continue the conversation about '{conversation.topic}'"
+        input_text = "\n".join(
+            f"{message.get('agent_id', '')}: {message.get('content', '')}"
+            for message in messages[:2]
+        )
+        output_text = "\n".join(
+            f"{message.get('agent_id', '')}: {message.get('content', '')}"
+            for message in messages[2:]
+        )
+        return {
+            "instruction": instruction,
+            "input": input_text,
+            "output": output_text or conversation.summary,
+        }
+
+    sharegpt_conversations = [
+        {"from": "human", "value": message.get("content", "")}
+        for message in messages
+    ]
+    if conversation.summary:
+        sharegpt_conversations.append({"from": "gpt", "value": conversation.summary})
+    return {"conversations": sharegpt_conversations}
+
+
+def wiki_training_sample(page: Any, fmt: TrainingFormat) -> dict[str, Any]:
+    if fmt == "chatml":
+        return {
+            "messages": [
+                {"role": "system", "content": "You are a world-building wiki author."},
+                {"role": "user", "content": f"Write a wiki article about: {page.title}"},
+                {"role": "assistant", "content": page.content},
+            ]
+        }
+    if fmt == "alpaca":
+        return {
+            "instruction": f"Write a wiki article about: {page.title}",
+            "input": "",
+            "output": page.content,
+        }
+    return {
+        "conversations": [
+            {"from": "human", "value": f"Write about {page.title}"},
+            {"from": "gpt", "value": page.content},
+        ]
+    }
+
+
+def knowledge_graph_training_sample(
+    edges: list[Any], fmt: TrainingFormat
+) -> dict[str, Any] | None:
+    if not edges:
+        return None
+
+    triples = [f"{edge.subject} {edge.predicate} {edge.object}" for edge in edges]
+    triple_text = "\n".join(triples)
+
+    if fmt == "chatml":
+        return {
+            "messages": [
+                {"role": "system", "content": "Extract knowledge triples."},
+                {"role": "assistant", "content": triple_text},
+            ]
+        }
+    if fmt == "alpaca":
+        return {
+            "instruction": "List knowledge graph triples.",
+            "input": "",
+            "output": triple_text,
+        }
+    return {
+        "conversations": [
+            {"from": "human", "value": "What are the key relationships?"},
+            {"from": "gpt", "value": triple_text},
+        ]
+    }
+
+
+def _conversation_row(c: Conversation) -> dict[str, Any]:
+    return {
+        "id": str(c.id),
+        "epoch": c.epoch,
+        "tick": c.tick,
+        "topic": c.topic,
+        "participants": c.participants,
+        "messages": c.messages,
+        "summary": c.summary,
+        "created_at": c.created_at.isoformat() if c.created_at else None,
+    }
+
+
+def _conversation_jsonl_row(c: Conversation) -> dict[str, Any]:
+    return {
+        "type": "conversation",
+        "id": str(c.id),
+        "epoch": c.epoch,
+        "tick": c.tick,
+        "topic": c.topic,
+        "participants": c.participants,
+        "messages": c.messages,
+        "summary": c.summary,
+    }
+
+
+def _csv_field(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _knowledge_graph_csv(rows: list[dict[str, Any]]) -> str:
+    return "".join(
+        f"{_csv_field(r['subject'])},{_csv_field(r['predicate'])},{_csv_field(r['object'])},{r['confidence']}\n"
+        for r in rows
+    )
+
+
+def _knowledge_edge_row(e: KnowledgeEdge) -> dict[str, Any]:
+    return {
+        "subject": e.subject,
+        "predicate": e.predicate,
+        "object": e.object,
+        "confidence": e.confidence,
+    }
+
+
+def _bound(stmt: Select, column: InstrumentedAttribute, window: ExportWindow | None) -> Select:
+    return window.bound(stmt, column) if window else stmt
+
+
+async def _incremental_trailer(
+    db: AsyncSession, world_id: uuid.UUID, window: ExportWindow | None
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Tombstones for wiki versions replaced in the window, then the next cursor."""
+    if not window or not window.incremental:
+        return
+    stmt = window.bound(
+        select(WikiHistory)
+        .options(load_only(WikiHistory.page_id, WikiHistory.version, WikiHistory.created_at))
+        .join(WikiPage, WikiPage.id == WikiHistory.page_id)
+        .where(WikiPage.world_id == world_id)
+        .order_by(WikiHistory.created_at),
+        WikiHistory.created_at,
+    )
+    async for batch in stream_batches(db, stmt):
+        yield [{
+            "type": "tombstone",
+            "entity": "wiki_page",
+            "id": str(h.page_id),
+            "version": h.version,
+            "replaced_at": h.created_at.isoformat() if h.created_at else None,
+        } for h in batch]
+    yield [{"type": "cursor", "next": window.next_cursor}]
+
+
+def _world_rows(
+    stmt: Select,
+    to_row: Callable[[Any], dict[str, Any]],
+    trailer: tuple[uuid.UUID, ExportWindow | None] | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    async def _rows():
+        async with async_session() as db:
+            async for batch in stream_batches(db, stmt):
+                yield [to_row(item) for item in batch]
+            if trailer:
+                async for batch in _incremental_trailer(db, *trailer):
+                    yield batch
+
+    return _rows()
+
+
+def _json_array(rows: AsyncIterator[list[dict[str, Any]]]) -> ExportBody:
+    async def _parts():
+        yield "["
+        async for batch in rows:
+            yield batch
+        yield "]"
+
+    return ExportBody(_parts(), JsonArrayRenderer(), "application/json")
+
+
+def _conversations_query(world_id: uuid.UUID, window: ExportWindow | None) -> Select:
+    stmt = (
+        select(Conversation)
+        .options(defer(Conversation.embedding))
+        .where(Conversation.world_id == world_id)
+        .order_by(Conversation.created_at)
+    )
+    return _bound(stmt, Conversation.created_at, window)
+
+
+def _wiki_query(world_id: uuid.UUID, window: ExportWindow | None) -> Select:
+    stmt = select(WikiPage).options(defer(WikiPage.embedding)).where(WikiPage.world_id == world_id)
+    return _bound(stmt, WikiPage.updated_at, window)
+
+
+def _knowledge_edges_query(world_id: uuid.UUID, window: ExportWindow | None) -> Select:
+    stmt = select(KnowledgeEdge).where(KnowledgeEdge.world_id == world_id)
+    # updated_at: corroborating an existing triple changes its confidence.
+    return _bound(stmt, KnowledgeEdge.updated_at, window)
+
+
+def conversations_export(
+    world_id: uuid.UUID, format: str = "jsonl", window: ExportWindow | None = None
+) -> ExportBody:
+    stmt = _conversations_query(world_id, window)
+    if format == "jsonl":
+        rows = _world_rows(stmt, _conversation_jsonl_row, trailer=(world_id, window))
+        return ExportBody(rows, jsonl_lines, "application/jsonl")
+    return _json_array(_world_rows(stmt, _conversation_row))
+
+
+def training_export(
+    world_id: uuid.UUID, format: TrainingFormat, include_set: set[str], window: ExportWindow | None = None
+) -> ExportBody:
+    async def _samples():
+        async with async_session() as db:
+            if "conversations" in include_set:
+                async for batch in stream_batches(db, _conversations_query(world_id, window)):
+                    yield [
+                        sample
+                        for sample in (conversation_training_sample(c, format) for c in batch)
+                        if sample
+                    ]
+
+            if "wiki" in include_set:
+                async for batch in stream_batches(db, _wiki_query(world_id, window)):
+                    yield [wiki_training_sample(p, format) for p in batch]
+
+            if "kg" in include_set:
+                # The graph is one sample; only the triples are kept, not the rows.
+                edges: list[SimpleNamespace] = []
+                async for batch in stream_batches(db, _knowledge_edges_query(world_id, window)):
+                    edges.extend(SimpleNamespace(subject=e.subject, predicate=e.predicate, object=e.object) for e in batch)
+                kg_sample = knowledge_graph_training_sample(edges, format)
+                if kg_sample:
+                    yield [kg_sample]
+
+            async for batch in _incremental_trailer(db, world_id, window):
+                yield batch
+
+    return ExportBody(_samples(), jsonl_lines, "application/jsonl")
+
+
+def knowledge_graph_export(
+    world_id: uuid.UUID, format: str = "json", window: ExportWindow | None = None
+) -> ExportBody:
+    stmt = _knowledge_edges_query(world_id, window)
+    if format == "csv":
+        async def _csv():
+            yield "subject,predicate,object,confidence\n"
+            async for rows in _world_rows(stmt, _knowledge_edge_row):
+                yield rows
+
+        return ExportBody(_csv(), _knowledge_graph_csv, "text/csv")
+    return _json_array(_world_rows(stmt, _knowledge_edge_row))
+
+
+def full_export(world_id: uuid.UUID, window: ExportWindow | None = None) -> ExportBody:
+    async def _records():
+        async with async_session() as db:
+            result = await db.execute(select(World).where(World.id == world_id))
+            world = result.scalar_one_or_none()
+            if world:
+                yield [{
+                    "type": "world",
+                    "id": str(world.id),
+                    "seed_prompt": world.seed_prompt,
+                    "config": world.config,
+                    "status": world.status,
+                }]
+
+            stmt = select(Agent).options(defer(Agent.embedding)).where(Agent.world_id == world_id)
+            async for batch in stream_batches(db, _bound(stmt, Agent.created_at, window)):
+                yield [{
+                    "type": "agent",
+                    "id": str(a.id),
+                    "name": a.name,
+                    "persona": a.persona,
+                    "beliefs": a.beliefs,
+                } for a in batch]
+
+            async for batch in stream_batches(db, _wiki_query(world_id, window)):
+                yield [{
+                    "type": "wiki_page",
+                    "id": str(p.id),
+                    "title": p.title,
+                    "content": p.content,
+                    "status": p.status,
+                } for p in batch]
+
+            async for batch in stream_batches(db, _conversations_query(world_id, window)):
+                yield [{
+                    "type": "conversation",
+                    "id": str(c.id),
+                    "epoch": c.epoch,
+                    "topic": c.topic,
+                    "messages": c.messages,
+                    "summary": c.summary,
+                } for c in batch]
+
+            async for batch in stream_batches(db, _knowledge_edges_query(world_id, window)):
+                yield [{"type": "knowledge_edge", **_knowledge_edge_row(e)} for e in batch]
+
+            async for batch in _incremental_trailer(db, world_id, window):
+                yield batch
+
+    return ExportBody(_records(), jsonl_lines, "application/jsonl")
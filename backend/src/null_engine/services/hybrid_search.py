@@ -0,0 +1,236 @@
+"""Hybrid (full-text + vector) search with reciprocal-rank fusion.
+
+The query is embedded once (embeddings.get_query_embedding caches it)
+while the full-text candidates are fetched; then the nearest wiki pages,
+conversations and strata by cosine distance come from the HNSW indexes
+(0009_vector_ann_indexes). Each list contributes its top
+search_candidates hits, and a hit's fused score is the sum over the lists
+it appears in of 1 / (search_rrf_k + rank). Rank fusion needs no score
+calibration between ts_rank and cosine distance.
+
+With world_id, HNSW results are filtered after the index scan, so a small
+world in a large table can get fewer than search_candidates vector hits;
+raise search_hnsw_ef_search to trade latency for recall. When no
+embedding is available (provider down, JSON fallback schema) results are
+full-text only and `semantic` is false.
+
+Pages are addressed with an opaque cursor holding the last hit's
+(score, type, id), so paging through a stable result set never repeats
+or skips a hit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.db import pgvector_enabled
+from null_engine.models.tables import Conversation, Stratum, WikiPage
+from null_engine.services.embeddings import get_query_embedding
+from null_engine.services.text_search import SEARCH_KINDS, search
+
+HYBRID_KINDS = ("wiki_page", "conversation", "stratum", "agent")
+_SNIPPET_CHARS = 200
+
+
+@dataclass
+class HybridHit:
+    entity_type: str
+    entity_id: uuid.UUID
+    world_id: uuid.UUID
+    title: str
+    snippet: str
+    highlight: str = ""
+    score: float = 0.0
+    text_rank: int | None = None
+    vector_rank: int | None = None
+    distance: float | None = None
+
+    @property
+    def sort_key(self) -> tuple[float, str, str]:
+        return (-self.score, self.entity_type, str(self.entity_id))
+
+
+@dataclass
+class HybridPage:
+    hits: list[HybridHit]
+    next_cursor: str | None
+    semantic: bool
+    embedding_cached: bool = False
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def server_timing(self) -> str:
+        """Stage timings as a Server-Timing header value (shown in browser devtools)."""
+        return ", ".join(f"{name.removesuffix('_ms')};dur={value}" for name, value in self.timings_ms.items())
+
+
+def encode_cursor(hit: HybridHit) -> str:
+    raw = json.dumps([hit.score, hit.entity_type, str(hit.entity_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str, str]:
+    """The sort key of the last hit on the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, entity_type, entity_id = json.loads(raw)
+        return (-float(score), str(entity_type), str(uuid.UUID(entity_id)))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError("malformed search cursor") from exc
+
+
+def _ann_query(
+    kind: str,
+    model: Any,
+    title: ColumnElement,
+    body: ColumnElement,
+    vector: list[float],
+    world_id: uuid.UUID | None,
+    limit: int,
+) -> Select:
+    distance = model.embedding.cosine_distance(vector)
+    stmt = select(
+        literal(kind).label("entity_type"),
+        model.id,
+        model.world_id,
+        title.label("title"),
+        func.left(func.coalesce(body, ""), _SNIPPET_CHARS).label("snippet"),
+        distance.label("distance"),
+    ).where(model.embedding.isnot(None))
+    if world_id is not None:
+        stmt = stmt.where(model.world_id == world_id)
+    return stmt.order_by(distance).limit(limit)
+
+
+def ann_queries(vector: list[float], world_id: uuid.UUID | None, limit: int, kinds: tuple[str, ...]) -> list[Select]:
+    queries = []
+    if "wiki_page" in kinds:
+        queries.append(_ann_query("wiki_page", WikiPage, WikiPage.title, WikiPage.content, vector, world_id, limit))
+    if "conversation" in kinds:
+        queries.append(
+            _ann_query("conversation", Conversation, Conversation.topic, Conversation.summary, vector, world_id, limit)
+        )
+    if "stratum" in kinds:
+        title = func.concat("Epoch ", Stratum.epoch)
+        queries.append(_ann_query("stratum", Stratum, title, Stratum.summary, vector, world_id, limit))
+    return queries
+
+
+async def _vector_hits(
+    db: AsyncSession, vector: list[float], world_id: uuid.UUID | None, limit: int, kinds: tuple[str, ...]
+) -> list[HybridHit]:
+    # The queue must hold at least `limit` candidates; SET LOCAL lasts until
+    # the session's transaction ends.
+    ef_search = max(settings.search_hnsw_ef_search, limit)
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    hits: list[HybridHit] = []
+    for stmt in ann_queries(vector, world_id, limit, kinds):
+        result = await db.execute(stmt)
+        hits.extend(
+            HybridHit(
+                entity_type=row.entity_type,
+                entity_id=row.id,
+                world_id=row.world_id,
+                title=row.title or "",
+                snippet=row.snippet or "",
+                distance=float(row.distance),
+            )
+            for row in result.all()
+        )
+    # One embedding model for every table, so distances compare across kinds.
+    hits.sort(key=lambda hit: (hit.distance, hit.entity_type, str(hit.entity_id)))
+    return hits[:limit]
+
+
+def fuse(text_hits: list[HybridHit], vector_hits: list[HybridHit], k: int | None = None) -> list[HybridHit]:
+    """Reciprocal-rank fusion of two ranked lists, best first."""
+    k = settings.search_rrf_k if k is None else k
+    fused: dict[tuple[str, uuid.UUID], HybridHit] = {}
+    for rank, hit in enumerate(text_hits, start=1):
+        entry = fused.setdefault((hit.entity_type, hit.entity_id), hit)
+        entry.text_rank = rank
+        entry.score += 1.0 / (k + rank)
+    for rank, hit in enumerate(vector_hits, start=1):
+        entry = fused.get((hit.entity_type, hit.entity_id))
+        if entry is None:
+            entry = fused[(hit.entity_type, hit.entity_id)] = hit
+        entry.vector_rank = rank
+        entry.distance = hit.distance
+        entry.score += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda hit: hit.sort_key)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def hybrid_search(
+    db: AsyncSession,
+    q: str,
+    *,
+    world_id: uuid.UUID | None = None,
+    kinds: tuple[str, ...] = HYBRID_KINDS,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> HybridPage:
+    """One page of fused results. Raises ValueError for a malformed cursor."""
+    after = decode_cursor(cursor) if cursor else None
+    candidates = settings.search_candidates
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def _embed() -> tuple[list[float] | None, bool]:
+        stage = time.perf_counter()
+        embedded = await get_query_embedding(q)
+        timings["embed_ms"] = _elapsed_ms(stage)
+        return embedded
+
+    async def _text() -> list[HybridHit]:
+        stage = time.perf_counter()
+        text_kinds = tuple(kind for kind in kinds if kind in SEARCH_KINDS)
+        hits = await search(db, q, world_id=world_id, kinds=text_kinds, limit=candidates) if text_kinds else []
+        timings["text_ms"] = _elapsed_ms(stage)
+        return [
+            HybridHit(
+                entity_type=hit.entity_type,
+                entity_id=hit.entity_id,
+                world_id=hit.world_id,
+                title=hit.title,
+                snippet=hit.snippet,
+                highlight=hit.highlight,
+            )
+            for hit in hits
+        ]
+
+    # The embedding call is network-bound and doesn't touch the session, so
+    # it overlaps the full-text queries.
+    (vector, embedding_cached), text_hits = await asyncio.gather(_embed(), _text())
+
+    vector_hits: list[HybridHit] = []
+    semantic = vector is not None and pgvector_enabled()
+    if semantic:
+        stage = time.perf_counter()
+        vector_hits = await _vector_hits(db, vector, world_id, candidates, kinds)
+        timings["vector_ms"] = _elapsed_ms(stage)
+
+    stage = time.perf_counter()
+    ranked = fuse(text_hits, vector_hits)
+    if after is not None:
+        ranked = [hit for hit in ranked if hit.sort_key > after]
+    page = ranked[:limit]
+    timings["fuse_ms"] = _elapsed_ms(stage)
+    timings["total_ms"] = _elapsed_ms(started)
+
+    next_cursor = encode_cursor(page[-1]) if len(ranked) > limit else None
+    return HybridPage(page, next_cursor, semantic, embedding_cached, timings)
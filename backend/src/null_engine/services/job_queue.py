@@ -0,0 +1,439 @@
+"""Durable job queue shared by every worker process.
+
+Background services register a handler per job kind; producers enqueue
+rows in the jobs table and job_worker_loop, running in every worker,
+claims them with FOR UPDATE SKIP LOCKED, so each job runs exactly once
+however many workers there are and more workers mean more throughput.
+
+- leases: a claimed job is held for job_lease_seconds and renewed while
+  its handler runs; if the worker dies the lease lapses and another
+  worker picks the job up again
+- retries: a handler that raises is retried with exponential backoff
+  until max_attempts, then the job is marked failed
+- dedupe: at most one queued or running job per (kind, dedupe_key)
+- max_running caps a kind's running jobs cluster-wide; claimers of such a
+  kind serialize on an advisory lock while counting
+- on_failure runs once a job has used up its attempts
+- handlers of multi-step jobs record finished steps with mark_step_done;
+  they land in the job's payload["done"], so a retried attempt is claimed
+  with them and can skip that work
+- periodic kinds keep one pending job that re-enqueues itself
+  repeat_seconds after each run, replacing the per-process sleep loops
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import uuid
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import and_, cast, delete, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.db import async_session
+from null_engine.models.tables import Job
+
+logger = structlog.get_logger()
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+FailureHandler = Callable[[dict[str, Any], str], Awaitable[None]]
+
+# Modules whose import registers job handlers.
+JOB_MODULES = (
+    "null_engine.core.epoch_pipeline",
+    "null_engine.core.genesis",
+    "null_engine.core.warm_pool",
+    "null_engine.services.convergence",
+    "null_engine.services.corpus_builder",
+    "null_engine.services.embedding_pipeline",
+    "null_engine.services.export_jobs",
+    "null_engine.services.knowledge_graph",
+    "null_engine.services.semantic_indexer",
+    "null_engine.services.taxonomy_builder",
+    "null_engine.services.translator",
+)
+PERIODIC_DEDUPE_KEY = "periodic"
+#: Identifies this process as a job lease holder.
+INSTANCE_ID = uuid.uuid4().hex
+_ERROR_CHARS = 2000
+_PENDING_PREDICATE = "status IN ('queued', 'running')"
+
+
+@dataclass(frozen=True)
+class JobKind:
+    handler: JobHandler
+    every_seconds: int | None = None
+    max_attempts: int | None = None
+    max_running: int | None = None
+    on_failure: FailureHandler | None = None
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: uuid.UUID
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    repeat_seconds: int | None
+
+
+_kinds: dict[str, JobKind] = {}
+_wakeup = asyncio.Event()
+# The job whose handler is running in this task (and the tasks it spawns).
+_current_job: ContextVar[ClaimedJob | None] = ContextVar("current_job", default=None)
+
+
+def register_job(
+    kind: str,
+    handler: JobHandler,
+    *,
+    every_seconds: int | None = None,
+    max_attempts: int | None = None,
+    max_running: int | None = None,
+    on_failure: FailureHandler | None = None,
+) -> None:
+    """Register the handler for a job kind; every_seconds makes it periodic."""
+    _kinds[kind] = JobKind(handler, every_seconds, max_attempts, max_running, on_failure)
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_kinds)
+
+
+def backoff_seconds(attempts: int) -> float:
+    return min(settings.job_backoff_max_seconds, settings.job_backoff_seconds * 2 ** max(0, attempts - 1))
+
+
+def _insert(
+    kind: str,
+    payload: dict[str, Any] | None,
+    *,
+    dedupe_key: str | None,
+    run_after: datetime,
+    priority: int,
+    repeat_seconds: int | None,
+):
+    spec = _kinds.get(kind)
+    max_attempts = spec.max_attempts if spec and spec.max_attempts else settings.job_max_attempts
+    return (
+        pg_insert(Job)
+        .values(
+            id=uuid.uuid4(),
+            kind=kind,
+            dedupe_key=dedupe_key,
+            payload=payload or {},
+            priority=priority,
+            max_attempts=max_attempts,
+            repeat_seconds=repeat_seconds,
+            run_after=run_after,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Job.kind, Job.dedupe_key],
+            # Literal, so Postgres can match it to the partial unique index.
+            index_where=text(_PENDING_PREDICATE),
+        )
+        .returning(Job.id)
+    )
+
+
+async def enqueue_job(
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    dedupe_key: str | None = None,
+    delay_seconds: float = 0,
+    priority: int = 0,
+    repeat_seconds: int | None = None,
+    db: AsyncSession | None = None,
+) -> bool:
+    """Queue a job; False if a pending job with the same dedupe_key exists.
+
+    With db the row is added in the caller's transaction (so it is only
+    visible once that commits); otherwise it is committed right away.
+    """
+    stmt = _insert(
+        kind,
+        payload,
+        dedupe_key=dedupe_key,
+        run_after=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        priority=priority,
+        repeat_seconds=repeat_seconds,
+    )
+    if db is not None:
+        inserted = (await db.execute(stmt)).first() is not None
+    else:
+        async with async_session() as session:
+            inserted = (await session.execute(stmt)).first() is not None
+            await session.commit()
+    if inserted:
+        _wakeup.set()
+    return inserted
+
+
+async def schedule_periodic_jobs() -> None:
+    """Make sure every periodic kind has its pending job (a no-op when it does)."""
+    for kind, spec in _kinds.items():
+        if spec.every_seconds:
+            await enqueue_job(
+                kind,
+                dedupe_key=PERIODIC_DEDUPE_KEY,
+                delay_seconds=spec.every_seconds,
+                repeat_seconds=spec.every_seconds,
+            )
+
+
+def claim_statement(kinds: list[str], limit: int, now: datetime):
+    claimable = (
+        select(Job.id)
+        .where(Job.kind.in_(kinds))
+        .where(or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            # The previous holder died; its lease ran out.
+            and_(Job.status == "running", Job.lease_expires_at < now),
+        ))
+        .order_by(Job.priority, Job.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Job)
+        .where(Job.id.in_(claimable.scalar_subquery()))
+        .values(
+            status="running",
+            lease_owner=INSTANCE_ID,
+            lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds),
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts, Job.repeat_seconds)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _claim_capped(db: AsyncSession, kind: str, max_running: int, limit: int, now: datetime) -> list:
+    """Claim up to limit jobs of a kind without exceeding max_running cluster-wide."""
+    # Held until commit, so concurrent claimers count one after another.
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"jobs:{kind}"))))
+    running = (await db.execute(
+        select(func.count()).select_from(Job).where(
+            Job.kind == kind, Job.status == "running", Job.lease_expires_at >= now
+        )
+    )).scalar() or 0
+    room = min(limit, max_running - running)
+    if room <= 0:
+        return []
+    return list((await db.execute(claim_statement([kind], room, now))).all())
+
+
+async def claim_jobs(kinds: list[str], limit: int) -> list[ClaimedJob]:
+    if not kinds or limit <= 0:
+        return []
+    now = datetime.utcnow()
+    capped = {kind: _kinds[kind].max_running for kind in kinds if kind in _kinds and _kinds[kind].max_running}
+    uncapped = [kind for kind in kinds if kind not in capped]
+    async with async_session() as db:
+        rows = list((await db.execute(claim_statement(uncapped, limit, now))).all()) if uncapped else []
+        for kind, max_running in capped.items():
+            if len(rows) >= limit:
+                break
+            rows.extend(await _claim_capped(db, kind, max_running, limit - len(rows), now))
+        await db.commit()
+    return [
+        ClaimedJob(
+            id=row.id,
+            kind=row.kind,
+            payload=row.payload or {},
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+            repeat_seconds=row.repeat_seconds,
+        )
+        for row in rows
+    ]
+
+
+def _ours(job: ClaimedJob):
+    return and_(Job.id == job.id, Job.lease_owner == INSTANCE_ID, Job.status == "running")
+
+
+async def _renew_lease(job: ClaimedJob) -> None:
+    async with async_session() as db:
+        await db.execute(
+            update(Job)
+            .where(_ours(job))
+            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=settings.job_lease_seconds))
+        )
+        await db.commit()
+
+
+async def _finish(job: ClaimedJob, status: str, error: str | None = None) -> None:
+    """Close the job; a periodic job's next run is queued in the same transaction."""
+    now = datetime.utcnow()
+    async with async_session() as db:
+        await db.execute(
+            update(Job)
+            .where(_ours(job))
+            .values(status=status, finished_at=now, lease_owner=None, lease_expires_at=None, last_error=error)
+        )
+        if job.repeat_seconds:
+            await db.execute(_insert(
+                job.kind,
+                job.payload,
+                dedupe_key=PERIODIC_DEDUPE_KEY,
+                run_after=now + timedelta(seconds=job.repeat_seconds),
+                priority=0,
+                repeat_seconds=job.repeat_seconds,
+            ))
+        await db.commit()
+
+
+async def _retry(job: ClaimedJob, error: str) -> None:
+    async with async_session() as db:
+        await db.execute(
+            update(Job)
+            .where(_ours(job))
+            .values(
+                status="queued",
+                run_after=datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts)),
+                lease_owner=None,
+                lease_expires_at=None,
+                last_error=error,
+            )
+        )
+        await db.commit()
+
+
+async def _release(job: ClaimedJob) -> None:
+    """Hand an interrupted job back without counting the attempt (shutdown)."""
+    async with async_session() as db:
+        await db.execute(
+            update(Job)
+            .where(_ours(job))
+            .values(status="queued", attempts=Job.attempts - 1, lease_owner=None, lease_expires_at=None)
+        )
+        await db.commit()
+
+
+async def mark_step_done(step: str) -> None:
+    """Record in the running job's payload["done"] that step has finished.
+
+    Safe to call from concurrent steps of one job: each UPDATE merges its
+    own key. Outside a job handler it does nothing.
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+    done = func.coalesce(Job.payload["done"], cast({}, JSONB)).concat(cast({step: True}, JSONB))
+    async with async_session() as db:
+        await db.execute(update(Job).where(_ours(job)).values(payload=func.jsonb_set(Job.payload, array(["done"]), done)))
+        await db.commit()
+
+
+async def run_job(job: ClaimedJob) -> None:
+    spec = _kinds.get(job.kind)
+    if spec is None:
+        await _retry(job, f"no handler for job kind {job.kind!r} in this worker")
+        return
+    if job.attempts > job.max_attempts:
+        # Reclaimed after its lease lapsed once too often.
+        await _finish(job, "failed", "lease expired on every attempt")
+        if spec.on_failure is not None:
+            await spec.on_failure(job.payload, "lease expired on every attempt")
+        return
+
+    async def _heartbeat() -> None:
+        while True:
+            await asyncio.sleep(settings.job_lease_seconds / 3)
+            await _renew_lease(job)
+
+    heartbeat = asyncio.create_task(_heartbeat())
+    token = _current_job.set(job)
+    try:
+        await spec.handler(job.payload)
+    except asyncio.CancelledError:
+        await asyncio.shield(_release(job))
+        raise
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"[:_ERROR_CHARS]
+        if job.attempts >= job.max_attempts:
+            logger.exception("job_queue.job_failed", kind=job.kind, job_id=str(job.id), attempts=job.attempts)
+            await _finish(job, "failed", error)
+            if spec.on_failure is not None:
+                await spec.on_failure(job.payload, error)
+        else:
+            logger.warning("job_queue.job_retry", kind=job.kind, job_id=str(job.id), attempts=job.attempts, error=error)
+            await _retry(job, error)
+        return
+    finally:
+        _current_job.reset(token)
+        heartbeat.cancel()
+    await _finish(job, "done")
+
+
+async def pending_job_count(kind: str) -> int:
+    async with async_session() as db:
+        result = await db.execute(
+            select(func.count()).select_from(Job).where(Job.kind == kind, Job.status.in_(("queued", "running")))
+        )
+        return int(result.scalar() or 0)
+
+
+async def _prune_jobs(_payload: dict[str, Any]) -> None:
+    cutoff = datetime.utcnow() - timedelta(hours=settings.job_retention_hours)
+    async with async_session() as db:
+        result = await db.execute(
+            delete(Job).where(Job.status.in_(("done", "failed")), Job.finished_at < cutoff)
+        )
+        await db.commit()
+    logger.info("job_queue.pruned", deleted=result.rowcount)
+
+
+register_job("jobs.prune", _prune_jobs, every_seconds=3600)
+
+
+def load_job_handlers() -> None:
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+
+
+async def job_worker_loop() -> None:
+    """Claim and run jobs of every registered kind, job_worker_concurrency at a time."""
+    load_job_handlers()
+    await schedule_periodic_jobs()
+    logger.info("job_queue.worker_started", instance=INSTANCE_ID, kinds=registered_kinds())
+
+    running: set[asyncio.Task] = set()
+
+    def _job_done(task: asyncio.Task) -> None:
+        running.discard(task)
+        _wakeup.set()
+
+    try:
+        while True:
+            _wakeup.clear()
+            free = settings.job_worker_concurrency - len(running)
+            jobs = await claim_jobs(registered_kinds(), free)
+            for job in jobs:
+                task = asyncio.create_task(run_job(job))
+                running.add(task)
+                task.add_done_callback(_job_done)
+            if jobs and len(running) < settings.job_worker_concurrency:
+                continue
+            # A finished job or one enqueued by this process wakes the loop
+            # at once; other workers' jobs are found by polling.
+            try:
+                await asyncio.wait_for(_wakeup.wait(), settings.job_poll_seconds)
+            except TimeoutError:
+                pass
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
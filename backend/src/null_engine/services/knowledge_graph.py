@@ -0,0 +1,308 @@
+"""Knowledge graph builder — fills knowledge_edges from wiki pages and conversations.
+
+A periodic kg.build job reads, per world, only the documents that changed
+since that world's watermark for their source (knowledge_watermarks):
+
+- wiki pages created, or whose content changed (a wiki_history row was
+  written), after the wiki_page watermark
+- conversations created after the conversation watermark
+
+Documents are sent kg_batch_documents at a time (and at most
+kg_batch_chars of text) in one LLM call that returns (subject, predicate,
+object) triples. Subjects and objects naming a known agent, faction or
+wiki page are rewritten to that entity's exact name, so one entity gets
+one node. Each batch is written with a single INSERT ... ON CONFLICT that
+merges confidence into existing triples (corroborating only from sources
+not yet recorded on the edge), and advances the watermarks in
+the same transaction, so an interrupted run resumes after the last
+committed batch.
+
+Only rows written at least kg_settle_seconds ago are read, so a
+transaction that committed late can't slip behind the watermark. A
+watermark is a (changed_at, id) keyset position, so documents sharing a
+timestamp that a limit cut off are read on the next run, not skipped.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import case, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.db import async_session
+from null_engine.models.tables import Conversation, KnowledgeEdge, KnowledgeWatermark, WikiHistory, WikiPage, World
+from null_engine.services.job_queue import register_job
+from null_engine.services.llm_router import llm_router
+from null_engine.services.mention_extractor import MentionIndex, _normalize, get_mention_index
+from null_engine.services.response_cache import bump_world_version
+from null_engine.services.world_stats import record_activity
+
+logger = structlog.get_logger()
+
+KG_JOB = "kg.build"
+SOURCES = ("wiki_page", "conversation")
+# Well under the btree row limit for uq_knowledge_edges_triple.
+ENTITY_CHARS = 200
+PREDICATE_CHARS = 100
+TRIPLES_PER_DOCUMENT = 8
+# Known entity names listed in the prompt.
+PROMPT_ENTITIES = 150
+
+KG_PROMPT = """Extract knowledge-graph facts from these documents about a simulated world.
+
+Known entities (use these exact names when a fact is about one of them):
+{entities}
+
+Documents:
+{documents}
+
+Return up to {per_document} facts per document, only ones the document states.
+Predicates are short snake_case verbs such as leads, member_of, allied_with,
+opposes, believes, located_in, caused.
+
+Respond with JSON:
+{{"triples": [{{"doc": 1, "subject": "...", "predicate": "...", "object": "...", "confidence": 0.0-1.0}}]}}"""
+
+
+@dataclass(frozen=True)
+class Document:
+    source: str
+    id: uuid.UUID
+    changed_at: datetime
+    title: str
+    text: str
+
+
+def canonical_entity(name: str, index: MentionIndex) -> str:
+    """The known entity name matches, or name itself, whitespace-collapsed.
+
+    A name is rewritten when it is a known name (ignoring case and
+    punctuation) or contains one covering at least half its words, e.g.
+    "the Tide Guild" -> "Tide Guild" but not "fall of the Tide Guild
+    fortress walls".
+    """
+    cleaned = " ".join(str(name).split())[:ENTITY_CHARS]
+    normalized = _normalize(cleaned)
+    words = [word for word in normalized.split(" ") if len(word) >= 2]
+    best = None
+    for entity in index.matches(cleaned):
+        entity_normalized = _normalize(entity.name)
+        if entity_normalized == normalized:
+            return entity.name[:ENTITY_CHARS]
+        if len(entity_normalized.split(" ")) * 2 >= len(words):
+            if best is None or len(entity.name) > len(best):
+                best = entity.name
+    return (best or cleaned)[:ENTITY_CHARS]
+
+
+def canonical_predicate(predicate: str) -> str:
+    return "_".join(_normalize(str(predicate)).split(" "))[:PREDICATE_CHARS]
+
+
+def _wiki_changed_at():
+    last_edit = (
+        select(func.max(WikiHistory.created_at))
+        .where(WikiHistory.page_id == WikiPage.id)
+        .correlate(WikiPage)
+        .scalar_subquery()
+    )
+    # greatest() skips NULLs, so a never-edited page counts from its creation.
+    return func.greatest(WikiPage.created_at, last_edit)
+
+
+Watermark = tuple[datetime, uuid.UUID]
+
+
+async def _watermarks(db: AsyncSession, world_id: uuid.UUID) -> dict[str, Watermark]:
+    rows = (await db.execute(
+        select(KnowledgeWatermark.source, KnowledgeWatermark.watermark, KnowledgeWatermark.watermark_id)
+        .where(KnowledgeWatermark.world_id == world_id)
+    )).all()
+    return {source: (watermark, watermark_id) for source, watermark, watermark_id in rows}
+
+
+async def changed_documents(
+    db: AsyncSession, world_id: uuid.UUID, watermarks: dict[str, Watermark], cutoff: datetime, limit: int,
+) -> list[Document]:
+    """Up to limit documents past their source's (changed_at, id) watermark, oldest change first."""
+    per_doc = max(200, settings.kg_batch_chars // max(1, settings.kg_batch_documents))
+    docs: list[Document] = []
+
+    changed_at = _wiki_changed_at().label("changed_at")
+    stmt = select(WikiPage.id, WikiPage.title, WikiPage.content, changed_at).where(WikiPage.world_id == world_id)
+    if "wiki_page" in watermarks:
+        stmt = stmt.where(tuple_(changed_at, WikiPage.id) > tuple_(*watermarks["wiki_page"]))
+    stmt = stmt.where(changed_at <= cutoff).order_by(changed_at, WikiPage.id).limit(limit)
+    for row in (await db.execute(stmt)).all():
+        docs.append(Document("wiki_page", row.id, row.changed_at, row.title, (row.content or "")[:per_doc]))
+
+    stmt = select(Conversation.id, Conversation.topic, Conversation.summary, Conversation.messages,
+                  Conversation.created_at).where(Conversation.world_id == world_id)
+    if "conversation" in watermarks:
+        stmt = stmt.where(tuple_(Conversation.created_at, Conversation.id) > tuple_(*watermarks["conversation"]))
+    stmt = stmt.where(Conversation.created_at <= cutoff).order_by(Conversation.created_at, Conversation.id).limit(limit)
+    for row in (await db.execute(stmt)).all():
+        lines = [row.summary or ""] + [
+            f"{m.get('agent_name', '?')}: {m.get('content', '')}" for m in (row.messages or []) if isinstance(m, dict)
+        ]
+        docs.append(Document("conversation", row.id, row.created_at, row.topic or "", "\n".join(lines)[:per_doc]))
+
+    # Each source stays in keyset order, so what survives the cut is a prefix of it.
+    docs.sort(key=lambda doc: (doc.changed_at, doc.id))
+    return docs[:limit]
+
+
+def batch_documents(docs: list[Document]) -> list[list[Document]]:
+    batches: list[list[Document]] = []
+    chars = 0
+    for doc in docs:
+        if not batches or len(batches[-1]) >= settings.kg_batch_documents or chars + len(doc.text) > settings.kg_batch_chars:
+            batches.append([])
+            chars = 0
+        batches[-1].append(doc)
+        chars += len(doc.text)
+    return batches
+
+
+def edge_rows(world_id: uuid.UUID, batch: list[Document], result: Any, index: MentionIndex) -> list[dict]:
+    """Deduplicated knowledge_edges rows from the model's triples (one per triple, most confident)."""
+    triples = result.get("triples") if isinstance(result, dict) else result
+    rows: dict[tuple[str, str, str], dict] = {}
+    for triple in triples or []:
+        if not isinstance(triple, dict):
+            continue
+        try:
+            doc = batch[int(triple.get("doc", 1)) - 1]
+            confidence = min(1.0, max(0.0, float(triple.get("confidence", 0.5))))
+        except (IndexError, TypeError, ValueError):
+            continue
+        subject = canonical_entity(triple.get("subject") or "", index)
+        predicate = canonical_predicate(triple.get("predicate") or "")
+        obj = canonical_entity(triple.get("object") or "", index)
+        if not subject or not predicate or not obj or subject == obj:
+            continue
+        key = (subject, predicate, obj)
+        if key in rows and rows[key]["confidence"] >= confidence:
+            continue
+        rows[key] = {
+            "id": uuid.uuid4(),
+            "world_id": world_id,
+            "subject": subject,
+            "predicate": predicate,
+            "object": obj,
+            "source_page": doc.id if doc.source == "wiki_page" else None,
+            "source_conversation": doc.id if doc.source == "conversation" else None,
+            "sources": [f"{doc.source}:{doc.id}"],
+            "confidence": confidence,
+        }
+    return list(rows.values())
+
+
+def upsert_edges_statement(rows: list[dict]):
+    """INSERT the rows, merging confidence into triples the world already has.
+
+    A source that already stated the triple (it is in sources) only keeps
+    the higher confidence; a new source corroborates it (1 - (1 - a)(1 - b))
+    and is added to sources, so each document counts once however often
+    it is re-read.
+    """
+    stmt = pg_insert(KnowledgeEdge).values(rows)
+    excluded = stmt.excluded
+    current = func.coalesce(KnowledgeEdge.confidence, 0.5)
+    known_source = KnowledgeEdge.sources.contains(excluded.sources)
+    return stmt.on_conflict_do_update(
+        index_elements=[KnowledgeEdge.world_id, KnowledgeEdge.subject, KnowledgeEdge.predicate, KnowledgeEdge.object],
+        set_={
+            "confidence": case(
+                (known_source, func.greatest(current, excluded.confidence)),
+                else_=1 - (1 - current) * (1 - excluded.confidence),
+            ),
+            "sources": case((known_source, KnowledgeEdge.sources), else_=KnowledgeEdge.sources.concat(excluded.sources)),
+            "source_page": excluded.source_page,
+            "source_conversation": excluded.source_conversation,
+            "updated_at": func.timezone("utc", func.now()),
+        },
+    )
+
+
+def watermark_statement(world_id: uuid.UUID, source: str, watermark: datetime, watermark_id: uuid.UUID):
+    """Move the source's watermark to (watermark, watermark_id), never backwards."""
+    stmt = pg_insert(KnowledgeWatermark).values(
+        world_id=world_id, source=source, watermark=watermark, watermark_id=watermark_id,
+    )
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[KnowledgeWatermark.world_id, KnowledgeWatermark.source],
+        set_={"watermark": excluded.watermark, "watermark_id": excluded.watermark_id},
+        where=tuple_(excluded.watermark, excluded.watermark_id)
+        > tuple_(KnowledgeWatermark.watermark, KnowledgeWatermark.watermark_id),
+    )
+
+
+def _prompt(batch: list[Document], index: MentionIndex) -> str:
+    entities = sorted({entity.name for entity in index.entities})[:PROMPT_ENTITIES]
+    documents = "\n\n".join(
+        f"[{i}] ({doc.source}) {doc.title}\n{doc.text}" for i, doc in enumerate(batch, start=1)
+    )
+    return KG_PROMPT.format(
+        entities="\n".join(f"- {name}" for name in entities) or "(none yet)",
+        documents=documents,
+        per_document=TRIPLES_PER_DOCUMENT,
+    )
+
+
+async def build_world_graph(world_id: uuid.UUID) -> int:
+    """Extract triples from the world's changed documents; returns edges written."""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.kg_settle_seconds)
+    written = 0
+    async with async_session() as db:
+        watermarks = await _watermarks(db, world_id)
+        docs = await changed_documents(db, world_id, watermarks, cutoff, settings.kg_max_documents)
+        if not docs:
+            return 0
+        index = await get_mention_index(db, world_id)
+        for batch in batch_documents(docs):
+            result = await llm_router.generate_json(
+                role="reaction_agent",
+                prompt=_prompt(batch, index),
+                max_tokens=256 * len(batch),
+            )
+            rows = edge_rows(world_id, batch, result, index)
+            if rows:
+                await db.execute(upsert_edges_statement(rows))
+                await record_activity(db, world_id)
+            for source in SOURCES:
+                latest = max(((doc.changed_at, doc.id) for doc in batch if doc.source == source), default=None)
+                if latest is not None:
+                    await db.execute(watermark_statement(world_id, source, *latest))
+            await db.commit()
+            written += len(rows)
+    if written:
+        await bump_world_version(world_id)
+    logger.info("knowledge_graph.built", world_id=str(world_id), documents=len(docs), edges=written)
+    return written
+
+
+async def run_kg_build(_payload: dict[str, Any]) -> None:
+    async with async_session() as db:
+        world_ids = list((await db.execute(select(World.id).order_by(World.created_at))).scalars().all())
+    failed = 0
+    for world_id in world_ids:
+        try:
+            await build_world_graph(world_id)
+        except Exception:
+            failed += 1
+            logger.exception("knowledge_graph.world_failed", world_id=str(world_id))
+    if failed and failed == len(world_ids):
+        # LLM down or misconfigured; the job queue retries with backoff.
+        raise RuntimeError(f"knowledge graph build failed for all {failed} worlds")
+
+
+register_job(KG_JOB, run_kg_build, every_seconds=settings.kg_interval_seconds)
@@ -1,4 +1,9 @@
+import asyncio
+import heapq
+import itertools
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import httpx
 import structlog
@@ -59,6 +64,71 @@ OLLAMA_ROLE_MODEL_MAP: dict[str, str] = {
 
 OLLAMA_DEFAULT_MODEL = "qwen3.5:9b"
 
+# Admission priority per role when calls queue for the LLM (lower first):
+# the live simulation, then content the librarian and genesis produce,
+# then background translation.
+ROLE_PRIORITY: dict[str, int] = {
+    "main_debater": 0,
+    "reaction_agent": 0,
+    "chaos_joker": 0,
+    "searcher": 0,
+    "post_writer": 1,
+    "librarian": 1,
+    "wiki_writer": 1,
+    "genesis_architect": 1,
+    "translator": 2,
+}
+DEFAULT_ROLE_PRIORITY = 1
+
+
+class LLMScheduler:
+    """Bounds in-flight LLM calls per process.
+
+    A caller that finds every slot taken waits; freed slots go to the
+    waiter with the lowest priority value, then the longest-waiting one.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int = DEFAULT_ROLE_PRIORITY) -> AsyncIterator[None]:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+            try:
+                await fut
+            except asyncio.CancelledError:
+                # Cancelled after the slot was handed over: pass it on.
+                if fut.done() and not fut.cancelled():
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        # The slot moves straight to the next live waiter, so active stays put.
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.active -= 1
+
+
+llm_scheduler = LLMScheduler(settings.llm_max_concurrency)
+
 
 class LLMRouter:
     def __init__(self):
@@ -119,12 +189,12 @@ class LLMRouter:
 
     async def generate_text(self, role: str, prompt: str, temperature: float = 0.8, max_tokens: int = 2048) -> str:
         """Generate text or raise LLMGenerationError (never returns error prose)."""
-        import asyncio
-
         last_reason = "unknown"
+        priority = ROLE_PRIORITY.get(role, DEFAULT_ROLE_PRIORITY)
         for attempt in range(1, LLM_RETRY_ATTEMPTS + 1):
             try:
-                result = await self._generate_text_once(role, prompt, temperature, max_tokens)
+                async with llm_scheduler.slot(priority):
+                    result = await self._generate_text_once(role, prompt, temperature, max_tokens)
                 if result:
                     return result
                 last_reason = "empty response"
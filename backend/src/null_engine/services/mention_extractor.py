@@ -2,26 +2,48 @@
 
 Uses fuzzy string matching against known entities (agents, wiki pages, factions)
 to create bidirectional entity_mentions links.
+
+Entity names are compiled per world into one Aho–Corasick automaton over
+their normalized phrases and tokens, so a text is scanned once however
+many entities the world has. A name matches when its whole phrase occurs,
+or when all of its tokens of two or more characters do — the same rule as
+_fuzzy_match. Compiled indexes are cached and rebuilt only when the
+world's entity signature (count and name hash per table) changes, i.e.
+when an entity is added, removed or renamed.
+
+Extraction runs off the tick: callers enqueue texts and
+mention_worker_loop writes the links in its own session.
 """
 
+import asyncio
 import uuid
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from null_engine.config import settings
+from null_engine.db import async_session
 from null_engine.models.tables import (
     Agent,
     EntityMention,
     Faction,
     WikiPage,
 )
+from null_engine.services.response_cache import bump_world_version
 
 logger = structlog.get_logger()
 
 # Minimum ratio for fuzzy match (0-100)
 FUZZY_THRESHOLD = 75
 
+# Confidence of a mention, by target type.
+_CONFIDENCE = {"agent": 0.9, "wiki_page": 0.85, "faction": 0.85}
+_MAX_CACHED_WORLDS = 256
+
 
 def _normalize(text: str) -> str:
     normalized = text.lower().strip()
@@ -46,6 +68,141 @@ def _fuzzy_match(needle: str, haystack: str) -> bool:
     return all(token in h for token in needle_tokens)
 
 
+class Automaton:
+    """Aho–Corasick automaton: every pattern occurring in a text, in one pass."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # Breadth-first, so a state's failure target is final before its children.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        """Indexes of the patterns that occur in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+@dataclass(frozen=True)
+class IndexedEntity:
+    target_type: str
+    target_id: uuid.UUID
+    name: str
+    phrase: int
+    tokens: tuple[int, ...]
+
+
+class MentionIndex:
+    """Compiled entity names of one world."""
+
+    def __init__(self, entities: Iterable[tuple[str, uuid.UUID, str]]):
+        patterns: dict[str, int] = {}
+        self.entities: list[IndexedEntity] = []
+        for target_type, target_id, name in entities:
+            phrase = _normalize(name or "")
+            if len(phrase) < 2:
+                continue
+            tokens = [token for token in phrase.split(" ") if len(token) >= 2]
+            self.entities.append(IndexedEntity(
+                target_type=target_type,
+                target_id=target_id,
+                name=name,
+                phrase=patterns.setdefault(phrase, len(patterns)),
+                tokens=tuple(patterns.setdefault(token, len(patterns)) for token in tokens),
+            ))
+        self._automaton = Automaton(patterns)
+
+    def matches(self, text: str) -> list[IndexedEntity]:
+        found = self._automaton.find(_normalize(text))
+        if not found:
+            return []
+        return [
+            entity for entity in self.entities
+            if entity.phrase in found or (entity.tokens and found.issuperset(entity.tokens))
+        ]
+
+
+_indexes: OrderedDict[uuid.UUID, tuple[tuple, MentionIndex]] = OrderedDict()
+
+
+def clear_mention_indexes() -> None:
+    _indexes.clear()
+
+
+def _signature_columns(name, world_column, world_id: uuid.UUID) -> list:
+    # hashtext() is Postgres' internal string hash; summed, it changes when
+    # any name in the world does, without shipping the names.
+    return [
+        select(func.count()).where(world_column == world_id).scalar_subquery(),
+        select(func.coalesce(func.sum(func.hashtext(name)), 0)).where(world_column == world_id).scalar_subquery(),
+    ]
+
+
+def signature_query(world_id: uuid.UUID):
+    return select(
+        *_signature_columns(Agent.name, Agent.world_id, world_id),
+        *_signature_columns(WikiPage.title, WikiPage.world_id, world_id),
+        *_signature_columns(Faction.name, Faction.world_id, world_id),
+    )
+
+
+async def get_mention_index(db: AsyncSession, world_id: uuid.UUID) -> MentionIndex:
+    """The world's compiled index, rebuilt only when its entities changed."""
+    signature = tuple((await db.execute(signature_query(world_id))).one())
+    cached = _indexes.get(world_id)
+    if cached is not None and cached[0] == signature:
+        _indexes.move_to_end(world_id)
+        return cached[1]
+
+    entities: list[tuple[str, uuid.UUID, str]] = []
+    for target_type, model, name in (
+        ("agent", Agent, Agent.name),
+        ("wiki_page", WikiPage, WikiPage.title),
+        ("faction", Faction, Faction.name),
+    ):
+        rows = (await db.execute(select(model.id, name).where(model.world_id == world_id))).all()
+        entities.extend((target_type, row[0], row[1]) for row in rows)
+
+    index = MentionIndex(entities)
+    _indexes[world_id] = (signature, index)
+    _indexes.move_to_end(world_id)
+    while len(_indexes) > _MAX_CACHED_WORLDS:
+        _indexes.popitem(last=False)
+    logger.info("mention_extractor.index_built", world_id=str(world_id), entities=len(index.entities))
+    return index
+
+
 async def extract_mentions_from_conversation(
     db: AsyncSession,
     world_id: uuid.UUID,
@@ -83,78 +240,39 @@ async def _extract_mentions(
     source_type: str,
     source_id: uuid.UUID,
     text: str,
-):
-    """Core extraction: match known entities against text."""
-    # Load all known entities for this world
-    agents = (await db.execute(
-        select(Agent).where(Agent.world_id == world_id)
-    )).scalars().all()
-
-    wiki_pages = (await db.execute(
-        select(WikiPage).where(WikiPage.world_id == world_id)
-    )).scalars().all()
-
-    factions = (await db.execute(
-        select(Faction).where(Faction.world_id == world_id)
-    )).scalars().all()
+) -> int:
+    """Core extraction: match known entities against text; returns the mentions added."""
+    index = await get_mention_index(db, world_id)
+    matched = [
+        entity for entity in index.matches(text)
+        # Skip self-reference
+        if not (source_type == "wiki" and entity.target_type == "wiki_page" and entity.target_id == source_id)
+    ]
+    if not matched:
+        return 0
 
     # Already existing mentions for this source
     existing = (await db.execute(
-        select(EntityMention).where(
+        select(EntityMention.target_type, EntityMention.target_id).where(
             EntityMention.source_type == source_type,
             EntityMention.source_id == source_id,
         )
-    )).scalars().all()
-    existing_targets = {(m.target_type, m.target_id) for m in existing}
-
-    mentions_to_add = []
-
-    # Match agents
-    for agent in agents:
-        if _fuzzy_match(agent.name, text):
-            key = ("agent", agent.id)
-            if key not in existing_targets:
-                mentions_to_add.append(EntityMention(
-                    world_id=world_id,
-                    source_type=source_type,
-                    source_id=source_id,
-                    mention_text=agent.name,
-                    target_type="agent",
-                    target_id=agent.id,
-                    confidence=0.9,
-                ))
-
-    # Match wiki pages
-    for page in wiki_pages:
-        if source_type == "wiki" and page.id == source_id:
-            continue  # Skip self-reference
-        if _fuzzy_match(page.title, text):
-            key = ("wiki_page", page.id)
-            if key not in existing_targets:
-                mentions_to_add.append(EntityMention(
-                    world_id=world_id,
-                    source_type=source_type,
-                    source_id=source_id,
-                    mention_text=page.title,
-                    target_type="wiki_page",
-                    target_id=page.id,
-                    confidence=0.85,
-                ))
-
-    # Match factions
-    for faction in factions:
-        if _fuzzy_match(faction.name, text):
-            key = ("faction", faction.id)
-            if key not in existing_targets:
-                mentions_to_add.append(EntityMention(
-                    world_id=world_id,
-                    source_type=source_type,
-                    source_id=source_id,
-                    mention_text=faction.name,
-                    target_type="faction",
-                    target_id=faction.id,
-                    confidence=0.85,
-                ))
+    )).all()
+    existing_targets = {(row[0], row[1]) for row in existing}
+
+    mentions_to_add = [
+        EntityMention(
+            world_id=world_id,
+            source_type=source_type,
+            source_id=source_id,
+            mention_text=entity.name,
+            target_type=entity.target_type,
+            target_id=entity.target_id,
+            confidence=_CONFIDENCE[entity.target_type],
+        )
+        for entity in matched
+        if (entity.target_type, entity.target_id) not in existing_targets
+    ]
 
     for mention in mentions_to_add:
         db.add(mention)
@@ -166,3 +284,72 @@ async def _extract_mentions(
             source_type=source_type,
             count=len(mentions_to_add),
         )
+    return len(mentions_to_add)
+
+
+# ── Background queue ────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class MentionJob:
+    world_id: uuid.UUID
+    source_type: str
+    source_id: uuid.UUID
+    text: str
+
+
+_queue: asyncio.Queue[MentionJob] | None = None
+
+
+def _get_queue() -> asyncio.Queue[MentionJob]:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.mention_queue_size)
+    return _queue
+
+
+def _enqueue(job: MentionJob) -> bool:
+    if not job.text.strip():
+        return False
+    try:
+        _get_queue().put_nowait(job)
+    except asyncio.QueueFull:
+        logger.warning("mention_extractor.queue_full", source_type=job.source_type, source_id=str(job.source_id))
+        return False
+    return True
+
+
+def enqueue_conversation_mentions(world_id: uuid.UUID, conversation_id: uuid.UUID, messages: list[dict]) -> bool:
+    """Queue a conversation for extraction; False if it was dropped."""
+    text = " ".join(m.get("content", "") for m in messages)
+    return _enqueue(MentionJob(world_id, "conversation", conversation_id, text))
+
+
+def enqueue_wiki_mentions(world_id: uuid.UUID, page_id: uuid.UUID, content: str) -> bool:
+    """Queue a wiki page revision for extraction; False if it was dropped."""
+    return _enqueue(MentionJob(world_id, "wiki", page_id, content))
+
+
+def pending_mention_jobs() -> int:
+    return _get_queue().qsize()
+
+
+async def process_mention_job(job: MentionJob) -> None:
+    async with async_session() as db:
+        added = await _extract_mentions(db, job.world_id, job.source_type, job.source_id, job.text)
+        await db.commit()
+    if added:
+        # Cached entity-graph views aggregate mentions.
+        await bump_world_version(job.world_id)
+
+
+async def mention_worker_loop() -> None:
+    """Drain the mention queue; a failed job is logged and skipped."""
+    queue = _get_queue()
+    while True:
+        job = await queue.get()
+        try:
+            await process_mention_job(job)
+        except Exception:
+            logger.exception("mention_extractor.job_failed", source_type=job.source_type, source_id=str(job.source_id))
+        finally:
+            queue.task_done()
@@ -0,0 +1,231 @@
+"""Read-model response cache for the hot GET endpoints.
+
+Entries are keyed by (route, query params, world version). The runner,
+wiki engine and background services bump a world's version when they
+commit, which makes every cached response for that world unreachable; no
+explicit invalidation is needed. World-agnostic routes (/worlds, the
+multiverse map, the taxonomy tree) key on the global version, which every
+bump advances; cross-world services bump with world_id=None, which also
+advances the all-worlds version every world-scoped key includes.
+
+- bounded LRU in-process, plus optional Redis backing so several workers
+  share entries and versions (response_cache_redis_enabled)
+- single-flight: a burst of misses for one key runs the loader once
+- ETag / If-None-Match → 304
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from null_engine.config import settings
+from null_engine.services.runtime_metrics import note_cache_event
+
+logger = structlog.get_logger()
+
+GLOBAL_SCOPE = "global"
+ALL_WORLDS_SCOPE = "worlds"
+_REDIS_PREFIX = "null:rc"
+
+_entries: OrderedDict[str, tuple[float, str, bytes]] = OrderedDict()
+_inflight: dict[str, asyncio.Future] = {}
+_versions: dict[str, int] = {}
+_adapters: dict[Any, TypeAdapter] = {}
+_redis_client = None
+
+
+def _redis():
+    global _redis_client
+    if not settings.response_cache_redis_enabled:
+        return None
+    if _redis_client is None:
+        from redis import asyncio as redis_asyncio
+
+        _redis_client = redis_asyncio.from_url(settings.redis_url)
+    return _redis_client
+
+
+async def _read_version(scope: str) -> int:
+    client = _redis()
+    if client is not None:
+        try:
+            raw = await client.get(f"{_REDIS_PREFIX}:v:{scope}")
+            return int(raw or 0)
+        except Exception:
+            logger.warning("response_cache.redis_version_read_failed", scope=scope)
+    return _versions.get(scope, 0)
+
+
+async def bump_world_version(world_id: uuid.UUID | None = None) -> None:
+    """Mark a world's read models stale (world_id=None: every world's)."""
+    await _bump([ALL_WORLDS_SCOPE, GLOBAL_SCOPE] if world_id is None else [str(world_id), GLOBAL_SCOPE])
+
+
+async def bump_global_version() -> None:
+    """Mark only the cross-world read models (cached without a world_id) stale."""
+    await _bump([GLOBAL_SCOPE])
+
+
+async def _bump(scopes: list[str]) -> None:
+    for scope in scopes:
+        _versions[scope] = _versions.get(scope, 0) + 1
+    client = _redis()
+    if client is not None:
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    pipe.incr(f"{_REDIS_PREFIX}:v:{scope}")
+                await pipe.execute()
+        except Exception:
+            logger.warning("response_cache.redis_bump_failed", scopes=scopes)
+
+
+def _local_get(key: str) -> tuple[str, bytes] | None:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, etag, body = entry
+    if expires_at <= time.monotonic():
+        _entries.pop(key, None)
+        return None
+    _entries.move_to_end(key)
+    return etag, body
+
+
+def _local_put(key: str, etag: str, body: bytes, route: str) -> None:
+    _entries[key] = (time.monotonic() + settings.response_cache_ttl_seconds, etag, body)
+    _entries.move_to_end(key)
+    while len(_entries) > settings.response_cache_max_entries:
+        _entries.popitem(last=False)
+        note_cache_event(route, "evictions")
+
+
+async def _shared_get(key: str) -> tuple[str, bytes] | None:
+    client = _redis()
+    if client is None:
+        return None
+    try:
+        raw = await client.get(f"{_REDIS_PREFIX}:e:{key}")
+    except Exception:
+        logger.warning("response_cache.redis_get_failed")
+        return None
+    if not raw:
+        return None
+    etag, _, body = raw.partition(b"\n")
+    return etag.decode(), body
+
+
+async def _shared_put(key: str, etag: str, body: bytes) -> None:
+    client = _redis()
+    if client is None:
+        return
+    try:
+        ttl_ms = max(1, int(settings.response_cache_ttl_seconds * 1000))
+        await client.set(f"{_REDIS_PREFIX}:e:{key}", etag.encode() + b"\n" + body, px=ttl_ms)
+    except Exception:
+        logger.warning("response_cache.redis_set_failed")
+
+
+def _encode(payload: Any, model: Any | None) -> bytes:
+    if model is not None:
+        adapter = _adapters.get(model)
+        if adapter is None:
+            adapter = _adapters[model] = TypeAdapter(model)
+        return adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode()
+
+
+def _respond(request: Request, etag: str, body: bytes, route: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")}:
+        note_cache_event(route, "not_modified")
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def cached_response(
+    request: Request,
+    loader: Callable[[], Awaitable[Any]],
+    *,
+    model: Any | None = None,
+    world_id: uuid.UUID | None = None,
+) -> Response:
+    """Serve loader()'s payload through the cache.
+
+    model is the route's response_model; the payload is validated and
+    serialized through it exactly once per cache fill.
+    """
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    scope = str(world_id) if world_id is not None else GLOBAL_SCOPE
+
+    if not settings.response_cache_enabled:
+        body = _encode(await loader(), model)
+        return _respond(request, f'"{hashlib.sha1(body).hexdigest()}"', body, route)
+
+    version = await _read_version(scope)
+    if scope != GLOBAL_SCOPE:
+        # Cross-world services bump with world_id=None, not per world.
+        version = f"{await _read_version(ALL_WORLDS_SCOPE)}.{version}"
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    key = f"{request.url.path}?{params}@{version}"
+
+    cached = _local_get(key) or await _shared_get(key)
+    if cached is not None:
+        note_cache_event(route, "hits")
+        if key not in _entries:
+            _local_put(key, cached[0], cached[1], route)
+        return _respond(request, cached[0], cached[1], route)
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        note_cache_event(route, "coalesced")
+        try:
+            etag, body = await asyncio.shield(pending)
+            return _respond(request, etag, body, route)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # this request itself was cancelled
+            # The leading request was cancelled mid-load; load it ourselves.
+
+    note_cache_event(route, "misses")
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        body = _encode(await loader(), model)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        _local_put(key, etag, body, route)
+        await _shared_put(key, etag, body)
+        future.set_result((etag, body))
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Waiters re-raise it; mark it retrieved so a failure nobody
+        # waited on isn't logged as "exception never retrieved".
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            _inflight.pop(key, None)
+    return _respond(request, etag, body, route)
+
+
+def clear_response_cache() -> None:
+    """Testing helper: drop entries, versions and in-flight loads."""
+    _entries.clear()
+    _inflight.clear()
+    _versions.clear()
@@ -9,6 +9,9 @@ from typing import Any
 _lock = Lock()
 _loop_metrics: dict[str, dict[str, Any]] = {}
 _runner_metrics: dict[uuid.UUID, dict[str, Any]] = {}
+_cache_metrics: dict[str, dict[str, Any]] = {}
+
+CACHE_EVENTS = ("hits", "misses", "coalesced", "not_modified", "evictions")
 
 
 def _now() -> datetime:
@@ -148,6 +151,24 @@ def note_runner_tick(
             )
 
 
+def note_cache_event(route: str, event: str) -> None:
+    with _lock:
+        metric = _cache_metrics.setdefault(route, {"route": route, **{e: 0 for e in CACHE_EVENTS}})
+        metric[event] = int(metric[event]) + 1
+
+
+def get_cache_metrics_snapshot() -> list[dict[str, Any]]:
+    with _lock:
+        out = []
+        for metric in _cache_metrics.values():
+            row = dict(metric)
+            lookups = row["hits"] + row["misses"] + row["coalesced"]
+            # Coalesced waiters were served without their own query.
+            row["hit_rate"] = round((row["hits"] + row["coalesced"]) / lookups, 3) if lookups else 0.0
+            out.append(row)
+        return out
+
+
 def get_loop_metrics_snapshot() -> list[dict[str, Any]]:
     with _lock:
         return [dict(metric) for metric in _loop_metrics.values()]
@@ -163,6 +184,7 @@ def clear_runtime_metrics() -> None:
     with _lock:
         _loop_metrics.clear()
         _runner_metrics.clear()
+        _cache_metrics.clear()
 
 
 def merge_metric_defaults(metric: Mapping[str, Any], defaults: Mapping[str, Any]) -> dict[str, Any]:
@@ -1,11 +1,9 @@
-"""SemanticIndexer — background service for embedding generation and neighbor discovery.
+"""SemanticIndexer — background service for neighbor discovery.
 
-Periodically:
-1. Ensures all entities have embeddings
-2. Computes semantic_neighbors for intra-world entities
+Periodically computes semantic_neighbors for intra-world entities.
+Embeddings come from services/embedding_pipeline.py.
 """
 
-import asyncio
 import time
 
 import structlog
@@ -13,12 +11,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from null_engine.db import async_session, pgvector_enabled
-from null_engine.models.tables import (
-    Agent,
-    Conversation,
-    SemanticNeighbor,
-    WikiPage,
-)
+from null_engine.models.tables import SemanticNeighbor, WikiPage
+from null_engine.services.job_queue import register_job
 
 logger = structlog.get_logger()
 
@@ -27,44 +21,6 @@ NEIGHBOR_THRESHOLD = 0.70
 MAX_NEIGHBORS = 5
 
 
-async def _get_embedding(text: str) -> list[float] | None:
-    """Reuse convergence embedding helper."""
-    from null_engine.services.convergence import _get_embedding as get_emb
-    return await get_emb(text)
-
-
-async def _ensure_agent_embeddings(db: AsyncSession):
-    """Generate embeddings for agents without them."""
-    result = await db.execute(
-        select(Agent).where(Agent.embedding.is_(None)).limit(50)
-    )
-    agents = result.scalars().all()
-    for agent in agents:
-        text = f"{agent.name}\n{agent.persona.get('role', '')}\n{agent.persona.get('personality', '')}"
-        emb = await _get_embedding(text)
-        if emb:
-            agent.embedding = emb
-    if agents:
-        await db.flush()
-        logger.info("semantic_indexer.agent_embeddings", count=len(agents))
-
-
-async def _ensure_conversation_embeddings(db: AsyncSession):
-    """Generate embeddings for conversations without them."""
-    result = await db.execute(
-        select(Conversation).where(Conversation.embedding.is_(None)).limit(50)
-    )
-    convs = result.scalars().all()
-    for conv in convs:
-        text = f"{conv.topic}\n{conv.summary}"
-        emb = await _get_embedding(text)
-        if emb:
-            conv.embedding = emb
-    if convs:
-        await db.flush()
-        logger.info("semantic_indexer.conversation_embeddings", count=len(convs))
-
-
 async def _update_neighbors(db: AsyncSession):
     """Find semantic neighbors among wiki pages within each world."""
     if not pgvector_enabled():
@@ -142,8 +98,6 @@ async def run_indexer_cycle():
     cycle_started = time.monotonic()
     async with async_session() as db:
         try:
-            await _ensure_agent_embeddings(db)
-            await _ensure_conversation_embeddings(db)
             await _update_neighbors(db)
             await db.commit()
             logger.info(
@@ -156,14 +110,8 @@ async def run_indexer_cycle():
                 "semantic_indexer.cycle_failed",
                 duration_ms=int((time.monotonic() - cycle_started) * 1000),
             )
+            raise
 
 
-async def semantic_indexer_loop():
-    """Background loop."""
-    logger.info("semantic_indexer.loop_started", interval=INDEXER_INTERVAL)
-    while True:
-        await asyncio.sleep(INDEXER_INTERVAL)
-        try:
-            await run_indexer_cycle()
-        except Exception:
-            logger.exception("semantic_indexer.loop_error")
+# One run per interval across all workers (services/job_queue.py).
+register_job("semantic_indexer.cycle", lambda _payload: run_indexer_cycle(), every_seconds=INDEXER_INTERVAL)
@@ -1,9 +1,11 @@
 import uuid
 
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from null_engine.models.tables import WikiPage
+from null_engine.services.text_search import wiki_page_headline, wiki_page_match
 
 
 async def search_wiki_pages(
@@ -11,19 +13,25 @@ async def search_wiki_pages(
     world_id: uuid.UUID,
     query: str,
     limit: int = 20,
-) -> list[WikiPage]:
-    """Search wiki pages by title or content (text match).
-    For vector search, use pgvector similarity when embeddings are available."""
-    q = f"%{query}%"
-    result = await db.execute(
-        select(WikiPage)
-        .where(
-            WikiPage.world_id == world_id,
-            or_(
-                WikiPage.title.ilike(q),
-                WikiPage.content.ilike(q),
-            ),
-        )
+    offset: int = 0,
+) -> list[tuple[WikiPage, str]]:
+    """Full-text search of a world's wiki pages, best match first, with each page's highlight.
+
+    ts_headline only runs for the rows of the requested page (see services/text_search.py).
+    """
+    match, score = wiki_page_match(query)
+    ranked = (
+        select(WikiPage.id, score.label("score"))
+        .where(WikiPage.world_id == world_id, match)
+        .order_by(score.desc(), WikiPage.id)
         .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    result = await db.execute(
+        select(WikiPage, wiki_page_headline(query).label("highlight"))
+        .options(defer(WikiPage.embedding))
+        .join(ranked, ranked.c.id == WikiPage.id)
+        .order_by(ranked.c.score.desc(), WikiPage.id)
     )
-    return list(result.scalars().all())
+    return [(page, highlight or "") for page, highlight in result.all()]
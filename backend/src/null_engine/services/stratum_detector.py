@@ -15,7 +15,9 @@ from null_engine.models.tables import (
     Stratum,
     WikiPage,
 )
+from null_engine.services.embedding_pipeline import enqueue_embeddings
 from null_engine.services.llm_router import llm_router
+from null_engine.services.world_stats import record_activity
 
 logger = structlog.get_logger()
 
@@ -25,7 +27,11 @@ async def detect_stratum(
     world_id: uuid.UUID,
     epoch: int,
 ):
-    """Generate a stratum summary for the completed epoch."""
+    """Generate a stratum summary for the completed epoch; the caller commits.
+
+    A no-op when the epoch already has one. LLM failures propagate so the
+    epoch pipeline can retry the step.
+    """
     # Check if stratum already exists
     existing = await db.execute(
         select(Stratum).where(
@@ -98,32 +104,25 @@ Generate a JSON summary:
   "dominant_themes": ["top 3-5 dominant themes"]
 }}"""
 
-    try:
-        result = await llm_router.generate_json(
-            role="reaction_agent",
-            prompt=prompt,
-            max_tokens=512,
-        )
-        if not isinstance(result, dict):
-            result = {}
-
-        # Get embedding for the summary
-        from null_engine.services.convergence import _get_embedding
-        summary_text = result.get("summary", f"Epoch {epoch} summary")
-        embedding = await _get_embedding(summary_text)
-
-        stratum = Stratum(
-            world_id=world_id,
-            epoch=epoch,
-            summary=str(result.get("summary", "")),
-            emerged_concepts=result.get("emerged_concepts", []),
-            faded_concepts=result.get("faded_concepts", []),
-            dominant_themes=result.get("dominant_themes", []),
-            embedding=embedding,
-        )
-        db.add(stratum)
-        await db.flush()
-        logger.info("stratum_detector.created", world_id=str(world_id), epoch=epoch)
-
-    except Exception:
-        logger.exception("stratum_detector.failed", world_id=str(world_id), epoch=epoch)
+    result = await llm_router.generate_json(
+        role="reaction_agent",
+        prompt=prompt,
+        max_tokens=512,
+    )
+    if not isinstance(result, dict):
+        result = {}
+
+    stratum = Stratum(
+        world_id=world_id,
+        epoch=epoch,
+        summary=str(result.get("summary", "")),
+        emerged_concepts=result.get("emerged_concepts", []),
+        faded_concepts=result.get("faded_concepts", []),
+        dominant_themes=result.get("dominant_themes", []),
+    )
+    db.add(stratum)
+    await db.flush()
+    await record_activity(db, world_id)
+    # Embedded by the pipeline once the caller commits.
+    await enqueue_embeddings(db, "stratum", [stratum.id])
+    logger.info("stratum_detector.created", world_id=str(world_id), epoch=epoch)
@@ -4,7 +4,6 @@ Periodically clusters world content into a hierarchical taxonomy tree
 using embeddings and LLM-based labeling.
 """
 
-import asyncio
 import time
 import uuid
 from collections import defaultdict
@@ -19,7 +18,9 @@ from null_engine.models.tables import (
     TaxonomyNode,
     WikiPage,
 )
+from null_engine.services.job_queue import register_job
 from null_engine.services.llm_router import llm_router
+from null_engine.services.response_cache import bump_global_version
 
 logger = structlog.get_logger()
 
@@ -27,8 +28,8 @@ TAXONOMY_INTERVAL = 300  # seconds
 CLUSTER_THRESHOLD = 0.72
 
 
-async def _build_leaf_nodes(db: AsyncSession):
-    """Create/update leaf taxonomy nodes from world content clusters."""
+async def _build_leaf_nodes(db: AsyncSession) -> int:
+    """Create/update leaf taxonomy nodes from world content clusters; returns pages placed."""
     # Get all worlds with wiki pages that have embeddings
     result = await db.execute(
         select(WikiPage)
@@ -38,8 +39,9 @@ async def _build_leaf_nodes(db: AsyncSession):
     )
     pages = result.scalars().all()
     if not pages:
-        return
+        return 0
 
+    placed = 0
     # Group pages by world
     by_world: dict[uuid.UUID, list] = defaultdict(list)
     for p in pages:
@@ -115,12 +117,14 @@ async def _build_leaf_nodes(db: AsyncSession):
                     entity_id=page.id,
                     similarity=1.0,
                 ))
+            placed += 1
 
     await db.flush()
+    return placed
 
 
-async def _merge_similar_nodes(db: AsyncSession):
-    """Merge taxonomy nodes that are very similar into parent nodes."""
+async def _merge_similar_nodes(db: AsyncSession) -> int:
+    """Merge taxonomy nodes that are very similar into parent nodes; returns parents created."""
     result = await db.execute(
         select(TaxonomyNode)
         .where(TaxonomyNode.parent_id.is_(None), TaxonomyNode.centroid.isnot(None))
@@ -128,7 +132,7 @@ async def _merge_similar_nodes(db: AsyncSession):
     )
     root_nodes = result.scalars().all()
     if len(root_nodes) < 2:
-        return
+        return 0
 
     merged = set()
     for i, node_a in enumerate(root_nodes):
@@ -173,15 +177,17 @@ async def _merge_similar_nodes(db: AsyncSession):
                 logger.exception("taxonomy.merge_error")
 
     await db.flush()
+    return len(merged) // 2
 
 
-async def _label_nodes(db: AsyncSession):
-    """Use LLM to generate labels for unlabeled taxonomy nodes."""
+async def _label_nodes(db: AsyncSession) -> int:
+    """Use LLM to generate labels for unlabeled taxonomy nodes; returns how many were labeled."""
     result = await db.execute(
         select(TaxonomyNode).where(TaxonomyNode.description == "").limit(5)
     )
     nodes = result.scalars().all()
 
+    labeled = 0
     for node in nodes:
         members_result = await db.execute(
             select(TaxonomyMembership)
@@ -217,8 +223,10 @@ Return JSON: {{"label": "...", "description": "..."}}""",
             if isinstance(result_json, dict):
                 node.label = str(result_json.get("label", node.label))[:200]
                 node.description = str(result_json.get("description", ""))
+                labeled += 1
         except Exception:
             logger.exception("taxonomy.label_failed", node_id=str(node.id))
+    return labeled
 
 
 async def run_taxonomy_cycle():
@@ -230,12 +238,16 @@ async def run_taxonomy_cycle():
     cycle_started = time.monotonic()
     async with async_session() as db:
         try:
-            await _build_leaf_nodes(db)
-            await _merge_similar_nodes(db)
-            await _label_nodes(db)
+            written = await _build_leaf_nodes(db)
+            written += await _merge_similar_nodes(db)
+            written += await _label_nodes(db)
             await db.commit()
+            if written:
+                # Only the cross-world taxonomy tree is cached.
+                await bump_global_version()
             logger.info(
                 "taxonomy_builder.cycle_complete",
+                written=written,
                 duration_ms=int((time.monotonic() - cycle_started) * 1000),
             )
         except Exception:
@@ -244,14 +256,8 @@ async def run_taxonomy_cycle():
                 "taxonomy_builder.cycle_failed",
                 duration_ms=int((time.monotonic() - cycle_started) * 1000),
             )
+            raise
 
 
-async def taxonomy_builder_loop():
-    """Background loop."""
-    logger.info("taxonomy_builder.loop_started", interval=TAXONOMY_INTERVAL)
-    while True:
-        await asyncio.sleep(TAXONOMY_INTERVAL)
-        try:
-            await run_taxonomy_cycle()
-        except Exception:
-            logger.exception("taxonomy_builder.loop_error")
+# One run per interval across all workers (services/job_queue.py).
+register_job("taxonomy.cycle", lambda _payload: run_taxonomy_cycle(), every_seconds=TAXONOMY_INTERVAL)
@@ -0,0 +1,176 @@
+"""Full-text search over wiki pages, conversations and agents.
+
+Matching runs against the generated search_vector columns (GIN-indexed,
+0008_full_text_search) with websearch_to_tsquery, so users can type plain
+words, "quoted phrases" and -exclusions. Agent names and wiki titles also
+match fuzzily through pg_trgm (name % q), which catches misspelt proper
+nouns that stemming can't. Scores are ts_rank normalised to [0, 1), or the
+trigram similarity when that is higher, so hits of different entity types
+merge into one ranking.
+
+Highlights come from ts_headline, which re-parses the document; it is
+only evaluated for the rows of the requested page.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.models.tables import Agent, Conversation, WikiPage
+
+SEARCH_KINDS = ("wiki_page", "conversation", "agent")
+SEARCH_CONFIG = "english"
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+_HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    'MaxWords=35, MinWords=12, MaxFragments=2, FragmentDelimiter=" … "'
+)
+# Normalisation flag 32 maps a rank r to r / (r + 1).
+_RANK_NORMALIZATION = 32
+_MARKS = re.compile(f"{re.escape(HIGHLIGHT_START)}|{re.escape(HIGHLIGHT_STOP)}")
+# Message text of the outer conversations row, for its highlight.
+_CONVERSATION_MESSAGES = literal_column(
+    "(SELECT string_agg(m ->> 'content', ' ') FROM jsonb_array_elements(conversations.messages) AS m)"
+)
+
+
+@dataclass
+class SearchHit:
+    entity_type: str
+    entity_id: uuid.UUID
+    world_id: uuid.UUID
+    title: str
+    highlight: str
+    score: float
+
+    @property
+    def snippet(self) -> str:
+        return _MARKS.sub("", self.highlight)
+
+
+def _config(name: str) -> ColumnElement:
+    # Inlined rather than bound so statements also compile with literal_binds.
+    return literal_column(f"'{name}'::regconfig")
+
+
+def _ts_query(q: str, config: str = SEARCH_CONFIG) -> ColumnElement:
+    return func.websearch_to_tsquery(_config(config), q)
+
+
+def _rank(vector: Any, query: ColumnElement) -> ColumnElement:
+    return func.ts_rank(vector, query, _RANK_NORMALIZATION)
+
+
+def _headline(document: Any, query: ColumnElement) -> ColumnElement:
+    return func.ts_headline(_config(SEARCH_CONFIG), func.coalesce(document, ""), query, _HEADLINE_OPTIONS)
+
+
+def wiki_page_match(q: str) -> tuple[ColumnElement, ColumnElement]:
+    """(where clause, score) for wiki pages matching q."""
+    query = _ts_query(q)
+    match = or_(WikiPage.search_vector.op("@@")(query), WikiPage.title.op("%")(q))
+    return match, func.greatest(_rank(WikiPage.search_vector, query), func.similarity(WikiPage.title, q))
+
+
+def wiki_page_headline(q: str) -> ColumnElement:
+    return _headline(WikiPage.content, _ts_query(q))
+
+
+def conversation_match(q: str) -> tuple[ColumnElement, ColumnElement]:
+    query = _ts_query(q)
+    return Conversation.search_vector.op("@@")(query), _rank(Conversation.search_vector, query)
+
+
+def _agent_query(q: str) -> ColumnElement:
+    # Names are indexed unstemmed ('simple'), roles stemmed; accept either.
+    return _ts_query(q, "simple").op("||")(_ts_query(q))
+
+
+def agent_match(q: str) -> tuple[ColumnElement, ColumnElement]:
+    query = _agent_query(q)
+    match = or_(Agent.search_vector.op("@@")(query), Agent.name.op("%")(q))
+    return match, func.greatest(_rank(Agent.search_vector, query), func.similarity(Agent.name, q))
+
+
+def _hits_query(
+    model: Any,
+    match: tuple[ColumnElement, ColumnElement],
+    columns: tuple[str, Any, Any],
+    world_id: uuid.UUID | None,
+    limit: int,
+) -> Select:
+    """Top `limit` matches by score, then title and highlight for just those rows."""
+    where, score = match
+    ranked = select(model.id, score.label("score")).where(where)
+    if world_id is not None:
+        ranked = ranked.where(model.world_id == world_id)
+    ranked = ranked.order_by(score.desc(), model.id).limit(limit).subquery()
+
+    entity_type, title, highlight = columns
+    return (
+        select(
+            literal(entity_type).label("entity_type"),
+            model.id,
+            model.world_id,
+            title.label("title"),
+            highlight.label("highlight"),
+            ranked.c.score,
+        )
+        .join(ranked, ranked.c.id == model.id)
+        .order_by(ranked.c.score.desc(), model.id)
+    )
+
+
+def search_queries(q: str, world_id: uuid.UUID | None, limit: int, kinds: tuple[str, ...] = SEARCH_KINDS) -> list[Select]:
+    queries = []
+    if "wiki_page" in kinds:
+        highlight = wiki_page_headline(q)
+        queries.append(_hits_query(WikiPage, wiki_page_match(q), ("wiki_page", WikiPage.title, highlight), world_id, limit))
+    if "conversation" in kinds:
+        document = func.concat_ws(" ", Conversation.summary, _CONVERSATION_MESSAGES)
+        highlight = _headline(document, _ts_query(q))
+        queries.append(
+            _hits_query(Conversation, conversation_match(q), ("conversation", Conversation.topic, highlight), world_id, limit)
+        )
+    if "agent" in kinds:
+        highlight = _headline(Agent.persona.op("->>")("role"), _agent_query(q))
+        queries.append(_hits_query(Agent, agent_match(q), ("agent", Agent.name, highlight), world_id, limit))
+    return queries
+
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    *,
+    world_id: uuid.UUID | None = None,
+    kinds: tuple[str, ...] = SEARCH_KINDS,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[SearchHit]:
+    """One page of hits across entity types, best first.
+
+    Each type contributes its own top offset + limit rows; merging those
+    is exact for the requested page.
+    """
+    hits: list[SearchHit] = []
+    for stmt in search_queries(q, world_id, offset + limit, kinds):
+        result = await db.execute(stmt)
+        hits.extend(
+            SearchHit(
+                entity_type=row.entity_type,
+                entity_id=row.id,
+                world_id=row.world_id,
+                title=row.title or "",
+                highlight=row.highlight or "",
+                score=float(row.score or 0.0),
+            )
+            for row in result.all()
+        )
+    hits.sort(key=lambda hit: (-hit.score, hit.entity_type, str(hit.entity_id)))
+    return hits[offset:offset + limit]
@@ -0,0 +1,89 @@
+"""Viewer demand for untranslated content, consumed by the translator.
+
+Read endpoints (/conversations, /feed, /wiki, /strata) note every row
+they serve whose Korean fields are still empty. The translator takes the
+most-read of those before its newest-first backfill, so a world someone
+is looking at is translated first, however old it is. Each translated
+row is announced to the world's WebSocket clients as translation.ready.
+
+Demand is in-process and bounded: past translation_demand_max_entries
+the least recently read entries are forgotten (backfill still reaches
+them eventually).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from null_engine.config import settings
+
+DEMAND_KINDS = ("conversation", "wiki_page", "stratum")
+
+
+@dataclass
+class Demand:
+    kind: str
+    entity_id: uuid.UUID
+    world_id: uuid.UUID
+    reads: int = 0
+
+
+class TranslationDemand:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, uuid.UUID], Demand] = OrderedDict()
+        self._arrived = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def note(self, kind: str, world_id: uuid.UUID, entity_ids: Iterable[uuid.UUID]) -> None:
+        noted = False
+        for entity_id in entity_ids:
+            key = (kind, entity_id)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = Demand(kind, entity_id, world_id)
+            entry.reads += 1
+            self._entries.move_to_end(key)
+            noted = True
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if noted:
+            self._arrived.set()
+
+    def take(self, kind: str, limit: int) -> list[Demand]:
+        """Remove and return up to limit entries of one kind, most-read (then most recent) first."""
+        # OrderedDict order is least → most recently read; reversed, a stable sort keeps recency as tie-break.
+        candidates = (entry for entry in reversed(self._entries.values()) if entry.kind == kind)
+        ranked = sorted(candidates, key=lambda entry: -entry.reads)[:limit]
+        for entry in ranked:
+            del self._entries[(entry.kind, entry.entity_id)]
+        if not self._entries:
+            self._arrived.clear()
+        return ranked
+
+    async def wait(self, timeout: float) -> None:
+        """Return when demand is pending, or after timeout seconds."""
+        try:
+            await asyncio.wait_for(self._arrived.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._arrived.clear()
+
+
+translation_demand = TranslationDemand(settings.translation_demand_max_entries)
+
+
+def note_untranslated(kind: str, world_id: uuid.UUID, rows: Iterable, field: str) -> None:
+    """Record demand for the rows whose Korean `field` is still NULL."""
+    ids = [row.id for row in rows if getattr(row, field) is None]
+    if ids:
+        translation_demand.note(kind, world_id, ids)
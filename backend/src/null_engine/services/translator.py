@@ -1,149 +1,296 @@
-"""Background translation worker — translates agent-generated content to Korean."""
+"""Background translation worker — translates agent-generated content to Korean.
+
+Each cycle collects every text field of the pending rows, drops texts the
+translation memory already holds (keyed by a hash of the source text, so
+recurring topics, names and boilerplate are translated once), and sends
+the rest as JSON arrays of up to translation_batch_segments strings per
+LLM call. A reply must be an array of the same length; a misaligned reply
+is bisected and retried, down to single-segment calls. A failed LLM call
+(LLMGenerationError) is not bisected: it fails the whole batch, which
+rolls back and is retried by the job queue with backoff.
+
+Batches run as translator.batch jobs (services/job_queue.py): one every
+INTERVAL_SECONDS, a follow-up straight away while batches come back full,
+and a priority one whenever viewers ask for rows
+(services/translation_demand.py); the rest of each batch backfills
+newest-first. Translated rows are pushed
+to the world's WebSocket clients as translation.ready.
+"""
 
 import asyncio
 import copy
+import hashlib
+import json
 import time
+import uuid
 
 import structlog
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from null_engine.config import settings
 from null_engine.db import async_session
-from null_engine.models.tables import Conversation, Stratum, WikiPage
+from null_engine.models.schemas import WSEnvelope
+from null_engine.models.tables import Conversation, Stratum, TranslationMemory, WikiPage
+from null_engine.services.job_queue import enqueue_job, pending_job_count, register_job
 from null_engine.services.llm_router import llm_router
+from null_engine.services.response_cache import bump_world_version
+from null_engine.services.translation_demand import DEMAND_KINDS, translation_demand
+from null_engine.services.world_stats import record_activity
+from null_engine.ws.handler import broadcast
 
 logger = structlog.get_logger()
 
-BATCH_SIZE = 5
 INTERVAL_SECONDS = 60
+TARGET_LANG = "ko"
+BATCH_JOB = "translator.batch"
 
 TRANSLATE_PROMPT = (
     "Translate the following English text to Korean. "
     "Output ONLY the Korean translation, nothing else.\n\n{text}"
 )
 
+BATCH_TRANSLATE_PROMPT = (
+    "Translate each English string in the following JSON array to Korean. "
+    "Output ONLY a JSON array of {count} strings, where item i is the Korean "
+    "translation of item i. Never merge, split, reorder or omit items.\n\n{segments}"
+)
+
 
 async def translate_to_korean(text: str) -> str | None:
-    """Translate a single text string to Korean via LLM."""
+    """Translate a single text string to Korean via LLM; raises LLMGenerationError if the call fails."""
     if not text or not text.strip():
         return None
-    try:
-        result = await llm_router.generate_text(
-            "translator",
-            TRANSLATE_PROMPT.format(text=text),
-            temperature=0.3,
-            max_tokens=2048,
+    result = await llm_router.generate_text(
+        "translator",
+        TRANSLATE_PROMPT.format(text=text),
+        temperature=0.3,
+        max_tokens=2048,
+    )
+    return result.strip() if result else None
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def pack_segments(texts: list[str], max_segments: int, max_chars: int) -> list[list[str]]:
+    """Split texts into consecutive chunks within both limits (an oversized text gets a chunk of its own)."""
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+    for text in texts:
+        if current and (len(current) >= max_segments or size + len(text) > max_chars):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _aligned(chunk: list[str], reply: object) -> bool:
+    return (
+        isinstance(reply, list)
+        and len(reply) == len(chunk)
+        and all(isinstance(item, str) and item.strip() for item in reply)
+    )
+
+
+async def _translate_chunk(chunk: list[str]) -> dict[str, str]:
+    if len(chunk) == 1:
+        ko = await translate_to_korean(chunk[0])
+        return {chunk[0]: ko} if ko else {}
+
+    chars = sum(len(text) for text in chunk)
+    # LLMGenerationError propagates: splitting would only multiply calls to a failing provider.
+    reply = await llm_router.generate_json(
+        "translator",
+        BATCH_TRANSLATE_PROMPT.format(count=len(chunk), segments=json.dumps(chunk, ensure_ascii=False)),
+        max_tokens=min(8192, max(1024, 2 * chars)),
+    )
+    if _aligned(chunk, reply):
+        return {text: ko.strip() for text, ko in zip(chunk, reply, strict=True)}
+
+    logger.warning("translator.batch_misaligned", segments=len(chunk))
+    mid = len(chunk) // 2
+    return {**await _translate_chunk(chunk[:mid]), **await _translate_chunk(chunk[mid:])}
+
+
+async def translate_batch(db: AsyncSession, texts: list[str]) -> dict[str, str]:
+    """Korean translations of the distinct non-blank texts, from memory or the LLM.
+
+    Texts that could not be translated are absent from the result. New
+    translations are added to the memory in the caller's transaction.
+    Raises LLMGenerationError if an LLM call fails.
+    """
+    sources = list(dict.fromkeys(text for text in texts if text and text.strip()))
+    if not sources:
+        return {}
+
+    by_hash = {source_hash(text): text for text in sources}
+    remembered = await db.execute(
+        select(TranslationMemory.source_hash, TranslationMemory.translation)
+        .where(TranslationMemory.target_lang == TARGET_LANG)
+        .where(TranslationMemory.source_hash.in_(list(by_hash)))
+    )
+    translations = {by_hash[row[0]]: row[1] for row in remembered.all()}
+    misses = [text for text in sources if text not in translations]
+
+    chunks = pack_segments(misses, settings.translation_batch_segments, settings.translation_batch_chars)
+    limiter = asyncio.Semaphore(max(1, settings.translation_concurrency))
+
+    async def _bounded(chunk: list[str]) -> dict[str, str]:
+        async with limiter:
+            return await _translate_chunk(chunk)
+
+    fresh: dict[str, str] = {}
+    for translated in await asyncio.gather(*(_bounded(chunk) for chunk in chunks)):
+        fresh.update(translated)
+    if fresh:
+        await db.execute(
+            pg_insert(TranslationMemory)
+            .values([
+                {"source_hash": source_hash(text), "target_lang": TARGET_LANG, "translation": ko}
+                for text, ko in fresh.items()
+            ])
+            .on_conflict_do_nothing()
         )
-        return result.strip() if result else None
-    except Exception:
-        logger.exception("translator.translate_failed")
-        return None
+
+    logger.info(
+        "translator.memory",
+        segments=len(sources),
+        memory_hits=len(translations),
+        translated=len(fresh),
+    )
+    translations.update(fresh)
+    return translations
 
 
-async def translate_messages(messages: list[dict]) -> list[dict] | None:
-    """Translate the content field of each message in a conversation messages list."""
+def translate_messages(messages: list[dict], translations: dict[str, str]) -> list[dict] | None:
+    """Copy a conversation messages list with each content replaced by its translation."""
     if not messages:
         return None
     translated = []
     for msg in messages:
         msg_copy = copy.copy(msg)
-        content = msg.get("content", "")
-        if content:
-            ko = await translate_to_korean(content)
-            if ko:
-                msg_copy["content"] = ko
-            # If translation fails, keep original
+        ko = translations.get(msg.get("content", ""))
+        if ko:
+            msg_copy["content"] = ko
+        # If translation fails, keep original
         translated.append(msg_copy)
     return translated
 
 
-async def _translate_conversations():
-    """Find conversations with NULL _ko fields and translate them."""
-    async with async_session() as db:
-        result = await db.execute(
-            select(Conversation)
-            .where(Conversation.topic_ko.is_(None))
-            .where(Conversation.topic != "")
-            .order_by(Conversation.created_at.desc())
-            .limit(BATCH_SIZE)
-        )
-        rows = result.scalars().all()
-
-        for conv in rows:
-            topic_ko = await translate_to_korean(conv.topic) if conv.topic else None
-            summary_ko = await translate_to_korean(conv.summary) if conv.summary else None
-            messages_ko = await translate_messages(conv.messages) if conv.messages else None
-
-            if topic_ko is not None:
-                conv.topic_ko = topic_ko
-            if summary_ko is not None:
-                conv.summary_ko = summary_ko
-            if messages_ko is not None:
-                conv.messages_ko = messages_ko
-
-            # Mark as processed even if translation partially failed
-            if conv.topic_ko is None:
-                conv.topic_ko = conv.topic or ""
-
-            logger.info("translator.conversation_done", id=str(conv.id))
-
-        await db.commit()
-        return len(rows)
-
-
-async def _translate_wiki_pages():
-    """Find wiki pages with NULL _ko fields and translate them."""
-    async with async_session() as db:
+_PENDING = {
+    "conversation": (Conversation, Conversation.topic_ko.is_(None), Conversation.topic != ""),
+    "wiki_page": (WikiPage, WikiPage.title_ko.is_(None), WikiPage.title != ""),
+    "stratum": (Stratum, Stratum.summary_ko.is_(None), Stratum.summary != ""),
+}
+_BACKFILL_ORDER = {
+    "conversation": Conversation.created_at.desc(),
+    "wiki_page": WikiPage.created_at.desc(),
+    "stratum": Stratum.epoch.desc(),
+}
+
+
+async def _pending_rows(db: AsyncSession, kind: str, demanded: list[uuid.UUID]) -> list:
+    """Up to translation_batch_rows untranslated rows of one kind, demanded ones first.
+
+    Rows are locked until the batch commits and rows locked by a concurrent
+    batch are skipped, so parallel translation jobs never share a row.
+    """
+    model, untranslated, non_empty = _PENDING[kind]
+    limit = settings.translation_batch_rows
+    rows = []
+    if demanded:
         result = await db.execute(
-            select(WikiPage)
-            .where(WikiPage.title_ko.is_(None))
-            .where(WikiPage.title != "")
-            .order_by(WikiPage.created_at.desc())
-            .limit(BATCH_SIZE)
+            select(model)
+            .where(model.id.in_(demanded[:limit]))
+            .where(untranslated)
+            .where(non_empty)
+            .with_for_update(skip_locked=True)
         )
-        rows = result.scalars().all()
-
-        for page in rows:
-            title_ko = await translate_to_korean(page.title) if page.title else None
-            content_ko = await translate_to_korean(page.content) if page.content else None
-
-            if title_ko is not None:
-                page.title_ko = title_ko
-            if content_ko is not None:
-                page.content_ko = content_ko
-
-            # Mark as processed
-            if page.title_ko is None:
-                page.title_ko = page.title or ""
-
-            logger.info("translator.wiki_page_done", id=str(page.id))
-
-        await db.commit()
-        return len(rows)
-
-
-async def _translate_strata():
-    """Find strata with NULL summary_ko and translate them."""
-    async with async_session() as db:
-        result = await db.execute(
-            select(Stratum)
-            .where(Stratum.summary_ko.is_(None))
-            .where(Stratum.summary != "")
-            .limit(BATCH_SIZE)
-        )
-        rows = result.scalars().all()
-
-        for s in rows:
-            summary_ko = await translate_to_korean(s.summary) if s.summary else None
-
-            if summary_ko is not None:
-                s.summary_ko = summary_ko
-            else:
-                s.summary_ko = s.summary or ""
-
-            logger.info("translator.stratum_done", id=str(s.id))
-
-        await db.commit()
-        return len(rows)
+        rows = list(result.scalars().all())
+    if len(rows) < limit:
+        stmt = select(model).where(untranslated).where(non_empty)
+        if rows:
+            stmt = stmt.where(model.id.notin_([row.id for row in rows]))
+        stmt = stmt.order_by(_BACKFILL_ORDER[kind]).limit(limit - len(rows)).with_for_update(skip_locked=True)
+        result = await db.execute(stmt)
+        rows += result.scalars().all()
+    return rows
+
+
+async def _announce(kind: str, row, fields: dict) -> None:
+    try:
+        await broadcast(row.world_id, WSEnvelope(
+            type="translation.ready",
+            payload={"entity_type": kind, "id": str(row.id), **fields},
+        ))
+    except Exception:
+        logger.warning("translator.announce_failed", entity_type=kind, id=str(row.id))
+
+
+async def translate_pending(db: AsyncSession, demanded: dict[str, list[uuid.UUID]] | None = None) -> dict[str, int]:
+    """Translate one batch of untranslated conversations, wiki pages and strata.
+
+    demanded maps an entity kind to the ids viewers asked for, most wanted first.
+    """
+    wanted = {kind: (demanded or {}).get(kind, []) for kind in _PENDING}
+    conversations = await _pending_rows(db, "conversation", wanted["conversation"])
+    wiki_pages = await _pending_rows(db, "wiki_page", wanted["wiki_page"])
+    strata = await _pending_rows(db, "stratum", wanted["stratum"])
+
+    texts: list[str] = []
+    for conv in conversations:
+        texts += [conv.topic, conv.summary]
+        texts += [m.get("content", "") for m in conv.messages or []]
+    for page in wiki_pages:
+        texts += [page.title, page.content]
+    texts += [s.summary for s in strata]
+    translations = await translate_batch(db, texts)
+
+    for conv in conversations:
+        if conv.summary in translations:
+            conv.summary_ko = translations[conv.summary]
+        if conv.messages:
+            conv.messages_ko = translate_messages(conv.messages, translations)
+        # Mark as processed even if translation partially failed
+        conv.topic_ko = translations.get(conv.topic, conv.topic or "")
+        logger.info("translator.conversation_done", id=str(conv.id))
+
+    for page in wiki_pages:
+        if page.content in translations:
+            page.content_ko = translations[page.content]
+        # Mark as processed
+        page.title_ko = translations.get(page.title, page.title or "")
+        logger.info("translator.wiki_page_done", id=str(page.id))
+
+    for s in strata:
+        s.summary_ko = translations.get(s.summary, s.summary or "")
+        logger.info("translator.stratum_done", id=str(s.id))
+
+    world_ids = {row.world_id for row in [*conversations, *wiki_pages, *strata]}
+    for world_id in world_ids:
+        # Moves data_version, so export artifacts with *_ko columns are rebuilt.
+        await record_activity(db, world_id)
+    await db.commit()
+    for world_id in world_ids:
+        await bump_world_version(world_id)
+
+    for conv in conversations:
+        await _announce("conversation", conv, {
+            "topic_ko": conv.topic_ko, "summary_ko": conv.summary_ko, "messages_ko": conv.messages_ko,
+        })
+    for page in wiki_pages:
+        await _announce("wiki_page", page, {"title_ko": page.title_ko, "content_ko": page.content_ko})
+    for s in strata:
+        await _announce("stratum", s, {"summary_ko": s.summary_ko})
+
+    return {"conversations": len(conversations), "wiki_pages": len(wiki_pages), "strata": len(strata)}
 
 
 async def _count_pending() -> dict[str, int]:
@@ -175,34 +322,44 @@ async def _count_pending() -> dict[str, int]:
         }
 
 
-async def translation_worker_loop():
-    """Background loop that periodically translates untranslated content."""
-    logger.info("translator.worker_started")
+async def run_translation_batch(payload: dict) -> None:
+    """Job handler: translate one batch, the ids in payload["demanded"] first."""
+    cycle_started = time.monotonic()
+    pending = await _count_pending()
+    logger.info("translator.queue", **pending)
+
+    demanded = {
+        kind: [uuid.UUID(entity_id) for entity_id in ids]
+        for kind, ids in (payload.get("demanded") or {}).items()
+    }
+    async with async_session() as db:
+        counts = await translate_pending(db, demanded)
+
+    logger.info(
+        "translator.batch_done",
+        **counts,
+        translated_total=sum(counts.values()),
+        duration_ms=int((time.monotonic() - cycle_started) * 1000),
+        **pending,
+    )
+    # A full batch means more rows are waiting: queue the next one now,
+    # keeping up to translation_max_jobs batches (this one included) going.
+    if max(counts.values()) >= settings.translation_batch_rows:
+        if await pending_job_count(BATCH_JOB) < settings.translation_max_jobs:
+            await enqueue_job(BATCH_JOB)
+
+
+register_job(BATCH_JOB, run_translation_batch, every_seconds=INTERVAL_SECONDS)
+
+
+async def translation_demand_loop():
+    """Turn viewer demand seen by this process into priority translation jobs."""
+    logger.info("translator.demand_loop_started")
     while True:
-        try:
-            await asyncio.sleep(INTERVAL_SECONDS)
-            cycle_started = time.monotonic()
-
-            pending = await _count_pending()
-            logger.info("translator.queue", **pending)
-
-            conv_count = await _translate_conversations()
-            wiki_count = await _translate_wiki_pages()
-            strata_count = await _translate_strata()
-
-            duration_ms = int((time.monotonic() - cycle_started) * 1000)
-            logger.info(
-                "translator.batch_done",
-                conversations=conv_count,
-                wiki_pages=wiki_count,
-                strata=strata_count,
-                translated_total=conv_count + wiki_count + strata_count,
-                duration_ms=duration_ms,
-                **pending,
-            )
-        except asyncio.CancelledError:
-            logger.info("translator.worker_stopped")
-            break
-        except Exception:
-            logger.exception("translator.worker_error")
-            await asyncio.sleep(10)
+        await translation_demand.wait(INTERVAL_SECONDS)
+        demanded = {
+            kind: [str(demand.entity_id) for demand in translation_demand.take(kind, settings.translation_batch_rows)]
+            for kind in DEMAND_KINDS
+        }
+        if any(demanded.values()):
+            await enqueue_job(BATCH_JOB, {"demanded": demanded}, priority=-1)
@@ -0,0 +1,142 @@
+"""Delta-compressed wiki page history.
+
+wiki_history keeps one row per superseded version of a page. Most rows
+hold only a reverse delta, the line operations that turn the next newer
+version on record (the next history row, or the live page) into this
+one; every wiki_snapshot_every-th version, and any version whose delta
+would not be smaller, is stored in full. Deltas are built at write time
+from the two texts already in hand, and any version is rebuilt from the
+nearest snapshot (or the live page) above it by at most
+wiki_snapshot_every - 1 deltas.
+
+A delta is a JSON list of operations over the newer text's lines:
+
+- n (n > 0): copy the next n lines
+- -n: skip the next n lines
+- ["line\\n", ...]: insert these lines
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.config import settings
+from null_engine.models.tables import WikiHistory, WikiPage
+
+Delta = list[int | list[str]]
+
+
+def make_delta(newer: str, older: str) -> Delta:
+    """Line operations that turn newer into older."""
+    a = newer.splitlines(keepends=True)
+    b = older.splitlines(keepends=True)
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(b[j1:j2])
+    return delta
+
+
+def apply_delta(newer: str, delta: Delta) -> str:
+    lines = newer.splitlines(keepends=True)
+    out: list[str] = []
+    pos = 0
+    for op in delta:
+        if isinstance(op, list):
+            out.extend(op)
+        elif op > 0:
+            out.extend(lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return "".join(out)
+
+
+def history_entry(page: WikiPage, new_content: str) -> WikiHistory:
+    """The history row that keeps page's current version once it becomes new_content."""
+    old = page.content or ""
+    if page.version % max(1, settings.wiki_snapshot_every) != 0:
+        delta = make_delta(new_content, old)
+        if len(json.dumps(delta)) < len(old):
+            return WikiHistory(page_id=page.id, version=page.version, content=None, delta=delta)
+    return WikiHistory(page_id=page.id, version=page.version, content=old, delta=None)
+
+
+async def reconstruct_version(db: AsyncSession, page: WikiPage, version: int) -> str | None:
+    """Full text of page at version, or None if that version isn't on record.
+
+    Also None when the chain down to version has a gap (a version written
+    without its history row): a delta applied to any text but the one it
+    was made from would return wrong text, not an error.
+    """
+    if version == page.version:
+        return page.content or ""
+    if version < 1 or version > page.version:
+        return None
+
+    # The chain ends at the first snapshot at or above version, else at the live page.
+    snapshot = (await db.execute(
+        select(func.min(WikiHistory.version)).where(
+            WikiHistory.page_id == page.id,
+            WikiHistory.version >= version,
+            WikiHistory.content.is_not(None),
+        )
+    )).scalar()
+    stmt = (
+        select(WikiHistory.version, WikiHistory.content, WikiHistory.delta)
+        .where(WikiHistory.page_id == page.id, WikiHistory.version >= version)
+        .order_by(WikiHistory.version.desc(), WikiHistory.created_at.desc())
+    )
+    if snapshot is not None:
+        stmt = stmt.where(WikiHistory.version <= snapshot)
+    rows = (await db.execute(stmt)).all()
+    if not rows or rows[-1].version != version:
+        return None
+
+    text = page.content or ""
+    # Each row must be the version right below the text in hand.
+    expected = snapshot if snapshot is not None else page.version - 1
+    for row in rows:
+        if row.version == expected + 1:
+            # Duplicate rows from concurrent edits; the newest one is the chain link.
+            continue
+        if row.version != expected:
+            return None
+        text = row.content if row.content is not None else apply_delta(text, row.delta or [])
+        expected -= 1
+    return text
+
+
+def unified_diff(older: str, newer: str, *, from_version: int, to_version: int, context: int = 3) -> str:
+    return "".join(difflib.unified_diff(
+        older.splitlines(keepends=True),
+        newer.splitlines(keepends=True),
+        fromfile=f"v{from_version}",
+        tofile=f"v{to_version}",
+        n=context,
+    ))
+
+
+async def history_versions(db: AsyncSession, page_id: uuid.UUID) -> list:
+    """Version metadata, newest first, without loading any text."""
+    result = await db.execute(
+        select(
+            WikiHistory.version,
+            WikiHistory.created_at,
+            WikiHistory.edited_by_agent,
+            WikiHistory.content.is_not(None).label("snapshot"),
+        )
+        .where(WikiHistory.page_id == page_id)
+        .order_by(WikiHistory.version.desc())
+    )
+    return list(result.all())
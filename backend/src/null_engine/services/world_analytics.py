@@ -0,0 +1,266 @@
+"""Relationship-graph analytics behind the faction-power and agent-influence endpoints.
+
+A world's relationships are loaded once per version — (current_epoch,
+current_tick, world_stats.data_version), which every tick and every
+recorded write moves — into a symmetric sparse matrix held as numpy
+COO arrays (row, col, strength), and everything the endpoints serve is
+computed from it in one vectorized pass:
+
+- influence: weighted PageRank over relationship strength, so an agent
+  is influential when agents with strong ties to it are
+- per agent: relationship count, mean strength, allies (> ALLY_STRENGTH),
+  rivals (< RIVAL_STRENGTH) and conversations taken part in
+- per faction: cohesion (mean strength of ties inside the faction),
+  tension (mean 1 - strength of ties to other factions, overall and per
+  faction pair), summed member influence and participation
+
+Snapshots are cached per world in process; a request costs one signature
+query and dict lookups until the world changes.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.models.tables import Agent, Conversation, Faction, Relationship, World, WorldStats
+
+logger = structlog.get_logger()
+
+ALLY_STRENGTH = 0.6
+RIVAL_STRENGTH = 0.3
+# Strength of a tie nobody has moved yet; also the cohesion of a faction without internal ties.
+NEUTRAL_STRENGTH = 0.5
+PAGERANK_DAMPING = 0.85
+PAGERANK_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-8
+_MAX_CACHED_WORLDS = 256
+
+
+@dataclass(frozen=True)
+class AgentStats:
+    name: str
+    faction_id: uuid.UUID | None
+    influence: float  # PageRank; sums to 1 over the world
+    influence_rank: int  # 1 = most influential
+    relationships: int
+    avg_strength: float
+    allies: int
+    rivals: int
+    conversations: int
+
+
+@dataclass(frozen=True)
+class FactionStats:
+    name: str
+    color: str | None
+    agent_count: int
+    cohesion: float
+    tension: float
+    influence: float
+    conversations: int
+    power: float
+
+
+@dataclass
+class WorldAnalytics:
+    epoch: int
+    max_influence: float
+    agents: dict[uuid.UUID, AgentStats]
+    factions: dict[uuid.UUID, FactionStats]
+    # (faction_a, faction_b) with a < b -> mean 1 - strength of the ties between them.
+    tensions: dict[tuple[uuid.UUID, uuid.UUID], float]
+
+
+_snapshots: OrderedDict[uuid.UUID, tuple[tuple, WorldAnalytics]] = OrderedDict()
+
+
+def pagerank(n: int, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted PageRank of the n-node graph with edges rows[k] -> cols[k].
+
+    Power iteration over the sparse edge arrays; nodes without outgoing
+    weight spread theirs evenly, so the result always sums to 1.
+    """
+    if n == 0:
+        return np.zeros(0)
+    out_weight = np.bincount(rows, weights=weights, minlength=n)
+    dangling = out_weight == 0
+    share = np.divide(weights, out_weight[rows], out=np.zeros_like(weights), where=out_weight[rows] > 0)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_ITERATIONS):
+        spread = np.bincount(cols, weights=share * rank[rows], minlength=n)
+        new = (1 - PAGERANK_DAMPING) / n + PAGERANK_DAMPING * (spread + rank[dangling].sum() / n)
+        if np.abs(new - rank).sum() < PAGERANK_TOLERANCE:
+            return new
+        rank = new
+    return rank
+
+
+def _group_mean(keys: np.ndarray, values: np.ndarray, size: int, default: float) -> np.ndarray:
+    counts = np.bincount(keys, minlength=size)
+    sums = np.bincount(keys, weights=values, minlength=size)
+    return np.divide(sums, counts, out=np.full(size, default), where=counts > 0)
+
+
+def compute_analytics(
+    epoch: int,
+    agents: list[tuple[uuid.UUID, str, uuid.UUID | None]],
+    factions: list[tuple[uuid.UUID, str, str | None]],
+    relationships: list[tuple[uuid.UUID, uuid.UUID, float | None]],
+    participation: dict[uuid.UUID, int],
+) -> WorldAnalytics:
+    """Analytics from (id, name, faction_id) agents, (id, name, color) factions,
+    (agent_a, agent_b, strength) relationships and conversations per agent."""
+    n, k = len(agents), len(factions)
+    agent_index = {agent_id: i for i, (agent_id, _, _) in enumerate(agents)}
+    faction_index = {faction_id: i for i, (faction_id, _, _) in enumerate(factions)}
+    member_of = np.array([faction_index.get(faction_id, -1) for _, _, faction_id in agents], dtype=np.int64)
+
+    ties = [
+        (agent_index[a], agent_index[b], NEUTRAL_STRENGTH if strength is None else strength)
+        for a, b, strength in relationships
+        if a in agent_index and b in agent_index and a != b
+    ]
+    a_idx = np.array([t[0] for t in ties], dtype=np.int64)
+    b_idx = np.array([t[1] for t in ties], dtype=np.int64)
+    strength = np.clip(np.array([t[2] for t in ties], dtype=np.float64), 0.0, 1.0)
+
+    # Relationships are undirected: each row is an edge both ways.
+    rows = np.concatenate([a_idx, b_idx])
+    cols = np.concatenate([b_idx, a_idx])
+    both = np.concatenate([strength, strength])
+
+    rank = pagerank(n, rows, cols, both)
+    order = np.argsort(-rank, kind="stable")
+    rank_of = np.empty(n, dtype=np.int64)
+    rank_of[order] = np.arange(1, n + 1)
+    degree = np.bincount(rows, minlength=n)
+    avg_strength = _group_mean(rows, both, n, NEUTRAL_STRENGTH)
+    allies = np.bincount(rows, weights=both > ALLY_STRENGTH, minlength=n)
+    rivals = np.bincount(rows, weights=both < RIVAL_STRENGTH, minlength=n)
+    conversations = np.array([participation.get(agent_id, 0) for agent_id, _, _ in agents], dtype=np.int64)
+
+    fa, fb = member_of[a_idx], member_of[b_idx]
+    known = (fa >= 0) & (fb >= 0)
+    inside = known & (fa == fb)
+    across = known & (fa != fb)
+    cohesion = _group_mean(fa[inside], strength[inside], k, NEUTRAL_STRENGTH)
+    # Each cross tie counts toward both factions' tension.
+    tension = _group_mean(
+        np.concatenate([fa[across], fb[across]]), np.tile(1 - strength[across], 2), k, 0.0,
+    )
+    lo, hi = np.minimum(fa[across], fb[across]), np.maximum(fa[across], fb[across])
+    pair_tension = _group_mean(lo * k + hi, 1 - strength[across], k * k, np.nan)
+
+    members = member_of >= 0
+    agent_count = np.bincount(member_of[members], minlength=k)
+    influence = np.bincount(member_of[members], weights=rank[members], minlength=k)
+    faction_conversations = np.bincount(member_of[members], weights=conversations[members], minlength=k)
+    # Influence share in percent, scaled up or down by how united the faction is.
+    power = 100 * influence * (cohesion / NEUTRAL_STRENGTH)
+
+    return WorldAnalytics(
+        epoch=epoch,
+        max_influence=float(rank.max()) if n else 0.0,
+        agents={
+            agent_id: AgentStats(
+                name=name,
+                faction_id=faction_id,
+                influence=float(rank[i]),
+                influence_rank=int(rank_of[i]),
+                relationships=int(degree[i]),
+                avg_strength=float(avg_strength[i]),
+                allies=int(allies[i]),
+                rivals=int(rivals[i]),
+                conversations=int(conversations[i]),
+            )
+            for i, (agent_id, name, faction_id) in enumerate(agents)
+        },
+        factions={
+            faction_id: FactionStats(
+                name=name,
+                color=color,
+                agent_count=int(agent_count[f]),
+                cohesion=float(cohesion[f]),
+                tension=float(tension[f]),
+                influence=float(influence[f]),
+                conversations=int(faction_conversations[f]),
+                power=float(power[f]),
+            )
+            for f, (faction_id, name, color) in enumerate(factions)
+        },
+        tensions={
+            (factions[int(cell) // k][0], factions[int(cell) % k][0]): float(pair_tension[cell])
+            for cell in np.flatnonzero(~np.isnan(pair_tension))
+        },
+    )
+
+
+def signature_query(world_id: uuid.UUID):
+    return (
+        select(World.current_epoch, World.current_tick, func.coalesce(WorldStats.data_version, 0))
+        .outerjoin(WorldStats, WorldStats.world_id == World.id)
+        .where(World.id == world_id)
+    )
+
+
+def participation_query(world_id: uuid.UUID):
+    participant = (
+        select(func.jsonb_array_elements_text(Conversation.participants).label("agent_id"))
+        .where(Conversation.world_id == world_id)
+        .subquery("participant")
+    )
+    return select(participant.c.agent_id, func.count()).group_by(participant.c.agent_id)
+
+
+async def _load(db: AsyncSession, world_id: uuid.UUID, epoch: int) -> WorldAnalytics:
+    agents = (await db.execute(
+        select(Agent.id, Agent.name, Agent.faction_id).where(Agent.world_id == world_id).order_by(Agent.created_at)
+    )).all()
+    factions = (await db.execute(
+        select(Faction.id, Faction.name, Faction.color).where(Faction.world_id == world_id).order_by(Faction.name)
+    )).all()
+    relationships = (await db.execute(
+        select(Relationship.agent_a, Relationship.agent_b, Relationship.strength)
+        .where(Relationship.world_id == world_id)
+    )).all()
+    participation: dict[uuid.UUID, int] = {}
+    for agent_id, count in (await db.execute(participation_query(world_id))).all():
+        try:
+            participation[uuid.UUID(agent_id)] = int(count)
+        except (TypeError, ValueError):
+            continue
+    return compute_analytics(
+        epoch,
+        [tuple(row) for row in agents],
+        [tuple(row) for row in factions],
+        [tuple(row) for row in relationships],
+        participation,
+    )
+
+
+async def get_world_analytics(db: AsyncSession, world_id: uuid.UUID) -> WorldAnalytics | None:
+    """The world's analytics as of its current version, or None if the world doesn't exist."""
+    row = (await db.execute(signature_query(world_id))).one_or_none()
+    if row is None:
+        return None
+    signature = tuple(row)
+    cached = _snapshots.get(world_id)
+    if cached is not None and cached[0] == signature:
+        _snapshots.move_to_end(world_id)
+        return cached[1]
+
+    analytics = await _load(db, world_id, int(row[0] or 0))
+    _snapshots[world_id] = (signature, analytics)
+    _snapshots.move_to_end(world_id)
+    while len(_snapshots) > _MAX_CACHED_WORLDS:
+        _snapshots.popitem(last=False)
+    logger.info("world_analytics.built", world_id=str(world_id), agents=len(analytics.agents),
+                factions=len(analytics.factions))
+    return analytics
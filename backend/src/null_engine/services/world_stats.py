@@ -0,0 +1,86 @@
+"""Incremental per-world counters backing /worlds and the faction endpoints.
+
+Write paths call record_activity() on the session that performs the write,
+so the counter moves in the same transaction as the row it counts (a
+rolled-back tick rolls the bump back too). The update is a single
+INSERT ... ON CONFLICT upsert, so worlds without a stats row yet need no
+special casing.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.models.tables import WorldStats
+
+# Per-key sum of the stored and incoming {faction_id: n} maps.
+_MERGE_FACTION_COUNTS = literal_column(
+    """(
+        SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+        FROM (
+            SELECT key, SUM(value::int) AS total
+            FROM (
+                SELECT * FROM jsonb_each_text(world_stats.faction_agent_counts)
+                UNION ALL
+                SELECT * FROM jsonb_each_text(excluded.faction_agent_counts)
+            ) AS merged
+            GROUP BY key
+        ) AS totals
+    )"""
+)
+
+_COUNTERS = {
+    "agents": "agent_count",
+    "conversations": "conversation_count",
+    "wiki_pages": "wiki_page_count",
+    "posts": "post_count",
+    "claims": "claim_count",
+    "canon": "canon_count",
+}
+
+
+async def record_activity(
+    db: AsyncSession,
+    world_id: uuid.UUID,
+    *,
+    latest_topic: str | None = None,
+    faction_agents: dict[uuid.UUID, int] | None = None,
+    **deltas: int,
+) -> None:
+    """Add deltas (agents=, conversations=, wiki_pages=, posts=, claims=, canon=) to the world's counters."""
+    unknown = set(deltas) - set(_COUNTERS)
+    if unknown:
+        raise TypeError(f"unknown world_stats counters: {sorted(unknown)}")
+
+    values: dict = {_COUNTERS[k]: v for k, v in deltas.items()}
+    values.update(
+        world_id=world_id,
+        latest_topic=latest_topic[:500] if latest_topic else None,
+        last_activity_at=datetime.utcnow(),
+        data_version=1,
+        faction_agent_counts={str(k): v for k, v in (faction_agents or {}).items()},
+    )
+
+    stmt = pg_insert(WorldStats).values(**values)
+    table = WorldStats.__table__
+    set_ = {
+        column: table.c[column] + stmt.excluded[column]
+        for column in _COUNTERS.values()
+        if column in values
+    }
+    set_["data_version"] = table.c.data_version + 1
+    set_["last_activity_at"] = stmt.excluded.last_activity_at
+    if latest_topic:
+        set_["latest_topic"] = stmt.excluded.latest_topic
+    if faction_agents:
+        set_["faction_agent_counts"] = _MERGE_FACTION_COUNTS
+
+    await db.execute(stmt.on_conflict_do_update(index_elements=[table.c.world_id], set_=set_))
+
+
+async def get_world_stats(db: AsyncSession, world_id: uuid.UUID) -> WorldStats | None:
+    result = await db.execute(select(WorldStats).where(WorldStats.world_id == world_id))
+    return result.scalar_one_or_none()
@@ -16,3 +16,13 @@ def _allow_anonymous_writes():
     yield
     settings.api_write_token = original_token
     settings.allow_anonymous_writes = original_anon
+
+
+@pytest.fixture(autouse=True)
+def _fresh_response_cache():
+    """Cached read models must not leak between tests that fake different DB rows."""
+    from null_engine.services.response_cache import clear_response_cache
+
+    clear_response_cache()
+    yield
+    clear_response_cache()
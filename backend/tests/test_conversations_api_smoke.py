@@ -32,8 +32,10 @@ class _ExecuteResult:
 class _QueueSession:
     def __init__(self, batches: list[list[Any]]):
         self._batches = list(batches)
+        self.statements: list[Any] = []
 
-    async def execute(self, _stmt: Any) -> _ExecuteResult:
+    async def execute(self, stmt: Any) -> _ExecuteResult:
+        self.statements.append(stmt)
         if not self._batches:
             raise AssertionError("Unexpected DB execute call")
         return _ExecuteResult(self._batches.pop(0))
@@ -46,13 +48,14 @@ def anyio_backend():
 
 @pytest.fixture
 def override_db():
-    def _install(*batches: list[Any]) -> None:
+    def _install(*batches: list[Any]) -> _QueueSession:
         session = _QueueSession(list(batches))
 
         async def _override():
             yield session
 
         app.dependency_overrides[get_db] = _override
+        return session
 
     yield _install
     app.dependency_overrides.pop(get_db, None)
@@ -95,6 +98,32 @@ async def test_list_conversations_smoke(override_db) -> None:
     assert data[0]["participants"][0]["faction_color"] == "#00ffcc"
 
 
+@pytest.mark.anyio
+async def test_list_conversations_keyset_cursor(override_db) -> None:
+    world_id = uuid4()
+    session = override_db([])
+    cursor_id = uuid4()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            f"/api/worlds/{world_id}/conversations",
+            params={"before_created_at": "2026-01-01T00:00:00+00:00", "before_id": str(cursor_id), "offset": 40},
+        )
+        partial = await client.get(
+            f"/api/worlds/{world_id}/conversations",
+            params={"before_id": str(cursor_id)},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json() == []
+    sql = str(session.statements[0]).lower()
+    assert "(conversations.created_at, conversations.id) <" in sql
+    assert "offset" not in sql
+    assert "embedding" not in sql.split("from")[0]
+    assert partial.status_code == 422
+
+
 @pytest.mark.anyio
 async def test_feed_smoke(override_db) -> None:
     world_id = uuid4()
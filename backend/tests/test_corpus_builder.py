@@ -0,0 +1,199 @@
+import json
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from null_engine.main import app
+from null_engine.services import corpus_builder
+from null_engine.services.corpus_builder import (
+    CorpusBuilder,
+    CorpusOptions,
+    LshIndex,
+    MinHasher,
+    build_corpus,
+    quality_issue,
+)
+
+LOREM = (
+    "The river guild of Hanseong taxes every barge that passes the third lock, and the salt merchants "
+    "answer by routing cargo through the mountain passes where the old monastery still keeps its own "
+    "tolls. Each winter the council debates whether to flood the lower valley for a new reservoir."
+)
+OTHER = (
+    "Automaton scribes in the northern archive copy weather almanacs by lamplight; their brass fingers "
+    "wear grooves into the desks. Nobody remembers who first wound them, and the archivists argue about "
+    "whether the machines are owed wages, rest days, or merely fresh oil at the solstice festival."
+)
+THIRD = (
+    "Sky pirates over the southern delta trade in forged weather permits. The admiralty pretends not to "
+    "notice, because half its captains buy the same permits to skip inspections before the monsoon fleet "
+    "departs, and the forgers have started signing their work with a small painted heron."
+)
+
+
+class _FakeStreamResult:
+    def __init__(self, items: list[Any]):
+        self._items = items
+
+    def scalars(self) -> "_FakeStreamResult":
+        return self
+
+    async def partitions(self, size: int):
+        for start in range(0, len(self._items), size):
+            yield self._items[start:start + size]
+
+
+class _StreamSession:
+    def __init__(self, batches: list[list[Any]]):
+        self._batches = list(batches)
+
+    async def __aenter__(self) -> "_StreamSession":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        return None
+
+    async def stream(self, _stmt: Any) -> _FakeStreamResult:
+        return _FakeStreamResult(self._batches.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _wiki_sample(content: str) -> dict[str, Any]:
+    return {"instruction": "Write a wiki article about: Hanseong", "input": "", "output": content}
+
+
+def test_minhash_lsh_flags_near_duplicates_only() -> None:
+    options = CorpusOptions()
+    hasher = MinHasher(options.num_perm, options.shingle_size)
+    index = LshIndex(options.bands, options.rows)
+
+    assert index.add_if_new(hasher.signature(LOREM))
+    # One word changed at the end: same page, re-rendered in a later epoch.
+    assert not index.add_if_new(hasher.signature(LOREM.replace("reservoir", "canal")))
+    assert index.add_if_new(hasher.signature(OTHER))
+    assert len(index) == 2
+
+
+def test_quality_filters() -> None:
+    options = CorpusOptions(min_chars=50, max_chars=2000)
+
+    assert quality_issue("too small", options) == "too_short"
+    assert quality_issue("x" * 2001, options) == "too_long"
+    assert quality_issue("all hail the council " * 20, options) == "repetitive"
+    assert quality_issue(LOREM, options) is None
+
+
+def test_builder_writes_balanced_shards_and_manifest(tmp_path) -> None:
+    world_id = str(uuid.uuid4())
+    builder = CorpusBuilder(tmp_path, CorpusOptions(include=frozenset({"wiki"}), shard_bytes=500))
+    builder.add(world_id, "wiki", [
+        _wiki_sample(LOREM),
+        _wiki_sample(LOREM),
+        _wiki_sample(OTHER),
+        _wiki_sample("stub"),
+        _wiki_sample(THIRD),
+    ])
+    manifest = builder.finish()
+
+    assert manifest["samples_seen"] == 5
+    assert manifest["samples_kept"] == 3
+    assert manifest["dropped"] == {"near_duplicate": 1, "too_short": 1}
+    assert [s["samples"] for s in manifest["shards"]] == [2, 1]
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+
+    lines = []
+    for shard in manifest["shards"]:
+        path = tmp_path / shard["path"]
+        assert path.stat().st_size == shard["file_bytes"]
+        lines.extend(path.read_text().splitlines())
+    assert [json.loads(line)["output"] for line in lines] == [LOREM, OTHER, THIRD]
+
+
+@pytest.mark.anyio
+async def test_build_corpus_streams_all_requested_worlds(tmp_path, monkeypatch) -> None:
+    def _conversation(summary: str) -> SimpleNamespace:
+        return SimpleNamespace(topic="Salt tolls", summary=summary, messages=[{"agent_id": "a1", "content": "Hi"}])
+
+    session = _StreamSession([
+        [_conversation(LOREM)],
+        [SimpleNamespace(title="Hanseong", content=OTHER)],
+        [_conversation(LOREM + " Indeed.")],
+        [SimpleNamespace(title="Archive", content=THIRD)],
+    ])
+    monkeypatch.setattr(corpus_builder, "async_session", lambda: session)
+    worlds = (uuid.uuid4(), uuid.uuid4())
+
+    manifest = await build_corpus(tmp_path, CorpusOptions(world_ids=worlds))
+
+    assert manifest["worlds"] == 2
+    assert manifest["kept_by_source"] == {"conversations": 1, "wiki": 2}
+    assert manifest["dropped"] == {"near_duplicate": 1}
+    assert (tmp_path / "shard-00000.jsonl").exists()
+
+
+@pytest.mark.anyio
+async def test_create_corpus_build_rejects_unknown_sources() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/api/exports/corpus", json={"include": "kg"})
+
+    assert resp.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_create_corpus_build_queues_the_build_in_its_transaction(tmp_path, monkeypatch) -> None:
+    class _BuildSession:
+        def __init__(self):
+            self.added: list[Any] = []
+            self.commits = 0
+
+        def add(self, row: Any) -> None:
+            self.added.append(row)
+
+        async def flush(self) -> None:
+            pass
+
+        async def commit(self) -> None:
+            self.commits += 1
+
+        async def refresh(self, _row: Any) -> None:
+            pass
+
+    enqueued: list[tuple[str, dict, str]] = []
+
+    async def _enqueue(kind, payload, *, dedupe_key, db):
+        assert db.commits == 0
+        enqueued.append((kind, payload, dedupe_key))
+        return True
+
+    monkeypatch.setattr(corpus_builder, "enqueue_job", _enqueue)
+    monkeypatch.setattr(corpus_builder.settings, "corpus_output_dir", str(tmp_path))
+    world = uuid.uuid4()
+    db = _BuildSession()
+
+    build = await corpus_builder.create_corpus_build(db, CorpusOptions(world_ids=(world,), output="parquet"))
+
+    assert db.added == [build] and db.commits == 1
+    assert build.status == "queued"
+    assert build.out_dir == str(tmp_path / str(build.id))
+    assert enqueued == [("corpus.build", {"build_id": str(build.id)}, str(build.id))]
+    assert corpus_builder.options_from_payload(build.options) == CorpusOptions(world_ids=(world,), output="parquet")
+
+
+def test_builder_parquet_shards(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    builder = CorpusBuilder(tmp_path, CorpusOptions(output="parquet", shard_bytes=500))
+    builder.add("w1", "wiki", [_wiki_sample(LOREM), _wiki_sample(OTHER), _wiki_sample(THIRD)])
+    manifest = builder.finish()
+
+    tables = [pq.read_table(tmp_path / shard["path"]) for shard in manifest["shards"]]
+    assert [t.num_rows for t in tables] == [2, 1]
+    assert tables[1].column("source").to_pylist() == ["wiki"]
+    assert json.loads(tables[1].column("sample")[0].as_py())["output"] == THIRD
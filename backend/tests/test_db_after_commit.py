@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.db import after_commit, engine
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_after_commit_runs_callbacks_only_for_committed_transactions() -> None:
+    calls: list[str] = []
+    async with AsyncSession(engine) as db:
+        await db.begin()
+        after_commit(db, lambda: calls.append("rolled back"))
+        await db.rollback()
+        assert calls == []
+
+        after_commit(db, lambda: calls.append("first"))
+        after_commit(db, lambda: calls.append("second"))
+        assert calls == []
+        await db.commit()
+        assert calls == ["first", "second"]
+
+        await db.commit()
+        assert calls == ["first", "second"]
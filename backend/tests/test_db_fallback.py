@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import MetaData
+
+from null_engine import db
+from null_engine.models.base import Base
+
+
+@pytest.fixture
+def metadata_copy(monkeypatch):
+    """The models' metadata, copied so the fallback can patch it without touching other tests."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    monkeypatch.setattr(db, "Base", SimpleNamespace(metadata=metadata))
+    return metadata
+
+
+def _index_names(metadata: MetaData) -> set[str]:
+    return {index.name for table in metadata.tables.values() for index in table.indexes}
+
+
+def test_json_fallback_drops_ann_indexes_on_embedding_columns(metadata_copy) -> None:
+    assert "ix_wiki_pages_embedding_hnsw" in _index_names(metadata_copy)
+
+    assert db._apply_vector_json_fallback() > 0
+
+    names = _index_names(metadata_copy)
+    assert not {name for name in names if name.endswith("_hnsw")}
+    # Plain btree indexes over embedding IS NULL stay.
+    assert "ix_wiki_pages_embedding_pending" in names
+
+
+def test_trigram_indexes_are_dropped_when_pg_trgm_is_unavailable(metadata_copy) -> None:
+    assert {"ix_agents_name_trgm", "ix_wiki_pages_title_trgm"} <= _index_names(metadata_copy)
+
+    assert db._drop_trigram_indexes() == 2
+
+    assert not {name for name in _index_names(metadata_copy) if name.endswith("_trgm")}
@@ -0,0 +1,147 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from null_engine.services import embedding_pipeline
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_queue(monkeypatch):
+    monkeypatch.setattr(embedding_pipeline, "_queue", None)
+    monkeypatch.setattr(embedding_pipeline, "_pending", {})
+    monkeypatch.setattr(embedding_pipeline, "_sweep_due", {})
+
+
+@pytest.mark.anyio
+async def test_rows_are_queued_only_once_the_transaction_commits(monkeypatch) -> None:
+    jobs: list[tuple] = []
+
+    async def _enqueue_job(kind, payload, **kwargs):
+        jobs.append((kind, payload, kwargs["dedupe_key"], kwargs.get("db")))
+        return True
+
+    monkeypatch.setattr(embedding_pipeline, "enqueue_job", _enqueue_job)
+    db = AsyncSession()
+    conv_id, page_id = uuid.uuid4(), uuid.uuid4()
+    await embedding_pipeline.enqueue_embeddings(db, "conversation", [conv_id])
+    await embedding_pipeline.enqueue_embeddings(db, "wiki_page", [page_id])
+    assert embedding_pipeline.pending_embeddings() == 0
+    assert jobs == []
+
+    db.sync_session.dispatch.after_commit(db.sync_session)
+    await asyncio.gather(*embedding_pipeline._sweep_tasks)
+    assert embedding_pipeline.pending_embeddings() == 2
+    # The durable sweep job is queued after the commit, in its own transaction.
+    assert jobs == [
+        ("embed.sweep", {"kinds": ["conversation"]}, "conversation", None),
+        ("embed.sweep", {"kinds": ["wiki_page"]}, "wiki_page", None),
+    ]
+
+    # A sweep this process queued is still due: no second job.
+    await embedding_pipeline.enqueue_embeddings(db, "conversation", [uuid.uuid4()])
+    db.sync_session.dispatch.after_commit(db.sync_session)
+    await asyncio.gather(*embedding_pipeline._sweep_tasks)
+    assert embedding_pipeline.pending_embeddings() == 3
+    assert len(jobs) == 2
+
+    await embedding_pipeline.enqueue_embeddings(db, "agent", [uuid.uuid4()])
+    db.sync_session.dispatch.after_rollback(db.sync_session)
+    db.sync_session.dispatch.after_commit(db.sync_session)
+    assert embedding_pipeline.pending_embeddings() == 3
+    assert len(jobs) == 2
+
+
+@pytest.mark.anyio
+async def test_drain_batches_by_kind_and_clears_backlog(monkeypatch) -> None:
+    calls: list[tuple[str, list[uuid.UUID]]] = []
+
+    async def _embed_rows(kind, ids, *, limit=None):
+        calls.append((kind, ids))
+        return len(ids), []
+
+    monkeypatch.setattr(embedding_pipeline, "embed_rows", _embed_rows)
+    monkeypatch.setattr(embedding_pipeline.settings, "embedding_batch_size", 3)
+    monkeypatch.setattr(embedding_pipeline.settings, "embedding_batch_wait_seconds", 0.0)
+    conv_ids = [uuid.uuid4(), uuid.uuid4()]
+    agent_ids = [uuid.uuid4(), uuid.uuid4()]
+    for conv_id, agent_id in zip(conv_ids, agent_ids):
+        embedding_pipeline._push("conversation", conv_id)
+        embedding_pipeline._push("agent", agent_id)
+    embedding_pipeline._push("agent", agent_ids[0])  # already queued
+    assert embedding_pipeline.pending_embeddings() == 4
+    assert embedding_pipeline.oldest_pending_age_seconds() >= 0
+
+    worker = asyncio.create_task(embedding_pipeline._drain())
+    await asyncio.wait_for(embedding_pipeline._get_queue().join(), 1)
+    worker.cancel()
+
+    assert calls == [("conversation", conv_ids), ("agent", [agent_ids[0]]), ("agent", [agent_ids[1]])]
+    assert embedding_pipeline.pending_embeddings() == 0
+    assert embedding_pipeline.oldest_pending_age_seconds() == 0
+
+
+@pytest.mark.anyio
+async def test_sweep_skips_unembeddable_rows_and_retries_when_provider_is_down(monkeypatch) -> None:
+    bad = uuid.uuid4()
+    batches = [(2, [bad]), (1, []), (0, [])]
+    excluded: list[set] = []
+
+    async def _embed_rows(kind, *, exclude):
+        excluded.append(set(exclude))
+        return batches.pop(0)
+
+    monkeypatch.setattr(embedding_pipeline, "embed_rows", _embed_rows)
+    await embedding_pipeline.run_embedding_sweep({"kinds": ["stratum"]})
+    assert excluded == [set(), {bad}, {bad}]
+
+    async def _provider_down(kind, *, exclude):
+        return 3, [uuid.uuid4() for _ in range(3)]
+
+    monkeypatch.setattr(embedding_pipeline, "embed_rows", _provider_down)
+    with pytest.raises(RuntimeError):
+        await embedding_pipeline.run_embedding_sweep({})
+
+
+@pytest.mark.anyio
+async def test_embed_rows_holds_no_lock_over_the_provider_call(monkeypatch) -> None:
+    stratum_id = uuid.uuid4()
+    sql: list[str] = []
+    open_sessions: list[object] = []
+
+    class _Session:
+        async def __aenter__(self):
+            open_sessions.append(self)
+            return self
+
+        async def __aexit__(self, *exc):
+            open_sessions.remove(self)
+
+        async def execute(self, stmt):
+            sql.append(str(stmt.compile(dialect=postgresql.asyncpg.dialect())))
+            return SimpleNamespace(all=lambda: [SimpleNamespace(id=stratum_id, summary="tides")], rowcount=1)
+
+        async def commit(self):
+            pass
+
+    async def _get_embeddings(texts):
+        assert open_sessions == []
+        return [[0.1] for _ in texts]
+
+    monkeypatch.setattr(embedding_pipeline, "async_session", _Session)
+    monkeypatch.setattr(embedding_pipeline, "get_embeddings", _get_embeddings)
+    assert await embedding_pipeline.embed_rows("stratum", [stratum_id]) == (1, [])
+
+    read, write = sql
+    assert "FOR UPDATE" not in read
+    # Another worker's embedding or an edit made meanwhile wins.
+    assert write.startswith("UPDATE strata SET embedding=")
+    assert "strata.embedding IS NULL AND strata.summary = $" in write
@@ -0,0 +1,114 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from null_engine.services import entity_graph
+from null_engine.services.entity_graph import Graph, GraphEdge, GraphNode, ego_graph, to_columnar
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def _edge(source, target, weight=1.0):
+    return SimpleNamespace(
+        source_id=source, source_type="agent", target_id=target, target_type="agent",
+        type="mention", weight=weight, label=None,
+    )
+
+
+def test_edges_merge_mentions_and_resolvable_knowledge_edges() -> None:
+    sql = _sql(entity_graph.edges_subquery(uuid.uuid4()))
+    assert "sum(coalesce(entity_mentions.confidence" in sql
+    assert "GROUP BY entity_mentions.source_id" in sql
+    assert "JOIN" in sql and "subject_entity.name = knowledge_edges.subject" in sql
+    assert "UNION ALL" in sql
+    # A name shared by an agent and a wiki page resolves to a single node.
+    assert "PARTITION BY subject_entity_candidates.name ORDER BY subject_entity_candidates.priority" in sql
+    assert "WHERE subject_entity_ranked.rank = " in sql
+
+
+@pytest.mark.anyio
+async def test_ego_graph_expands_level_by_level_within_the_edge_budget() -> None:
+    center, a, b, c = (uuid.uuid4() for _ in range(4))
+    levels = [[_edge(center, a, 3.0), _edge(b, center, 2.0)], [_edge(a, c)]]
+    edge_queries: list[str] = []
+
+    class _Session:
+        async def execute(self, stmt):
+            sql = _sql(stmt)
+            if "graph_edges" in sql:
+                edge_queries.append(sql)
+                return SimpleNamespace(all=lambda: levels.pop(0))
+            return SimpleNamespace(all=lambda: [])
+
+    graph = await ego_graph(_Session(), uuid.uuid4(), "agent", center, depth=3, max_edges=3)
+
+    assert [(e.source_id, e.target_id) for e in graph.edges] == [(center, a), (b, center), (a, c)]
+    assert {node.id for node in graph.nodes} == {center, a, b, c}
+    # The second level skips edges back to the center, and the budget stops a third.
+    assert len(edge_queries) == 2
+    assert "NOT IN" in edge_queries[1]
+
+
+def test_columnar_encoding_uses_node_indexes_and_type_vocabularies() -> None:
+    a, b = uuid.uuid4(), uuid.uuid4()
+    graph = Graph(
+        [GraphNode(a, "agent", "Mara"), GraphNode(b, "wiki_page", "Salt Road")],
+        [GraphEdge(a, b, "mention", 1.23456), GraphEdge(b, a, "knowledge", 0.5, "founded_by")],
+    )
+    assert to_columnar(graph) == {
+        "node_types": ["agent", "wiki_page"],
+        "edge_types": ["knowledge", "mention"],
+        "nodes": {"id": [str(a), str(b)], "type": [0, 1], "label": ["Mara", "Salt Road"]},
+        "edges": {
+            "source": [0, 1], "target": [1, 0], "type": [1, 0], "weight": [1.2346, 0.5],
+            "label": [None, "founded_by"],
+        },
+    }
+
+
+@pytest.mark.anyio
+async def test_entity_graph_endpoint_is_bounded_and_can_answer_columnar(monkeypatch) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from null_engine.api.routes import entities as entities_route
+    from null_engine.db import get_db
+    from null_engine.main import app
+
+    a, b = uuid.uuid4(), uuid.uuid4()
+    world_id = uuid.uuid4()
+    calls: list[dict] = []
+
+    async def _sampled(_db, _world_id, **kwargs):
+        calls.append(kwargs)
+        return Graph([GraphNode(a, "agent", "Mara"), GraphNode(b, "agent", "Ode")], [GraphEdge(a, b, "mention", 2.0)])
+
+    async def _override():
+        yield object()
+
+    monkeypatch.setattr(entities_route, "sampled_graph", _sampled)
+    app.dependency_overrides[get_db] = _override
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            json_resp = await client.get(f"/api/worlds/{world_id}/entity-graph")
+            cached = await client.get(f"/api/worlds/{world_id}/entity-graph")
+            columnar = await client.get(f"/api/worlds/{uuid.uuid4()}/entity-graph?format=columnar&max_nodes=50")
+            too_big = await client.get(f"/api/worlds/{uuid.uuid4()}/entity-graph?max_edges=100000")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert json_resp.status_code == 200
+    assert json_resp.json()["edges"][0]["weight"] == 2.0
+    # The repeat is served from the cache until the world's version moves.
+    assert cached.json() == json_resp.json() and len(calls) == 2
+    assert columnar.json()["edges"] == {"source": [0], "target": [1], "type": [0], "weight": [2.0], "label": [None]}
+    assert calls[1] == {"max_nodes": 50, "max_edges": 500, "sample": "hubs"}
+    assert too_big.status_code == 422
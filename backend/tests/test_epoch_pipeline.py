@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from null_engine.core import epoch_pipeline
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _Session:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc):
+        return None
+
+    async def execute(self, _stmt):
+        return SimpleNamespace(scalar_one_or_none=lambda: uuid.uuid4())
+
+
+def test_epoch_topics_are_distinct_and_capped() -> None:
+    summaries = [
+        "[E0T1] Trade (4 messages): a / b",
+        "[E0T2] War (3 messages): c",
+        "[E0T3] Trade (2 messages): d",
+        "no marker",
+        "[E0T4] Faith (5 messages): e",
+        "[E0T5] Harvest (1 messages): f",
+    ]
+    assert epoch_pipeline.epoch_topics(summaries) == ["Trade", "War", "Faith"]
+
+
+@pytest.mark.anyio
+async def test_pipeline_runs_pending_steps_concurrently_and_retries_only_failures(monkeypatch) -> None:
+    world_id = uuid.uuid4()
+    in_flight = 0
+    peak = 0
+    ran: list[str] = []
+    marked: list[str] = []
+
+    async def _step(name: str, fail: bool = False) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        ran.append(name)
+        if fail:
+            raise RuntimeError("llm down")
+
+    async def _announce(_world_id, epoch, events):
+        await _step(f"herald:{epoch}:{len(events)}")
+
+    async def _stratum(_world_id, epoch):
+        await _step(f"stratum:{epoch}")
+
+    async def _wiki(_world_id, topic, summaries):
+        await _step(f"wiki:{topic}", fail=topic == "War")
+
+    async def _mark(step):
+        marked.append(step)
+
+    monkeypatch.setattr(epoch_pipeline, "async_session", _Session)
+    monkeypatch.setattr(epoch_pipeline.herald, "announce", _announce)
+    monkeypatch.setattr(epoch_pipeline, "_stratum", _stratum)
+    monkeypatch.setattr(epoch_pipeline, "_wiki", _wiki)
+    monkeypatch.setattr(epoch_pipeline, "mark_step_done", _mark)
+
+    payload = {
+        "world_id": str(world_id),
+        "epoch": 4,
+        "events": [{"description": "Flood"}],
+        "summaries": ["[E4T1] Trade (2 messages): x", "[E4T2] War (2 messages): y"],
+        "done": {"wiki:Trade": True},
+    }
+    with pytest.raises(RuntimeError, match="wiki:War"):
+        await epoch_pipeline.run_epoch_pipeline(payload)
+
+    assert peak == 3
+    assert sorted(ran) == ["herald:5:1", "stratum:4", "wiki:War"]
+    assert sorted(marked) == ["herald", "stratum"]
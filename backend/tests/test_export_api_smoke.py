@@ -1,13 +1,19 @@
+import gzip
 import json
 import uuid
+from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from null_engine.api.routes import export as export_route
+from null_engine.config import settings
 from null_engine.db import get_db
 from null_engine.main import app
+from null_engine.services import columnar_export, exporter
+from null_engine.services.export_stream import decode_cursor, encode_cursor
 
 
 class _FakeScalarResult:
@@ -25,6 +31,9 @@ class _FakeExecuteResult:
     def scalars(self) -> _FakeScalarResult:
         return _FakeScalarResult(self._items)
 
+    def scalar_one_or_none(self) -> Any:
+        return self._items[0] if self._items else None
+
 
 class _QueueSession:
     def __init__(self, batches: list[list[Any]]):
@@ -36,6 +45,40 @@ class _QueueSession:
         return _FakeExecuteResult(self._batches.pop(0))
 
 
+class _FakeStreamResult:
+    def __init__(self, items: list[Any]):
+        self._items = items
+
+    def scalars(self) -> "_FakeStreamResult":
+        return self
+
+    async def partitions(self, size: int):
+        for start in range(0, len(self._items), size):
+            yield self._items[start:start + size]
+
+
+class _StreamSession(_QueueSession):
+    """Stands in for async_session() in the streaming export generators."""
+
+    def __init__(self, batches: list[list[Any]]):
+        super().__init__(batches)
+        self.streamed = 0
+        self.statements: list[Any] = []
+
+    async def __aenter__(self) -> "_StreamSession":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        return None
+
+    async def stream(self, _stmt: Any) -> _FakeStreamResult:
+        if not self._batches:
+            raise AssertionError("Unexpected DB stream call")
+        self.streamed += 1
+        self.statements.append(_stmt)
+        return _FakeStreamResult(self._batches.pop(0))
+
+
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
@@ -55,6 +98,16 @@ def override_db():
     app.dependency_overrides.pop(get_db, None)
 
 
+@pytest.fixture
+def stream_db(monkeypatch):
+    def _install(*batches: list[Any]) -> _StreamSession:
+        session = _StreamSession(list(batches))
+        monkeypatch.setattr(exporter, "async_session", lambda: session)
+        return session
+
+    return _install
+
+
 @pytest.mark.anyio
 async def test_export_wiki_markdown_smoke(override_db) -> None:
     world_id = uuid.uuid4()
@@ -81,9 +134,9 @@ async def test_export_wiki_markdown_smoke(override_db) -> None:
 
 
 @pytest.mark.anyio
-async def test_export_training_jsonl_smoke(override_db) -> None:
+async def test_export_training_jsonl_smoke(stream_db) -> None:
     world_id = uuid.uuid4()
-    override_db(
+    stream_db(
         [
             SimpleNamespace(
                 topic="Faction diplomacy",
@@ -115,9 +168,9 @@ async def test_export_training_jsonl_smoke(override_db) -> None:
 
 
 @pytest.mark.anyio
-async def test_export_knowledge_graph_csv_smoke(override_db) -> None:
+async def test_export_knowledge_graph_csv_smoke(stream_db) -> None:
     world_id = uuid.uuid4()
-    override_db(
+    stream_db(
         [
             SimpleNamespace(
                 subject="Guild",
@@ -138,6 +191,71 @@ async def test_export_knowledge_graph_csv_smoke(override_db) -> None:
     assert '"Guild","controls","Harbor",0.91' in resp.text
 
 
+def _conversation(epoch: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        world_id=uuid.uuid4(),
+        epoch=epoch,
+        tick=epoch * 10,
+        topic=f"Topic {epoch}",
+        participants=[],
+        messages=[{"agent_id": "A1", "content": f"line {epoch}"}],
+        summary="",
+        messages_ko=None,
+        created_at=None,
+    )
+
+
+@pytest.mark.anyio
+async def test_export_conversations_streams_in_batches(stream_db, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    stream_db([_conversation(epoch) for epoch in range(5)])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{uuid.uuid4()}/export/conversations?format=json")
+
+    assert resp.status_code == 200
+    assert [c["epoch"] for c in resp.json()] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.anyio
+async def test_export_conversations_gzip(stream_db) -> None:
+    stream_db([_conversation(1), _conversation(2)])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream(
+            "GET", f"/api/worlds/{uuid.uuid4()}/export/conversations?compression=gzip"
+        ) as resp:
+            raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+
+    assert resp.headers["content-encoding"] == "gzip"
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert [json.loads(line)["topic"] for line in lines] == ["Topic 1", "Topic 2"]
+
+
+@pytest.mark.anyio
+async def test_export_all_streams_every_section(stream_db) -> None:
+    world_id = uuid.uuid4()
+    session = stream_db(
+        [SimpleNamespace(id=world_id, seed_prompt="seed", config={}, status="running")],
+        [SimpleNamespace(id=uuid.uuid4(), name="Archivist-7", persona={}, beliefs=[])],
+        [],
+        [_conversation(1)],
+        [SimpleNamespace(subject="Guild", predicate="controls", object="Harbor", confidence=0.5)],
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{world_id}/export/all")
+
+    assert resp.status_code == 200
+    types = [json.loads(line)["type"] for line in resp.text.splitlines()]
+    assert types == ["world", "agent", "conversation", "knowledge_edge"]
+    assert session.streamed == 4
+
+
 @pytest.mark.anyio
 async def test_export_agents_json_schema_smoke(override_db) -> None:
     world_id = uuid.uuid4()
@@ -164,3 +282,147 @@ async def test_export_agents_json_schema_smoke(override_db) -> None:
     assert isinstance(data, list)
     assert data[0]["name"] == "Archivist-7"
     assert data[0]["world_id"] == str(world_id)
+
+
+def test_export_cursor_round_trip() -> None:
+    watermark = datetime(2026, 10, 19, 3, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(watermark)) == watermark
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.anyio
+async def test_export_conversations_since_appends_tombstones_and_cursor(stream_db) -> None:
+    page_id = uuid.uuid4()
+    session = stream_db(
+        [_conversation(5)],
+        [SimpleNamespace(page_id=page_id, version=2, created_at=datetime(2026, 10, 18, 12, 0))],
+    )
+    since = encode_cursor(datetime(2026, 10, 18))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{uuid.uuid4()}/export/conversations", params={"since": since})
+        bad = await client.get(f"/api/worlds/{uuid.uuid4()}/export/conversations", params={"since": "garbage"})
+
+    assert resp.status_code == 200
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["type"] for r in records] == ["conversation", "tombstone", "cursor"]
+    assert records[1] == {
+        "type": "tombstone",
+        "entity": "wiki_page",
+        "id": str(page_id),
+        "version": 2,
+        "replaced_at": "2026-10-18T12:00:00",
+    }
+    assert records[2]["next"] == resp.headers["x-export-cursor"]
+    assert decode_cursor(records[2]["next"]) > datetime(2026, 10, 18)
+    assert "conversations.created_at >=" in str(session.statements[0])
+    assert bad.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_full_export_has_cursor_header_but_no_trailer(stream_db) -> None:
+    session = stream_db([_conversation(1)])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{uuid.uuid4()}/export/conversations")
+
+    assert [json.loads(line)["type"] for line in resp.text.splitlines()] == ["conversation"]
+    assert decode_cursor(resp.headers["x-export-cursor"])
+    assert "created_at >=" not in str(session.statements[0])
+    assert "conversations.created_at <" in str(session.statements[0])
+
+
+@pytest.mark.anyio
+async def test_full_then_incremental_export_never_repeats_a_row(monkeypatch) -> None:
+    now = datetime.now(UTC).replace(tzinfo=None)
+    old, recent = _conversation(1), _conversation(2)
+    old.created_at = now - timedelta(hours=1)
+    recent.created_at = now - timedelta(minutes=1)  # inside the lag window at the first pull
+
+    class _WindowSession(_StreamSession):
+        """Streams the conversations the statement's [since, until) bounds select."""
+
+        async def stream(self, stmt: Any) -> _FakeStreamResult:
+            self.statements.append(stmt)
+            bounds = sorted(v for v in stmt.compile().params.values() if isinstance(v, datetime))
+            since, until = (None, bounds[0]) if len(bounds) == 1 else bounds
+            rows = [old, recent] if "conversations" in str(stmt) and "wiki_history" not in str(stmt) else []
+            return _FakeStreamResult([
+                row for row in rows if (since is None or row.created_at >= since) and row.created_at < until
+            ])
+
+    monkeypatch.setattr(exporter, "async_session", lambda: _WindowSession([]))
+    world_id = uuid.uuid4()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        monkeypatch.setattr(settings, "export_since_lag_seconds", 600)
+        full = await client.get(f"/api/worlds/{world_id}/export/conversations")
+        monkeypatch.setattr(settings, "export_since_lag_seconds", 0)
+        incremental = await client.get(
+            f"/api/worlds/{world_id}/export/conversations", params={"since": full.headers["x-export-cursor"]},
+        )
+
+    def _topics(resp) -> list[str]:
+        return [r["topic"] for r in map(json.loads, resp.text.splitlines()) if r["type"] == "conversation"]
+
+    assert _topics(full) == ["Topic 1"]
+    assert _topics(incremental) == ["Topic 2"]
+
+
+def test_message_rows_flatten_one_row_per_message() -> None:
+    conversation = _conversation(2)
+    conversation.messages = [
+        {"agent_id": "A1", "content": "Open the gates."},
+        {"agent_id": "B2", "content": "Not yet.", "round": 4},
+    ]
+    conversation.messages_ko = [{"agent_id": "A1", "content": "문을 열어라."}]
+
+    rows = columnar_export.message_rows(conversation)
+
+    assert [(r["agent_id"], r["round"], r["content_ko"]) for r in rows] == [
+        ("A1", 0, "문을 열어라."),
+        ("B2", 4, None),
+    ]
+    assert {r["conversation_id"] for r in rows} == {str(conversation.id)}
+    assert rows[0]["epoch"] == 2 and rows[0]["tick"] == 20
+
+
+@pytest.mark.anyio
+async def test_export_columnar_requires_pyarrow(monkeypatch) -> None:
+    monkeypatch.setattr(export_route, "pyarrow_available", lambda: False)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{uuid.uuid4()}/export/columnar/messages")
+        unknown = await client.get(f"/api/worlds/{uuid.uuid4()}/export/columnar/wiki")
+
+    assert resp.status_code == 400
+    assert unknown.status_code == 422
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+async def test_export_columnar_messages_round_trip(monkeypatch, fmt) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(settings, "export_row_group_size", 2)
+    session = _StreamSession([[_conversation(1), _conversation(2)]])
+    monkeypatch.setattr(columnar_export, "async_session", lambda: session)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{uuid.uuid4()}/export/columnar/messages?format={fmt}")
+
+    assert resp.status_code == 200
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(pa.BufferReader(resp.content))
+        table = parquet.read()
+        assert parquet.metadata.num_row_groups == 1
+    else:
+        table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.num_rows == 2
+    assert table.column("content").to_pylist() == ["line 1", "line 2"]
+    assert pa.types.is_dictionary(table.schema.field("agent_id").type)
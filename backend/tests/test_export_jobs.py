@@ -0,0 +1,205 @@
+import os
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from null_engine.config import settings
+from null_engine.db import get_db
+from null_engine.main import app
+from null_engine.services import export_jobs
+from null_engine.services.export_jobs import ArtifactFormat, artifact_path, build_artifact, evict_artifacts
+
+
+class _ScalarResult:
+    def __init__(self, value: Any):
+        self._value = value
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+
+class _QueueSession:
+    def __init__(self, values: list[Any]):
+        self._values = list(values)
+
+    async def execute(self, _stmt: Any) -> _ScalarResult:
+        if not self._values:
+            raise AssertionError("Unexpected DB execute call")
+        return _ScalarResult(self._values.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "export_artifact_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def override_db():
+    def _install(*values: Any) -> None:
+        session = _QueueSession(list(values))
+
+        async def _override():
+            yield session
+
+        app.dependency_overrides[get_db] = _override
+
+    yield _install
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.anyio
+async def test_build_artifact_reuses_file_for_same_version(artifact_dir, monkeypatch) -> None:
+    builds: list[uuid.UUID] = []
+
+    async def _build(world_id: uuid.UUID):
+        builds.append(world_id)
+        yield b"line 1\n"
+        yield b"line 2\n"
+
+    monkeypatch.setitem(export_jobs.ARTIFACT_FORMATS, "test.jsonl", ArtifactFormat("application/jsonl", _build))
+    world_id = uuid.uuid4()
+
+    path = await build_artifact(world_id, 3, "test.jsonl")
+    again = await build_artifact(world_id, 3, "test.jsonl")
+    newer = await build_artifact(world_id, 4, "test.jsonl")
+
+    assert path == again == artifact_path(world_id, 3, "test.jsonl")
+    assert path.read_bytes() == b"line 1\nline 2\n"
+    assert newer != path
+    assert builds == [world_id, world_id]
+    assert not [p for p in path.parent.iterdir() if p.name.startswith(".")]
+
+
+@pytest.mark.anyio
+async def test_failed_build_leaves_no_artifact(artifact_dir, monkeypatch) -> None:
+    async def _build(_world_id: uuid.UUID):
+        yield b"partial"
+        raise RuntimeError("db went away")
+
+    monkeypatch.setitem(export_jobs.ARTIFACT_FORMATS, "test.jsonl", ArtifactFormat("application/jsonl", _build))
+    world_id = uuid.uuid4()
+
+    with pytest.raises(RuntimeError):
+        await build_artifact(world_id, 1, "test.jsonl")
+
+    assert not artifact_path(world_id, 1, "test.jsonl").exists()
+    assert not list(artifact_path(world_id, 1, "test.jsonl").parent.iterdir())
+
+
+def test_evict_artifacts_drops_least_recently_used(artifact_dir) -> None:
+    world_id = uuid.uuid4()
+    paths = [artifact_path(world_id, version, "all.jsonl") for version in (1, 2, 3)]
+    for age, path in zip((300, 200, 100), paths, strict=True):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"x" * 10)
+        stamp = path.stat().st_mtime - age
+        os.utime(path, (stamp, stamp))
+
+    freed = evict_artifacts(budget_bytes=15, keep={paths[0]})
+
+    assert freed == 20
+    assert [p.exists() for p in paths] == [True, False, False]
+    assert not paths[1].parent.exists()
+
+
+@pytest.mark.anyio
+async def test_create_export_rejects_unknown_formats() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(f"/api/worlds/{uuid.uuid4()}/exports", json={"formats": ["all.jsonl", "nope.bin"]})
+
+    assert resp.status_code == 422
+    assert "nope.bin" in resp.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_download_export_supports_range(artifact_dir, override_db) -> None:
+    world_id = uuid.uuid4()
+    job = SimpleNamespace(id=uuid.uuid4(), world_id=world_id, formats=["all.jsonl"], data_version=7, status="ready")
+    path = artifact_path(world_id, 7, "all.jsonl")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"0123456789")
+    override_db(job, job)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        url = f"/api/worlds/{world_id}/exports/{job.id}/files/all.jsonl"
+        full = await client.get(url)
+        resumed = await client.get(url, headers={"Range": "bytes=4-"})
+
+    assert full.status_code == 200
+    assert full.content == b"0123456789"
+    assert resumed.status_code == 206
+    assert resumed.content == b"456789"
+    assert resumed.headers["content-range"] == "bytes 4-9/10"
+
+
+@pytest.mark.anyio
+async def test_download_evicted_export_is_gone(artifact_dir, override_db) -> None:
+    world_id = uuid.uuid4()
+    job = SimpleNamespace(id=uuid.uuid4(), world_id=world_id, formats=["all.jsonl"], data_version=1, status="ready")
+    override_db(job)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{world_id}/exports/{job.id}/files/all.jsonl")
+
+    assert resp.status_code == 410
+
+
+class _JobSession:
+    def __init__(self):
+        self.added: list[Any] = []
+        self.commits = 0
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        for obj in self.added:
+            obj.id = obj.id or uuid.uuid4()
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def refresh(self, _obj: Any) -> None:
+        pass
+
+
+@pytest.mark.anyio
+async def test_create_export_job_queues_the_build_in_its_transaction(artifact_dir, monkeypatch) -> None:
+    world_id = uuid.uuid4()
+    enqueued: list[tuple[str, dict, Any]] = []
+
+    async def _stats(_db, _world_id):
+        return SimpleNamespace(data_version=4)
+
+    async def _enqueue(kind, payload, *, dedupe_key, db):
+        assert db.commits == 0
+        enqueued.append((kind, payload, dedupe_key))
+        return True
+
+    monkeypatch.setattr(export_jobs, "get_world_stats", _stats)
+    monkeypatch.setattr(export_jobs, "enqueue_job", _enqueue)
+
+    db = _JobSession()
+    job = await export_jobs.create_export_job(db, world_id, ["all.jsonl"])
+    assert job.status == "queued"
+    assert enqueued == [("export.build", {"job_id": str(job.id)}, str(job.id))]
+
+    # Every artifact already built for this version: ready at once, nothing queued.
+    path = artifact_path(world_id, 4, "all.jsonl")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"{}\n")
+    job = await export_jobs.create_export_job(_JobSession(), world_id, ["all.jsonl"])
+    assert job.status == "ready"
+    assert len(enqueued) == 1
@@ -1,34 +1,34 @@
 from types import SimpleNamespace
 
-from null_engine.api.routes.export import (
-    _conversation_training_sample,
-    _knowledge_graph_training_sample,
-    _parse_include,
-    _wiki_training_sample,
+from null_engine.services.exporter import (
+    conversation_training_sample,
+    knowledge_graph_training_sample,
+    parse_include,
+    wiki_training_sample,
 )
 
 
 def test_parse_include_trims_and_deduplicates() -> None:
-    include_set = _parse_include("conversations, wiki,kg,kg,, ")
+    include_set = parse_include("conversations, wiki,kg,kg,, ")
     assert include_set == {"conversations", "wiki", "kg"}
 
 
 def test_parse_include_normalizes_case_and_aliases() -> None:
-    include_set = _parse_include("Conversations, WIKIS, knowledge_graph, knowledge-graph")
+    include_set = parse_include("Conversations, WIKIS, knowledge_graph, knowledge-graph")
     assert include_set == {"conversations", "wiki", "kg"}
 
 
 def test_parse_include_supports_all_and_wildcard_alias() -> None:
-    assert _parse_include("all") == {"conversations", "wiki", "kg"}
-    assert _parse_include("*") == {"conversations", "wiki", "kg"}
-    assert _parse_include("default") == {"conversations", "wiki", "kg"}
-    assert _parse_include("full") == {"conversations", "wiki", "kg"}
+    assert parse_include("all") == {"conversations", "wiki", "kg"}
+    assert parse_include("*") == {"conversations", "wiki", "kg"}
+    assert parse_include("default") == {"conversations", "wiki", "kg"}
+    assert parse_include("full") == {"conversations", "wiki", "kg"}
 
 
 def test_parse_include_supports_none_aliases() -> None:
-    assert _parse_include("none") == set()
-    assert _parse_include("null") == set()
-    assert _parse_include("off") == set()
+    assert parse_include("none") == set()
+    assert parse_include("null") == set()
+    assert parse_include("off") == set()
 
 
 def test_conversation_chatml_sample() -> None:
@@ -41,7 +41,7 @@ def test_conversation_chatml_sample() -> None:
         ],
     )
 
-    sample = _conversation_training_sample(conversation, "chatml")
+    sample = conversation_training_sample(conversation, "chatml")
     assert sample == {
         "messages": [
             {"role": "system", "content": "Topic: Faction diplomacy"},
@@ -62,7 +62,7 @@ def test_conversation_alpaca_uses_summary_when_output_missing() -> None:
         ],
     )
 
-    sample = _conversation_training_sample(conversation, "alpaca")
+    sample = conversation_training_sample(conversation, "alpaca")
     assert sample == {
         "instruction": "Continue the conversation about 'Silent meeting'",
         "input": "X: We meet at dawn.\nY: Understood.",
@@ -72,12 +72,12 @@ def test_conversation_alpaca_uses_summary_when_output_missing() -> None:
 
 def test_conversation_returns_none_when_empty() -> None:
     conversation = SimpleNamespace(topic="Empty", summary="", messages=[])
-    assert _conversation_training_sample(conversation, "sharegpt") is None
+    assert conversation_training_sample(conversation, "sharegpt") is None
 
 
 def test_wiki_sharegpt_sample() -> None:
     page = SimpleNamespace(title="Neon Joseon", content="A techno-feudal kingdom.")
-    sample = _wiki_training_sample(page, "sharegpt")
+    sample = wiki_training_sample(page, "sharegpt")
 
     assert sample == {
         "conversations": [
@@ -92,7 +92,7 @@ def test_knowledge_graph_chatml_sample() -> None:
         SimpleNamespace(subject="Guild", predicate="controls", object="Port"),
         SimpleNamespace(subject="Court", predicate="allies_with", object="Academy"),
     ]
-    sample = _knowledge_graph_training_sample(edges, "chatml")
+    sample = knowledge_graph_training_sample(edges, "chatml")
 
     assert sample == {
         "messages": [
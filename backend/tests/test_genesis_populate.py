@@ -0,0 +1,227 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import Insert
+
+from null_engine.core import genesis
+
+
+class _Result:
+    def __init__(self, value: Any = None):
+        self._value = value
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+    def scalars(self) -> Any:
+        return SimpleNamespace(all=lambda: self._value)
+
+    def first(self) -> Any:
+        return None
+
+
+class _RecordingSession:
+    def __init__(self, world: Any, factions: list[Any] | None = None):
+        self.world = world
+        self.factions = factions or []
+        self.inserts: dict[str, Any] = {}
+        self.added: list[Any] = []
+
+    def add(self, obj: Any) -> None:
+        if getattr(obj, "id", None) is None:
+            obj.id = uuid4()
+        self.added.append(obj)
+
+    def expunge(self, _obj: Any) -> None:
+        return None
+
+    async def flush(self) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+    async def execute(self, stmt: Any, *_args: Any) -> _Result:
+        if isinstance(stmt, Insert):
+            table = stmt.table.name
+            self.inserts[table] = self.inserts.get(table, 0) + 1
+            return _Result()
+        if isinstance(stmt, Select) and stmt.column_descriptions[0]["entity"] is genesis.Faction:
+            return _Result(self.factions)
+        return _Result(self.world)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_populate_world_generates_factions_concurrently_and_bulk_inserts(monkeypatch) -> None:
+    world_id = uuid4()
+    session = _RecordingSession(SimpleNamespace(id=world_id, config={}, genesis_checkpoint=None))
+    in_flight = 0
+    peak = 0
+    progress: list[tuple[str, int]] = []
+
+    async def _generate_json(role: str, prompt: str, max_tokens: int = 4096):
+        nonlocal in_flight, peak
+        if prompt.startswith("You are a world architect"):
+            return {
+                "description": "A drowned archipelago",
+                "factions": [{"name": f"F{i}", "agent_count": 2} for i in range(3)],
+            }
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if prompt.startswith("Analyze this world"):
+            return [{"tag": "Maritime", "weight": 0.8}]
+        return [{"name": f"Agent {uuid4().hex[:4]}", "role": "scout"} for _ in range(2)]
+
+    async def _announce(world_id, step, step_num, total_steps, detail=""):
+        progress.append((step, step_num))
+
+    async def _no_op(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(genesis.llm_router, "generate_json", _generate_json)
+    monkeypatch.setattr(genesis, "_announce_progress", _announce)
+    monkeypatch.setattr(genesis, "record_activity", _no_op)
+    monkeypatch.setattr(genesis, "enqueue_embeddings", _no_op)
+    monkeypatch.setattr(genesis, "_checkpoint_personas", _no_op)
+    monkeypatch.setattr(genesis.settings, "default_factions", 3)
+
+    await genesis.populate_world(session, world_id, "islands", {})
+
+    # Three persona calls and the tag call overlap.
+    assert peak == 4
+    assert session.inserts == {"agents": 1, "relationships": 1}
+    assert [tag.tag for tag in session.added if isinstance(tag, genesis.WorldTag)] == ["maritime"]
+    assert [step for step, _ in progress] == [
+        "world_config", "factions", "agents", "agents", "agents", "relationships", "tags",
+    ]
+    assert [num for _, num in progress] == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_relationships_cover_every_agent_without_self_links() -> None:
+    agent_ids = [uuid4() for _ in range(4)]
+    rows = genesis._generate_relationships(uuid4(), agent_ids)
+    assert {row["agent_a"] for row in rows} == set(agent_ids)
+    assert all(row["agent_a"] != row["agent_b"] for row in rows)
+    assert genesis._generate_relationships(uuid4(), agent_ids[:1]) == []
+    assert len(genesis._generate_relationships(uuid4(), agent_ids[:2])) == 2
+
+
+@pytest.mark.anyio
+async def test_populate_world_resumes_from_its_checkpoint(monkeypatch) -> None:
+    world_id = uuid4()
+    done, pending = (SimpleNamespace(id=uuid4(), name=name, description="") for name in ("Tide", "Reef"))
+    world = SimpleNamespace(
+        id=world_id,
+        config={"description": "Sea", "factions": [{"name": "Tide"}, {"name": "Reef"}]},
+        genesis_checkpoint={"config": True, "factions": True, "personas": {str(done.id): [{"name": "Ama"}]}},
+    )
+    session = _RecordingSession(world, [done, pending])
+    prompts: list[str] = []
+    agent_rows: list[dict] = []
+    checkpointed: list = []
+
+    async def _generate_json(role: str, prompt: str, max_tokens: int = 4096):
+        prompts.append(prompt.split()[0])
+        if prompt.startswith("Analyze this world"):
+            return []
+        return [{"name": "Bo"}]
+
+    async def _record_activity(_db, _world_id, *, agents, faction_agents):
+        agent_rows.append(faction_agents)
+
+    async def _checkpoint_personas(_world_id, faction_id, personas):
+        checkpointed.append((faction_id, personas))
+
+    async def _no_op(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(genesis.llm_router, "generate_json", _generate_json)
+    monkeypatch.setattr(genesis, "_announce_progress", _no_op)
+    monkeypatch.setattr(genesis, "record_activity", _record_activity)
+    monkeypatch.setattr(genesis, "enqueue_embeddings", _no_op)
+    monkeypatch.setattr(genesis, "_checkpoint_personas", _checkpoint_personas)
+
+    await genesis.populate_world(session, world_id, "sea", {})
+
+    # Only the unfinished faction and the tags go back to the LLM.
+    assert sorted(prompts) == ["Analyze", "Generate"]
+    assert checkpointed == [(pending.id, [{"name": "Bo"}])]
+    assert agent_rows == [{done.id: 1, pending.id: 1}]
+    assert session.inserts == {"agents": 1, "relationships": 1}
+
+
+@pytest.mark.anyio
+async def test_progress_is_persisted_for_clients_on_other_workers(monkeypatch) -> None:
+    world_id = uuid4()
+    statements: list[Any] = []
+    broadcasts: list[Any] = []
+    bumped: list[Any] = []
+
+    class _ProgressSession(_RecordingSession):
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_exc):
+            return None
+
+        async def execute(self, stmt: Any, *_args: Any) -> _Result:
+            statements.append(stmt)
+            return _Result()
+
+    async def _broadcast(target, envelope):
+        broadcasts.append((target, envelope.type, envelope.payload))
+
+    async def _bump(target):
+        bumped.append(target)
+
+    monkeypatch.setattr(genesis, "async_session", lambda: _ProgressSession(None))
+    monkeypatch.setattr(genesis, "broadcast", _broadcast)
+    monkeypatch.setattr(genesis, "bump_world_version", _bump)
+
+    await genesis._announce_progress(world_id, "agents", 3, 4, "Summoned agents for F0...")
+
+    assert len(statements) == 1
+    checkpoint = statements[0].compile().params
+    assert any(
+        isinstance(value, dict) and value.get("progress", {}).get("percent") == 75 for value in checkpoint.values()
+    )
+    assert bumped == [world_id]
+    assert broadcasts[0][:2] == (world_id, "genesis.progress")
+    assert broadcasts[0][2]["step_num"] == 3
+
+
+@pytest.mark.anyio
+async def test_recovered_genesis_keeps_the_worlds_config(monkeypatch) -> None:
+    stranded = SimpleNamespace(id=uuid4(), seed_prompt="salt and tides", config={"epoch_count": 7})
+    queued: list[Any] = []
+
+    class _StrandedSession(_RecordingSession):
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *_exc):
+            return None
+
+        async def execute(self, stmt: Any, *_args: Any) -> Any:
+            return SimpleNamespace(all=lambda: [stranded])
+
+    async def _enqueue_genesis(db, world_id, seed_prompt, extra_config, **_kwargs):
+        queued.append((world_id, seed_prompt, extra_config))
+
+    monkeypatch.setattr(genesis, "async_session", lambda: _StrandedSession(None))
+    monkeypatch.setattr(genesis, "enqueue_genesis", _enqueue_genesis)
+
+    await genesis.recover_genesis({})
+
+    assert queued == [(stranded.id, "salt and tides", {"epoch_count": 7})]
@@ -0,0 +1,153 @@
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from null_engine.db import get_db
+from null_engine.main import app
+from null_engine.services import embeddings, hybrid_search
+from null_engine.services.hybrid_search import HybridHit, fuse
+
+
+class _RowsResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _QueueSession:
+    def __init__(self, results: list[list[Any]]):
+        self._results = list(results)
+
+    async def execute(self, _stmt: Any) -> _RowsResult:
+        return _RowsResult(self._results.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_query_embeddings():
+    embeddings.clear_query_embedding_cache()
+    yield
+    embeddings.clear_query_embedding_cache()
+
+
+@pytest.fixture
+def override_db():
+    def _install(*results: list[Any]) -> None:
+        session = _QueueSession(list(results))
+
+        async def _override():
+            yield session
+
+        app.dependency_overrides[get_db] = _override
+
+    yield _install
+    app.dependency_overrides.pop(get_db, None)
+
+
+def _hit(entity_type: str, entity_id: uuid.UUID) -> HybridHit:
+    return HybridHit(entity_type=entity_type, entity_id=entity_id, world_id=uuid.uuid4(), title="", snippet="")
+
+
+def _text_row(entity_type: str, entity_id: uuid.UUID, score: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        entity_type=entity_type, id=entity_id, world_id=uuid.uuid4(), title="t", highlight="h", score=score
+    )
+
+
+def _vector_row(entity_type: str, entity_id: uuid.UUID, distance: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        entity_type=entity_type, id=entity_id, world_id=uuid.uuid4(), title="t", snippet="s", distance=distance
+    )
+
+
+def test_fuse_rewards_hits_found_by_both_lists() -> None:
+    both, text_only, vector_only = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    fused = fuse(
+        [_hit("wiki_page", text_only), _hit("wiki_page", both)],
+        [_hit("stratum", vector_only), _hit("wiki_page", both)],
+        k=60,
+    )
+
+    assert [hit.entity_id for hit in fused][0] == both
+    assert (fused[0].text_rank, fused[0].vector_rank) == (2, 2)
+    assert fused[0].score == pytest.approx(2 / 62)
+    assert {hit.entity_id for hit in fused[1:]} == {text_only, vector_only}
+
+
+@pytest.mark.anyio
+async def test_query_embedding_is_cached_per_normalised_text(monkeypatch) -> None:
+    calls: list[str] = []
+
+    async def _embed(text: str):
+        calls.append(text)
+        return None if text == "down" else [0.1, 0.2]
+
+    monkeypatch.setattr(embeddings, "get_embedding", _embed)
+
+    assert await embeddings.get_query_embedding("Salt Guild") == ([0.1, 0.2], False)
+    assert await embeddings.get_query_embedding("  salt   guild ") == ([0.1, 0.2], True)
+    assert await embeddings.get_query_embedding("down") == (None, False)
+    assert await embeddings.get_query_embedding("down") == (None, False)
+    assert calls == ["Salt Guild", "down", "down"]
+
+
+@pytest.mark.anyio
+async def test_hybrid_search_pages_with_cursor(monkeypatch) -> None:
+    async def _embed(_text: str):
+        return [0.0, 1.0], True
+
+    monkeypatch.setattr(hybrid_search, "get_query_embedding", _embed)
+    ids = [uuid.uuid4() for _ in range(4)]
+
+    def _session() -> _QueueSession:
+        return _QueueSession([
+            [_text_row("wiki_page", ids[0], 0.9), _text_row("wiki_page", ids[1], 0.5)],
+            [_text_row("conversation", ids[2], 0.7)],
+            [],
+            [],  # SET LOCAL hnsw.ef_search
+            [_vector_row("wiki_page", ids[1], 0.1)],
+            [],
+            [_vector_row("stratum", ids[3], 0.2)],
+        ])
+
+    first = await hybrid_search.hybrid_search(_session(), "salt", limit=2)
+    second = await hybrid_search.hybrid_search(_session(), "salt", limit=2, cursor=first.next_cursor)
+
+    assert first.semantic and first.embedding_cached
+    assert [hit.entity_id for hit in first.hits] == [ids[1], ids[0]]
+    # Equal fused scores fall back to (type, id) order.
+    assert [hit.entity_id for hit in second.hits] == [ids[2], ids[3]]
+    assert second.next_cursor is None
+    assert {"embed_ms", "text_ms", "vector_ms", "fuse_ms", "total_ms"} <= set(first.timings_ms)
+
+
+@pytest.mark.anyio
+async def test_hybrid_endpoint_falls_back_to_text_without_embedding(override_db, monkeypatch) -> None:
+    async def _embed(_text: str):
+        return None, False
+
+    monkeypatch.setattr(hybrid_search, "get_query_embedding", _embed)
+    page_id = uuid.uuid4()
+    override_db([_text_row("wiki_page", page_id, 0.4)], [], [])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/multiverse/search/hybrid", params={"q": "salt"})
+        bad = await client.get("/api/multiverse/search/hybrid", params={"q": "salt", "cursor": "nope"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["semantic"] is False
+    assert [r["entity_id"] for r in body["results"]] == [str(page_id)]
+    assert body["results"][0]["text_rank"] == 1
+    assert "text;dur=" in resp.headers["server-timing"]
+    assert bad.status_code == 422
@@ -0,0 +1,119 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from null_engine.services import job_queue
+from null_engine.services.job_queue import ClaimedJob, backoff_seconds, claim_statement, run_job
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+def test_claim_skips_locked_rows_and_reclaims_lapsed_leases() -> None:
+    sql = _sql(claim_statement(["translator.batch"], 3, datetime(2026, 10, 19)))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "jobs.lease_expires_at <" in sql
+    assert "attempts=(jobs.attempts +" in sql
+
+
+def test_enqueue_dedupes_only_against_pending_jobs() -> None:
+    stmt = job_queue._insert(
+        "convergence.cycle", None, dedupe_key="periodic", run_after=datetime(2026, 10, 19), priority=0,
+        repeat_seconds=120,
+    )
+    sql = _sql(stmt)
+    assert "ON CONFLICT (kind, dedupe_key) WHERE status IN ('queued', 'running')" in sql
+    assert "DO NOTHING" in sql
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch) -> None:
+    monkeypatch.setattr(job_queue.settings, "job_backoff_seconds", 10.0)
+    monkeypatch.setattr(job_queue.settings, "job_backoff_max_seconds", 60.0)
+    assert [backoff_seconds(n) for n in (1, 2, 3, 4, 5)] == [10.0, 20.0, 40.0, 60.0, 60.0]
+
+
+def test_background_services_register_periodic_jobs() -> None:
+    job_queue.load_job_handlers()
+    periodic = {kind for kind, spec in job_queue._kinds.items() if spec.every_seconds}
+    assert {
+        "convergence.cycle", "semantic_indexer.cycle", "taxonomy.cycle", "translator.batch", "jobs.prune",
+        "embed.sweep", "kg.build",
+    } <= periodic
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("attempts", "fails", "expected"),
+    [(1, False, ("finish", "done")), (1, True, ("retry",)), (3, True, ("finish", "failed"))],
+)
+async def test_run_job_outcomes(monkeypatch, attempts: int, fails: bool, expected: tuple) -> None:
+    outcomes: list[tuple] = []
+
+    async def _finish(job, status, error=None):
+        outcomes.append(("finish", status))
+
+    async def _retry(job, error):
+        outcomes.append(("retry",))
+
+    async def _handler(payload):
+        if fails:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(job_queue, "_finish", _finish)
+    monkeypatch.setattr(job_queue, "_retry", _retry)
+    monkeypatch.setitem(job_queue._kinds, "test.job", job_queue.JobKind(_handler))
+
+    await run_job(ClaimedJob(uuid.uuid4(), "test.job", {}, attempts, 3, None))
+    assert outcomes == [expected]
+
+
+@pytest.mark.anyio
+async def test_capped_kind_only_claims_up_to_its_free_slots() -> None:
+    statements: list[str] = []
+
+    class _Session:
+        def __init__(self, running: int):
+            self.running = running
+
+        async def execute(self, stmt):
+            sql = _sql(stmt)
+            statements.append(sql)
+            if "count(*)" in sql:
+                return type("R", (), {"scalar": lambda _self: self.running})()
+            return type("R", (), {"all": lambda _self: ["job"]})()
+
+    now = datetime(2026, 1, 1)
+    assert await job_queue._claim_capped(_Session(2), "genesis.run", 2, 5, now) == []
+    assert "pg_advisory_xact_lock" in statements[0]
+    assert len(statements) == 2
+
+    assert await job_queue._claim_capped(_Session(1), "genesis.run", 2, 5, now) == ["job"]
+    assert "LIMIT $" in statements[-1] and "FOR UPDATE SKIP LOCKED" in statements[-1]
+
+
+@pytest.mark.anyio
+async def test_final_failure_calls_the_kinds_failure_hook(monkeypatch) -> None:
+    failed: list[tuple] = []
+
+    async def _finish(job, status, error=None):
+        return None
+
+    async def _handler(payload):
+        raise RuntimeError("boom")
+
+    async def _on_failure(payload, error):
+        failed.append((payload, error))
+
+    monkeypatch.setattr(job_queue, "_finish", _finish)
+    monkeypatch.setitem(job_queue._kinds, "test.job", job_queue.JobKind(_handler, on_failure=_on_failure))
+
+    await run_job(ClaimedJob(uuid.uuid4(), "test.job", {"world_id": "w"}, 3, 3, None))
+    assert failed == [({"world_id": "w"}, "RuntimeError: boom")]
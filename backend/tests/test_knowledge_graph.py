@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from null_engine.services import knowledge_graph
+from null_engine.services.knowledge_graph import (
+    Document,
+    batch_documents,
+    canonical_entity,
+    changed_documents,
+    edge_rows,
+    upsert_edges_statement,
+    watermark_statement,
+)
+from null_engine.services.mention_extractor import MentionIndex
+
+INDEX = MentionIndex([
+    ("agent", uuid.uuid4(), "Elder Mara"),
+    ("faction", uuid.uuid4(), "Tide Guild"),
+    ("wiki_page", uuid.uuid4(), "Salt Road"),
+])
+
+
+def _doc(source: str, text: str = "x", minutes: int = 0) -> Document:
+    return Document(source, uuid.uuid4(), datetime(2026, 1, 1) + timedelta(minutes=minutes), "T", text)
+
+
+def test_entities_are_canonicalized_to_known_names() -> None:
+    assert canonical_entity("elder  mara", INDEX) == "Elder Mara"
+    assert canonical_entity("the Tide-Guild", INDEX) == "Tide Guild"
+    assert canonical_entity("fall of the Tide Guild fortress walls", INDEX) == "fall of the Tide Guild fortress walls"
+    assert canonical_entity("  Unknown   Prophet ", INDEX) == "Unknown Prophet"
+
+
+def test_edge_rows_dedupe_triples_and_attribute_sources() -> None:
+    world_id = uuid.uuid4()
+    wiki, conv = _doc("wiki_page"), _doc("conversation")
+    rows = edge_rows(world_id, [wiki, conv], {"triples": [
+        {"doc": 1, "subject": "elder mara", "predicate": "Leads", "object": "the tide guild", "confidence": 0.6},
+        {"doc": 2, "subject": "Elder Mara", "predicate": "leads", "object": "Tide Guild", "confidence": 0.9},
+        {"doc": 2, "subject": "Tide Guild", "predicate": "controls", "object": "Salt Road"},
+        {"doc": 7, "subject": "a", "predicate": "b", "object": "c"},
+        {"doc": 1, "subject": "Salt Road", "predicate": "is", "object": "salt road"},
+    ]}, INDEX)
+
+    by_triple = {(r["subject"], r["predicate"], r["object"]): r for r in rows}
+    assert set(by_triple) == {("Elder Mara", "leads", "Tide Guild"), ("Tide Guild", "controls", "Salt Road")}
+    leads = by_triple[("Elder Mara", "leads", "Tide Guild")]
+    assert leads["confidence"] == 0.9
+    assert leads["source_conversation"] == conv.id and leads["source_page"] is None
+    assert leads["sources"] == [f"conversation:{conv.id}"]
+
+
+def test_batches_respect_document_and_character_budgets(monkeypatch) -> None:
+    monkeypatch.setattr(knowledge_graph.settings, "kg_batch_documents", 2)
+    monkeypatch.setattr(knowledge_graph.settings, "kg_batch_chars", 100)
+    docs = [_doc("wiki_page", "a" * 30, i) for i in range(3)] + [_doc("conversation", "b" * 90, 9)]
+    assert [len(batch) for batch in batch_documents(docs)] == [2, 1, 1]
+
+
+def test_upsert_merges_confidence_on_the_triple_index() -> None:
+    row = {
+        "id": uuid.uuid4(), "world_id": uuid.uuid4(), "subject": "A", "predicate": "p", "object": "B",
+        "source_page": None, "source_conversation": uuid.uuid4(), "sources": ["conversation:c1"], "confidence": 0.5,
+    }
+    sql = str(upsert_edges_statement([row]).compile(dialect=postgresql.asyncpg.dialect()))
+    assert "ON CONFLICT (world_id, subject, predicate, object) DO UPDATE" in sql
+    # A source already on the edge only keeps the higher confidence; a new one
+    # corroborates and is recorded, so re-reading documents can't inflate it.
+    assert "WHEN (knowledge_edges.sources @> excluded.sources) THEN greatest(" in sql
+    assert "ELSE knowledge_edges.sources || excluded.sources END" in sql
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.sql: list[str] = []
+
+    async def execute(self, stmt):
+        self.sql.append(str(stmt.compile(dialect=postgresql.asyncpg.dialect())))
+        return SimpleNamespace(all=lambda: [])
+
+
+@pytest.mark.anyio
+async def test_changed_documents_resume_after_the_keyset_watermark() -> None:
+    db = _RecordingSession()
+    at = datetime(2026, 1, 1)
+    watermarks = {"wiki_page": (at, uuid.uuid4()), "conversation": (at, uuid.uuid4())}
+    await changed_documents(db, uuid.uuid4(), watermarks, at + timedelta(hours=1), 10)
+    wiki_sql, conversation_sql = db.sql
+    # Documents sharing the watermark's timestamp but cut off by the limit are
+    # still ahead of it, so the next run reads them.
+    assert ", wiki_pages.id) > (" in wiki_sql
+    assert "ORDER BY changed_at, wiki_pages.id" in wiki_sql
+    assert "(conversations.created_at, conversations.id) > (" in conversation_sql
+    assert "ORDER BY conversations.created_at, conversations.id" in conversation_sql
+
+
+def test_watermark_only_moves_forward_along_the_keyset() -> None:
+    stmt = watermark_statement(uuid.uuid4(), "wiki_page", datetime(2026, 1, 1), uuid.uuid4())
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert "SET watermark = excluded.watermark, watermark_id = excluded.watermark_id" in sql
+    assert "WHERE (excluded.watermark, excluded.watermark_id) > " \
+        "(knowledge_watermarks.watermark, knowledge_watermarks.watermark_id)" in sql
@@ -0,0 +1,122 @@
+import uuid
+from typing import Any
+
+import pytest
+
+from null_engine.services import mention_extractor
+from null_engine.services.mention_extractor import (
+    Automaton,
+    MentionIndex,
+    _fuzzy_match,
+    enqueue_wiki_mentions,
+    get_mention_index,
+)
+
+
+class _Result:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+    def one(self) -> Any:
+        return self._rows[0]
+
+
+class _QueueSession:
+    def __init__(self, results: list[list[Any]]):
+        self._results = list(results)
+        self.executed = 0
+        self.added: list[Any] = []
+
+    async def execute(self, _stmt: Any) -> _Result:
+        self.executed += 1
+        return _Result(self._results.pop(0))
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def flush(self) -> None:
+        pass
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_indexes():
+    mention_extractor.clear_mention_indexes()
+    yield
+    mention_extractor.clear_mention_indexes()
+
+
+def test_automaton_finds_overlapping_patterns_in_one_pass() -> None:
+    automaton = Automaton(["he", "she", "his", "hers"])
+    assert automaton.find("ushers") == {0, 1, 3}
+    assert automaton.find("nothing here") == {0}
+    assert automaton.find("xyz") == set()
+
+
+def test_index_agrees_with_fuzzy_match() -> None:
+    names = ["Roman-Empire", "Dune_Prophecy", "x", "", "Order of the Dawn", "Kael", "Kaelith"]
+    texts = [
+        "The roman empire rises while the dune prophecy arc unfolds.",
+        "Dawn broke; the order held. Kaelith spoke.",
+        "x marks the spot",
+        "Nothing relevant here.",
+    ]
+    index = MentionIndex(("agent", uuid.uuid4(), name) for name in names)
+    for text in texts:
+        expected = {name for name in names if _fuzzy_match(name, text)}
+        assert {entity.name for entity in index.matches(text)} == expected
+
+
+@pytest.mark.anyio
+async def test_index_is_cached_until_entities_change() -> None:
+    world_id = uuid.uuid4()
+    agent_id = uuid.uuid4()
+    session = _QueueSession([
+        [(1, 11, 0, 0, 0, 0)],
+        [(agent_id, "Kael")],
+        [],
+        [],
+        [(1, 11, 0, 0, 0, 0)],
+        [(1, 12, 0, 0, 0, 0)],
+        [(agent_id, "Kaelen")],
+        [],
+        [],
+    ])
+
+    first = await get_mention_index(session, world_id)
+    assert session.executed == 4
+    assert await get_mention_index(session, world_id) is first
+    assert session.executed == 5
+
+    renamed = await get_mention_index(session, world_id)
+    assert renamed is not first
+    assert [entity.name for entity in renamed.entities] == ["Kaelen"]
+
+
+@pytest.mark.anyio
+async def test_extraction_skips_existing_and_self_references() -> None:
+    world_id, page_id, agent_id, known_id = (uuid.uuid4() for _ in range(4))
+    session = _QueueSession([
+        [(2, 5, 1, 7, 0, 0)],
+        [(agent_id, "Kael"), (known_id, "Mira")],
+        [(page_id, "Great Schism")],
+        [],
+        [("agent", known_id)],
+    ])
+
+    await mention_extractor.extract_mentions_from_wiki(
+        session, world_id, page_id, "During the Great Schism, Kael and Mira parted."
+    )
+
+    assert [(m.target_type, m.target_id, m.confidence) for m in session.added] == [("agent", agent_id, 0.9)]
+
+
+def test_enqueue_skips_empty_text() -> None:
+    assert enqueue_wiki_mentions(uuid.uuid4(), uuid.uuid4(), "   ") is False
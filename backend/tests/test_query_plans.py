@@ -0,0 +1,162 @@
+"""EXPLAIN the hot read queries against a migrated database.
+
+Runs only when QUERY_PLAN_DATABASE_URL points at a database upgraded to
+head (CI does this after the migration round-trip). The tables are
+empty there, so seq scans are disabled to make the planner show whether
+a usable index exists at all; any remaining Seq Scan on one of the large
+tables means a query lost its index.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from null_engine.models.tables import (
+    Agent,
+    AgentPost,
+    Conversation,
+    EntityMention,
+    Relationship,
+    ResonanceLink,
+    Stratum,
+    WikiPage,
+)
+from null_engine.services.text_search import agent_match, conversation_match, wiki_page_match
+
+DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="QUERY_PLAN_DATABASE_URL not set")
+
+LARGE_TABLES = {
+    "agents",
+    "agent_posts",
+    "conversations",
+    "entity_mentions",
+    "relationships",
+    "resonance_links",
+    "strata",
+    "wiki_pages",
+}
+
+WORLD_ID = uuid.uuid4()
+AGENT_ID = uuid.uuid4()
+CURSOR_AT = datetime(2026, 1, 1)
+
+
+def _hot_queries() -> dict[str, object]:
+    return {
+        "conversations.keyset": (
+            select(Conversation.id)
+            .where(Conversation.world_id == WORLD_ID)
+            .where(tuple_(Conversation.created_at, Conversation.id) < tuple_(CURSOR_AT, uuid.uuid4()))
+            .order_by(Conversation.created_at.desc(), Conversation.id.desc())
+            .limit(20)
+        ),
+        "conversations.by_epoch": select(Conversation.id).where(
+            Conversation.world_id == WORLD_ID, Conversation.epoch == 3
+        ),
+        "feed.wiki": (
+            select(WikiPage.id)
+            .where(WikiPage.world_id == WORLD_ID, WikiPage.created_at < CURSOR_AT)
+            .order_by(WikiPage.created_at.desc())
+            .limit(20)
+        ),
+        "feed.posts": (
+            select(AgentPost.id)
+            .where(AgentPost.world_id == WORLD_ID, AgentPost.created_at < CURSOR_AT)
+            .order_by(AgentPost.created_at.desc())
+            .limit(20)
+        ),
+        "strata.list": select(Stratum.id).where(Stratum.world_id == WORLD_ID).order_by(Stratum.epoch.desc()),
+        "agents.list": select(Agent.id).where(Agent.world_id == WORLD_ID),
+        "wiki.by_title": select(WikiPage.id).where(WikiPage.world_id == WORLD_ID, WikiPage.title == "Origins"),
+        "relationships.pair": select(Relationship.id).where(
+            Relationship.world_id == WORLD_ID,
+            Relationship.agent_a == AGENT_ID,
+            Relationship.agent_b == uuid.uuid4(),
+        ),
+        "relationships.either_side": select(Relationship.id).where(
+            Relationship.world_id == WORLD_ID,
+            (Relationship.agent_a == AGENT_ID) | (Relationship.agent_b == AGENT_ID),
+        ),
+        "mentions.by_target": (
+            select(EntityMention.id)
+            .where(
+                EntityMention.world_id == WORLD_ID,
+                EntityMention.target_type == "agent",
+                EntityMention.target_id == AGENT_ID,
+            )
+            .order_by(EntityMention.created_at.desc())
+        ),
+        "resonance.by_world": (
+            select(ResonanceLink.id)
+            .where(or_(ResonanceLink.world_a == WORLD_ID, ResonanceLink.world_b == WORLD_ID))
+            .order_by(ResonanceLink.strength.desc())
+            .limit(50)
+        ),
+        "translator.conversations": (
+            select(Conversation.id)
+            .where(Conversation.topic_ko.is_(None))
+            .where(Conversation.topic != "")
+            .order_by(Conversation.created_at.desc())
+            .limit(5)
+        ),
+        "translator.wiki": (
+            select(WikiPage.id)
+            .where(WikiPage.title_ko.is_(None))
+            .where(WikiPage.title != "")
+            .order_by(WikiPage.created_at.desc())
+            .limit(5)
+        ),
+        "ops.pending_strata": (
+            select(func.count()).select_from(Stratum).where(Stratum.summary_ko.is_(None)).where(Stratum.summary != "")
+        ),
+        "export.wiki_since": select(WikiPage.id).where(
+            WikiPage.world_id == WORLD_ID, WikiPage.updated_at >= CURSOR_AT, WikiPage.updated_at < datetime(2026, 1, 2)
+        ),
+        "search.wiki": select(WikiPage.id).where(WikiPage.world_id == WORLD_ID, wiki_page_match("river guild")[0]),
+        "search.conversations": select(Conversation.id).where(conversation_match("salt tolls")[0]),
+        "search.agents": select(Agent.id).where(agent_match("Seo-yeon")[0]),
+        "indexer.pending_conversations": select(Conversation.id).where(Conversation.embedding.is_(None)).limit(50),
+    }
+
+
+def _seq_scanned_tables(plan: dict) -> set[str]:
+    found: set[str] = set()
+    if plan.get("Node Type") == "Seq Scan":
+        found.add(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found |= _seq_scanned_tables(child)
+    return found
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", sorted(_hot_queries()))
+async def test_hot_query_uses_an_index(name: str) -> None:
+    stmt = _hot_queries()[name]
+    # asyncpg's dialect leaves pg_trgm's % operator unescaped in literal SQL.
+    sql = str(stmt.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+
+    engine = create_async_engine(DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SET enable_seqscan = off"))
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            raw = result.scalar()
+    finally:
+        await engine.dispose()
+
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    offenders = _seq_scanned_tables(plan) & LARGE_TABLES
+    assert not offenders, f"{name} seq-scans {sorted(offenders)}:\n{json.dumps(plan, indent=2)}"
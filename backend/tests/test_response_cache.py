@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from null_engine.config import settings
+from null_engine.services import response_cache
+from null_engine.services.response_cache import bump_global_version, bump_world_version, cached_response
+from null_engine.services.runtime_metrics import clear_runtime_metrics, get_cache_metrics_snapshot
+
+WORLD_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def cache_app():
+    calls: list[str] = []
+    gate: dict[str, asyncio.Event | None] = {"event": None}
+    app = FastAPI()
+
+    @app.get("/worlds/{world_id}/things")
+    async def things(request: Request, world_id: uuid.UUID, limit: int = 10):
+        async def _load():
+            calls.append(request.url.query)
+            if gate["event"] is not None:
+                await gate["event"].wait()
+            return {"world_id": str(world_id), "limit": limit, "n": len(calls)}
+
+        return await cached_response(request, _load, world_id=world_id)
+
+    @app.get("/tree")
+    async def tree(request: Request):
+        async def _load():
+            calls.append("tree")
+            return {"n": calls.count("tree")}
+
+        return await cached_response(request, _load)
+
+    clear_runtime_metrics()
+    yield app, calls, gate
+    clear_runtime_metrics()
+
+
+def _client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_second_read_is_served_from_cache(cache_app) -> None:
+    app, calls, _ = cache_app
+    async with _client(app) as client:
+        first = await client.get(f"/worlds/{WORLD_ID}/things")
+        second = await client.get(f"/worlds/{WORLD_ID}/things")
+        other = await client.get(f"/worlds/{WORLD_ID}/things", params={"limit": 5})
+
+    assert first.status_code == 200
+    assert second.json() == first.json() == {"world_id": str(WORLD_ID), "limit": 10, "n": 1}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert other.json()["limit"] == 5
+    assert len(calls) == 2
+
+    (metrics,) = get_cache_metrics_snapshot()
+    assert metrics["route"] == "/worlds/{world_id}/things"
+    assert (metrics["hits"], metrics["misses"]) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_if_none_match_returns_304(cache_app) -> None:
+    app, _, _ = cache_app
+    async with _client(app) as client:
+        first = await client.get(f"/worlds/{WORLD_ID}/things")
+        revalidated = await client.get(
+            f"/worlds/{WORLD_ID}/things", headers={"If-None-Match": first.headers["etag"]}
+        )
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.anyio
+async def test_version_bump_invalidates_world_and_global(cache_app) -> None:
+    app, calls, _ = cache_app
+    async with _client(app) as client:
+        await client.get(f"/worlds/{WORLD_ID}/things")
+        await bump_world_version(uuid.uuid4())  # another world: still cached
+        await client.get(f"/worlds/{WORLD_ID}/things")
+        assert len(calls) == 1
+
+        await bump_world_version(WORLD_ID)
+        refreshed = await client.get(f"/worlds/{WORLD_ID}/things")
+        assert refreshed.json()["n"] == 2
+
+        await bump_world_version()  # cross-world services invalidate every world
+        refreshed = await client.get(f"/worlds/{WORLD_ID}/things")
+        assert refreshed.json()["n"] == 3
+
+
+@pytest.mark.anyio
+async def test_global_bump_keeps_world_scoped_entries(cache_app) -> None:
+    app, calls, _ = cache_app
+    async with _client(app) as client:
+        await client.get(f"/worlds/{WORLD_ID}/things")
+        await client.get("/tree")
+        await bump_global_version()
+        world = await client.get(f"/worlds/{WORLD_ID}/things")
+        tree = await client.get("/tree")
+
+    assert world.json()["n"] == 1
+    assert tree.json()["n"] == 2
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_run_the_loader_once(cache_app) -> None:
+    app, calls, gate = cache_app
+    gate["event"] = asyncio.Event()
+    async with _client(app) as client:
+        requests = [asyncio.create_task(client.get(f"/worlds/{WORLD_ID}/things")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        gate["event"].set()
+        responses = await asyncio.gather(*requests)
+
+    assert len(calls) == 1
+    assert {r.json()["n"] for r in responses} == {1}
+    (metrics,) = get_cache_metrics_snapshot()
+    assert metrics["coalesced"] == 4
+    assert metrics["hit_rate"] == 0.8
+
+
+@pytest.mark.anyio
+async def test_lru_evicts_oldest_entry(cache_app, monkeypatch) -> None:
+    app, calls, _ = cache_app
+    monkeypatch.setattr(settings, "response_cache_max_entries", 2)
+    async with _client(app) as client:
+        for limit in (1, 2, 3):
+            await client.get(f"/worlds/{WORLD_ID}/things", params={"limit": limit})
+        await client.get(f"/worlds/{WORLD_ID}/things", params={"limit": 3})
+        await client.get(f"/worlds/{WORLD_ID}/things", params={"limit": 1})
+
+    assert len(response_cache._entries) == 2
+    assert len(calls) == 4  # limit=1 was evicted and reloaded
+    (metrics,) = get_cache_metrics_snapshot()
+    assert metrics["evictions"] == 2
+
+
+@pytest.mark.anyio
+async def test_disabled_cache_always_loads(cache_app, monkeypatch) -> None:
+    app, calls, _ = cache_app
+    monkeypatch.setattr(settings, "response_cache_enabled", False)
+    async with _client(app) as client:
+        await client.get(f"/worlds/{WORLD_ID}/things")
+        await client.get(f"/worlds/{WORLD_ID}/things")
+
+    assert len(calls) == 2
+    assert not response_cache._entries
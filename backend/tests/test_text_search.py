@@ -0,0 +1,125 @@
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from null_engine.db import get_db
+from null_engine.main import app
+from null_engine.services.text_search import search_queries
+
+
+class _RowsResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _QueueSession:
+    def __init__(self, results: list[list[Any]]):
+        self._results = list(results)
+        self.statements: list[Any] = []
+
+    async def execute(self, stmt: Any) -> _RowsResult:
+        self.statements.append(stmt)
+        return _RowsResult(self._results.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def override_db():
+    def _install(*results: list[Any]) -> _QueueSession:
+        session = _QueueSession(list(results))
+
+        async def _override():
+            yield session
+
+        app.dependency_overrides[get_db] = _override
+        return session
+
+    yield _install
+    app.dependency_overrides.pop(get_db, None)
+
+
+def _row(entity_type: str, title: str, score: float, highlight: str = "") -> SimpleNamespace:
+    return SimpleNamespace(
+        entity_type=entity_type, id=uuid.uuid4(), world_id=uuid.uuid4(), title=title, highlight=highlight, score=score
+    )
+
+
+def test_search_queries_use_text_indexes_not_ilike() -> None:
+    world_id = uuid.uuid4()
+    for stmt in search_queries("salt guild", world_id, 10):
+        sql = str(stmt.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+        assert "search_vector @@ " in sql
+        assert "ILIKE" not in sql.upper()
+        assert str(world_id) in sql
+        assert "LIMIT 10" in sql
+
+
+@pytest.mark.anyio
+async def test_global_search_merges_types_by_rank_and_paginates(override_db) -> None:
+    session = override_db(
+        [_row("wiki_page", "Salt Guild", 0.6, "The <mark>salt</mark> guild"), _row("wiki_page", "Tolls", 0.2)],
+        [_row("conversation", "Guild tax vote", 0.4)],
+        [_row("agent", "Salter", 0.5)],
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/multiverse/search", params={"q": "salt", "limit": 3, "offset": 0})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [(r["entity_type"], r["score"]) for r in body] == [("wiki_page", 0.6), ("agent", 0.5), ("conversation", 0.4)]
+    assert body[0]["snippet"] == "The salt guild"
+    assert body[0]["highlight"] == "The <mark>salt</mark> guild"
+    assert len(session.statements) == 3
+
+
+@pytest.mark.anyio
+async def test_global_search_offset_skips_earlier_hits(override_db) -> None:
+    override_db(
+        [_row("wiki_page", "A", 0.9), _row("wiki_page", "B", 0.3)],
+        [_row("conversation", "C", 0.5)],
+        [],
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/multiverse/search", params={"q": "x", "limit": 1, "offset": 1})
+
+    assert [r["title"] for r in resp.json()] == ["C"]
+
+
+@pytest.mark.anyio
+async def test_wiki_search_returns_highlights(override_db) -> None:
+    from datetime import datetime
+
+    from null_engine.models.tables import WikiPage
+
+    world_id = uuid.uuid4()
+    page = WikiPage(
+        id=uuid.uuid4(), world_id=world_id, title="Salt Guild", content="The salt guild taxes the coast.",
+        status="draft", version=1, created_at=datetime(2026, 1, 1),
+    )
+    session = override_db([(page, "The <mark>salt</mark> guild")])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(f"/api/worlds/{world_id}/wiki/search", params={"q": "salt", "limit": 5})
+
+    assert resp.status_code == 200
+    assert resp.json()[0]["title"] == "Salt Guild"
+    assert resp.json()[0]["highlight"] == "The <mark>salt</mark> guild"
+    sql = str(session.statements[0].compile(dialect=asyncpg.dialect()))
+    # The headline is computed in the outer query, for the ranked page only.
+    assert sql.index("ts_headline") < sql.index("LIMIT")
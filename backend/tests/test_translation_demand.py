@@ -0,0 +1,124 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from null_engine.db import get_db
+from null_engine.main import app
+from null_engine.services.llm_router import LLMScheduler
+from null_engine.services.translation_demand import TranslationDemand, translation_demand
+
+
+class _ScalarResult:
+    def __init__(self, items: list[Any]):
+        self._items = items
+
+    def all(self) -> list[Any]:
+        return self._items
+
+
+class _ExecuteResult:
+    def __init__(self, items: list[Any]):
+        self._items = items
+
+    def scalars(self) -> _ScalarResult:
+        return _ScalarResult(self._items)
+
+
+class _QueueSession:
+    def __init__(self, batches: list[list[Any]]):
+        self._batches = list(batches)
+
+    async def execute(self, _stmt: Any) -> _ExecuteResult:
+        return _ExecuteResult(self._batches.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_demand():
+    translation_demand.clear()
+    yield
+    translation_demand.clear()
+
+
+def test_take_returns_most_read_then_most_recent() -> None:
+    demand = TranslationDemand(max_entries=10)
+    world_id = uuid.uuid4()
+    a, b, c, page = (uuid.uuid4() for _ in range(4))
+    demand.note("conversation", world_id, [a, b])
+    demand.note("conversation", world_id, [b])
+    demand.note("conversation", world_id, [c])
+    demand.note("wiki_page", world_id, [page])
+
+    assert [d.entity_id for d in demand.take("conversation", 2)] == [b, c]
+    assert [d.entity_id for d in demand.take("conversation", 5)] == [a]
+    assert len(demand) == 1
+
+
+def test_demand_is_bounded_by_recency() -> None:
+    demand = TranslationDemand(max_entries=2)
+    world_id = uuid.uuid4()
+    old, mid, new = (uuid.uuid4() for _ in range(3))
+    demand.note("stratum", world_id, [old, mid, new])
+
+    assert {d.entity_id for d in demand.take("stratum", 5)} == {mid, new}
+
+
+@pytest.mark.anyio
+async def test_wiki_list_records_untranslated_pages() -> None:
+    world_id = uuid.uuid4()
+    pending = SimpleNamespace(
+        id=uuid.uuid4(), world_id=world_id, title="Dawn", content="", title_ko=None, content_ko=None,
+        status="draft", version=1, created_at="2026-10-19T00:00:00",
+    )
+    done = SimpleNamespace(**{**vars(pending), "id": uuid.uuid4(), "title_ko": "새벽"})
+    session = _QueueSession([[pending, done]])
+
+    async def _override():
+        yield session
+
+    app.dependency_overrides[get_db] = _override
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/api/worlds/{world_id}/wiki")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 200
+    assert [d.entity_id for d in translation_demand.take("wiki_page", 10)] == [pending.id]
+
+
+@pytest.mark.anyio
+async def test_scheduler_admits_waiters_by_priority() -> None:
+    scheduler = LLMScheduler(limit=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def _call(name: str, priority: int) -> None:
+        async with scheduler.slot(priority):
+            order.append(name)
+            if name == "first":
+                await release.wait()
+
+    first = asyncio.create_task(_call("first", 1))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(_call("translator", 2)),
+        asyncio.create_task(_call("debater", 0)),
+        asyncio.create_task(_call("librarian", 1)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 3
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+    assert order == ["first", "debater", "librarian", "translator"]
+    assert scheduler.active == 0
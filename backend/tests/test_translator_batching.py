@@ -0,0 +1,113 @@
+import json
+from typing import Any
+
+import pytest
+
+from null_engine.services import translator
+from null_engine.services.llm_router import LLMGenerationError
+from null_engine.services.translator import pack_segments, source_hash, translate_batch, translate_messages
+
+
+class _Result:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _MemorySession:
+    def __init__(self, remembered: dict[str, str]):
+        self._remembered = remembered
+        self.statements: list[Any] = []
+
+    async def execute(self, stmt: Any) -> _Result:
+        self.statements.append(stmt)
+        return _Result([(source_hash(text), ko) for text, ko in self._remembered.items()])
+
+
+class _FakeLLM:
+    """Translates by prefixing 'ko:'; drops the last item of any batch larger than break_above."""
+
+    def __init__(self, break_above: int | None = None):
+        self.break_above = break_above
+        self.batches: list[list[str]] = []
+        self.singles: list[str] = []
+
+    async def generate_json(self, role: str, prompt: str, max_tokens: int = 4096) -> list[str]:
+        segments = json.loads(prompt[prompt.index("["):])
+        self.batches.append(segments)
+        reply = [f"ko:{text}" for text in segments]
+        if self.break_above is not None and len(segments) > self.break_above:
+            reply = reply[:-1]
+        return reply
+
+    async def generate_text(self, role: str, prompt: str, temperature: float = 0.8, max_tokens: int = 2048) -> str:
+        text = prompt.rsplit("\n\n", 1)[1]
+        self.singles.append(text)
+        return f"ko:{text}"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_pack_segments_respects_count_and_size_limits() -> None:
+    assert pack_segments(["a", "b", "c"], 2, 100) == [["a", "b"], ["c"]]
+    assert pack_segments(["aaaa", "bb", "cc", "dddddddd"], 10, 5) == [["aaaa"], ["bb", "cc"], ["dddddddd"]]
+    assert pack_segments([], 5, 5) == []
+
+
+@pytest.mark.anyio
+async def test_batch_uses_memory_and_one_call_for_the_rest(monkeypatch) -> None:
+    llm = _FakeLLM()
+    monkeypatch.setattr(translator, "llm_router", llm)
+    session = _MemorySession({"The Schism": "대분열"})
+
+    result = await translate_batch(session, ["The Schism", "Hello", "", "World", "Hello"])
+
+    assert result == {"The Schism": "대분열", "Hello": "ko:Hello", "World": "ko:World"}
+    assert llm.batches == [["Hello", "World"]]
+    assert len(session.statements) == 2  # memory lookup + memory insert
+
+
+@pytest.mark.anyio
+async def test_misaligned_reply_is_bisected(monkeypatch) -> None:
+    llm = _FakeLLM(break_above=2)
+    monkeypatch.setattr(translator, "llm_router", llm)
+
+    result = await translate_batch(_MemorySession({}), ["a1", "b2", "c3", "d4", "e5"])
+
+    assert result == {text: f"ko:{text}" for text in ["a1", "b2", "c3", "d4", "e5"]}
+    assert llm.batches[0] == ["a1", "b2", "c3", "d4", "e5"]
+    assert ["a1", "b2"] in llm.batches
+    assert llm.singles == ["c3"]
+
+
+@pytest.mark.anyio
+async def test_llm_failure_fails_the_batch_instead_of_bisecting(monkeypatch) -> None:
+    llm = _FakeLLM()
+
+    async def _fail(role: str, prompt: str, max_tokens: int = 4096) -> list[str]:
+        llm.batches.append(json.loads(prompt[prompt.index("["):]))
+        raise LLMGenerationError(role, "provider unavailable")
+
+    monkeypatch.setattr(llm, "generate_json", _fail)
+    monkeypatch.setattr(translator, "llm_router", llm)
+    session = _MemorySession({})
+
+    with pytest.raises(LLMGenerationError):
+        await translate_batch(session, ["a1", "b2", "c3"])
+
+    assert llm.batches == [["a1", "b2", "c3"]]
+    assert llm.singles == []
+    assert len(session.statements) == 1  # memory lookup only; nothing remembered
+
+
+def test_translate_messages_keeps_untranslated_content() -> None:
+    messages = [{"agent_id": "x", "content": "Hi"}, {"agent_id": "y", "content": "Bye"}]
+    assert translate_messages(messages, {"Hi": "안녕"}) == [
+        {"agent_id": "x", "content": "안녕"},
+        {"agent_id": "y", "content": "Bye"},
+    ]
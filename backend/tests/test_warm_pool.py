@@ -0,0 +1,90 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from null_engine.api.routes import worlds as worlds_route
+from null_engine.core import warm_pool
+from null_engine.core.auto_genesis import AUTO_SEEDS
+from null_engine.db import get_db
+from null_engine.main import app
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_claim_takes_one_pooled_world_without_blocking_on_locked_rows() -> None:
+    stmt = warm_pool.claim_statement(
+        [warm_pool.GENERIC_SEED], "generating", seed_prompt="Tidal kingdoms", extra_config={"era": "bronze"},
+    )
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert sql.startswith("UPDATE worlds SET")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "worlds.status = $" in sql
+    assert "RETURNING worlds.id, worlds.seed_prompt" in sql
+    assert "seed_prompt=" in sql and "config=" in sql
+
+
+def test_pool_keeps_generic_worlds_first_then_unused_auto_seeds(monkeypatch) -> None:
+    monkeypatch.setattr(warm_pool.settings, "warm_pool_generic", 1)
+    assert warm_pool._next_seed([]) == warm_pool.GENERIC_SEED
+    pooled = [warm_pool.GENERIC_SEED, *AUTO_SEEDS[:-1]]
+    assert warm_pool._next_seed(pooled) == AUTO_SEEDS[-1]
+
+
+@pytest.mark.anyio
+async def test_create_world_claims_a_generic_pooled_world(monkeypatch) -> None:
+    world = SimpleNamespace(
+        id=uuid4(), seed_prompt="Tidal kingdoms", config={}, status="generating",
+        current_epoch=0, current_tick=0, created_at=datetime.now(UTC),
+    )
+    queued: list[dict[str, Any]] = []
+    steps: list[str] = []
+
+    class _Session:
+        async def execute(self, _stmt: Any) -> Any:
+            return SimpleNamespace(scalar_one=lambda: world)
+
+        async def commit(self) -> None:
+            steps.append("commit")
+
+        async def refresh(self, _obj: Any) -> None:
+            return None
+
+    async def _override():
+        yield _Session()
+
+    async def _no_exact(_db, _seeds, **kwargs):
+        steps.append(f"claim_pooled commit={kwargs['commit']}")
+        return None
+
+    async def _generic(_db, seed_prompt, **kwargs):
+        steps.append(f"claim_generic commit={kwargs['commit']}")
+        return warm_pool.PooledWorld(world.id, seed_prompt)
+
+    async def _enqueue_genesis(_db, world_id, seed_prompt, extra_config, **kwargs):
+        steps.append("enqueue")
+        queued.append({"world_id": world_id, "seed": seed_prompt, **kwargs})
+
+    monkeypatch.setattr(worlds_route, "claim_pooled_world", _no_exact)
+    monkeypatch.setattr(worlds_route, "claim_generic_world", _generic)
+    monkeypatch.setattr(worlds_route, "enqueue_genesis", _enqueue_genesis)
+    app.dependency_overrides[get_db] = _override
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/api/worlds", json={"seed_prompt": "Tidal kingdoms"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 201
+    assert resp.json()["id"] == str(world.id)
+    assert queued == [{"world_id": world.id, "seed": "Tidal kingdoms", "retheme": True}]
+    # The claim is committed together with its genesis.run job.
+    assert steps == ["claim_pooled commit=False", "claim_generic commit=False", "enqueue", "commit"]
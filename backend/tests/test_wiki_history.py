@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from null_engine.services import wiki_history
+from null_engine.services.wiki_history import apply_delta, history_entry, make_delta, reconstruct_version
+
+VERSIONS = [
+    "## Overview\n\nA port town.\n",
+    "## Overview\n\nA port town.\n\n## Notable Events\n\nThe flood.\n",
+    "## Overview\n\nA walled port town.\n\n## Notable Events\n\nThe flood.\nThe siege.\n",
+    "## Overview\n\nA walled port town.\n\n## Notable Events\n\nThe siege.\n\n## Current Status\n\nAt peace.",
+]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_delta_round_trips_between_versions() -> None:
+    for older, newer in zip(VERSIONS, VERSIONS[1:]):
+        assert apply_delta(newer, make_delta(newer, older)) == older
+    assert apply_delta("", make_delta("", VERSIONS[0])) == VERSIONS[0]
+    assert make_delta(VERSIONS[0], VERSIONS[0]) == [3]
+
+
+def test_history_keeps_a_full_snapshot_every_k_versions(monkeypatch) -> None:
+    monkeypatch.setattr(wiki_history.settings, "wiki_snapshot_every", 2)
+    article = "".join(f"Line {i}\n" for i in range(50))
+    page = SimpleNamespace(id=uuid.uuid4(), content=article, version=1)
+
+    row = history_entry(page, article + "Line 50\n")
+    assert row.content is None and row.delta == [50, -1]
+
+    page.version = 2
+    row = history_entry(page, article + "Line 50\n")
+    assert row.content == article and row.delta is None
+
+
+class _Session:
+    def __init__(self, rows):
+        self.rows = rows
+        self.results = []
+
+    async def execute(self, _stmt):
+        if not self.results:
+            snapshots = [row.version for row in self.rows if row.content is not None]
+            self.results.append(None)
+            return SimpleNamespace(scalar=lambda: min(snapshots, default=None))
+        snapshot = min((row.version for row in self.rows if row.content is not None), default=None)
+        chain = [row for row in self.rows if snapshot is None or row.version <= snapshot]
+        return SimpleNamespace(all=lambda: sorted(chain, key=lambda row: -row.version))
+
+
+@pytest.mark.anyio
+async def test_reconstruct_walks_deltas_down_from_the_live_page_or_nearest_snapshot(monkeypatch) -> None:
+    monkeypatch.setattr(wiki_history.settings, "wiki_snapshot_every", 100)
+    page = SimpleNamespace(id=uuid.uuid4(), content=VERSIONS[3], version=4)
+    rows = []
+    for version in (3, 2, 1):
+        page.version = version
+        page.content = VERSIONS[version - 1]
+        entry = history_entry(page, VERSIONS[version])
+        rows.append(SimpleNamespace(version=version, content=entry.content, delta=entry.delta, created_at=datetime.now()))
+    page.version, page.content = 4, VERSIONS[3]
+
+    for version in (1, 2, 3, 4):
+        chain = [row for row in rows if row.version >= version]
+        assert await reconstruct_version(_Session(chain), page, version) == VERSIONS[version - 1]
+    assert await reconstruct_version(_Session(rows), page, 5) is None
+    assert await reconstruct_version(_Session(rows[:1]), page, 1) is None
+
+
+@pytest.mark.anyio
+async def test_consensus_edit_keeps_the_history_chain_reconstructible(monkeypatch) -> None:
+    from null_engine.core import consensus
+
+    monkeypatch.setattr(wiki_history.settings, "wiki_snapshot_every", 100)
+    article = "".join(f"Line {i}\n" for i in range(50))
+    page = SimpleNamespace(id=uuid.uuid4(), content=article, version=1, status="draft", embedding=[0.1])
+    added = []
+
+    class _ConsensusSession:
+        async def execute(self, _stmt):
+            return SimpleNamespace(scalar_one_or_none=lambda: page)
+
+        def add(self, row):
+            added.append(row)
+
+        async def flush(self):
+            return None
+
+    async def _no_op(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(consensus, "record_activity", _no_op)
+    monkeypatch.setattr(consensus, "enqueue_embeddings", _no_op)
+
+    engine = consensus.ConsensusEngine()
+    await engine._create_wiki_from_claim(_ConsensusSession(), uuid.uuid4(), {"claim": "The tide obeys", "category": "x"})
+
+    assert page.version == 2 and page.embedding is None
+    assert [row.version for row in added] == [1] and added[0].delta is not None
+    rows = [SimpleNamespace(version=1, content=added[0].content, delta=added[0].delta, created_at=datetime.now())]
+    assert await reconstruct_version(_Session(rows), page, 1) == article
+
+    # A version written without its history row (what consensus used to do)
+    # leaves a gap: refuse rather than apply v1's delta to the wrong text.
+    page.version, page.content = 3, page.content + "- Later\n"
+    assert await reconstruct_version(_Session(rows), page, 1) is None
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from null_engine.core import wiki
+from null_engine.core.wiki import WikiEngine, splice_sections, split_sections
+
+ARTICLE = """# Salt Road
+
+Intro line.
+
+## Overview
+
+Old overview.
+
+## Notable Events
+
+The first flood.
+
+## Current Status
+
+Quiet.
+"""
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_split_and_splice_keep_untouched_sections_verbatim() -> None:
+    assert [heading for heading, _ in split_sections(ARTICLE)] == ["", "Overview", "Notable Events", "Current Status"]
+
+    spliced = splice_sections(ARTICLE, [
+        ("notable events", "The second flood.", True),
+        ("Current Status", "At war.", False),
+        ("Legacy", "Songs remain.", True),
+    ])
+    sections = dict(split_sections(spliced))
+    assert sections[""] == "# Salt Road\n\nIntro line."
+    assert sections["Overview"] == "Old overview."
+    assert sections["Notable Events"] == "The first flood.\n\nThe second flood."
+    assert sections["Current Status"] == "At war."
+    assert sections["Legacy"] == "Songs remain."
+
+
+@pytest.mark.anyio
+async def test_sectioned_pages_only_send_a_bounded_outline(monkeypatch) -> None:
+    prompts: list[str] = []
+
+    async def _generate_json(role, prompt, max_tokens=4096):
+        prompts.append(prompt)
+        return {"sections": [{"heading": "Current Status", "mode": "replace", "content": "Rebuilt."}]}
+
+    async def _generate_text(role, prompt, max_tokens=2048, **_kwargs):
+        raise AssertionError("sectioned pages must not be rewritten whole")
+
+    monkeypatch.setattr(wiki.llm_router, "generate_json", _generate_json)
+    monkeypatch.setattr(wiki.llm_router, "generate_text", _generate_text)
+    long_article = ARTICLE.replace("The first flood.", "Flood. " * 2000)
+
+    content = await WikiEngine()._write_article("Salt Road", long_article, ["[E1T2] Salt Road (3 messages): rebuilt"])
+
+    assert dict(split_sections(content))["Current Status"] == "Rebuilt."
+    assert len(prompts[0]) < len(wiki.WIKI_SECTION_PROMPT) + 4 * wiki.SECTION_EXCERPT_CHARS + 500
+
+
+@pytest.mark.anyio
+async def test_article_generation_is_bounded(monkeypatch) -> None:
+    in_flight = 0
+    peak = 0
+
+    async def _generate_text(role, prompt, max_tokens=2048, **_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "## Overview\n\nNew."
+
+    monkeypatch.setattr(wiki.llm_router, "generate_text", _generate_text)
+    monkeypatch.setattr(wiki.settings, "wiki_concurrency", 2)
+    engine = WikiEngine()
+    await asyncio.gather(*(engine._write_article(f"T{i}", "", []) for i in range(5)))
+    assert peak == 2
@@ -86,7 +86,7 @@ def override_db(monkeypatch):
 
         app.dependency_overrides[get_db] = _override
 
-    async def _no_background_genesis(_world_id, _seed_prompt, _extra_config):
+    async def _no_genesis_job(_db, _world_id, _seed_prompt, _extra_config, **_kwargs):
         return None
 
     class _DummyRunner:
@@ -100,7 +100,7 @@ def override_db(monkeypatch):
         def stop(self):
             self.running = False
 
-    monkeypatch.setattr(worlds_route, "_background_genesis", _no_background_genesis)
+    monkeypatch.setattr(worlds_route, "enqueue_genesis", _no_genesis_job)
     monkeypatch.setattr(runner_manager, "runner_factory", _DummyRunner)
 
     async def _lease_ok(_world_id):
@@ -113,9 +113,6 @@ def override_db(monkeypatch):
     monkeypatch.setattr(runner_manager, "release_lease", _release)
     yield _set_session
     app.dependency_overrides.pop(get_db, None)
-    for task in list(worlds_route._genesis_tasks.values()):
-        task.cancel()
-    worlds_route._genesis_tasks.clear()
     runner_manager._runners.clear()
 
 
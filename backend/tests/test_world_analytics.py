@@ -0,0 +1,117 @@
+import uuid
+from typing import Any
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from null_engine.services import world_analytics
+from null_engine.services.world_analytics import (
+    compute_analytics,
+    get_world_analytics,
+    pagerank,
+    participation_query,
+)
+
+
+class _Result:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+    def one_or_none(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+
+class _QueueSession:
+    def __init__(self, results: list[list[Any]]):
+        self._results = list(results)
+        self.executed = 0
+
+    async def execute(self, _stmt: Any) -> _Result:
+        self.executed += 1
+        return _Result(self._results.pop(0))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_snapshots():
+    world_analytics._snapshots.clear()
+    yield
+    world_analytics._snapshots.clear()
+
+
+def test_pagerank_ranks_the_hub_first_and_sums_to_one() -> None:
+    # Star around node 0, plus an isolated node 4.
+    rows = np.array([0, 0, 0, 1, 2, 3])
+    cols = np.array([1, 2, 3, 0, 0, 0])
+    rank = pagerank(5, rows, cols, np.ones(6))
+
+    assert rank.sum() == pytest.approx(1.0)
+    assert rank.argmax() == 0
+    assert rank[1] == pytest.approx(rank[2])
+    assert rank[4] < rank[1]
+
+
+def test_compute_analytics_scores_factions_and_agents_from_their_own_ties() -> None:
+    red, blue = uuid.uuid4(), uuid.uuid4()
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    analytics = compute_analytics(
+        3,
+        [(a, "Ash", red), (b, "Bryn", red), (c, "Cole", blue), (d, "Dara", None)],
+        [(red, "Red", "#f00"), (blue, "Blue", "#00f")],
+        [(a, b, 0.9), (a, c, 0.1), (b, c, 0.3), (c, d, 0.5)],
+        {a: 4, c: 1},
+    )
+
+    ash = analytics.agents[a]
+    assert (ash.relationships, ash.allies, ash.rivals, ash.conversations) == (2, 1, 1, 4)
+    assert ash.avg_strength == pytest.approx(0.5)
+    assert analytics.agents[b].conversations == 0
+    assert sum(agent.influence for agent in analytics.agents.values()) == pytest.approx(1.0)
+    assert sorted(agent.influence_rank for agent in analytics.agents.values()) == [1, 2, 3, 4]
+
+    assert analytics.factions[red].agent_count == 2
+    assert analytics.factions[red].cohesion == pytest.approx(0.9)
+    assert analytics.factions[red].tension == pytest.approx(0.8)
+    assert analytics.factions[red].conversations == 4
+    # No ties inside Blue: neutral cohesion, power equals influence share.
+    assert analytics.factions[blue].cohesion == pytest.approx(0.5)
+    assert analytics.factions[blue].power == pytest.approx(100 * analytics.agents[c].influence)
+    pair = (red, blue) if (red, blue) in analytics.tensions else (blue, red)
+    assert analytics.tensions == {pair: pytest.approx(0.8)}
+
+
+def test_participation_counts_each_agent_in_conversation_participants() -> None:
+    sql = str(participation_query(uuid.uuid4()).compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert "jsonb_array_elements_text(conversations.participants)" in sql
+    assert "GROUP BY participant.agent_id" in sql
+
+
+@pytest.mark.anyio
+async def test_world_analytics_are_rebuilt_only_when_the_world_version_moves() -> None:
+    world_id, agent_id = uuid.uuid4(), uuid.uuid4()
+    load = [[(agent_id, "Ash", None)], [], [], [(str(agent_id), 2), ("not-a-uuid", 1)]]
+    db = _QueueSession([[(1, 5, 7)], *load, [(1, 5, 7)], [(1, 6, 8)], *load])
+
+    first = await get_world_analytics(db, world_id)
+    assert first is not None and first.agents[agent_id].conversations == 2
+    assert db.executed == 5
+
+    assert await get_world_analytics(db, world_id) is first
+    assert db.executed == 6
+
+    assert await get_world_analytics(db, world_id) is not first
+    assert db.executed == 11
+
+
+@pytest.mark.anyio
+async def test_world_analytics_is_none_for_an_unknown_world() -> None:
+    assert await get_world_analytics(_QueueSession([[]]), uuid.uuid4()) is None
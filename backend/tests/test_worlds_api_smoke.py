@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+from types import SimpleNamespace
 from typing import Any
 from uuid import uuid4
 
@@ -64,16 +65,13 @@ def world_db(monkeypatch):
     async def _override():
         yield session
 
-    async def _no_background_genesis(_world_id, _seed_prompt, _extra_config):
+    async def _no_genesis_job(_db, _world_id, _seed_prompt, _extra_config, **_kwargs):
         return None
 
     app.dependency_overrides[get_db] = _override
-    monkeypatch.setattr(worlds_route, "_background_genesis", _no_background_genesis)
+    monkeypatch.setattr(worlds_route, "enqueue_genesis", _no_genesis_job)
     yield session
     app.dependency_overrides.pop(get_db, None)
-    for task in list(worlds_route._genesis_tasks.values()):
-        task.cancel()
-    worlds_route._genesis_tasks.clear()
     runner_manager._runners.clear()
 
 
@@ -184,3 +182,106 @@ async def test_start_stop_world_smoke(world_db, monkeypatch) -> None:
     assert start_resp.json()["status"] == "started"
     assert stop_resp.status_code == 200
     assert stop_resp.json()["status"] == "stopped"
+
+
+class _RowsResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+    def scalars(self) -> "_RowsResult":
+        return self
+
+    def scalar(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+
+class _RowsSession:
+    def __init__(self, *batches: list[Any]):
+        self._batches = list(batches)
+
+    async def execute(self, _stmt: Any) -> _RowsResult:
+        if not self._batches:
+            raise AssertionError("Unexpected DB execute call")
+        return _RowsResult(self._batches.pop(0))
+
+
+@pytest.mark.anyio
+async def test_list_worlds_reads_world_stats() -> None:
+    def _world(seed: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            id=uuid4(), seed_prompt=seed, config={}, status="running",
+            current_epoch=4, current_tick=9, created_at=datetime.now(UTC),
+        )
+
+    busy, fresh = _world("Busy"), _world("Fresh")
+    stats = SimpleNamespace(
+        agent_count=12, conversation_count=40, wiki_page_count=3, latest_topic="Harvest tithe",
+    )
+    # (world, stats) rows from the outer join, then tags — no per-table counts.
+    rows = [(busy, stats), (fresh, None)]
+    session = _RowsSession(rows, [], rows, [])
+
+    async def _override():
+        yield session
+
+    app.dependency_overrides[get_db] = _override
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/worlds")
+            mature = await client.get("/api/worlds", params={"mature": "true"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 200
+    cards = {c["seed_prompt"]: c for c in resp.json()}
+    assert cards["Busy"]["conversation_count"] == 40
+    assert cards["Busy"]["latest_activity"] == "Harvest tithe"
+    assert cards["Fresh"]["agent_count"] == 0
+    assert [c["seed_prompt"] for c in mature.json()] == ["Busy"]
+
+
+@pytest.mark.anyio
+async def test_list_factions_uses_stats_counts() -> None:
+    world_id = uuid4()
+    faction = SimpleNamespace(id=uuid4(), world_id=world_id, name="Guild", description="", color="#112233")
+    session = _RowsSession([faction], [{str(faction.id): 7}])
+
+    async def _override():
+        yield session
+
+    app.dependency_overrides[get_db] = _override
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get(f"/api/worlds/{world_id}/factions")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 200
+    assert resp.json()[0]["agent_count"] == 7
+
+
+def test_record_activity_is_a_single_upsert() -> None:
+    import asyncio
+
+    from sqlalchemy.dialects import postgresql
+
+    from null_engine.services.world_stats import record_activity
+
+    captured: list[Any] = []
+
+    class _Capture:
+        async def execute(self, stmt: Any) -> None:
+            captured.append(stmt)
+
+    asyncio.run(record_activity(_Capture(), uuid4(), conversations=1, latest_topic="Border dispute"))
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (world_id) DO UPDATE" in sql
+    assert "conversation_count = (world_stats.conversation_count + excluded.conversation_count)" in sql
+    assert "agent_count =" not in sql
+    assert "latest_topic = excluded.latest_topic" in sql
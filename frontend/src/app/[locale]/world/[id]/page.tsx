@@ -33,6 +33,7 @@ export default function WorldPage() {
     openOracle,
     setFocusFilter,
     focusFilter,
+    genesisProgress,
   } = useSimulationStore();
   const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
@@ -44,12 +45,17 @@ export default function WorldPage() {
     }
   }, [id, connect, disconnect, fetchWorld]);
 
-  // Poll while world is generating
+  // Progress and completion arrive over the WebSocket (genesis.progress,
+  // world.status) when genesis runs on the worker this socket is attached
+  // to. Otherwise poll the persisted genesis_progress; once live events
+  // flow, a slow poll only covers a completion sent before the socket
+  // connected.
+  const liveProgress = genesisProgress !== null;
   useEffect(() => {
     if (world?.status === "generating" && id) {
       pollRef.current = setInterval(() => {
         fetchWorld(id);
-      }, 2000);
+      }, liveProgress ? 15000 : 2000);
       return () => {
         if (pollRef.current) clearInterval(pollRef.current);
       };
@@ -58,7 +64,7 @@ export default function WorldPage() {
       clearInterval(pollRef.current);
       pollRef.current = null;
     }
-  }, [world?.status, id, fetchWorld]);
+  }, [world?.status, id, fetchWorld, liveProgress]);
 
   const handleAgentClick = useCallback(
     (agentId: string) => {
@@ -110,9 +116,7 @@ export default function WorldPage() {
   }
 
   if (world.status === "generating") {
-    const progress = (world.config as Record<string, unknown>)?._genesis_progress as
-      | { step: string; step_num: number; total_steps: number; detail: string; percent: number }
-      | undefined;
+    const progress = genesisProgress ?? world.genesis_progress ?? null;
     const percent = progress?.percent ?? 0;
     const detail = progress?.detail || GENERATING_MESSAGES[Math.floor(Date.now() / 3000) % GENERATING_MESSAGES.length];
     const stepLabel = progress ? `${progress.step_num} / ${progress.total_steps}` : "";
@@ -8,9 +8,7 @@ interface IncubatorChipProps {
 }
 
 export function IncubatorChip({ world, locale }: IncubatorChipProps) {
-  const progress = (world.config as Record<string, unknown>)?._genesis_progress as
-    | { percent: number; step_num: number; total_steps: number }
-    | undefined;
+  const progress = world.genesis_progress;
 
   const statusLabel =
     world.status === "generating"
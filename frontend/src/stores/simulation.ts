@@ -17,6 +17,7 @@ export interface WorldData {
   epoch_count?: number;
   latest_activity?: string | null;
   tags?: Array<{ tag: string; weight: number }>;
+  genesis_progress?: GenesisProgress | null;
 }
 
 export interface AgentData {
@@ -59,6 +60,14 @@ export interface WikiPageData {
 }
 
 
+export interface GenesisProgress {
+  step: string;
+  step_num: number;
+  total_steps: number;
+  detail: string;
+  percent: number;
+}
+
 export interface WSEvent {
   type: string;
   timestamp: string;
@@ -113,6 +122,7 @@ interface SimulationState {
   autoWorlds: WorldData[];
   worldTags: Record<string, Array<{ tag: string; weight: number }>>;
   tagFilter: string | null;
+  genesisProgress: GenesisProgress | null;
 
   // Chronicle state
   chronicleItems: ChronicleItem[];
@@ -181,6 +191,7 @@ export const useSimulationStore = create<SimulationState>((set, get) => ({
   activeAgentIds: new Set<string>(),
   oracleTarget: null,
   oracleOpen: false,
+  genesisProgress: null,
 
   createWorld: async (seedPrompt: string) => {
     try {
@@ -459,6 +470,42 @@ export const useSimulationStore = create<SimulationState>((set, get) => ({
       const world = get().world;
       if (world) get().fetchRelationships(world.id);
     }
+
+    if (event.type === "genesis.progress") {
+      set({ genesisProgress: event.payload as unknown as GenesisProgress });
+    }
+
+    if (event.type === "world.status") {
+      set({ genesisProgress: null });
+      const world = get().world;
+      if (world) get().fetchWorld(world.id);
+    }
+
+    if (event.type === "translation.ready") {
+      // Swap the Korean fields in place; the payload carries them.
+      const { entity_type: entityType, id, ...fields } = event.payload as Record<string, unknown>;
+      set((s) => {
+        const patchFeed = (item: FeedItem): FeedItem => {
+          const matches =
+            item.data.id === id &&
+            ((entityType === "conversation" && item.type === "conversation") ||
+              (entityType === "wiki_page" && item.type === "wiki_edit") ||
+              (entityType === "stratum" && item.type === "epoch"));
+          return matches ? { ...item, data: { ...item.data, ...fields } } : item;
+        };
+        return {
+          conversations:
+            entityType === "conversation"
+              ? s.conversations.map((c) => (c.id === id ? { ...c, ...(fields as Partial<ConversationData>) } : c))
+              : s.conversations,
+          wikiPages:
+            entityType === "wiki_page"
+              ? s.wikiPages.map((p) => (p.id === id ? { ...p, ...(fields as Partial<WikiPageData>) } : p))
+              : s.wikiPages,
+          feedItems: s.feedItems.map(patchFeed),
+        };
+      });
+    }
   },
 
   fetchConversations: async (worldId: string) => {